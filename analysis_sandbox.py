@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+격리된 분석 작업자
+
+pylint/astroid처럼 입력에 따라 오래 걸리거나 메모리를 많이 쓰는 분석을
+별도 프로세스에서 파일 단위 시간 제한과 메모리 제한을 걸고 실행합니다.
+제한을 넘은 작업자는 종료 후 새로 띄워 다음 파일 분석에 영향을 주지 않습니다.
+"""
+
+import io
+import os
+import threading
+import contextlib
+import multiprocessing
+
+try:
+    import resource
+except ImportError:  # Windows에서는 메모리 제한 없이 시간 제한만 적용
+    resource = None
+
+# 작업자 프로세스가 모듈을 불러오기까지 기다릴 최대 시간 (초)
+STARTUP_TIMEOUT = 60
+
+# 분석 결과 상태
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'
+STATUS_OOM = 'oom'
+STATUS_CRASH = 'crash'
+STATUS_ERROR = 'error'
+
+
+def _quality_filter():
+    """작업자에서 메서드를 실행할 기본 분석 객체 (CodeQualityFilter)"""
+    from code_filter import CodeQualityFilter
+    return CodeQualityFilter(metadata_file=os.devnull)
+
+
+def _worker_main(conn, memory_mb, target=_quality_filter):
+    """
+    작업자 프로세스 본체
+
+    Args:
+        conn: 부모 프로세스와 통신할 파이프
+        memory_mb (int): 주소 공간 제한 (MB, None이면 제한 없음)
+        target (callable): 메서드를 실행할 분석 객체를 만드는 함수
+    """
+    if memory_mb and resource is not None:
+        limit = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    quality_filter = target()
+    conn.send(STATUS_OK)
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        method, args = task
+        try:
+            # pylint은 내부 예외를 잡아 트레이스백만 출력하므로 stderr로 메모리 부족을 감지
+            errors = io.StringIO()
+            with contextlib.redirect_stderr(errors):
+                value = getattr(quality_filter, method)(*args)
+            if 'MemoryError' in errors.getvalue():
+                raise MemoryError()
+            conn.send((STATUS_OK, value))
+        except MemoryError:
+            # 메모리가 부족한 상태의 작업자는 재사용하지 않음
+            try:
+                conn.send((STATUS_OOM, None))
+            finally:
+                break
+        except Exception as e:
+            conn.send((STATUS_ERROR, str(e)))
+
+
+class IsolatedAnalyzer:
+    """파일 단위 시간/메모리 제한이 걸린 분석 작업자 관리 클래스"""
+
+    def __init__(self, timeout=60, memory_mb=1024, max_tasks_per_worker=200, target=_quality_filter):
+        """
+        격리 분석기 초기화
+
+        Args:
+            timeout (float): 파일 하나당 최대 분석 시간 (초)
+            memory_mb (int): 작업자 프로세스 메모리 제한 (MB)
+            max_tasks_per_worker (int): 작업자를 새로 띄우기 전까지 처리할 파일 수
+            target (callable): 작업자에서 분석 객체를 만드는 함수
+                (spawn으로 넘기므로 모듈 최상위 함수여야 함, 기본값은 CodeQualityFilter)
+        """
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.target = target
+        self.stats = {STATUS_OK: 0, STATUS_TIMEOUT: 0, STATUS_OOM: 0,
+                      STATUS_CRASH: 0, STATUS_ERROR: 0, 'restarts': 0}
+        # 웹 앱의 스레드에서 fork하면 잠금 상태가 복제될 수 있으므로 spawn 사용
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._tasks = 0
+        self._lock = threading.Lock()
+
+    def _start_worker(self):
+        """작업자 프로세스 시작"""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, self.memory_mb, self.target), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        self._tasks = 0
+
+        # 모듈 로딩 시간이 첫 파일의 분석 시간 제한에 포함되지 않도록 준비 신호 대기
+        if not parent_conn.poll(STARTUP_TIMEOUT):
+            self._stop_worker(force=True)
+            raise RuntimeError("분석 작업자 프로세스를 시작하지 못했습니다.")
+        parent_conn.recv()
+
+    def _stop_worker(self, force=False):
+        """
+        작업자 프로세스 종료
+
+        Args:
+            force (bool): True이면 응답을 기다리지 않고 강제 종료
+        """
+        if self._process is None:
+            return
+        try:
+            if not force and self._process.is_alive():
+                self._conn.send(None)
+                self._process.join(timeout=5)
+        except (OSError, EOFError, BrokenPipeError):
+            pass
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def call(self, method, *args):
+        """
+        작업자 프로세스에서 분석 객체(기본값은 CodeQualityFilter)의 메서드 실행
+
+        Args:
+            method (str): 실행할 메서드 이름
+            *args: 메서드 인수
+
+        Returns:
+            tuple: (상태, 결과) - 상태는 'ok', 'timeout', 'oom', 'crash', 'error' 중 하나
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                if self._process is not None:
+                    self._stop_worker(force=True)
+                    self.stats['restarts'] += 1
+                self._start_worker()
+
+            try:
+                self._conn.send((method, args))
+                if self._conn.poll(self.timeout):
+                    status, value = self._conn.recv()
+                else:
+                    status, value = STATUS_TIMEOUT, None
+            except (EOFError, OSError):
+                # 메모리 제한을 넘으면 C 확장에서 프로세스가 바로 죽는 경우가 많음
+                status, value = STATUS_CRASH, None
+                self._process.join(timeout=1)
+                if self.memory_mb and self._process.exitcode not in (0, None):
+                    status = STATUS_OOM
+
+            self.stats[status] += 1
+            self._tasks += 1
+
+            if status in (STATUS_TIMEOUT, STATUS_OOM, STATUS_CRASH):
+                self._stop_worker(force=True)
+                self.stats['restarts'] += 1
+            elif self._tasks >= self.max_tasks_per_worker:
+                self._stop_worker()
+
+            return status, value
+
+    def close(self):
+        """작업자 프로세스 정리"""
+        with self._lock:
+            self._stop_worker()
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+코드 분석기 등록 및 실행 모듈
+
+각 분석기는 필요한 입력(원문, 라인, 토큰, AST, 파일), 비용 등급, 출력 필드를
+선언합니다. 분석 엔진은 파일마다 입력을 한 번만 만들어 모든 분석기가 공유하게 하고,
+저비용 분석기부터 실행하며, 부적합 판정이 나오면 이후의 고비용 분석기를 건너뜁니다.
+분석기별 실행 횟수와 소요 시간은 엔진 통계에 누적됩니다.
+
+새 지표를 추가할 때는 Analyzer를 상속한 클래스를 만들어 등록하면 됩니다.
+
+    @register_analyzer
+    class TypingCoverageAnalyzer(Analyzer):
+        name = 'typing_coverage'
+        inputs = (INPUT_AST,)
+        cost = COST_PARSE
+        outputs = {'typed_ratio': float}
+
+        def run(self, context):
+            ...
+            return {'typed_ratio': ratio}
+"""
+
+import io
+import re
+import ast
+import time
+import tokenize
+from quality_model import extract_features
+from secret_scanner import default_scanner, SECRET_REASON
+
+# 비용 등급 (낮은 등급부터 실행)
+COST_TRIVIAL = 0    # 메타데이터만 확인
+COST_CHEAP = 1      # 원문/라인 한 번 훑기
+COST_PARSE = 2      # 토큰 또는 AST 필요
+COST_MODEL = 3      # 예측 모델 계산
+COST_EXTERNAL = 4   # 외부 도구 실행 (pylint, radon)
+
+# 분석기가 선언할 수 있는 입력
+INPUT_METADATA = 'metadata'
+INPUT_TEXT = 'text'
+INPUT_LINES = 'lines'
+INPUT_TOKENS = 'tokens'
+INPUT_AST = 'ast'
+INPUT_FILE = 'file'
+
+# 자동 생성 코드 표식 (파일 앞부분에서만 검사)
+GENERATED_CODE_PATTERN = re.compile(
+    r'(@generated|generated by|auto-?generated|do not edit|'
+    r'automatically generated|protocol buffer compiler)',
+    re.IGNORECASE
+)
+GENERATED_HEADER_BYTES = 2048
+
+# 심볼 색인에 저장하는 시그니처 최대 길이
+MAX_SIGNATURE_LENGTH = 200
+
+_UNSET = object()
+
+
+def extract_symbols(tree):
+    """
+    AST에서 정의(클래스, 함수, 메서드)와 가져온 모듈 추출
+
+    조건문이나 try 블록 안의 정의도 포함하며, 중첩된 정의는 바깥 이름을 붙인
+    qualname(예: 'Parser.parse')으로 구분합니다.
+
+    Args:
+        tree (ast.AST): 구문 분석한 모듈
+
+    Returns:
+        tuple: (정의 목록, 모듈 이름 목록)
+            정의는 name, qualname, kind, signature, line, end_line을 가진 딕셔너리이고
+            kind는 class, function, async_function, method, async_method 중 하나입니다.
+            모듈 이름은 정렬된 중복 없는 목록이며 상대 가져오기는 앞에 '.'이 붙습니다.
+    """
+    symbols = []
+
+    def visit(nodes, prefix, in_class):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = 'method' if in_class else 'function'
+                if isinstance(node, ast.AsyncFunctionDef):
+                    kind = 'async_' + kind
+                signature = f"({ast.unparse(node.args)})"
+                if node.returns is not None:
+                    signature += f" -> {ast.unparse(node.returns)}"
+            elif isinstance(node, ast.ClassDef):
+                kind = 'class'
+                bases = [ast.unparse(base) for base in node.bases + node.keywords]
+                signature = f"({', '.join(bases)})" if bases else ''
+            else:
+                # 조건문, 반복문, try/with 블록 안의 정의
+                visit([child for child in ast.iter_child_nodes(node)
+                       if isinstance(child, (ast.stmt, ast.excepthandler))], prefix, in_class)
+                continue
+
+            qualname = prefix + node.name
+            symbols.append({
+                'name': node.name,
+                'qualname': qualname,
+                'kind': kind,
+                'signature': signature[:MAX_SIGNATURE_LENGTH],
+                'line': node.lineno,
+                'end_line': node.end_lineno
+            })
+            visit(node.body, qualname + '.', kind == 'class')
+
+    visit(tree.body, '', False)
+
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.add('.' * node.level + (node.module or ''))
+
+    return symbols, sorted(modules)
+
+
+class AnalysisContext:
+    """파일 하나의 분석 입력과 결과 (입력은 처음 요청될 때 한 번만 생성)"""
+
+    def __init__(self, quality_filter, file_path, content, metadata_item):
+        """
+        분석 컨텍스트 초기화
+
+        Args:
+            quality_filter: 기준값과 분석 도구를 제공하는 CodeQualityFilter
+            file_path (str): 파이썬 파일 경로
+            content (str): 파일 내용
+            metadata_item (dict): 메타데이터 항목
+        """
+        self.quality_filter = quality_filter
+        self.file_path = file_path
+        self.content = content
+        self.metadata_item = metadata_item
+        self.license_name = metadata_item.get('repo_license')
+        self.results = {}
+        self.rejection = None
+        self.timings = {}
+        self._lines = _UNSET
+        self._tokens = _UNSET
+        self._tree = _UNSET
+
+    @property
+    def lines(self):
+        """파일 라인 목록"""
+        if self._lines is _UNSET:
+            self._lines = self.content.splitlines()
+        return self._lines
+
+    @property
+    def tokens(self):
+        """토큰 목록 (토큰화할 수 없으면 None)"""
+        if self._tokens is _UNSET:
+            try:
+                self._tokens = list(tokenize.generate_tokens(io.StringIO(self.content).readline))
+            except (tokenize.TokenError, SyntaxError):
+                self._tokens = None
+        return self._tokens
+
+    @property
+    def tree(self):
+        """AST (구문 분석에 실패하면 None)"""
+        if self._tree is _UNSET:
+            try:
+                self._tree = ast.parse(self.content)
+            except (SyntaxError, ValueError, RecursionError, MemoryError):
+                self._tree = None
+        return self._tree
+
+    def prepare(self, input_name):
+        """
+        선언된 입력을 미리 생성
+
+        Args:
+            input_name (str): 입력 이름
+
+        Returns:
+            bool: 이번 호출에서 새로 생성했는지 여부
+        """
+        if input_name == INPUT_LINES and self._lines is _UNSET:
+            self.lines
+        elif input_name == INPUT_TOKENS and self._tokens is _UNSET:
+            self.tokens
+        elif input_name == INPUT_AST and self._tree is _UNSET:
+            self.tree
+        else:
+            return False
+        return True
+
+    def reject(self, reason, persistent=False):
+        """
+        부적합 판정 기록 (이후 고비용 분석기는 실행하지 않음)
+
+        Args:
+            reason (str): 부적합 이유
+            persistent (bool): 기준값과 무관하게 항상 부적합한 이유인지 여부
+                (True이면 prescreen_reason으로 저장되어 재판정에도 유지됨)
+        """
+        if self.rejection is None:
+            self.rejection = reason
+        if persistent and not self.results.get('prescreen_reason'):
+            self.results['prescreen_reason'] = reason
+
+
+class Analyzer:
+    """분석기 기본 클래스"""
+
+    name = None
+    inputs = (INPUT_TEXT,)
+    cost = COST_CHEAP
+    outputs = {}
+    # 부적합 판정 후에도 실행할지 여부 (기준 재판정에 필요한 지표용)
+    runs_after_rejection = False
+
+    def applies(self, context):
+        """
+        이 파일에 분석기를 실행할지 확인
+
+        Args:
+            context (AnalysisContext): 분석 컨텍스트
+
+        Returns:
+            bool: 실행 여부
+        """
+        return True
+
+    def run(self, context):
+        """
+        분석 실행
+
+        Args:
+            context (AnalysisContext): 분석 컨텍스트
+
+        Returns:
+            dict: outputs에 선언된 필드의 값
+        """
+        raise NotImplementedError
+
+
+class AnalyzerRegistry:
+    """분석기 등록부"""
+
+    def __init__(self, analyzers=None):
+        """
+        등록부 초기화
+
+        Args:
+            analyzers (list, optional): 처음 등록할 분석기 인스턴스 목록
+        """
+        self._analyzers = []
+        for analyzer in analyzers or []:
+            self.register(analyzer)
+
+    def register(self, analyzer):
+        """
+        분석기 등록 (같은 비용 등급에서는 등록 순서대로 실행)
+
+        Args:
+            analyzer (Analyzer): 분석기 인스턴스
+
+        Returns:
+            Analyzer: 등록한 분석기
+        """
+        if not analyzer.name:
+            raise ValueError("분석기 이름이 없습니다.")
+        if self.get(analyzer.name) is not None:
+            raise ValueError(f"이미 등록된 분석기입니다: {analyzer.name}")
+        self._analyzers.append(analyzer)
+        return analyzer
+
+    def unregister(self, name):
+        """
+        분석기 등록 해제
+
+        Args:
+            name (str): 분석기 이름
+
+        Returns:
+            bool: 해제 여부
+        """
+        analyzer = self.get(name)
+        if analyzer is None:
+            return False
+        self._analyzers.remove(analyzer)
+        return True
+
+    def get(self, name):
+        """
+        이름으로 분석기 찾기
+
+        Args:
+            name (str): 분석기 이름
+
+        Returns:
+            Analyzer: 분석기 (없으면 None)
+        """
+        for analyzer in self._analyzers:
+            if analyzer.name == name:
+                return analyzer
+        return None
+
+    def ordered(self):
+        """
+        실행 순서대로 정렬된 분석기 목록
+
+        Returns:
+            list: 비용 등급 오름차순 분석기 목록
+        """
+        return sorted(self._analyzers, key=lambda analyzer: analyzer.cost)
+
+    def schema(self):
+        """
+        등록된 분석기의 전체 출력 스키마
+
+        Returns:
+            dict: 필드 이름 -> 타입
+        """
+        schema = {}
+        for analyzer in self.ordered():
+            schema.update(analyzer.outputs)
+        return schema
+
+    def copy(self):
+        """
+        같은 분석기로 구성된 새 등록부
+
+        Returns:
+            AnalyzerRegistry: 복사된 등록부
+        """
+        return AnalyzerRegistry(list(self._analyzers))
+
+
+# 기본 분석기 등록부
+default_registry = AnalyzerRegistry()
+
+
+def register_analyzer(analyzer_class):
+    """
+    기본 등록부에 분석기 클래스를 등록하는 데코레이터
+
+    Args:
+        analyzer_class (type): Analyzer 하위 클래스
+
+    Returns:
+        type: 등록한 클래스
+    """
+    default_registry.register(analyzer_class())
+    return analyzer_class
+
+
+class AnalysisEngine:
+    """등록된 분석기를 비용 순서로 실행하고 분석기별 비용을 집계하는 엔진"""
+
+    def __init__(self, registry=None):
+        """
+        분석 엔진 초기화
+
+        Args:
+            registry (AnalyzerRegistry, optional): 사용할 등록부 (없으면 기본 등록부)
+        """
+        self.registry = registry if registry is not None else default_registry
+        self.stats = {}
+
+    def _record(self, name, key, amount=1):
+        """분석기 통계 누적"""
+        entry = self.stats.setdefault(name, {'runs': 0, 'seconds': 0.0, 'rejections': 0, 'skipped': 0})
+        entry[key] += amount
+
+    def _validate(self, analyzer, output):
+        """
+        분석기 출력이 선언된 스키마와 맞는지 확인
+
+        Args:
+            analyzer (Analyzer): 분석기
+            output (dict): 분석 결과
+        """
+        for field, value in output.items():
+            if field not in analyzer.outputs:
+                raise ValueError(f"분석기 {analyzer.name}가 선언하지 않은 필드를 반환했습니다: {field}")
+            if value is not None and not isinstance(value, analyzer.outputs[field]):
+                raise TypeError(f"분석기 {analyzer.name}의 {field} 타입이 올바르지 않습니다: "
+                                f"{type(value).__name__}")
+
+    def run(self, context):
+        """
+        파일 하나에 등록된 분석기 실행
+
+        Args:
+            context (AnalysisContext): 분석 컨텍스트
+
+        Returns:
+            dict: 모든 분석기 결과를 합친 딕셔너리
+        """
+        for analyzer in self.registry.ordered():
+            if context.rejection is not None and not analyzer.runs_after_rejection:
+                self._record(analyzer.name, 'skipped')
+                continue
+            if not analyzer.applies(context):
+                continue
+
+            # 공유 입력은 처음 요청한 분석기와 별도로 집계
+            for input_name in analyzer.inputs:
+                start = time.perf_counter()
+                if context.prepare(input_name):
+                    self._record(f"<{input_name}>", 'seconds', time.perf_counter() - start)
+                    self._record(f"<{input_name}>", 'runs')
+
+            rejected_before = context.rejection is not None
+            start = time.perf_counter()
+            output = analyzer.run(context) or {}
+            elapsed = time.perf_counter() - start
+            self._validate(analyzer, output)
+            context.results.update(output)
+
+            context.timings[analyzer.name] = elapsed
+            self._record(analyzer.name, 'runs')
+            self._record(analyzer.name, 'seconds', elapsed)
+            if not rejected_before and context.rejection is not None:
+                self._record(analyzer.name, 'rejections')
+
+        return context.results
+
+    def report(self):
+        """
+        분석기별 누적 통계
+
+        Returns:
+            list: 소요 시간 내림차순 통계 목록
+        """
+        rows = [dict(name=name, **entry) for name, entry in self.stats.items()]
+        return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+    def reset_stats(self):
+        """누적 통계 초기화"""
+        self.stats = {}
+
+
+@register_analyzer
+class LicenseAnalyzer(Analyzer):
+    """저장소 라이센스 호환성 확인"""
+
+    name = 'license'
+    inputs = (INPUT_METADATA,)
+    cost = COST_TRIVIAL
+
+    def run(self, context):
+        if not context.quality_filter.check_license_compatibility(context.license_name):
+            context.reject(f"라이센스 호환성 문제 ({context.license_name})")
+        return {}
+
+
+@register_analyzer
+class LineMetricsAnalyzer(Analyzer):
+    """코드 라인 수와 주석 비율 계산"""
+
+    name = 'line_metrics'
+    inputs = (INPUT_LINES,)
+    cost = COST_CHEAP
+    outputs = {'code_lines': int, 'comment_ratio': float}
+    runs_after_rejection = True
+
+    def run(self, context):
+        quality_filter = context.quality_filter
+        lines = context.lines
+        code_lines = quality_filter._count_code_lines_in(lines)
+        comment_lines = sum(1 for line in lines if line.lstrip().startswith('#'))
+        non_blank_lines = sum(1 for line in lines if line.strip())
+
+        if code_lines < quality_filter.min_code_lines:
+            context.reject(f"코드 라인 수 부족 ({code_lines} < {quality_filter.min_code_lines})")
+        elif code_lines > quality_filter.max_code_lines:
+            context.reject(f"코드 라인 수 초과 ({code_lines} > {quality_filter.max_code_lines})")
+
+        return {
+            'code_lines': code_lines,
+            'comment_ratio': round(comment_lines / non_blank_lines, 3) if non_blank_lines else 0.0
+        }
+
+
+@register_analyzer
+class GeneratedCodeAnalyzer(Analyzer):
+    """파일 앞부분의 자동 생성 코드 표식 확인"""
+
+    name = 'generated'
+    inputs = (INPUT_TEXT,)
+    cost = COST_CHEAP
+    outputs = {'prescreen_reason': str}
+    runs_after_rejection = True
+
+    def run(self, context):
+        if GENERATED_CODE_PATTERN.search(context.content[:GENERATED_HEADER_BYTES]):
+            context.reject("자동 생성 코드", persistent=True)
+        return {}
+
+
+@register_analyzer
+class SecretScanAnalyzer(Analyzer):
+    """API 키, 개인 키, 비밀번호 등 비밀 정보 탐지"""
+
+    name = 'secrets'
+    inputs = (INPUT_TEXT,)
+    cost = COST_CHEAP
+    outputs = {'has_secrets': bool, 'secret_findings': list, 'prescreen_reason': str}
+    # 기준이 바뀌어 적합해지더라도 내보내기에서 제외할 수 있도록 항상 실행
+    runs_after_rejection = True
+
+    def run(self, context):
+        findings = default_scanner.scan(context.content)
+        if findings:
+            context.reject(SECRET_REASON, persistent=True)
+        return {'has_secrets': bool(findings), 'secret_findings': findings}
+
+
+@register_analyzer
+class SyntaxAnalyzer(Analyzer):
+    """구문 분석 성공 여부 확인"""
+
+    name = 'syntax'
+    inputs = (INPUT_AST,)
+    cost = COST_PARSE
+    outputs = {'prescreen_reason': str}
+
+    def run(self, context):
+        if context.tree is None:
+            context.reject("구문 오류", persistent=True)
+        return {}
+
+
+@register_analyzer
+class SymbolAnalyzer(Analyzer):
+    """심볼 색인용 정의(클래스, 함수, 메서드)와 가져온 모듈 추출"""
+
+    name = 'symbols'
+    inputs = (INPUT_AST,)
+    cost = COST_PARSE
+    outputs = {'symbols': list, 'imports': list}
+    # 부적합한 파일도 검색할 수 있도록 항상 실행
+    runs_after_rejection = True
+
+    def run(self, context):
+        if context.tree is None:
+            return {'symbols': None, 'imports': None}
+        symbols, imports = extract_symbols(context.tree)
+        return {'symbols': symbols, 'imports': imports}
+
+
+@register_analyzer
+class QualityModelAnalyzer(Analyzer):
+    """품질 예측 모델이 충분히 확신하면 예측 점수 사용"""
+
+    name = 'quality_model'
+    inputs = (INPUT_TEXT, INPUT_AST)
+    cost = COST_MODEL
+    outputs = {'quality_score': float, 'quality_confidence': float, 'evaluation_tier': str}
+
+    def applies(self, context):
+        quality_filter = context.quality_filter
+        return quality_filter.quality_model is not None and quality_filter.min_quality_score > 0
+
+    def run(self, context):
+        quality_filter = context.quality_filter
+        model = quality_filter.quality_model
+        predicted = model.predict(extract_features(context.content, context.tree))
+        confidence = model.decision_confidence(predicted, quality_filter.min_quality_score)
+        if confidence < quality_filter.model_min_confidence:
+            return {}
+
+        if predicted < quality_filter.min_quality_score:
+            context.reject(f"품질 점수 미달 ({predicted:.1f} < {quality_filter.min_quality_score})")
+        return {
+            'quality_score': round(float(predicted), 2),
+            'quality_confidence': round(float(confidence), 3),
+            'evaluation_tier': 'model'
+        }
+
+
+@register_analyzer
+class PylintAnalyzer(Analyzer):
+    """pylint 품질 점수와 메시지 ID별 발생 횟수 (시간/메모리 제한 적용)"""
+
+    name = 'pylint'
+    inputs = (INPUT_FILE,)
+    cost = COST_EXTERNAL
+    outputs = {'quality_score': float, 'analysis_status': str, 'evaluation_tier': str,
+               'lint_messages': dict}
+
+    def applies(self, context):
+        # 품질 기준이 없거나 이미 예측 점수가 있으면 결과가 판정을 바꿀 수 없음
+        return (context.quality_filter.min_quality_score > 0
+                and context.results.get('quality_score') is None)
+
+    def run(self, context):
+        quality_filter = context.quality_filter
+        messages = {}
+        quality_score, status = quality_filter.evaluate_code_quality_guarded(context.file_path, messages)
+        if quality_score is None:
+            _, reason = quality_filter.judge_suitability(
+                context.license_name, context.results.get('code_lines'), None, analysis_status=status
+            )
+            context.reject(reason)
+        elif quality_score < quality_filter.min_quality_score:
+            context.reject(f"품질 점수 미달 ({quality_score:.1f} < {quality_filter.min_quality_score})")
+
+        return {
+            'quality_score': None if quality_score is None else round(float(quality_score), 2),
+            'analysis_status': status,
+            'evaluation_tier': 'pylint',
+            'lint_messages': None if quality_score is None else messages
+        }
+
+
+@register_analyzer
+class ComplexityAnalyzer(Analyzer):
+    """radon 순환 복잡도 (pylint로 평가한 파일만)"""
+
+    name = 'complexity'
+    inputs = (INPUT_FILE,)
+    cost = COST_EXTERNAL
+    outputs = {'complexity': dict}
+
+    def applies(self, context):
+        return (context.results.get('evaluation_tier') == 'pylint'
+                and context.results.get('quality_score') is not None)
+
+    def run(self, context):
+        return {'complexity': context.quality_filter.check_code_complexity(context.file_path)}
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+소스 코드 묶음 저장소 (pack 파일)
+
+다운로드한 소스를 파일마다 따로 저장하는 대신 큰 pack 파일 몇 개에 이어 붙여 저장합니다.
+수백만 개의 작은 파일 때문에 생기는 inode 사용량, 디렉토리 탐색, 백업 시간 문제를 줄입니다.
+
+- pack 파일 항목: 헤더(매직, 압축 여부, 키 길이, 저장 길이, 원본 길이, CRC32) + 키 + 내용
+  (내용은 zlib으로 압축해 작아질 때만 압축해서 저장)
+- 위치 색인: 저장소 디렉토리의 index.db (키 -> pack 번호, 내용 오프셋, 길이)
+- 읽기: pack 파일을 메모리 매핑(mmap)해 색인의 위치를 바로 읽음
+  (압축하지 않은 항목은 복사 없이 memoryview로 읽을 수 있음)
+- 같은 키로 다시 저장하면 새 내용을 뒤에 붙이고 이전 항목은 삭제 표시하며,
+  삭제 표시된 항목이 차지하던 공간은 compact()로 pack 파일을 다시 써서 회수합니다.
+
+저장된 소스는 'blob:<저장소 디렉토리>#<키>' 형식의 참조를 local_path로 사용하며,
+read_source/source_stat/materialize 등은 일반 파일 경로와 참조를 똑같이 다룹니다.
+한 저장소에는 한 프로세스만 쓴다고 가정합니다 (읽기는 여러 프로세스 가능).
+"""
+
+import os
+import re
+import mmap
+import shutil
+import sqlite3
+import time
+import zlib
+import struct
+import tempfile
+import threading
+import contextlib
+from db_connection import get_pool
+
+# local_path에 저장하는 참조의 접두어
+BLOB_PREFIX = 'blob:'
+
+# 수집 디렉토리 안의 묶음 저장소 디렉토리 이름
+PACK_DIR_NAME = 'packs'
+
+# 저장소 디렉토리 안의 위치 색인 파일 이름
+INDEX_NAME = 'index.db'
+
+# pack 파일 하나의 최대 크기 (넘으면 새 pack 파일에 씀)
+PACK_BYTES = 256 * 1024 * 1024
+
+# pack 파일 이름 (pack-00000.pack)
+PACK_PATTERN = re.compile(r'^pack-(\d{5})\.pack$')
+
+# 항목 헤더: 매직, 압축 여부, 키 길이, 저장 길이, 원본 길이, 원본 CRC32
+ENTRY_HEADER = struct.Struct('<4sBHIII')
+ENTRY_MAGIC = b'CHBL'
+
+# 이 크기보다 작은 내용은 압축하지 않음 (압축 이득보다 헤더 비용이 큼)
+MIN_COMPRESS_BYTES = 256
+
+# zlib 압축 수준
+COMPRESS_LEVEL = 6
+
+# 저장소 디렉토리별 BlobStore (프로세스 안에서 mmap과 연결 풀을 공유)
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _pack_name(number):
+    """pack 번호의 파일 이름"""
+    return f'pack-{number:05d}.pack'
+
+
+def source_key(repo_full_name, file_path):
+    """
+    소스 파일의 저장소 키 (개별 파일로 저장할 때의 상대 경로와 같음)
+
+    Args:
+        repo_full_name (str): 저장소 전체 이름 (owner/repo)
+        file_path (str): 저장소 안의 파일 경로
+
+    Returns:
+        str: 항목 키 (예: 'owner_repo/pkg/module.py')
+    """
+    return f"{repo_full_name.replace('/', '_')}/{file_path}"
+
+
+class BlobStore:
+    """pack 파일과 위치 색인으로 소스 코드를 저장하고 읽는 클래스"""
+
+    def __init__(self, store_dir, compress=True, pack_bytes=PACK_BYTES):
+        """
+        묶음 저장소 초기화
+
+        Args:
+            store_dir (str): pack 파일과 색인을 둘 디렉토리
+            compress (bool): 내용 압축 여부
+            pack_bytes (int): pack 파일 하나의 최대 크기
+        """
+        self.store_dir = store_dir
+        self.compress = compress
+        self.pack_bytes = pack_bytes
+        os.makedirs(store_dir, exist_ok=True)
+        self.pool = get_pool(os.path.join(store_dir, INDEX_NAME))
+        self._lock = threading.Lock()
+        self._maps = {}
+        self._write_pack = None
+
+        with self.pool.connection() as conn:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                pack INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                raw_length INTEGER NOT NULL,
+                compressed INTEGER NOT NULL,
+                crc32 INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0
+            )
+            ''')
+            # 키마다 삭제되지 않은 항목은 하나뿐
+            conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_blobs_key ON blobs(key) WHERE deleted = 0')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_blobs_pack ON blobs(pack, offset)')
+
+    def _pack_path(self, number):
+        """pack 번호의 파일 경로"""
+        return os.path.join(self.store_dir, _pack_name(number))
+
+    def _pack_numbers(self):
+        """디스크에 있는 pack 번호 목록 (오름차순)"""
+        return sorted(int(match.group(1)) for match in map(PACK_PATTERN.match, os.listdir(self.store_dir))
+                      if match)
+
+    def _pack_for_write(self, size):
+        """
+        size 바이트를 이어 쓸 pack 번호 (현재 pack이 가득 차면 다음 번호)
+
+        Args:
+            size (int): 쓸 항목 크기
+
+        Returns:
+            int: pack 번호
+        """
+        if self._write_pack is None:
+            numbers = self._pack_numbers()
+            self._write_pack = numbers[-1] if numbers else 0
+        path = self._pack_path(self._write_pack)
+        if os.path.exists(path) and os.path.getsize(path) > 0 and os.path.getsize(path) + size > self.pack_bytes:
+            self._write_pack += 1
+        return self._write_pack
+
+    def _encode(self, key, data):
+        """
+        pack 파일에 쓸 항목 만들기
+
+        Returns:
+            tuple: (항목 바이트, 헤더와 키를 뺀 내용 시작 위치, 저장 길이, 압축 여부, CRC32)
+        """
+        crc = zlib.crc32(data)
+        stored, compressed = data, 0
+        if self.compress and len(data) >= MIN_COMPRESS_BYTES:
+            packed = zlib.compress(data, COMPRESS_LEVEL)
+            if len(packed) < len(data):
+                stored, compressed = packed, 1
+        key_bytes = key.encode('utf-8')
+        header = ENTRY_HEADER.pack(ENTRY_MAGIC, compressed, len(key_bytes), len(stored), len(data), crc)
+        return header + key_bytes + stored, ENTRY_HEADER.size + len(key_bytes), len(stored), compressed, crc
+
+    def put(self, key, content):
+        """
+        내용을 pack 파일 끝에 붙여 저장 (같은 키의 이전 내용은 삭제 표시)
+
+        Args:
+            key (str): 항목 키 (예: 'owner_repo/pkg/module.py')
+            content (str|bytes): 저장할 내용
+
+        Returns:
+            str: local_path로 쓸 참조 ('blob:<저장소 디렉토리>#<키>')
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else bytes(content)
+        entry, data_start, length, compressed, crc = self._encode(key, data)
+
+        with self._lock:
+            number = self._pack_for_write(len(entry))
+            with open(self._pack_path(number), 'ab') as f:
+                offset = f.tell() + data_start
+                f.write(entry)
+
+            # pack 파일에 먼저 쓰고 색인에 기록하므로, 중간에 멈추면 색인에 없는 항목만 남음
+            # (compact()가 정리)
+            with self.pool.connection() as conn:
+                conn.execute('UPDATE blobs SET deleted = 1 WHERE key = ? AND deleted = 0', (key,))
+                conn.execute('''
+                INSERT INTO blobs (key, pack, offset, length, raw_length, compressed, crc32, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (key, number, offset, length, len(data), compressed, crc, time.time()))
+
+        return make_ref(self.store_dir, key)
+
+    def _lookup(self, key):
+        """
+        키의 현재 항목 위치 조회
+
+        Raises:
+            FileNotFoundError: 없거나 삭제된 키
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute('''
+            SELECT pack, offset, length, raw_length, compressed, crc32, stored_at
+            FROM blobs WHERE key = ? AND deleted = 0
+            ''', (key,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"저장소에 없는 항목: {key}")
+        return row
+
+    def _mapped(self, number, end):
+        """
+        pack 파일의 메모리 매핑 (end까지 매핑되지 않았으면 다시 매핑)
+
+        Args:
+            number (int): pack 번호
+            end (int): 읽을 위치의 끝
+
+        Returns:
+            mmap.mmap: 읽기 전용 매핑
+        """
+        with self._lock:
+            mapped = self._maps.get(number)
+            if mapped is None or len(mapped) < end:
+                # 이전 매핑은 view()가 돌려준 memoryview가 남아 있을 수 있으므로 닫지 않고 참조만 놓음
+                with open(self._pack_path(number), 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[number] = mapped
+            return mapped
+
+    def view(self, key):
+        """
+        항목 내용을 memoryview로 읽기
+
+        압축하지 않고 저장된 항목은 pack 파일 매핑을 복사 없이 가리키고,
+        압축된 항목은 풀어 쓴 내용을 가리킵니다.
+
+        Args:
+            key (str): 항목 키
+
+        Returns:
+            memoryview: 내용
+
+        Raises:
+            FileNotFoundError: 없거나 삭제된 키
+            OSError: 내용이 손상된 경우 (CRC 불일치)
+        """
+        number, offset, length, raw_length, compressed, crc, _ = self._lookup(key)
+        stored = memoryview(self._mapped(number, offset + length))[offset:offset + length]
+        data = memoryview(zlib.decompress(stored, bufsize=max(raw_length, 1))) if compressed else stored
+        if len(data) != raw_length or zlib.crc32(data) != crc:
+            raise OSError(f"손상된 항목: {key}")
+        return data
+
+    def get(self, key):
+        """
+        항목 내용 읽기
+
+        Args:
+            key (str): 항목 키
+
+        Returns:
+            bytes: 내용
+        """
+        return bytes(self.view(key))
+
+    def stat(self, key):
+        """
+        항목 크기와 저장 시각 (파일의 os.stat 대신 변경 감지에 사용)
+
+        Args:
+            key (str): 항목 키
+
+        Returns:
+            os.stat_result: st_size는 원본 크기, st_mtime은 저장 시각
+        """
+        _, _, _, raw_length, _, _, stored_at = self._lookup(key)
+        return os.stat_result((0o100644, 0, 0, 1, 0, 0, raw_length, stored_at, stored_at, stored_at))
+
+    def delete(self, key):
+        """
+        항목 삭제 표시 (공간은 compact()에서 회수)
+
+        Args:
+            key (str): 항목 키
+
+        Returns:
+            bool: 삭제한 항목이 있었는지 여부
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.execute('UPDATE blobs SET deleted = 1 WHERE key = ? AND deleted = 0', (key,))
+            return cursor.rowcount > 0
+
+    def stats(self):
+        """
+        저장소 사용량
+
+        Returns:
+            dict: 항목 수, 삭제 표시 항목 수, pack 파일 수, pack 파일 크기, 원본 크기 합계
+        """
+        with self.pool.connection() as conn:
+            live, raw_bytes = conn.execute(
+                'SELECT COUNT(*), IFNULL(SUM(raw_length), 0) FROM blobs WHERE deleted = 0').fetchone()
+            deleted = conn.execute('SELECT COUNT(*) FROM blobs WHERE deleted = 1').fetchone()[0]
+        numbers = self._pack_numbers()
+        return {
+            'entries': live,
+            'deleted': deleted,
+            'packs': len(numbers),
+            'pack_bytes': sum(os.path.getsize(self._pack_path(number)) for number in numbers),
+            'raw_bytes': raw_bytes
+        }
+
+    def compact(self, min_garbage=0.0):
+        """
+        삭제 표시 항목이 있는 pack 파일을 살아 있는 항목만 새 pack 파일로 옮겨 다시 쓰기
+
+        Args:
+            min_garbage (float): 다시 쓸 pack 파일의 최소 낭비 비율 (0이면 낭비가 있는 pack 모두)
+
+        Returns:
+            dict: 다시 쓴 pack 수, 옮긴 항목 수, 회수한 바이트 수
+        """
+        result = {'packs': 0, 'moved': 0, 'reclaimed': 0}
+        numbers = self._pack_numbers()
+        if not numbers:
+            return result
+
+        with self.pool.connection() as conn:
+            live = {}
+            for number, live_bytes in conn.execute('''
+                SELECT pack, SUM(length + ? + LENGTH(CAST(key AS BLOB)))
+                FROM blobs WHERE deleted = 0 GROUP BY pack
+            ''', (ENTRY_HEADER.size,)):
+                live[number] = live_bytes
+
+            # 색인에 없는 항목(쓰다 멈춘 항목)도 낭비에 포함되도록 파일 크기 기준으로 비교
+            targets = []
+            for number in numbers:
+                size = os.path.getsize(self._pack_path(number))
+                garbage = size - live.get(number, 0)
+                if garbage > 0 and (size == 0 or garbage / size >= min_garbage):
+                    targets.append(number)
+                    result['reclaimed'] += garbage
+            if not targets:
+                return result
+
+            with self._lock:
+                placeholders = ', '.join(['?'] * len(targets))
+                rows = conn.execute(f'''
+                SELECT id, key, pack, offset, length, raw_length, compressed, crc32
+                FROM blobs WHERE deleted = 0 AND pack IN ({placeholders})
+                ORDER BY pack, offset
+                ''', targets).fetchall()
+
+                # 새 pack 파일은 기존 번호 뒤에 쓰고, 색인을 바꾼 뒤 이전 pack 파일 삭제
+                self._write_pack = numbers[-1] + 1
+                updates = []
+                source = source_number = writer = None
+                try:
+                    for blob_id, key, number, offset, length, raw_length, compressed, crc in rows:
+                        if number != source_number:
+                            if source is not None:
+                                source.close()
+                            source, source_number = open(self._pack_path(number), 'rb'), number
+                        source.seek(offset)
+                        stored = source.read(length)
+                        key_bytes = key.encode('utf-8')
+                        entry = (ENTRY_HEADER.pack(ENTRY_MAGIC, compressed, len(key_bytes), length, raw_length, crc)
+                                 + key_bytes + stored)
+                        if writer is None or (writer.tell() > 0 and writer.tell() + len(entry) > self.pack_bytes):
+                            if writer is not None:
+                                writer.close()
+                                self._write_pack += 1
+                            writer = open(self._pack_path(self._write_pack), 'ab')
+                        updates.append((self._write_pack, writer.tell() + ENTRY_HEADER.size + len(key_bytes),
+                                        blob_id))
+                        writer.write(entry)
+                finally:
+                    for f in (source, writer):
+                        if f is not None:
+                            f.close()
+
+                conn.executemany('UPDATE blobs SET pack = ?, offset = ? WHERE id = ?', updates)
+                conn.execute(f'DELETE FROM blobs WHERE deleted = 1 AND pack IN ({placeholders})', targets)
+                conn.commit()
+
+                for number in targets:
+                    self._maps.pop(number, None)
+                    os.remove(self._pack_path(number))
+                result.update(packs=len(targets), moved=len(updates))
+
+        print(f"pack 파일 정리 완료: {result['packs']}개 pack 다시 작성, 항목 {result['moved']}개 이동, "
+              f"{result['reclaimed'] / 1024 / 1024:.1f}MB 회수")
+        return result
+
+    def backup(self, backup_dir):
+        """
+        색인과 pack 파일 백업
+
+        pack 파일에 먼저 쓰고 색인에 기록하므로, 색인을 먼저 백업하면 그 뒤에 복사한
+        pack 파일에는 백업된 색인의 항목이 모두 들어 있습니다.
+
+        Args:
+            backup_dir (str): 백업 디렉토리
+        """
+        os.makedirs(backup_dir, exist_ok=True)
+        with self._lock:
+            target = sqlite3.connect(os.path.join(backup_dir, INDEX_NAME))
+            with self.pool.connection() as conn:
+                conn.backup(target)
+            target.close()
+            for number in self._pack_numbers():
+                shutil.copy2(self._pack_path(number), os.path.join(backup_dir, _pack_name(number)))
+
+    def close(self):
+        """메모리 매핑 해제 (view()의 memoryview가 남아 있는 매핑은 그 memoryview가 사라질 때 해제)"""
+        with self._lock:
+            for mapped in self._maps.values():
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass
+            self._maps.clear()
+
+
+def get_store(store_dir):
+    """
+    저장소 디렉토리의 BlobStore (프로세스 안에서 하나를 공유)
+
+    Args:
+        store_dir (str): 저장소 디렉토리
+
+    Returns:
+        BlobStore: 묶음 저장소
+    """
+    key = os.path.abspath(store_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = BlobStore(store_dir)
+        return store
+
+
+def make_ref(store_dir, key):
+    """저장소 항목을 가리키는 local_path 참조"""
+    return f'{BLOB_PREFIX}{store_dir}#{key}'
+
+
+def is_blob_ref(path):
+    """local_path가 묶음 저장소 참조인지 확인"""
+    return isinstance(path, str) and path.startswith(BLOB_PREFIX)
+
+
+def _resolve(path):
+    """참조를 (BlobStore, 키)로 변환"""
+    store_dir, _, key = path[len(BLOB_PREFIX):].partition('#')
+    return get_store(store_dir), key
+
+
+def read_source_bytes(path):
+    """
+    파일 경로 또는 저장소 참조의 내용 읽기
+
+    Args:
+        path (str): local_path (파일 경로 또는 'blob:' 참조)
+
+    Returns:
+        bytes: 내용
+
+    Raises:
+        OSError: 없거나 읽을 수 없는 경우
+    """
+    if is_blob_ref(path):
+        store, key = _resolve(path)
+        return store.get(key)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def read_source(path):
+    """
+    파일 경로 또는 저장소 참조의 내용을 문자열로 읽기 (UTF-8, 잘못된 바이트는 무시)
+
+    Raises:
+        OSError: 없거나 읽을 수 없는 경우
+    """
+    return read_source_bytes(path).decode('utf-8', errors='ignore')
+
+
+def source_stat(path):
+    """
+    파일 경로 또는 저장소 참조의 크기/수정 시각 (os.stat과 같은 형식)
+
+    Raises:
+        OSError: 없는 경우
+    """
+    if is_blob_ref(path):
+        store, key = _resolve(path)
+        return store.stat(key)
+    return os.stat(path)
+
+
+def source_exists(path):
+    """파일 경로 또는 저장소 참조가 있는지 확인"""
+    try:
+        source_stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def write_source(path, content):
+    """
+    파일 경로 또는 저장소 참조에 내용 쓰기 (참조는 같은 키로 새 내용 저장)
+
+    Args:
+        path (str): local_path
+        content (str): 내용
+    """
+    if is_blob_ref(path):
+        store, key = _resolve(path)
+        store.put(key, content)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def remove_source(path):
+    """
+    파일 경로 또는 저장소 참조 삭제 (없으면 무시)
+
+    Args:
+        path (str): local_path
+    """
+    if is_blob_ref(path):
+        store, key = _resolve(path)
+        store.delete(key)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+@contextlib.contextmanager
+def materialize(path):
+    """
+    외부 도구(pylint, radon)에 넘길 실제 파일 경로
+
+    일반 파일은 그대로, 저장소 참조는 같은 확장자의 임시 파일에 풀어 쓴 뒤
+    블록이 끝나면 지웁니다.
+
+    Args:
+        path (str): local_path
+
+    Yields:
+        str: 실제 파일 경로
+    """
+    if not is_blob_ref(path):
+        yield path
+        return
+
+    data = read_source_bytes(path)
+    suffix = os.path.splitext(path)[1] or '.py'
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        yield temp_path
+    finally:
+        os.remove(temp_path)
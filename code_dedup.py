@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+유사 중복 코드 탐지 모듈
+
+토큰 shingle의 MinHash 서명으로 파일 간 Jaccard 유사도를 추정하고,
+LSH(locality-sensitive hashing) 밴드 버킷으로 후보 쌍만 비교하여
+유사 중복 묶음을 찾습니다. 묶음마다 대표 파일 하나를 남기고 나머지는
+files.duplicate_of에 대표 파일 ID를 기록합니다.
+
+그보다 앞서 공백, 주석, 독스트링을 제거한 내용의 해시로 완전히 같은 코드를
+찾는 저비용 정확 중복 검사용 함수도 제공합니다.
+"""
+
+import io
+import re
+import zlib
+import hashlib
+import tokenize
+import numpy as np
+from db_connection import get_pool
+from blob_store import read_source, source_stat
+
+# MinHash 해시 함수 출력 범위 (32비트)
+MAX_HASH = np.uint64((1 << 32) - 1)
+HASH_SHIFT = np.uint64(32)
+
+# 한 번에 MinHash를 계산할 최대 shingle 수 (shingle 수 x 해시 함수 수 크기의 행렬 생성)
+BATCH_SHINGLES = 32768
+
+# 서명을 계산하고 저장할 파일 묶음 크기
+BATCH_FILES = 500
+
+# 모든 쌍을 비교할 LSH 버킷의 최대 크기 (버킷 크기의 제곱 x num_perm 크기의 행렬 생성)
+MAX_BUCKET_PAIRS = 256
+
+# 주석을 제외한 식별자, 숫자, 기호 단위 토큰
+TOKEN_PATTERN = re.compile(r'#[^\n]*|[A-Za-z_]\w*|\d[\w.]*|\S')
+
+
+# 정규화 시 구조를 보존하기 위한 들여쓰기 표시
+INDENT_MARK = '\x01'
+DEDENT_MARK = '\x02'
+
+
+def normalize_code(content):
+    """
+    공백, 주석, 독스트링을 제거한 코드 토큰 문자열 생성
+
+    문장 위치에 홀로 놓인 문자열(독스트링 포함)은 코드 의미와 무관하므로 제거하고,
+    들여쓰기와 줄바꿈은 구조를 구분하기 위해 표시만 남깁니다.
+    토큰화할 수 없는 코드는 주석만 제외한 단순 토큰으로 대신합니다.
+
+    Args:
+        content (str): 코드 내용
+
+    Returns:
+        str: 정규화된 코드
+    """
+    parts = []
+    pending = []  # 문장 시작 위치의 문자열 토큰 (독스트링 후보)
+    statement_start = True
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(content).readline):
+            kind = token.type
+            if kind in (tokenize.COMMENT, tokenize.NL, tokenize.ENCODING, tokenize.ENDMARKER):
+                continue
+            if kind == tokenize.STRING and (statement_start or pending):
+                pending.append(token.string)
+                statement_start = False
+                continue
+            if kind == tokenize.NEWLINE:
+                if pending:
+                    # 문자열만으로 된 문장은 버림
+                    pending = []
+                else:
+                    parts.append('\n')
+                statement_start = True
+                continue
+
+            parts.extend(pending)
+            pending = []
+            if kind == tokenize.INDENT:
+                parts.append(INDENT_MARK)
+                statement_start = True
+            elif kind == tokenize.DEDENT:
+                parts.append(DEDENT_MARK)
+                statement_start = True
+            else:
+                parts.append(token.string)
+                statement_start = False
+    except (tokenize.TokenError, SyntaxError):
+        parts = [token for token in TOKEN_PATTERN.findall(content) if token[0] != '#']
+    return ' '.join(parts)
+
+
+def normalized_content_hash(content):
+    """
+    정규화된 코드 내용의 해시 계산 (정확 중복 검사용)
+
+    Args:
+        content (str): 코드 내용
+
+    Returns:
+        str: SHA-256 해시 (16진수)
+    """
+    return hashlib.sha256(normalize_code(content).encode('utf-8')).hexdigest()
+
+
+def optimal_bands(threshold, num_perm):
+    """
+    Jaccard 기준값에 맞는 LSH 밴드 수와 밴드당 행 수 선택
+
+    기준값 아래 쌍이 후보가 될 확률(거짓 양성)과 기준값 위 쌍이 누락될 확률
+    (거짓 음성)의 합이 가장 작은 조합을 고릅니다.
+
+    Args:
+        threshold (float): Jaccard 유사도 기준값
+        num_perm (int): MinHash 해시 함수 수
+
+    Returns:
+        tuple: (밴드 수, 밴드당 행 수)
+    """
+    below = np.linspace(0.0, threshold, 200)
+    above = np.linspace(threshold, 1.0, 200)
+    best, best_error = (1, num_perm), None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = (1 - (1 - below ** rows) ** bands).mean() * threshold
+            false_negative = ((1 - above ** rows) ** bands).mean() * (1 - threshold)
+            error = false_positive + false_negative
+            if best_error is None or error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class _UnionFind:
+    """유사 중복 묶음을 만들기 위한 서로소 집합"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class CodeDeduplicator:
+    """MinHash/LSH 기반 유사 중복 코드 탐지 클래스"""
+
+    def __init__(self, db_file, threshold=0.8, num_perm=128, shingle_size=5, seed=1):
+        """
+        중복 탐지기 초기화
+
+        Args:
+            db_file (str): 데이터베이스 파일 경로
+            threshold (float): 중복으로 볼 최소 Jaccard 유사도
+            num_perm (int): MinHash 해시 함수 수
+            shingle_size (int): shingle 하나의 토큰 수
+            seed (int): 해시 함수 생성 시드 (바뀌면 저장된 서명을 다시 계산)
+        """
+        self.db_file = db_file
+        self.pool = get_pool(db_file)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        # multiply-shift 해시 함수 계수 (a는 홀수)
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self._token_hashes = {}
+
+    def _params_key(self):
+        """서명 재사용 여부를 판단하기 위한 설정 문자열"""
+        return f"{self.num_perm}:{self.shingle_size}:{self.seed}"
+
+    def shingles(self, content):
+        """
+        코드 내용의 토큰 shingle 해시 집합 계산
+
+        Args:
+            content (str): 코드 내용
+
+        Returns:
+            numpy.ndarray: 중복 없는 shingle 해시 (uint64, 32비트 범위)
+        """
+        tokens = [token for token in TOKEN_PATTERN.findall(content) if token[0] != '#']
+        if not tokens:
+            return np.empty(0, dtype=np.uint64)
+
+        # 토큰 해시는 파일 간에 재사용 (어휘가 너무 커지면 비움)
+        if len(self._token_hashes) > 1000000:
+            self._token_hashes.clear()
+        cache = self._token_hashes
+        hashes = np.fromiter(
+            (cache.get(t) or cache.setdefault(t, zlib.crc32(t.encode('utf-8')) or 1) for t in tokens),
+            dtype=np.uint64, count=len(tokens)
+        )
+
+        # 연속된 shingle_size개 토큰 해시를 하나의 해시로 결합 (uint64 범위에서 순환)
+        size = min(self.shingle_size, len(hashes))
+        count = len(hashes) - size + 1
+        combined = hashes[:count].copy()
+        for offset in range(1, size):
+            combined = combined * np.uint64(1000003) + hashes[offset:offset + count]
+        combined = (combined ^ (combined >> HASH_SHIFT)) & MAX_HASH
+        return np.unique(combined)
+
+    def compute_signatures(self, shingle_sets):
+        """
+        여러 파일의 MinHash 서명을 한 번에 계산
+
+        모든 파일의 shingle을 이어 붙여 일정 크기씩 해시 행렬을 만들고,
+        파일 경계마다 최솟값을 구합니다.
+
+        Args:
+            shingle_sets (list): 파일별 shingle 해시 배열 (비어 있으면 안 됨)
+
+        Returns:
+            numpy.ndarray: (파일 수, num_perm) 크기의 uint32 서명
+        """
+        signatures = np.full((len(shingle_sets), self.num_perm), MAX_HASH, dtype=np.uint64)
+        if not shingle_sets:
+            return signatures.astype(np.uint32)
+
+        lengths = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        values = np.concatenate(shingle_sets)
+
+        for start in range(0, len(values), BATCH_SHINGLES):
+            chunk = values[start:start + BATCH_SHINGLES]
+            hashed = (chunk[:, None] * self._a + self._b) >> HASH_SHIFT
+
+            # 이 구간에 걸친 파일별 최솟값
+            owners = np.searchsorted(offsets, np.arange(start, start + len(chunk)), side='right') - 1
+            boundaries = np.flatnonzero(np.concatenate(([True], owners[1:] != owners[:-1])))
+            minimums = np.minimum.reduceat(hashed, boundaries, axis=0)
+            files = owners[boundaries]
+            signatures[files] = np.minimum(signatures[files], minimums)
+
+        return signatures.astype(np.uint32)
+
+    def update_signatures(self, full=False):
+        """
+        새 파일 및 변경된 파일의 서명 계산 후 저장
+
+        파일 크기와 수정 시간이 저장된 값과 같으면 다시 계산하지 않습니다.
+
+        Args:
+            full (bool): True이면 모든 파일의 서명을 다시 계산
+
+        Returns:
+            int: 새로 계산한 서명 수
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                SELECT f.id, f.local_path, s.file_size, s.file_mtime, s.params
+                FROM files f
+                LEFT JOIN file_signatures s ON s.file_id = f.id
+                ''')
+                rows = cursor.fetchall()
+
+                pending = []
+                params = self._params_key()
+                for file_id, local_path, file_size, file_mtime, stored_params in rows:
+                    try:
+                        stat = source_stat(local_path)
+                    except OSError:
+                        continue
+                    if (not full and stored_params == params and file_size == stat.st_size
+                            and file_mtime == stat.st_mtime):
+                        continue
+                    pending.append((file_id, local_path, stat.st_size, stat.st_mtime))
+
+                computed = 0
+                for start in range(0, len(pending), BATCH_FILES):
+                    batch = []
+                    for file_id, local_path, file_size, file_mtime in pending[start:start + BATCH_FILES]:
+                        try:
+                            shingles = self.shingles(read_source(local_path))
+                        except OSError:
+                            continue
+                        if len(shingles):
+                            batch.append((file_id, file_size, file_mtime, shingles))
+
+                    signatures = self.compute_signatures([entry[3] for entry in batch])
+                    cursor.executemany('''
+                    INSERT OR REPLACE INTO file_signatures
+                    (file_id, file_size, file_mtime, params, signature)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''', [
+                        (file_id, file_size, file_mtime, params, signature.tobytes())
+                        for (file_id, file_size, file_mtime, _), signature in zip(batch, signatures)
+                    ])
+                    conn.commit()
+                    computed += len(batch)
+
+            return computed
+
+        except Exception as e:
+            print(f"MinHash 서명 계산 오류: {str(e)}")
+            return 0
+
+    def load_signatures(self):
+        """
+        현재 설정으로 계산된 서명 불러오기
+
+        Returns:
+            tuple: (파일 ID 배열, (파일 수, num_perm) 크기의 서명 배열)
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT s.file_id, s.signature
+            FROM file_signatures s
+            JOIN files f ON f.id = s.file_id
+            WHERE s.params = ?
+            ORDER BY s.file_id
+            ''', (self._params_key(),))
+            rows = cursor.fetchall()
+
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        signatures = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.uint32)
+        return ids, signatures.reshape(len(rows), self.num_perm)
+
+    def find_clusters(self, signatures):
+        """
+        LSH 밴드 버킷으로 유사 중복 묶음 찾기
+
+        같은 버킷에 들어간 파일끼리만 추정 유사도를 비교하므로 전체 쌍을 비교하지 않습니다.
+        버킷 안에서는 모든 쌍을 비교하고, MAX_BUCKET_PAIRS보다 큰 버킷은 각 파일을
+        앞서 만들어진 묶음의 첫 파일들과만 비교합니다.
+
+        Args:
+            signatures (numpy.ndarray): (파일 수, num_perm) 크기의 서명
+
+        Returns:
+            list: 묶음별 행 번호 목록 (두 개 이상인 묶음만)
+        """
+        count = len(signatures)
+        union_find = _UnionFind(count)
+
+        for band in range(self.bands):
+            start = band * self.rows
+            keys = np.ascontiguousarray(signatures[:, start:start + self.rows])
+            keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * self.rows))).ravel()
+            _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            if counts.max(initial=0) < 2:
+                continue
+
+            # 같은 버킷의 행들을 연속되게 정렬
+            order = np.argsort(inverse, kind='stable')
+            bucket_sizes = counts[inverse[order]]
+            order = order[bucket_sizes > 1]
+            buckets = np.split(order, np.flatnonzero(np.diff(inverse[order])) + 1)
+
+            for members in buckets:
+                if len(members) <= MAX_BUCKET_PAIRS:
+                    block = signatures[members]
+                    similarity = (block[:, None, :] == block[None, :, :]).mean(axis=2)
+                    for left, right in zip(*np.nonzero(np.triu(similarity >= self.threshold, k=1))):
+                        union_find.union(members[left], members[right])
+                    continue
+
+                # 큰 버킷 (공통 상용구 등): 어느 묶음의 첫 파일과도 비슷하지 않으면 새 묶음 시작
+                leaders = [members[0]]
+                for member in members[1:]:
+                    similarity = (signatures[leaders] == signatures[member]).mean(axis=1)
+                    matched = np.flatnonzero(similarity >= self.threshold)
+                    if len(matched) == 0:
+                        leaders.append(member)
+                    for index in matched:
+                        union_find.union(leaders[index], member)
+
+        clusters = {}
+        for row in range(count):
+            clusters.setdefault(union_find.find(row), []).append(row)
+        return [rows for rows in clusters.values() if len(rows) > 1]
+
+    def mark_duplicates(self, full=False):
+        """
+        서명 갱신, 중복 묶음 탐지 후 대표 파일 외 나머지를 중복으로 표시
+
+        대표 파일은 품질 점수가 가장 높은 파일(같으면 먼저 수집된 파일)입니다.
+
+        Args:
+            full (bool): True이면 모든 파일의 서명을 다시 계산
+
+        Returns:
+            tuple: (중복 묶음 수, 중복으로 표시된 파일 수)
+        """
+        computed = self.update_signatures(full=full)
+        print(f"MinHash 서명 계산: {computed}개 파일 "
+              f"(밴드 {self.bands}개 x {self.rows}행, 기준 유사도 {self.threshold})")
+
+        try:
+            ids, signatures = self.load_signatures()
+            clusters = self.find_clusters(signatures)
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT id, quality_score FROM files')
+                scores = {file_id: score for file_id, score in cursor.fetchall()}
+
+                updates = []
+                for rows in clusters:
+                    members = sorted(int(ids[row]) for row in rows)
+                    representative = max(members, key=lambda file_id: (
+                        scores.get(file_id) is not None, scores.get(file_id) or 0, -file_id
+                    ))
+                    representative_row = int(np.searchsorted(ids, representative))
+                    for row in rows:
+                        file_id = int(ids[row])
+                        if file_id == representative:
+                            continue
+                        similarity = float((signatures[row] == signatures[representative_row]).mean())
+                        updates.append((representative, round(similarity, 4), file_id))
+
+                cursor.execute('UPDATE files SET duplicate_of = NULL, duplicate_similarity = NULL '
+                               'WHERE duplicate_of IS NOT NULL')
+                cursor.executemany('UPDATE files SET duplicate_of = ?, duplicate_similarity = ? WHERE id = ?',
+                                   updates)
+
+            return len(clusters), len(updates)
+
+        except Exception as e:
+            print(f"중복 탐지 오류: {str(e)}")
+            return 0, 0
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+유사 코드 검색 모듈
+
+외부 모델 없이 CPU만으로 코드 내용을 고정 길이 벡터로 바꾸고(임베딩),
+코사인 유사도가 높은 파일을 찾습니다.
+
+임베딩은 식별자(및 snake_case/camelCase로 나눈 하위 단어)와 연속된 두 단어의
+해시 특징을 로그 빈도로 가중한 뒤, 희소 랜덤 프로젝션으로 차원을 줄여 정규화한 벡터입니다.
+벡터는 int8로 양자화하여 file_embeddings 테이블에 저장하고, 검색할 때는
+데이터베이스 옆 색인 디렉토리의 메모리 매핑 행렬을 씁니다.
+
+파일이 많으면 색인을 만들 때 k-means로 벡터를 묶어(IVF) 묶음별로 연속 저장하고,
+질의와 가까운 묶음 몇 개만 확인하는 근사 검색을 합니다. 파일이 적거나 정확한 검색을
+요청하면 전체 행렬을 구간별로 나누어 벡터 연산으로 모두 비교합니다.
+"""
+
+import os
+import re
+import json
+import zlib
+import shutil
+import keyword
+import threading
+import numpy as np
+from numpy.lib.format import open_memmap
+from db_connection import get_pool
+from blob_store import read_source, source_stat
+
+# 임베딩 차원 수
+EMBEDDING_DIM = 256
+
+# 특징 하나가 더해지는 차원 수 (희소 랜덤 프로젝션)
+PROJECTIONS = 4
+
+# 단어와 하위 단어 (snake_case, camelCase 분리)
+WORD_PATTERN = re.compile(r'[A-Za-z_]\w*|\d+')
+SUBWORD_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+# 거의 모든 파일에 나오는 단어는 단일 단어 특징에서 제외 (연속된 두 단어 특징에는 포함)
+STOP_WORDS = frozenset(word.lower() for word in keyword.kwlist) | {'self', 'cls'}
+
+# 임베딩을 계산하고 저장할 파일 묶음 크기
+BATCH_FILES = 500
+
+# 전체 비교 시 한 번에 부동소수점으로 바꿔 계산할 행 수
+SCAN_ROWS = 65536
+
+# 이보다 파일이 적으면 묶음 없이 전체 비교 (이 정도는 전체 비교도 수 ms)
+FLAT_INDEX_MAX = 20000
+
+# k-means 학습에 쓸 묶음당 표본 수와 반복 횟수
+KMEANS_SAMPLE_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+
+# 묶음 배정 시 한 번에 계산할 행 수 (행 수 x 묶음 수 크기의 행렬 생성)
+ASSIGN_ROWS = 16384
+
+# 근사 검색에서 확인할 기본 묶음 수
+DEFAULT_PROBES = 16
+
+# 색인 디렉토리 이름 (데이터베이스 파일과 같은 디렉토리)
+INDEX_DIR_NAME = 'embedding_index'
+
+# 불러온 색인 (색인 디렉토리와 생성 시각이 같으면 재사용)
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def quantize(vectors):
+    """
+    벡터를 행별 배율과 int8 값으로 양자화
+
+    Args:
+        vectors (numpy.ndarray): (행 수, 차원) 크기의 float32 벡터
+
+    Returns:
+        tuple: (int8 벡터, float32 행별 배율)
+    """
+    peaks = np.abs(vectors).max(axis=1)
+    scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+    quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
+
+class EmbeddingIndex:
+    """메모리 매핑된 양자화 벡터 행렬과 묶음(IVF) 정보"""
+
+    def __init__(self, index_dir):
+        """
+        저장된 색인 불러오기 (벡터 행렬은 메모리 매핑)
+
+        Args:
+            index_dir (str): 색인 디렉토리 경로
+        """
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.vectors = np.load(os.path.join(index_dir, 'vectors.npy'), mmap_mode='r')
+        self.scales = np.load(os.path.join(index_dir, 'scales.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(index_dir, 'ids.npy'), mmap_mode='r')
+        self.centroids = np.load(os.path.join(index_dir, 'centroids.npy'))
+        self.offsets = np.load(os.path.join(index_dir, 'offsets.npy'))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, k, probes=DEFAULT_PROBES, exact=False):
+        """
+        코사인 유사도가 가장 높은 k개 벡터 찾기
+
+        Args:
+            query (numpy.ndarray): 정규화된 질의 벡터 (float32)
+            k (int): 찾을 개수
+            probes (int): 근사 검색에서 확인할 묶음 수
+            exact (bool): True이면 묶음과 관계없이 모든 벡터와 비교
+
+        Returns:
+            tuple: (파일 ID 배열, 유사도 배열) 유사도 내림차순
+        """
+        if exact or len(self.centroids) <= 1:
+            ranges = [(0, len(self.ids))]
+        else:
+            nearest = np.argsort(-(self.centroids @ query))[:probes]
+            ranges = sorted((int(self.offsets[l]), int(self.offsets[l + 1])) for l in nearest)
+
+        rows, scores = [], []
+        for start, end in ranges:
+            for chunk_start in range(start, end, SCAN_ROWS):
+                chunk_end = min(chunk_start + SCAN_ROWS, end)
+                chunk = self.vectors[chunk_start:chunk_end].astype(np.float32) @ query
+                chunk *= self.scales[chunk_start:chunk_end]
+                if len(chunk) > k:
+                    top = np.argpartition(-chunk, k)[:k]
+                    chunk = chunk[top]
+                    rows.append(top + chunk_start)
+                else:
+                    rows.append(np.arange(chunk_start, chunk_end))
+                scores.append(chunk)
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return np.asarray(self.ids[rows[order]]), scores[order]
+
+
+def load_index(index_dir):
+    """
+    색인 불러오기 (다시 만들어지기 전까지는 불러온 색인 공유)
+
+    Args:
+        index_dir (str): 색인 디렉토리 경로
+
+    Returns:
+        EmbeddingIndex: 색인 (없으면 None)
+    """
+    try:
+        built = os.stat(os.path.join(index_dir, 'meta.json')).st_mtime_ns
+    except OSError:
+        return None
+
+    key = os.path.abspath(index_dir)
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is None or cached[0] != built:
+            cached = _indexes[key] = (built, EmbeddingIndex(index_dir))
+        return cached[1]
+
+
+class CodeEmbedder:
+    """해시 특징과 랜덤 프로젝션 기반 코드 임베딩 및 유사 코드 검색 클래스"""
+
+    def __init__(self, db_file, dim=EMBEDDING_DIM, seed=1):
+        """
+        임베딩 계산기 초기화
+
+        Args:
+            db_file (str): 데이터베이스 파일 경로
+            dim (int): 임베딩 차원 수
+            seed (int): 프로젝션 생성 시드 (바뀌면 저장된 임베딩을 다시 계산)
+        """
+        self.db_file = db_file
+        self.pool = get_pool(db_file)
+        self.dim = dim
+        self.seed = seed
+        self.index_dir = os.path.join(os.path.dirname(os.path.abspath(db_file)), INDEX_DIR_NAME)
+
+        # multiply-shift 해시로 특징마다 PROJECTIONS개의 차원과 부호 결정 (a는 홀수)
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(0, 1 << 63, size=PROJECTIONS, dtype=np.uint64) | np.uint64(1)
+        self._b = generator.randint(0, 1 << 63, size=PROJECTIONS, dtype=np.uint64)
+        self._token_hashes = {}
+
+    def _params_key(self):
+        """임베딩 재사용 여부를 판단하기 위한 설정 문자열"""
+        return f"{self.dim}:{PROJECTIONS}:{self.seed}"
+
+    def _hashes(self, tokens):
+        """토큰 목록의 해시 배열 (토큰 해시는 파일 간에 재사용)"""
+        if len(self._token_hashes) > 1000000:
+            self._token_hashes.clear()
+        cache = self._token_hashes
+        return np.fromiter(
+            (cache.get(t) or cache.setdefault(t, zlib.crc32(t.encode('utf-8')) or 1) for t in tokens),
+            dtype=np.uint64, count=len(tokens)
+        )
+
+    def features(self, content):
+        """
+        코드 내용의 해시 특징과 가중치 계산
+
+        Args:
+            content (str): 코드 내용
+
+        Returns:
+            tuple: (중복 없는 특징 해시 배열, 로그 빈도 가중치 배열)
+        """
+        words = WORD_PATTERN.findall(content)
+        if not words:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.float32)
+
+        lowered = [word.lower() for word in words]
+        tokens = []
+        for word, lower in zip(words, lowered):
+            if lower in STOP_WORDS:
+                continue
+            tokens.append(lower)
+            parts = SUBWORD_PATTERN.findall(word)
+            if len(parts) > 1:
+                tokens.extend(part.lower() for part in parts)
+
+        sequence = self._hashes(lowered)
+        bigrams = sequence[:-1] * np.uint64(1000003) + sequence[1:]
+        values, counts = np.unique(np.concatenate((self._hashes(tokens), bigrams)), return_counts=True)
+        return values, (1.0 + np.log(counts)).astype(np.float32)
+
+    def embed(self, content):
+        """
+        코드 내용의 임베딩 계산
+
+        Args:
+            content (str): 코드 내용
+
+        Returns:
+            numpy.ndarray: 길이 1로 정규화된 float32 벡터 (단어가 없으면 0 벡터)
+        """
+        values, weights = self.features(content)
+        if not len(values):
+            return np.zeros(self.dim, dtype=np.float32)
+
+        mixed = values[:, None] * self._a + self._b
+        dims = ((mixed >> np.uint64(32)) % np.uint64(self.dim)).astype(np.intp)
+        signs = np.where(mixed >> np.uint64(63), -1.0, 1.0)
+        vector = np.bincount(dims.ravel(), weights=(signs * weights[:, None]).ravel(),
+                             minlength=self.dim).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def update_embeddings(self, full=False):
+        """
+        새 파일 및 변경된 파일의 임베딩 계산 후 저장
+
+        파일 크기와 수정 시간이 저장된 값과 같으면 다시 계산하지 않습니다.
+
+        Args:
+            full (bool): True이면 모든 파일의 임베딩을 다시 계산
+
+        Returns:
+            int: 새로 계산한 임베딩 수
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                SELECT f.id, f.local_path, e.file_size, e.file_mtime, e.params
+                FROM files f
+                LEFT JOIN file_embeddings e ON e.file_id = f.id
+                ''')
+                rows = cursor.fetchall()
+
+                pending = []
+                params = self._params_key()
+                for file_id, local_path, file_size, file_mtime, stored_params in rows:
+                    try:
+                        stat = source_stat(local_path)
+                    except OSError:
+                        continue
+                    if (not full and stored_params == params and file_size == stat.st_size
+                            and file_mtime == stat.st_mtime):
+                        continue
+                    pending.append((file_id, local_path, stat.st_size, stat.st_mtime))
+
+                computed = 0
+                for start in range(0, len(pending), BATCH_FILES):
+                    batch, vectors = [], []
+                    for file_id, local_path, file_size, file_mtime in pending[start:start + BATCH_FILES]:
+                        try:
+                            vectors.append(self.embed(read_source(local_path)))
+                        except OSError:
+                            continue
+                        batch.append((file_id, file_size, file_mtime))
+                    if not batch:
+                        continue
+
+                    quantized, scales = quantize(np.vstack(vectors))
+                    cursor.executemany('''
+                    INSERT OR REPLACE INTO file_embeddings
+                    (file_id, file_size, file_mtime, params, scale, vector)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ''', [
+                        (file_id, file_size, file_mtime, params, float(scale), vector.tobytes())
+                        for (file_id, file_size, file_mtime), scale, vector in zip(batch, scales, quantized)
+                    ])
+                    conn.commit()
+                    computed += len(batch)
+
+            return computed
+
+        except Exception as e:
+            print(f"임베딩 계산 오류: {str(e)}")
+            return 0
+
+    def _train_centroids(self, vectors, lists):
+        """
+        표본 벡터로 구면 k-means 묶음 중심 학습
+
+        Args:
+            vectors (numpy.ndarray): (행 수, 차원) 크기의 int8 벡터
+            lists (int): 묶음 수
+
+        Returns:
+            numpy.ndarray: (묶음 수, 차원) 크기의 정규화된 float32 중심
+        """
+        generator = np.random.RandomState(self.seed)
+        size = min(len(vectors), lists * KMEANS_SAMPLE_PER_LIST)
+        sample = vectors[np.sort(generator.choice(len(vectors), size, replace=False))].astype(np.float32)
+        sample /= np.maximum(np.linalg.norm(sample, axis=1, keepdims=True), 1e-12)
+
+        centroids = sample[generator.choice(size, lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # 빈 묶음은 이전 중심 유지
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        return centroids.astype(np.float32)
+
+    def _assign(self, vectors, centroids):
+        """각 벡터와 가장 가까운 묶음 번호 (구간별로 계산)"""
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), ASSIGN_ROWS):
+            chunk = np.asarray(vectors[start:start + ASSIGN_ROWS], dtype=np.float32)
+            assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignments
+
+    def build_index(self, lists=None):
+        """
+        저장된 임베딩으로 검색 색인 생성
+
+        색인은 임시 디렉토리에 만든 뒤 기존 색인과 바꾸므로 만드는 동안에도 기존 색인으로 검색할 수 있습니다.
+
+        Args:
+            lists (int, optional): 묶음 수 (기본값: 파일 수가 FLAT_INDEX_MAX 이하이면 1,
+                그보다 많으면 파일 수의 제곱근)
+
+        Returns:
+            tuple: (색인에 넣은 파일 수, 묶음 수)
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                params = self._params_key()
+                count = cursor.execute('''
+                SELECT COUNT(*) FROM file_embeddings e JOIN files f ON f.id = e.file_id
+                WHERE e.params = ?
+                ''', (params,)).fetchone()[0]
+
+                ids = np.empty(count, dtype=np.int64)
+                scales = np.empty(count, dtype=np.float32)
+                vectors = np.empty((count, self.dim), dtype=np.int8)
+                cursor.execute('''
+                SELECT e.file_id, e.scale, e.vector
+                FROM file_embeddings e JOIN files f ON f.id = e.file_id
+                WHERE e.params = ?
+                ORDER BY e.file_id
+                ''', (params,))
+                row = 0
+                while True:
+                    rows = cursor.fetchmany(BATCH_FILES)
+                    if not rows or row >= count:
+                        break
+                    rows = rows[:count - row]
+                    ids[row:row + len(rows)] = [r[0] for r in rows]
+                    scales[row:row + len(rows)] = [r[1] for r in rows]
+                    vectors[row:row + len(rows)] = np.frombuffer(
+                        b''.join(r[2] for r in rows), dtype=np.int8).reshape(len(rows), self.dim)
+                    row += len(rows)
+
+            if lists is None:
+                lists = 1 if count <= FLAT_INDEX_MAX else int(np.sqrt(count))
+            lists = max(1, min(lists, count))
+
+            if lists > 1:
+                centroids = self._train_centroids(vectors, lists)
+                assignments = self._assign(vectors, centroids)
+                # 같은 묶음의 벡터를 연속되게 저장 (묶음 안에서는 파일 ID 순)
+                order = np.argsort(assignments, kind='stable')
+                offsets = np.searchsorted(assignments[order], np.arange(lists + 1))
+            else:
+                centroids = np.zeros((1, self.dim), dtype=np.float32)
+                order = np.arange(count)
+                offsets = np.array([0, count], dtype=np.int64)
+
+            building = self.index_dir + '.tmp'
+            shutil.rmtree(building, ignore_errors=True)
+            os.makedirs(building)
+            matrix = open_memmap(os.path.join(building, 'vectors.npy'), mode='w+',
+                                 dtype=np.int8, shape=(count, self.dim))
+            for start in range(0, count, SCAN_ROWS):
+                matrix[start:start + SCAN_ROWS] = vectors[order[start:start + SCAN_ROWS]]
+            matrix.flush()
+            del matrix
+            np.save(os.path.join(building, 'ids.npy'), ids[order])
+            np.save(os.path.join(building, 'scales.npy'), scales[order])
+            np.save(os.path.join(building, 'centroids.npy'), centroids)
+            np.save(os.path.join(building, 'offsets.npy'), offsets.astype(np.int64))
+            with open(os.path.join(building, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({'params': params, 'count': count, 'lists': lists}, f)
+
+            previous = self.index_dir + '.old'
+            shutil.rmtree(previous, ignore_errors=True)
+            if os.path.exists(self.index_dir):
+                os.rename(self.index_dir, previous)
+            os.rename(building, self.index_dir)
+            shutil.rmtree(previous, ignore_errors=True)
+
+            return count, lists
+
+        except Exception as e:
+            print(f"임베딩 색인 생성 오류: {str(e)}")
+            return 0, 0
+
+    def _file_vector(self, file_id):
+        """저장된 파일 임베딩 (없거나 설정이 다르면 파일을 읽어 계산, 파일이 없으면 None)"""
+        with self.pool.connection() as conn:
+            row = conn.execute('''
+            SELECT f.local_path, e.params, e.scale, e.vector
+            FROM files f LEFT JOIN file_embeddings e ON e.file_id = f.id
+            WHERE f.id = ?
+            ''', (file_id,)).fetchone()
+        if row is None:
+            return None
+
+        local_path, params, scale, vector = row
+        if params == self._params_key():
+            vector = np.frombuffer(vector, dtype=np.int8).astype(np.float32) * scale
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else vector
+        return self.embed(read_source(local_path))
+
+    def find_similar(self, file_id=None, content=None, limit=10, exact=False, probes=DEFAULT_PROBES):
+        """
+        파일 또는 코드 조각과 유사한 파일 찾기
+
+        색인을 만든 뒤 추가된 파일은 결과에 나오지 않고, 삭제된 파일은 결과에서 빠집니다.
+
+        Args:
+            file_id (int, optional): 기준 파일 ID (결과에서 자기 자신은 제외)
+            content (str, optional): 기준 코드 조각 (file_id가 없을 때 사용)
+            limit (int): 최대 결과 수
+            exact (bool): True이면 근사 검색 대신 모든 벡터와 비교
+            probes (int): 근사 검색에서 확인할 묶음 수
+
+        Returns:
+            list: 유사도 내림차순 결과 목록 (파일 ID, 저장소, 경로, 파일명, 품질 점수, 유사도)
+        """
+        try:
+            query = self._file_vector(file_id) if file_id is not None else self.embed(content or '')
+            index = load_index(self.index_dir)
+            if query is None or index is None or index.meta.get('params') != self._params_key():
+                return []
+
+            # 자기 자신과 삭제된 파일이 빠질 것을 감안해 더 많이 찾음
+            ids, scores = index.search(query, limit * 2 + 1, probes=probes, exact=exact)
+            candidates = [(int(i), float(s)) for i, s in zip(ids, scores) if int(i) != file_id]
+            if not candidates:
+                return []
+
+            placeholders = ', '.join(['?'] * len(candidates))
+            with self.pool.connection() as conn:
+                rows = conn.execute(f'''
+                SELECT f.id, r.full_name, f.path, f.name, f.quality_score
+                FROM files f
+                JOIN repositories r ON f.repo_id = r.id
+                WHERE f.id IN ({placeholders})
+                ''', [i for i, _ in candidates]).fetchall()
+            files = {row[0]: row for row in rows}
+
+            results = []
+            for candidate_id, score in candidates:
+                if candidate_id not in files:
+                    continue
+                _, repo_name, path, name, quality_score = files[candidate_id]
+                results.append({
+                    'id': candidate_id,
+                    'repo_name': repo_name,
+                    'path': path,
+                    'name': name,
+                    'quality_score': quality_score,
+                    'similarity': round(score, 4)
+                })
+            return results[:limit]
+
+        except Exception as e:
+            print(f"유사 코드 검색 오류: {str(e)}")
+            return []
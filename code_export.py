@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+열 형식(Parquet/Arrow) 내보내기 모듈
+
+학습 작업이 바로 읽을 수 있도록 파일 메타데이터(와 선택적으로 소스 코드)를
+Parquet 또는 Arrow IPC 파일로 내보냅니다.
+
+데이터베이스 커서에서 ROW_GROUP_ROWS개씩 읽어 열 단위 레코드 배치로 바꾼 뒤
+바로 한 행 그룹으로 쓰므로, 전체 결과를 메모리에 올리지 않고 파일 수와 관계없이
+일정한 메모리로 내보냅니다. 소스 코드는 행 그룹마다 원본 파일(또는 묶음 저장소)에서
+읽으므로, 전문 검색 색인처럼 길이 제한으로 잘리지 않습니다 (읽을 수 없는 파일은 null).
+
+pyarrow가 설치되어 있어야 합니다 (pip install pyarrow).
+"""
+
+import os
+from db_connection import get_pool
+from blob_store import read_source
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 열 형식 내보내기에만 필요
+    pa = pq = None
+
+# 내보내기 형식과 기본 확장자
+EXPORT_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow'
+}
+
+# 형식별 기본 압축 (Arrow IPC는 lz4/zstd만 지원)
+DEFAULT_COMPRESSION = 'zstd'
+
+# 한 행 그룹(레코드 배치)으로 읽고 쓰는 행 수
+ROW_GROUP_ROWS = 50000
+
+# 내보내는 열: (열 이름, SQL 식, Arrow 자료형 이름)
+EXPORT_COLUMNS = (
+    ('id', 'f.id', 'int64'),
+    ('repo_name', 'r.name', 'string'),
+    ('repo_full_name', 'r.full_name', 'string'),
+    ('repo_url', 'r.url', 'string'),
+    ('repo_stars', 'r.stars', 'int64'),
+    ('repo_license', 'r.license', 'string'),
+    ('file_name', 'f.name', 'string'),
+    ('file_path', 'f.path', 'string'),
+    ('file_url', 'f.url', 'string'),
+    ('quality_score', 'f.quality_score', 'float64'),
+    ('code_lines', 'f.code_lines', 'int64'),
+    ('is_suitable', 'f.is_suitable', 'bool_'),
+    ('complexity_avg', 'f.complexity_avg', 'float64'),
+    ('complexity_max', 'f.complexity_max', 'int64'),
+    ('function_count', 'f.function_count', 'int64'),
+    ('normalized_hash', 'f.normalized_hash', 'string'),
+    ('duplicate_of', 'f.duplicate_of', 'int64'),
+    ('downloaded_at', 'f.downloaded_at', 'string'),
+)
+
+# 소스 코드 열 (include_content일 때 추가, local_path를 읽어 내용으로 바꿈)
+CONTENT_COLUMN = ('content', 'f.local_path', 'large_string')
+
+
+def _column_values(values, arrow_type):
+    """SQLite 값 목록을 Arrow 자료형에 맞게 변환 (SQLite는 불 값을 0/1 정수로 저장)"""
+    if pa.types.is_boolean(arrow_type):
+        return [None if value is None else bool(value) for value in values]
+    return values
+
+
+def _read_contents(local_paths):
+    """local_path 목록의 소스 코드 읽기 (읽을 수 없는 파일은 None)"""
+    contents = []
+    for local_path in local_paths:
+        try:
+            contents.append(read_source(local_path))
+        except (OSError, TypeError):
+            contents.append(None)
+    return contents
+
+
+class ColumnarExporter:
+    """데이터베이스 커서에서 바로 Parquet/Arrow 파일로 쓰는 스트리밍 내보내기"""
+
+    def __init__(self, db_file, base_dir):
+        """
+        열 형식 내보내기 초기화
+
+        Args:
+            db_file (str): 데이터베이스 파일 경로
+            base_dir (str): 상대 출력 경로의 기준 디렉토리
+        """
+        self.pool = get_pool(db_file)
+        self.base_dir = base_dir
+
+    def _export_query(self, include_content, query=None, min_quality=None, suitable_only=False,
+                      collapse_duplicates=False, include_secrets=False):
+        """
+        내보낼 파일을 ID 순서로 읽는 SQL 생성
+
+        Args:
+            include_content (bool): 소스 코드 열 포함
+            query (str, optional): 전문 검색 검색식 (FTS5)
+            min_quality (float, optional): 최소 품질 점수
+            suitable_only (bool): 적합한 파일만
+            collapse_duplicates (bool): 정규화 내용이 같은 파일은 하나만
+            include_secrets (bool): 비밀 정보가 발견된 파일도 포함
+
+        Returns:
+            tuple: (SQL 문, 매개변수 목록, 열 목록)
+        """
+        columns = list(EXPORT_COLUMNS) + ([CONTENT_COLUMN] if include_content else [])
+        sql = 'SELECT ' + ', '.join(expr for _, expr, _ in columns) + '''
+        FROM files f
+        JOIN repositories r ON f.repo_id = r.id
+        '''
+        params = []
+        conditions = []
+
+        # 검색어가 있으면 전문 검색 색인과 조인해 걸러냄
+        if query:
+            sql += ' JOIN files_fts s ON s.rowid = f.id'
+            conditions.append('files_fts MATCH ?')
+            params.append(query)
+
+        if min_quality is not None:
+            conditions.append('f.quality_score >= ?')
+            params.append(min_quality)
+        if suitable_only:
+            conditions.append('f.is_suitable = 1')
+        if collapse_duplicates:
+            conditions.append('''
+            (f.normalized_hash IS NULL OR NOT EXISTS (
+                SELECT 1 FROM files d
+                WHERE d.normalized_hash = f.normalized_hash AND d.id < f.id
+            ))
+            ''')
+        if not include_secrets:
+            conditions.append('COALESCE(f.has_secrets, 0) = 0')
+
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        # 파일 ID(rowid) 순서는 정렬 없이 테이블 순서대로 읽으므로 결과도 항상 같음
+        sql += ' ORDER BY f.id'
+
+        return sql, params, columns
+
+    def _open_writer(self, path, fmt, schema, compression):
+        """
+        형식별 스트리밍 작성기 생성 (write_batch/close를 제공)
+
+        Args:
+            path (str): 출력 파일 경로
+            fmt (str): 'parquet' 또는 'arrow'
+            schema: Arrow 스키마
+            compression (str): 압축 방식 (None이면 압축 안 함)
+
+        Returns:
+            작성기 객체
+        """
+        if fmt == 'parquet':
+            # 저장소/라이센스처럼 값이 반복되는 열은 사전 인코딩으로 작게 저장됨
+            return pq.ParquetWriter(path, schema, compression=compression or 'none',
+                                    use_dictionary=True, write_statistics=True)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        return pa.ipc.new_file(path, schema, options=options)
+
+    def export(self, output_file, fmt='parquet', include_content=False,
+               compression=DEFAULT_COMPRESSION, row_group_rows=ROW_GROUP_ROWS, **filters):
+        """
+        조건에 맞는 파일을 Parquet 또는 Arrow IPC 파일로 내보내기
+
+        임시 파일에 모두 쓴 뒤 이름을 바꾸므로 중간에 실패해도 이전 내보내기 파일이
+        반쯤 덮어써지지 않습니다.
+
+        Args:
+            output_file (str): 출력 파일 경로 (상대 경로는 base_dir 기준)
+            fmt (str): 'parquet' 또는 'arrow'
+            include_content (bool): 소스 코드 열 포함
+            compression (str): 압축 방식 (zstd, lz4, snappy, gzip 등, None이면 압축 안 함)
+            row_group_rows (int): 한 행 그룹의 행 수
+            **filters: query, min_quality, suitable_only, collapse_duplicates, include_secrets
+
+        Returns:
+            dict: 출력 경로, 행 수, 행 그룹 수, 파일 크기 (실패하면 None)
+        """
+        if pa is None:
+            print("열 형식 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+            return None
+        if fmt not in EXPORT_FORMATS:
+            print(f"지원하지 않는 내보내기 형식: {fmt}")
+            return None
+
+        output_path = os.path.join(self.base_dir, output_file)
+        temp_path = output_path + '.tmp'
+        try:
+            sql, params, columns = self._export_query(include_content, **filters)
+            schema = pa.schema([(name, getattr(pa, type_name)()) for name, _, type_name in columns])
+
+            rows = 0
+            row_groups = 0
+            writer = self._open_writer(temp_path, fmt, schema, compression)
+            try:
+                with self.pool.connection() as conn:
+                    cursor = conn.execute(sql, params)
+                    while True:
+                        chunk = cursor.fetchmany(row_group_rows)
+                        if not chunk:
+                            break
+                        # 행 목록을 열 목록으로 바꿔 열마다 한 번에 Arrow 배열로 변환
+                        column_values = list(zip(*chunk))
+                        if include_content:
+                            column_values[-1] = _read_contents(column_values[-1])
+                        arrays = [pa.array(_column_values(values, field.type), type=field.type)
+                                  for values, field in zip(column_values, schema)]
+                        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                        rows += len(chunk)
+                        row_groups += 1
+            finally:
+                writer.close()
+
+            os.replace(temp_path, output_path)
+            size = os.path.getsize(output_path)
+            print(f"{fmt} 파일 내보내기 완료: {output_path} ({rows}개 파일, 행 그룹 {row_groups}개, "
+                  f"{size / 1024 / 1024:.1f}MB)")
+            return {'path': output_path, 'rows': rows, 'row_groups': row_groups, 'bytes': size}
+
+        except Exception as e:
+            print(f"{fmt} 파일 내보내기 오류: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
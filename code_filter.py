@@ -6,25 +6,77 @@ GitHub에서 수집한 파이썬 코드의 품질을 평가하고 필터링하
 학습용으로 적합한 코드를 선별하는 기능을 제공합니다.
 """
 
-import os
+import ast
 import json
 import re
+import hashlib
 import subprocess
 from pylint import lint
 from pylint.reporters.text import TextReporter
 from io import StringIO
+from quality_model import QualityPredictor
+from analyzers import AnalysisContext, AnalysisEngine, extract_symbols
+from analysis_sandbox import IsolatedAnalyzer, STATUS_OK
+from code_dedup import normalized_content_hash
+from secret_scanner import default_scanner, SECRET_REASON
+from blob_store import (materialize, read_source, read_source_bytes, source_exists,
+                        source_stat)
+
+# 분석 로직이 바뀌면 올려서 기존 평가 결과를 무효화합니다
+ANALYZER_VERSION = "2"
+
+# 적합성 판정 이유 (품질 점수가 없어 기준 재판정이 불가능한 경우)
+NEEDS_ANALYSIS_REASON = "품질 점수 없음 (재분석 필요)"
+
+# 격리 분석이 제한에 걸린 경우의 부적합 이유
+ANALYSIS_FAILURE_REASONS = {
+    'timeout': "분석 시간 초과 (timeout)",
+    'oom': "분석 메모리 한도 초과 (oom)",
+    'crash': "분석 프로세스 비정상 종료 (crash)",
+    'error': "분석 오류 (error)"
+}
+
+# 정규화 내용이 같은 파일끼리 재사용하는 분석 결과 필드
+REUSABLE_FIELDS = (
+    'quality_score', 'quality_confidence', 'code_lines', 'comment_ratio', 'complexity',
+    'prescreen_reason', 'analysis_status', 'evaluation_tier', 'lint_messages'
+)
+
+
+class MessageCountingReporter(TextReporter):
+    """텍스트 출력과 함께 메시지 ID별 발생 횟수를 모으는 pylint 리포터"""
+
+    def __init__(self, output=None):
+        super().__init__(output)
+        self.counts = {}
+
+    def handle_message(self, msg):
+        entry = self.counts.setdefault(msg.msg_id, {'symbol': msg.symbol, 'count': 0})
+        entry['count'] += 1
+        super().handle_message(msg)
+
 
 class CodeQualityFilter:
     """파이썬 코드 품질을 평가하고 필터링하는 클래스"""
     
-    def __init__(self, metadata_file="collected_code/metadata.json"):
+    def __init__(self, metadata_file="collected_code/metadata.json", quality_model_file=None,
+                 registry=None):
         """
         코드 품질 필터 초기화
         
         Args:
             metadata_file (str): 메타데이터 파일 경로
+            quality_model_file (str, optional): 품질 예측 모델 파일 경로 (없으면 항상 pylint 사용)
+            registry (AnalyzerRegistry, optional): 사용할 분석기 등록부 (없으면 기본 등록부)
         """
         self.metadata_file = metadata_file
+        self.engine = AnalysisEngine(registry)
+        self.quality_model = QualityPredictor.load(quality_model_file) if quality_model_file else None
+        self.model_min_confidence = 0.95  # pylint를 생략할 예측 판정 최소 신뢰도
+        self.isolate_analysis = True      # pylint를 별도 작업자 프로세스에서 실행
+        self.analysis_timeout = 60        # 파일당 최대 분석 시간 (초)
+        self.analysis_memory_mb = 2048    # 분석 작업자 메모리 제한 (MB)
+        self._sandbox = None
         self.min_quality_score = 6.0  # 최소 품질 점수 (0-10)
         self.min_code_lines = 10      # 최소 코드 라인 수
         self.max_code_lines = 1000    # 최대 코드 라인 수
@@ -64,36 +116,42 @@ class CodeQualityFilter:
         except Exception as e:
             print(f"메타데이터 저장 오류: {str(e)}")
     
-    def evaluate_code_quality(self, file_path):
+    def evaluate_code_quality(self, file_path, messages=None):
         """
         pylint를 사용하여 코드 품질 평가
         
         Args:
             file_path (str): 파이썬 파일 경로
+            messages (dict, optional): 메시지 ID별 발생 횟수를 채울 딕셔너리
+                ({'W0611': {'symbol': 'unused-import', 'count': 2}, ...})
             
         Returns:
             float: 품질 점수 (0-10)
         """
-        if not os.path.exists(file_path):
+        if not source_exists(file_path):
             print(f"파일이 존재하지 않습니다: {file_path}")
             return 0.0
             
         # pylint 출력을 캡처하기 위한 StringIO 객체
         pylint_output = StringIO()
-        reporter = TextReporter(pylint_output)
+        reporter = MessageCountingReporter(pylint_output)
         
         try:
-            # pylint 실행
-            lint.Run([
-                '--disable=C0111',  # 문서화 경고 비활성화
-                '--disable=C0103',  # 이름 규칙 경고 비활성화
-                file_path
-            ], reporter=reporter, exit=False)
+            # pylint 실행 (팩 저장소의 파일은 임시 파일로 풀어서 검사)
+            with materialize(file_path) as real_path:
+                lint.Run([
+                    '--disable=C0111',  # 문서화 경고 비활성화
+                    '--disable=C0103',  # 이름 규칙 경고 비활성화
+                    real_path
+                ], reporter=reporter, exit=False)
             
             # 결과에서 점수 추출
             output = pylint_output.getvalue()
             match = re.search(r'Your code has been rated at ([-\d.]+)/10', output)
             
+            if messages is not None:
+                messages.update(reporter.counts)
+            
             if match:
                 score = float(match.group(1))
                 # 음수 점수를 0으로 처리
@@ -106,6 +164,59 @@ class CodeQualityFilter:
             print(f"코드 품질 평가 오류: {str(e)}")
             return 0.0
     
+    def lint_file(self, file_path):
+        """
+        pylint 품질 점수와 메시지 ID별 발생 횟수 계산
+        
+        Args:
+            file_path (str): 파이썬 파일 경로
+            
+        Returns:
+            tuple: (품질 점수, 메시지 ID별 발생 횟수)
+        """
+        messages = {}
+        score = self.evaluate_code_quality(file_path, messages)
+        return score, messages
+    
+    def evaluate_code_quality_guarded(self, file_path, messages=None):
+        """
+        시간/메모리 제한을 걸고 pylint 품질 평가 실행
+        
+        isolate_analysis가 꺼져 있으면 현재 프로세스에서 바로 실행합니다.
+        
+        Args:
+            file_path (str): 파이썬 파일 경로
+            messages (dict, optional): 메시지 ID별 발생 횟수를 채울 딕셔너리
+            
+        Returns:
+            tuple: (품질 점수 또는 None, 상태 - 'ok', 'timeout', 'oom', 'crash', 'error')
+        """
+        if not self.isolate_analysis:
+            return self.evaluate_code_quality(file_path, messages), STATUS_OK
+        
+        if self._sandbox is None:
+            self._sandbox = IsolatedAnalyzer(
+                timeout=self.analysis_timeout,
+                memory_mb=self.analysis_memory_mb
+            )
+        
+        # 작업자 프로세스는 저장소 참조를 모르므로 실제 파일 경로를 넘김
+        with materialize(file_path) as real_path:
+            status, value = self._sandbox.call('lint_file', real_path)
+        if status != STATUS_OK:
+            print(f"격리 분석 실패 ({status}): {file_path}")
+            return None, status
+        score, file_messages = value
+        if messages is not None:
+            messages.update(file_messages)
+        return score, status
+    
+    def close(self):
+        """격리 분석 작업자 정리"""
+        if self._sandbox is not None:
+            self._sandbox.close()
+            self._sandbox = None
+    
     def count_code_lines(self, file_path):
         """
         파이썬 파일의 코드 라인 수 계산 (주석 및 빈 줄 제외)
@@ -116,48 +227,59 @@ class CodeQualityFilter:
         Returns:
             int: 코드 라인 수
         """
-        if not os.path.exists(file_path):
+        if not source_exists(file_path):
             return 0
             
         try:
             # 주석 및 빈 줄을 제외한 라인 수 계산
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+            lines = read_source(file_path).splitlines(keepends=True)
                 
-            code_lines = 0
-            in_multiline_comment = False
+            return self._count_code_lines_in(lines)
             
-            for line in lines:
-                line = line.strip()
-                
-                # 빈 줄 건너뛰기
-                if not line:
-                    continue
-                    
-                # 멀티라인 주석 처리
-                if '"""' in line or "'''" in line:
-                    # 한 줄에 멀티라인 주석이 시작되고 끝나는 경우
-                    if line.count('"""') == 2 or line.count("'''") == 2:
-                        continue
-                    
-                    in_multiline_comment = not in_multiline_comment
-                    continue
-                
-                # 멀티라인 주석 내부 건너뛰기
-                if in_multiline_comment:
-                    continue
+        except Exception as e:
+            print(f"코드 라인 수 계산 오류: {str(e)}")
+            return 0
+    
+    def _count_code_lines_in(self, lines):
+        """
+        라인 목록에서 코드 라인 수 계산 (주석 및 빈 줄 제외)
+        
+        Args:
+            lines (list): 파일 라인 목록
+            
+        Returns:
+            int: 코드 라인 수
+        """
+        code_lines = 0
+        in_multiline_comment = False
+        
+        for line in lines:
+            line = line.strip()
+            
+            # 빈 줄 건너뛰기
+            if not line:
+                continue
                 
-                # 한 줄 주석 건너뛰기
-                if line.startswith('#'):
+            # 멀티라인 주석 처리
+            if '"""' in line or "'''" in line:
+                # 한 줄에 멀티라인 주석이 시작되고 끝나는 경우
+                if line.count('"""') == 2 or line.count("'''") == 2:
                     continue
                 
-                code_lines += 1
-                
-            return code_lines
+                in_multiline_comment = not in_multiline_comment
+                continue
             
-        except Exception as e:
-            print(f"코드 라인 수 계산 오류: {str(e)}")
-            return 0
+            # 멀티라인 주석 내부 건너뛰기
+            if in_multiline_comment:
+                continue
+            
+            # 한 줄 주석 건너뛰기
+            if line.startswith('#'):
+                continue
+            
+            code_lines += 1
+            
+        return code_lines
     
     def check_license_compatibility(self, license_name):
         """
@@ -197,18 +319,20 @@ class CodeQualityFilter:
                 subprocess.run(["pip3", "install", "radon"], check=True)
                 
             # 순환 복잡도 계산
-            result = subprocess.run(
-                ["radon", "cc", file_path, "--json"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+            with materialize(file_path) as real_path:
+                result = subprocess.run(
+                    ["radon", "cc", real_path, "--json"],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=self.analysis_timeout
+                )
             
             if result.returncode == 0 and result.stdout:
                 complexity_data = json.loads(result.stdout)
                 
-                if complexity_data and file_path in complexity_data:
-                    functions = complexity_data[file_path]
+                if complexity_data and real_path in complexity_data:
+                    functions = complexity_data[real_path]
                     
                     # 평균 복잡도 계산
                     if functions:
@@ -248,7 +372,7 @@ class CodeQualityFilter:
             tuple: (적합 여부, 이유)
         """
         # 파일 존재 확인
-        if not os.path.exists(file_path):
+        if not source_exists(file_path):
             return False, "파일이 존재하지 않음"
         
         # 라이센스 확인
@@ -271,50 +395,481 @@ class CodeQualityFilter:
         # 모든 조건 통과
         return True, "학습용으로 적합함"
     
-    def filter_code(self):
+    def judge_suitability(self, license_name, code_lines, quality_score, prescreen_reason=None,
+                          analysis_status=None):
+        """
+        이미 계산된 지표로 학습 적합성 판정 (분석기를 실행하지 않음)
+        
+        판정 순서와 이유 문구는 is_suitable_for_learning과 동일합니다.
+        
+        Args:
+            license_name (str): 라이센스 이름
+            code_lines (int): 코드 라인 수
+            quality_score (float): 품질 점수 (None이면 아직 pylint를 실행하지 않은 파일)
+            prescreen_reason (str, optional): 기준과 무관한 사전 검사 부적합 이유
+            analysis_status (str, optional): 격리 분석 상태 ('timeout', 'oom' 등은 부적합)
+            
+        Returns:
+            tuple: (적합 여부, 이유)
+        """
+        code_lines = code_lines or 0
+        
+        if not self.check_license_compatibility(license_name):
+            return False, f"라이센스 호환성 문제 ({license_name})"
+        if prescreen_reason:
+            return False, prescreen_reason
+        if analysis_status in ANALYSIS_FAILURE_REASONS:
+            return False, ANALYSIS_FAILURE_REASONS[analysis_status]
+        if code_lines < self.min_code_lines:
+            return False, f"코드 라인 수 부족 ({code_lines} < {self.min_code_lines})"
+        if code_lines > self.max_code_lines:
+            return False, f"코드 라인 수 초과 ({code_lines} > {self.max_code_lines})"
+        if quality_score is None:
+            if self.min_quality_score <= 0:
+                return True, "학습용으로 적합함"
+            return False, NEEDS_ANALYSIS_REASON
+        if quality_score < self.min_quality_score:
+            return False, f"품질 점수 미달 ({quality_score:.1f} < {self.min_quality_score})"
+        return True, "학습용으로 적합함"
+    
+    def compute_fingerprint(self, file_path, data=None):
+        """
+        파일 변경 감지용 지문 계산
+        
+        Args:
+            file_path (str): 파이썬 파일 경로
+            data (bytes, optional): 이미 읽은 파일 내용 (있으면 다시 읽지 않음)
+            
+        Returns:
+            dict: 내용 해시, 수정 시각, 크기 (파일이 없으면 빈 딕셔너리)
+        """
+        try:
+            stat = source_stat(file_path)
+            digest = hashlib.sha256()
+            if data is not None:
+                digest.update(data)
+            else:
+                digest.update(read_source_bytes(file_path))
+            return {
+                'content_hash': digest.hexdigest(),
+                'file_mtime': stat.st_mtime,
+                'file_size': stat.st_size
+            }
+        except OSError:
+            return {}
+    
+    def needs_evaluation(self, item):
+        """
+        메타데이터 항목을 다시 평가해야 하는지 확인
+        
+        새 항목, 내용이 바뀐 항목, 분석기 버전이 다른 항목, 명시적으로
+        무효화된 항목만 재평가 대상입니다. 수정 시각과 크기가 같으면
+        해시 계산 없이 건너뛰고, 다르면 내용 해시로 실제 변경 여부를 확인합니다.
+        
+        Args:
+            item (dict): 메타데이터 항목
+            
+        Returns:
+            bool: 재평가 필요 여부
+        """
+        if item.get('invalidated'):
+            return True
+        if item.get('analyzer_version') != ANALYZER_VERSION:
+            return True
+        if 'is_suitable' not in item or not item.get('content_hash'):
+            return True
+        
+        file_path = item.get('local_path')
+        try:
+            stat = source_stat(file_path)
+        except OSError:
+            return True
+        
+        if stat.st_mtime == item.get('file_mtime') and stat.st_size == item.get('file_size'):
+            return False
+        
+        # touch 등으로 수정 시각만 바뀐 경우는 해시로 걸러냄
+        fingerprint = self.compute_fingerprint(file_path)
+        if fingerprint.get('content_hash') == item.get('content_hash'):
+            item.update(fingerprint)
+            return False
+        
+        return True
+    
+    def build_hash_index(self, metadata):
+        """
+        정규화 내용 해시로 분석 결과를 찾는 색인 생성
+        
+        Args:
+            metadata (list): 메타데이터 목록
+            
+        Returns:
+            dict: 정규화 해시 -> 메타데이터 항목 (해시마다 첫 항목)
+        """
+        index = {}
+        for item in metadata:
+            normalized_hash = item.get('normalized_hash')
+            if normalized_hash and not item.get('invalidated') and normalized_hash not in index:
+                index[normalized_hash] = item
+        return index
+    
+    def _reuse_analysis(self, source, file_path, license_name):
+        """
+        같은 정규화 내용을 가진 파일의 분석 결과를 현재 파일에 맞게 재사용
+        
+        판정은 현재 파일의 라이센스로 다시 수행하며, 재사용한 결과로
+        판정할 수 없으면(pylint 평가가 필요하면) None을 반환합니다.
+        
+        Args:
+            source (dict): 색인에서 찾은 메타데이터 항목
+            file_path (str): 현재 파일 경로
+            license_name (str): 현재 파일의 라이센스
+            
+        Returns:
+            dict: 재사용한 평가 결과 (재사용할 수 없으면 None)
+        """
+        if source is None or source.get('local_path') == file_path:
+            return None
+        if source.get('analyzer_version') != ANALYZER_VERSION or self._prediction_uncertain(source):
+            return None
+        
+        reused = {field: source[field] for field in REUSABLE_FIELDS if field in source}
+        if isinstance(reused.get('complexity'), dict):
+            reused['complexity'] = dict(reused['complexity'])
+        is_suitable, reason = self.judge_suitability(
+            license_name, reused.get('code_lines'), reused.get('quality_score'),
+            reused.get('prescreen_reason'), reused.get('analysis_status')
+        )
+        if reason == NEEDS_ANALYSIS_REASON:
+            return None
+        
+        reused.update({
+            'is_suitable': is_suitable,
+            'unsuitable_reason': None if is_suitable else reason,
+            'reused_from': source.get('local_path')
+        })
+        return reused
+    
+    def analyze_file(self, file_path, metadata_item, hash_index=None):
+        """
+        파일 하나를 단계별로 분석하여 메타데이터에 기록할 평가 결과 생성
+        
+        공백, 주석, 독스트링을 제거한 내용이 같은 파일을 이미 분석했다면 그 결과를
+        재사용합니다. 그 외에는 저비용 사전 검사(prescreen)로 결과가 분명한 파일은
+        바로 판정하고, 품질 예측 모델이 있으면 예측이 최소 품질 점수에서 충분히 먼
+        파일도 바로 판정합니다. 결과가 불확실한 파일만 pylint와 radon을 한 번씩 실행합니다.
+        어느 단계에서 판정했는지는 'evaluation_tier'에 기록됩니다.
+        
+        Args:
+            file_path (str): 파이썬 파일 경로
+            metadata_item (dict): 메타데이터 항목
+            hash_index (dict, optional): build_hash_index로 만든 정규화 해시 색인
+                (새로 분석한 결과도 이 색인에 추가됨)
+            
+        Returns:
+            dict: 품질 점수, 코드 라인 수, 적합성, 복잡도, 판정 단계, 지문 정보
+        """
+        result = {
+            'quality_score': None,
+            'code_lines': 0,
+            'is_suitable': False,
+            'unsuitable_reason': "파일이 존재하지 않음",
+            'complexity': {
+                'avg_complexity': 0,
+                'function_count': 0,
+                'max_complexity': 0
+            },
+            'prescreen_reason': None,
+            'analysis_status': None,
+            'evaluation_tier': 'prescreen',
+            'lint_messages': None,
+            'symbols': None,
+            'imports': None,
+            'analyzer_version': ANALYZER_VERSION,
+            'reused_from': None
+        }
+        
+        try:
+            data = read_source_bytes(file_path)
+        except OSError:
+            return result
+        
+        license_name = metadata_item.get('repo_license')
+        content = data.decode('utf-8', errors='ignore')
+        result.update(self.compute_fingerprint(file_path, data))
+        result['normalized_hash'] = normalized_content_hash(content)
+        
+        # 0단계: 같은 코드를 이미 분석했으면 분석 없이 결과 재사용
+        if hash_index is not None:
+            reused = self._reuse_analysis(
+                hash_index.get(result['normalized_hash']), file_path, license_name
+            )
+            if reused is not None:
+                result.update(reused)
+                # 주석은 정규화 내용에 없으므로 비밀 정보는 이 파일에서 다시 검사
+                self._apply_secret_scan(content, result)
+                # 줄 번호가 다를 수 있으므로 심볼도 이 파일에서 다시 추출
+                self._apply_symbol_index(content, result)
+                is_suitable, reason = self.judge_suitability(
+                    license_name, result['code_lines'], result['quality_score'],
+                    result['prescreen_reason'], result['analysis_status']
+                )
+                result.update({
+                    'is_suitable': is_suitable,
+                    'unsuitable_reason': None if is_suitable else reason
+                })
+                return result
+        
+        self._evaluate_tiers(file_path, content, metadata_item, result)
+        if hash_index is not None:
+            hash_index[result['normalized_hash']] = dict(metadata_item, **result)
+        return result
+    
+    def _evaluate_tiers(self, file_path, content, metadata_item, result):
+        """
+        등록된 분석기를 비용 순서로 실행하여 결과 딕셔너리 갱신
+        
+        라이센스, 라인 수, 자동 생성 표식, 구문 분석 같은 저비용 분석기가 먼저 실행되고,
+        부적합 판정이 나오면 예측 모델과 pylint/radon은 실행하지 않습니다.
+        최종 판정은 저장된 지표로 재판정할 때와 같은 judge_suitability로 내립니다.
+        
+        Args:
+            file_path (str): 파이썬 파일 경로
+            content (str): 파일 내용
+            metadata_item (dict): 메타데이터 항목
+            result (dict): 갱신할 평가 결과
+            
+        Returns:
+            dict: 갱신된 평가 결과
+        """
+        context = AnalysisContext(self, file_path, content, metadata_item)
+        result.update(self.engine.run(context))
+        
+        is_suitable, reason = self.judge_suitability(
+            context.license_name, result['code_lines'], result['quality_score'],
+            result['prescreen_reason'], result['analysis_status']
+        )
+        result.update({
+            'is_suitable': is_suitable,
+            'unsuitable_reason': None if is_suitable else reason
+        })
+        return result
+    
+    def _prediction_uncertain(self, item):
+        """
+        예측 점수로 판정한 항목이 현재 기준에서는 불확실한지 확인
+        
+        Args:
+            item (dict): 메타데이터 항목
+            
+        Returns:
+            bool: pylint 재평가 필요 여부
+        """
+        if item.get('evaluation_tier') != 'model':
+            return False
+        if self.quality_model is None:
+            return True
+        confidence = self.quality_model.decision_confidence(
+            item.get('quality_score') or 0.0, self.min_quality_score
+        )
+        return confidence < self.model_min_confidence
+    
+    def invalidate(self, local_paths=None):
+        """
+        평가 결과를 무효화하여 다음 필터링에서 재평가되도록 표시
+        
+        Args:
+            local_paths (list, optional): 무효화할 로컬 경로 목록 (None이면 전체)
+            
+        Returns:
+            int: 무효화된 항목 수
+        """
+        metadata = self.load_metadata()
+        targets = set(local_paths) if local_paths is not None else None
+        
+        count = 0
+        for item in metadata:
+            if targets is None or item.get('local_path') in targets:
+                item['invalidated'] = True
+                count += 1
+        
+        self.save_metadata(metadata)
+        return count
+    
+    def filter_code(self, full=False):
         """
         수집된 코드를 필터링하고 메타데이터 업데이트
         
+        기본적으로 새로 추가되었거나 변경된 항목만 분석하고,
+        나머지는 저장된 평가 결과를 그대로 사용합니다.
+        
+        Args:
+            full (bool, optional): True이면 모든 항목을 다시 분석
+        
         Returns:
             tuple: (적합한 파일 수, 부적합한 파일 수)
         """
         metadata = self.load_metadata()
         
+        # 정규화 내용이 같은 파일은 한 번만 분석
+        hash_index = {} if full else self.build_hash_index(metadata)
+        self.engine.reset_stats()
+        
         suitable_count = 0
         unsuitable_count = 0
+        evaluated_count = 0
+        skipped_count = 0
+        tier_counts = {}
         
         for item in metadata:
             file_path = item.get('local_path')
             
             if not file_path:
                 continue
-                
-            # 학습 적합성 확인
-            is_suitable, reason = self.is_suitable_for_learning(file_path, item)
             
-            # 품질 점수 계산
-            quality_score = self.evaluate_code_quality(file_path)
+            if full or self.needs_evaluation(item):
+                # 메타데이터 업데이트
+                item.pop('invalidated', None)
+                item.update(self.analyze_file(file_path, item, hash_index))
+                evaluated_count += 1
+                tier = 'reused' if item.get('reused_from') else item.get('evaluation_tier')
+                tier_counts[tier] = tier_counts.get(tier, 0) + 1
+            else:
+                # 분석은 건너뛰되 현재 기준으로 판정만 다시 수행
+                is_suitable, reason = self.judge_suitability(
+                    item.get('repo_license'), item.get('code_lines'),
+                    item.get('quality_score'), item.get('prescreen_reason'),
+                    item.get('analysis_status')
+                )
+                if reason == NEEDS_ANALYSIS_REASON or self._prediction_uncertain(item):
+                    # 사전 검사/예측으로 판정했던 파일이 새 기준에서는 pylint가 필요함
+                    item.update(self.analyze_file(file_path, item, hash_index))
+                    evaluated_count += 1
+                    tier = 'reused' if item.get('reused_from') else item.get('evaluation_tier')
+                    tier_counts[tier] = tier_counts.get(tier, 0) + 1
+                else:
+                    item['is_suitable'] = is_suitable
+                    item['unsuitable_reason'] = None if is_suitable else reason
+                    if not item.get('normalized_hash') or 'has_secrets' not in item or 'symbols' not in item:
+                        # 이전 버전에서 분석한 항목은 저비용 검사 결과만 추가
+                        self._backfill(item, hash_index)
+                    skipped_count += 1
             
-            # 메타데이터 업데이트
-            item['quality_score'] = round(quality_score, 2)
-            item['code_lines'] = self.count_code_lines(file_path)
+            # 카운터 업데이트
+            if item.get('is_suitable'):
+                suitable_count += 1
+            else:
+                unsuitable_count += 1
+        
+        # 업데이트된 메타데이터 저장
+        self.save_metadata(metadata)
+        self.close()
+        
+        print(f"필터링 완료: 적합한 파일 {suitable_count}개, 부적합한 파일 {unsuitable_count}개 "
+              f"(분석 {evaluated_count}개, 변경 없음 {skipped_count}개)")
+        if tier_counts:
+            print("판정 단계별 파일 수: " + ", ".join(f"{k} {v}개" for k, v in sorted(tier_counts.items())))
+        report = self.engine.report()
+        if report:
+            print("분석기별 소요 시간:")
+        for row in report:
+            print(f"- {row['name']}: 실행 {row['runs']}회, {row['seconds']:.2f}초, "
+                  f"부적합 판정 {row['rejections']}개, 생략 {row['skipped']}회")
+        return suitable_count, unsuitable_count
+    
+    def _apply_secret_scan(self, content, result):
+        """
+        비밀 정보 검사 결과를 평가 결과에 반영
+        
+        Args:
+            content (str): 파일 내용
+            result (dict): 갱신할 평가 결과
+        """
+        findings = default_scanner.scan(content)
+        result['has_secrets'] = bool(findings)
+        result['secret_findings'] = findings
+        if result.get('prescreen_reason') == SECRET_REASON:
+            result['prescreen_reason'] = None
+        if findings and not result.get('prescreen_reason'):
+            result['prescreen_reason'] = SECRET_REASON
+    
+    def _apply_symbol_index(self, content, result):
+        """
+        심볼 색인용 정의와 가져온 모듈을 평가 결과에 반영
+        
+        Args:
+            content (str): 파일 내용
+            result (dict): 갱신할 평가 결과
+        """
+        try:
+            result['symbols'], result['imports'] = extract_symbols(ast.parse(content))
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            result['symbols'], result['imports'] = None, None
+    
+    def _backfill(self, item, hash_index):
+        """
+        이전 버전에서 분석한 항목에 정규화 해시, 비밀 정보 검사 결과, 심볼 추가
+        
+        Args:
+            item (dict): 메타데이터 항목
+            hash_index (dict): 정규화 해시 색인
+        """
+        try:
+            content = read_source(item['local_path'])
+        except OSError:
+            return
+        
+        if not item.get('normalized_hash'):
+            item['normalized_hash'] = normalized_content_hash(content)
+            hash_index.setdefault(item['normalized_hash'], item)
+        if 'symbols' not in item:
+            self._apply_symbol_index(content, item)
+        if 'has_secrets' not in item:
+            self._apply_secret_scan(content, item)
+            if item['has_secrets']:
+                is_suitable, reason = self.judge_suitability(
+                    item.get('repo_license'), item.get('code_lines'), item.get('quality_score'),
+                    item.get('prescreen_reason'), item.get('analysis_status')
+                )
+                item['is_suitable'] = is_suitable
+                item['unsuitable_reason'] = None if is_suitable else reason
+    
+    def rescore(self):
+        """
+        저장된 지표로 메타데이터의 적합성 판정만 다시 수행 (분석기 실행 없음)
+        
+        Returns:
+            tuple: (적합한 파일 수, 부적합한 파일 수)
+        """
+        metadata = self.load_metadata()
+        
+        suitable_count = 0
+        unsuitable_count = 0
+        
+        for item in metadata:
+            if not item.get('local_path') or 'is_suitable' not in item:
+                continue
+            if item.get('unsuitable_reason') == "파일이 존재하지 않음":
+                unsuitable_count += 1
+                continue
+            
+            is_suitable, reason = self.judge_suitability(
+                item.get('repo_license'), item.get('code_lines'),
+                item.get('quality_score'), item.get('prescreen_reason'),
+                item.get('analysis_status')
+            )
             item['is_suitable'] = is_suitable
             item['unsuitable_reason'] = None if is_suitable else reason
+            if reason == NEEDS_ANALYSIS_REASON:
+                # 다음 filter_code 실행에서 pylint로 평가
+                item['invalidated'] = True
             
-            # 복잡도 정보 추가
-            complexity_info = self.check_code_complexity(file_path)
-            item['complexity'] = complexity_info
-            
-            # 카운터 업데이트
             if is_suitable:
                 suitable_count += 1
             else:
                 unsuitable_count += 1
         
-        # 업데이트된 메타데이터 저장
         self.save_metadata(metadata)
-        
-        print(f"필터링 완료: 적합한 파일 {suitable_count}개, 부적합한 파일 {unsuitable_count}개")
         return suitable_count, unsuitable_count
     
     def get_suitable_files(self):
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+정규식 코드 검색 모듈
+
+Google Code Search나 Zoekt처럼 트라이그램 색인으로 후보 파일을 먼저 좁힌 뒤
+후보 파일의 소스 코드만 정규식으로 확인합니다.
+
+정규식에서 일치하려면 반드시 나타나야 하는 3자 이상 문자열을 뽑아 AND/OR 검색식을 만들고,
+트라이그램 색인(files_trigram)에서 그 문자열을 모두 포함하는 파일만 읽습니다.
+뽑을 수 있는 문자열이 없으면 (예: '\\w+\\(') 모든 파일을 확인합니다.
+
+트라이그램 색인은 FTS5 trigram 토크나이저 가상 테이블로, 전문 검색 색인(files_fts)에
+저장된 소스 코드를 내용으로 쓰며 CodeStorageManager가 가져오기/수정/삭제 때 함께 갱신합니다.
+색인에는 파일마다 앞부분(SEARCH_CONTENT_LIMIT)만 저장되므로, 잘린 파일(search_truncated)은
+항상 후보에 넣고 원본 파일(또는 묶음 저장소)에서 전체 내용을 읽어 확인합니다.
+원본을 읽지 못하면 색인된 앞부분만 확인하고 그 파일 수를 통계('unreadable')에 남깁니다.
+"""
+
+import re
+import bisect
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python 3.10 이하
+    import sre_parse
+from db_connection import get_pool
+from blob_store import read_source
+
+# 트라이그램 색인에서 찾을 수 있는 최소 문자열 길이
+MIN_LITERAL_LENGTH = 3
+
+# 대안(|)을 OR로 묶을 때 허용하는 최대 문자열 수 (넘으면 해당 조건은 버림)
+MAX_ALTERNATIVES = 16
+
+# 후보 파일 내용을 한 번에 읽는 파일 수
+BATCH_FILES = 200
+
+# 반복 연산자 (최소 반복 횟수가 1 이상이면 본문의 조건이 필요)
+REPEAT_OPS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) + (
+    (sre_parse.POSSESSIVE_REPEAT,) if hasattr(sre_parse, 'POSSESSIVE_REPEAT') else ())
+
+
+def _required_clauses(items):
+    """
+    정규식 구문 트리에서 일치하려면 반드시 포함해야 하는 문자열 조건 추출
+
+    Args:
+        items: sre_parse로 분석한 구문 노드 목록
+
+    Returns:
+        list: 조건 목록 (모두 만족해야 함, 각 조건은 그중 하나를 포함해야 하는 문자열 집합)
+    """
+    clauses = []
+    run = []
+
+    def flush():
+        if len(run) >= MIN_LITERAL_LENGTH:
+            clauses.append(frozenset([''.join(run)]))
+        run.clear()
+
+    for op, value in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(value))
+            continue
+        # 문자 하나짜리 문자 클래스 (예: [(])는 문자 그대로 취급
+        if op == sre_parse.IN and len(value) == 1 and value[0][0] == sre_parse.LITERAL:
+            run.append(chr(value[0][1]))
+            continue
+
+        flush()
+        if op == sre_parse.SUBPATTERN:
+            clauses.extend(_required_clauses(value[-1]))
+        elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+            clauses.extend(_required_clauses(value))
+        elif op in REPEAT_OPS:
+            minimum, _, body = value
+            if minimum >= 1:
+                clauses.extend(_required_clauses(body))
+        elif op == sre_parse.BRANCH:
+            # (A1 그리고 A2) 또는 (B1 그리고 B2)이면 적어도 (A1 또는 B1)은 만족
+            alternatives = set()
+            for branch in value[1]:
+                branch_clauses = _required_clauses(branch)
+                if not branch_clauses:
+                    alternatives = None
+                    break
+                alternatives |= max(branch_clauses, key=lambda c: min(len(s) for s in c))
+            if alternatives and len(alternatives) <= MAX_ALTERNATIVES:
+                clauses.append(frozenset(alternatives))
+    flush()
+
+    return clauses
+
+
+def trigram_query(pattern):
+    """
+    정규식을 트라이그램 색인 검색식(FTS5)으로 변환
+
+    색인은 대소문자를 구분하지 않으므로 대소문자 옵션과 관계없이 쓸 수 있습니다.
+
+    Args:
+        pattern (str): 정규식
+
+    Returns:
+        str: FTS5 검색식 (후보를 좁힐 문자열이 없으면 None)
+
+    Raises:
+        re.error: 올바르지 않은 정규식
+    """
+    clauses = _required_clauses(sre_parse.parse(pattern))
+
+    terms = []
+    for clause in dict.fromkeys(clauses):
+        quoted = ['"' + literal.replace('"', '""') + '"' for literal in sorted(clause)]
+        terms.append(quoted[0] if len(quoted) == 1 else '(' + ' OR '.join(quoted) + ')')
+    return ' AND '.join(terms) if terms else None
+
+
+class CodeGrep:
+    """트라이그램 색인을 이용한 정규식 코드 검색"""
+
+    def __init__(self, db_file):
+        """
+        정규식 검색 초기화
+
+        Args:
+            db_file (str): 데이터베이스 파일 경로 (CodeStorageManager가 만든 색인 사용)
+        """
+        self.pool = get_pool(db_file)
+        self.stats = {'files': 0, 'candidates': 0, 'matched_files': 0, 'matches': 0, 'unreadable': 0}
+
+    def candidate_ids(self, pattern):
+        """
+        정규식과 일치할 수 있는 후보 파일 ID 조회
+
+        Args:
+            pattern (str): 정규식
+
+        Returns:
+            list: 후보 파일 ID 목록 (ID 순)
+        """
+        query = trigram_query(pattern)
+        with self.pool.connection() as conn:
+            self.stats['files'] = conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+            if query is None:
+                rows = conn.execute('SELECT rowid FROM files_fts ORDER BY rowid')
+            else:
+                # 잘린 파일은 색인에 없는 뒷부분에서 일치할 수 있으므로 항상 후보
+                rows = conn.execute('''
+                SELECT rowid FROM files_trigram WHERE files_trigram MATCH ?
+                UNION
+                SELECT id FROM files WHERE search_truncated = 1
+                ORDER BY 1
+                ''', (query,))
+            return [row[0] for row in rows]
+
+    def grep(self, pattern, ignore_case=False, context=0, max_matches=None):
+        """
+        정규식과 일치하는 줄을 찾는 대로 하나씩 반환
+
+        한 줄에 여러 번 일치해도 한 번만 반환하고, 여러 줄에 걸친 일치는 시작 줄로 반환합니다.
+
+        Args:
+            pattern (str): 정규식 (줄 단위 ^, $ 사용 가능)
+            ignore_case (bool): 대소문자 무시
+            context (int): 앞뒤로 함께 반환할 줄 수
+            max_matches (int, optional): 최대 일치 줄 수
+
+        Yields:
+            dict: 파일 ID, 저장소, 경로, 줄 번호, 줄 내용, 앞뒤 줄 목록
+
+        Raises:
+            re.error: 올바르지 않은 정규식
+        """
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        regex = re.compile(pattern, flags)
+        candidates = self.candidate_ids(pattern)
+        self.stats.update(candidates=len(candidates), matched_files=0, matches=0, unreadable=0)
+
+        for start in range(0, len(candidates), BATCH_FILES):
+            chunk = candidates[start:start + BATCH_FILES]
+            placeholders = ', '.join(['?'] * len(chunk))
+            with self.pool.connection() as conn:
+                rows = conn.execute(f'''
+                SELECT s.rowid, s.repo_name, s.path, s.content, f.local_path, f.search_truncated
+                FROM files_fts s
+                JOIN files f ON f.id = s.rowid
+                WHERE s.rowid IN ({placeholders}) ORDER BY s.rowid
+                ''', chunk).fetchall()
+
+            for file_id, repo_name, path, content, local_path, truncated in rows:
+                if truncated:
+                    try:
+                        content = read_source(local_path)
+                    except OSError:
+                        # 색인된 앞부분만 확인하므로 뒷부분의 일치는 빠짐
+                        self.stats['unreadable'] += 1
+                lines = None
+                last_line = 0
+                for match in regex.finditer(content or ''):
+                    if lines is None:
+                        lines = content.split('\n')
+                        line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+                        self.stats['matched_files'] += 1
+                    line_no = bisect.bisect_right(line_starts, match.start())
+                    if line_no == last_line:
+                        continue
+                    last_line = line_no
+
+                    self.stats['matches'] += 1
+                    yield {
+                        'file_id': file_id,
+                        'repo_name': repo_name,
+                        'path': path,
+                        'line': line_no,
+                        'text': lines[line_no - 1].rstrip('\r'),
+                        'before': [line.rstrip('\r')
+                                   for line in lines[max(0, line_no - 1 - context):line_no - 1]],
+                        'after': [line.rstrip('\r') for line in lines[line_no:line_no + context]]
+                    }
+                    if max_matches is not None and self.stats['matches'] >= max_matches:
+                        return
+
@@ -7,11 +7,400 @@ GitHub에서 수집한 파이썬 코드와 메타데이터를 저장하고 관
 """
 
 import os
+import re
 import json
+import base64
+import time
+import hashlib
 import shutil
 import sqlite3
 from datetime import datetime
 import pandas as pd
+from code_filter import NEEDS_ANALYSIS_REASON, ANALYSIS_FAILURE_REASONS
+from code_embedding import CodeEmbedder
+from code_export import ColumnarExporter
+from blob_store import get_store, is_blob_ref, read_source, source_key, PACK_DIR_NAME
+from db_connection import get_pool
+
+# pylint 메시지 분류 이름과 메시지 ID 첫 글자
+LINT_CATEGORIES = {
+    'convention': 'C',
+    'refactor': 'R',
+    'warning': 'W',
+    'error': 'E',
+    'fatal': 'F',
+    'info': 'I'
+}
+
+# 가져오기에서 한 트랜잭션으로 처리할 메타데이터 항목 수
+IMPORT_BATCH_SIZE = 5000
+
+# 동기화 해시에 포함하는 메타데이터 필드 (데이터베이스에 저장되는 값)
+SYNC_FIELDS = (
+    'file_name', 'file_url', 'local_path', 'quality_score', 'code_lines', 'is_suitable',
+    'unsuitable_reason', 'complexity', 'evaluation_tier', 'prescreen_reason', 'analysis_status',
+    'normalized_hash', 'content_hash', 'has_secrets', 'secret_findings', 'lint_messages',
+    'symbols', 'imports'
+)
+
+# 메타데이터 파일을 읽는 단위 (문자 수)
+METADATA_READ_SIZE = 1 << 20
+
+# 보조 인덱스 (대량 가져오기 중에는 지웠다가 마지막에 다시 만들 수 있음)
+SECONDARY_INDEXES = [
+    # 정규화 내용 해시로 정확 중복을 바로 찾기 위한 인덱스
+    ('idx_files_normalized_hash', 'files (normalized_hash)'),
+    ('idx_secret_findings_file', 'secret_findings (file_id)'),
+    ('idx_lint_messages_msg', 'file_lint_messages (msg_id, file_id)'),
+    ('idx_lint_messages_symbol', 'file_lint_messages (symbol, file_id)'),
+    # 검색 결과를 품질 점수 순으로 읽고 LIMIT에서 멈추기 위한 인덱스
+    # (code_lines까지 포함해 평균 집계도 테이블을 읽지 않고 처리)
+    ('idx_files_quality', 'files (quality_score, code_lines)'),
+    # 품질 점수 순 다음 페이지를 (품질 점수, 파일 ID) 범위로 바로 찾기 위한 인덱스
+    ('idx_files_quality_page', 'files (quality_score)'),
+    ('idx_files_code_lines', 'files (code_lines)'),
+    # 적합한 파일만 품질 점수 순으로 검색 / 적합 파일 수 집계 (파일 ID 순서까지 인덱스에 포함)
+    ('idx_files_suitable_quality', 'files (is_suitable, quality_score)'),
+    ('idx_files_duplicate_of', 'files (duplicate_of)'),
+    ('idx_files_has_secrets', 'files (has_secrets)'),
+    # 태그 이름으로 찾은 태그 ID에서 파일 ID로 (기본 키는 file_id가 앞)
+    ('idx_file_tags_tag', 'file_tags (tag_id, file_id)'),
+    ('idx_repositories_license', 'repositories (license)'),
+    # 파일 수가 많은 저장소/태그 (트리거가 갱신하는 file_count)
+    ('idx_repositories_file_count', 'repositories (file_count)'),
+    ('idx_tags_file_count', 'tags (file_count)'),
+    # 심볼 이름 일치/접두어 검색과 (뒤집은 이름으로) 접미어 검색
+    ('idx_file_symbols_name', 'file_symbols (name)'),
+    ('idx_file_symbols_reversed', 'file_symbols (reversed_name)'),
+    ('idx_file_symbols_file', 'file_symbols (file_id)'),
+    ('idx_file_imports_module', 'file_imports (module, file_id)'),
+    # 색인 내용이 길이 제한으로 잘린 파일 (정규식 검색이 원본을 직접 확인)
+    ('idx_files_search_truncated', 'files (id) WHERE search_truncated = 1'),
+]
+
+# 현재 스키마 버전 (PRAGMA user_version, 버전 기록 전에 만든 데이터베이스는 0)
+# 1: 검색/통계용 보조 인덱스 추가
+# 2: 전문 검색 색인(files_fts) 추가
+# 3: 정규식 검색용 트라이그램 색인(files_trigram) 추가
+# 4: 통계 카운터(statistics_counters)와 이를 갱신하는 트리거 추가
+# 5: 검색 색인 내용이 잘린 파일 표시(files.search_truncated) 추가
+SCHEMA_VERSION = 5
+
+# 전문 검색 색인의 열별 BM25 가중치 (저장소 이름, 경로, 파일명, 소스 코드)
+SEARCH_RANK = 'bm25(2.0, 4.0, 8.0, 1.0)'
+
+# 전문 검색 색인에 넣는 소스 코드 최대 길이 (문자 수)
+SEARCH_CONTENT_LIMIT = 1 << 20
+
+# 전문 검색 색인을 한 번에 갱신하는 파일 수
+SEARCH_INDEX_BATCH = 500
+
+# 검색 결과의 태그를 한 번에 조회하는 파일 수 (SQLite 매개변수 수 제한 이내)
+TAG_LOOKUP_BATCH = 500
+
+# 검색 결과 발췌문에서 일치한 부분을 감싸는 표시
+SNIPPET_MARKERS = ('[', ']')
+
+# 통계 카운터를 처음부터 다시 계산하는 집계 쿼리 (평소에는 트리거가 카운터를 갱신)
+STATISTICS_QUERIES = {
+    'repository_count': 'SELECT COUNT(*) FROM repositories',
+    'file_count': 'SELECT COUNT(*) FROM files',
+    'suitable_file_count': 'SELECT COUNT(*) FROM files WHERE is_suitable = 1',
+    # 유사 중복으로 표시된 파일 수
+    'duplicate_file_count': 'SELECT COUNT(*) FROM files WHERE duplicate_of IS NOT NULL',
+    # 정규화 내용이 다른 파일과 완전히 같은 파일 수
+    'exact_duplicate_count': '''
+        SELECT COUNT(*) - COUNT(DISTINCT normalized_hash)
+        FROM files WHERE normalized_hash IS NOT NULL
+    ''',
+    'secret_file_count': 'SELECT COUNT(*) FROM files WHERE has_secrets = 1',
+    'tag_count': 'SELECT COUNT(*) FROM tags',
+    # 평균 계산용 개수와 합계
+    'quality_count': 'SELECT COUNT(quality_score) FROM files',
+    'quality_sum': 'SELECT IFNULL(SUM(quality_score), 0) FROM files',
+    'code_lines_count': 'SELECT COUNT(code_lines) FROM files',
+    'code_lines_sum': 'SELECT IFNULL(SUM(code_lines), 0) FROM files',
+}
+
+# 품질 점수 분포 구간 (1점 단위, 0점 미만은 첫 구간, 9점 이상은 마지막 구간)
+QUALITY_HISTOGRAM_BUCKETS = 10
+QUALITY_BUCKET_SQL = 'MIN(MAX(CAST({} AS INTEGER), 0), 9)'
+
+# 이름이 여러 개인 통계 카운터를 다시 계산하는 집계 쿼리 ((카운터 이름, 값) 행 반환)
+STATISTICS_GROUP_QUERIES = {
+    'quality_histogram': f'''
+        SELECT 'quality_bucket:' || {QUALITY_BUCKET_SQL.format('quality_score')}, COUNT(*)
+        FROM files WHERE quality_score IS NOT NULL GROUP BY 1
+    ''',
+    'license_distribution': '''
+        SELECT 'license:' || IFNULL(license, ''), COUNT(*) FROM repositories GROUP BY 1
+    ''',
+}
+
+# 파일 수가 많은 저장소와 태그 (트리거가 갱신하는 file_count 인덱스 순서로 읽음)
+TOP_REPOSITORIES_SQL = '''
+    SELECT name, full_name, file_count FROM repositories
+    WHERE file_count > 0 ORDER BY file_count DESC LIMIT 10
+'''
+TOP_TAGS_SQL = '''
+    SELECT name, file_count FROM tags
+    WHERE file_count > 0 ORDER BY file_count DESC LIMIT 10
+'''
+
+
+def _file_counter_values(row, sign, include_count=True):
+    """
+    파일 행 하나가 통계 카운터에 더하는 값 (트리거의 VALUES 목록)
+    
+    Args:
+        row (str): 트리거의 행 별칭 ('NEW' 또는 'OLD')
+        sign (int): 더하면 1, 빼면 -1
+        include_count (bool): 파일 수 카운터 포함 여부
+        
+    Returns:
+        list: (카운터 이름 식, 값 식) SQL 문자열 목록
+    """
+    values = [
+        ('suitable_file_count', f'{row}.is_suitable = 1'),
+        ('duplicate_file_count', f'{row}.duplicate_of IS NOT NULL'),
+        ('secret_file_count', f'{row}.has_secrets = 1'),
+        ('quality_count', f'{row}.quality_score IS NOT NULL'),
+        ('quality_sum', f'IFNULL({row}.quality_score, 0)'),
+        ('code_lines_count', f'{row}.code_lines IS NOT NULL'),
+        ('code_lines_sum', f'IFNULL({row}.code_lines, 0)'),
+        # 같은 정규화 내용의 다른 파일이 있으면 정확 중복이 하나 늘거나 줆
+        ('exact_duplicate_count', f'''{row}.normalized_hash IS NOT NULL AND EXISTS (
+            SELECT 1 FROM files d WHERE d.normalized_hash = {row}.normalized_hash AND d.id != {row}.id)'''),
+    ]
+    values = [(f"'{name}'", value) for name, value in values]
+    values.append((
+        f"'quality_bucket:' || IFNULL({QUALITY_BUCKET_SQL.format(f'{row}.quality_score')}, 0)",
+        f'{row}.quality_score IS NOT NULL'
+    ))
+    if include_count:
+        values.insert(0, ("'file_count'", '1'))
+    # NULL 열과의 비교 결과(NULL)는 0으로 더함
+    return [(name, f'{sign} * IFNULL({value}, 0)') for name, value in values]
+
+
+def _counter_upsert(values):
+    """통계 카운터에 값을 더하는 트리거 문장"""
+    rows = ',\n        '.join(f'({name}, {value})' for name, value in values)
+    return f'''
+    INSERT INTO statistics_counters (name, value) VALUES
+        {rows}
+    ON CONFLICT (name) DO UPDATE SET value = value + excluded.value;
+    '''
+
+
+# 파일, 저장소, 태그가 바뀔 때 같은 트랜잭션 안에서 통계 카운터와 file_count 열을 갱신하는 트리거
+STATISTICS_TRIGGERS = {
+    'files_stats_insert': f'''
+        AFTER INSERT ON files BEGIN
+        {_counter_upsert(_file_counter_values('NEW', 1))}
+        UPDATE repositories SET file_count = file_count + 1 WHERE id = NEW.repo_id;
+        END
+    ''',
+    'files_stats_delete': f'''
+        AFTER DELETE ON files BEGIN
+        {_counter_upsert(_file_counter_values('OLD', -1))}
+        UPDATE repositories SET file_count = file_count - 1 WHERE id = OLD.repo_id;
+        END
+    ''',
+    'files_stats_update': f'''
+        AFTER UPDATE OF quality_score, code_lines, is_suitable, duplicate_of, has_secrets, normalized_hash
+        ON files BEGIN
+        {_counter_upsert(_file_counter_values('OLD', -1, False) + _file_counter_values('NEW', 1, False))}
+        END
+    ''',
+    'files_stats_move': '''
+        AFTER UPDATE OF repo_id ON files WHEN OLD.repo_id IS NOT NEW.repo_id BEGIN
+        UPDATE repositories SET file_count = file_count - 1 WHERE id = OLD.repo_id;
+        UPDATE repositories SET file_count = file_count + 1 WHERE id = NEW.repo_id;
+        END
+    ''',
+    'repositories_stats_insert': f'''
+        AFTER INSERT ON repositories BEGIN
+        {_counter_upsert([("'repository_count'", '1'), ("'license:' || IFNULL(NEW.license, '')", '1')])}
+        END
+    ''',
+    'repositories_stats_delete': f'''
+        AFTER DELETE ON repositories BEGIN
+        {_counter_upsert([("'repository_count'", '-1'), ("'license:' || IFNULL(OLD.license, '')", '-1')])}
+        END
+    ''',
+    'repositories_stats_license': f'''
+        AFTER UPDATE OF license ON repositories WHEN OLD.license IS NOT NEW.license BEGIN
+        {_counter_upsert([("'license:' || IFNULL(OLD.license, '')", '-1'),
+                          ("'license:' || IFNULL(NEW.license, '')", '1')])}
+        END
+    ''',
+    'tags_stats_insert': f'''
+        AFTER INSERT ON tags BEGIN
+        {_counter_upsert([("'tag_count'", '1')])}
+        END
+    ''',
+    'tags_stats_delete': f'''
+        AFTER DELETE ON tags BEGIN
+        {_counter_upsert([("'tag_count'", '-1')])}
+        END
+    ''',
+    'file_tags_stats_insert': '''
+        AFTER INSERT ON file_tags BEGIN
+        UPDATE tags SET file_count = file_count + 1 WHERE id = NEW.tag_id;
+        END
+    ''',
+    'file_tags_stats_delete': '''
+        AFTER DELETE ON file_tags BEGIN
+        UPDATE tags SET file_count = file_count - 1 WHERE id = OLD.tag_id;
+        END
+    ''',
+}
+
+# 검색 정렬 기준별 정렬 값 (None이면 파일 ID만)과 정렬 값이 NULL일 수 있는지 여부
+# (relevance와 oldest는 오름차순, 나머지는 내림차순이고 같은 값끼리는 파일 ID 순)
+SEARCH_SORTS = {
+    'relevance': ('s.rank', False),
+    'quality': ('f.quality_score', True),
+    'lines': ('f.code_lines', True),
+    'newest': (None, False),
+    'oldest': (None, False),
+}
+
+# 다음 페이지 커서에 넣을 정렬 값의 검색 결과 열 이름
+SEARCH_SORT_COLUMNS = {'relevance': 'rank', 'quality': 'quality_score', 'lines': 'code_lines', 'newest': None,
+                       'oldest': None}
+
+# 검색 결과 전체를 읽을 때의 페이지 크기
+SEARCH_PAGE_SIZE = 1000
+
+# CSV로 내보낼 때 한 번에 읽어 쓰는 행 수
+EXPORT_CHUNK_ROWS = 50000
+
+# 실행 계획을 검사할 자주 쓰는 검색 조건 (search_files 인자)
+HOT_SEARCHES = {
+    'search': {},
+    'search_query': {'query': 'example'},
+    'search_tags': {'tags': ['example']},
+    'search_min_quality': {'min_quality': 7.0},
+    'search_suitable': {'suitable_only': True},
+    'search_collapse_duplicates': {'collapse_duplicates': True},
+    'search_with_lint': {'with_lint': ['W0611']},
+    'search_without_lint': {'without_lint': ['warning']},
+    # 다음 페이지 (keyset)
+    'search_page': {'after': (7.0, 1000)},
+    'search_page_nulls': {'after': (None, 1000)},
+    'search_suitable_page': {'suitable_only': True, 'after': (7.0, 1000)},
+    'search_lines_page': {'sort': 'lines', 'after': (100, 1000)},
+    'search_newest_page': {'sort': 'newest', 'after': (1000,)},
+    'search_oldest_page': {'sort': 'oldest', 'after': (1000,)},
+}
+
+# 실행 계획을 검사할 자주 쓰는 심볼 검색 조건 (find_symbols, find_importers 인자)
+HOT_SYMBOL_LOOKUPS = {
+    'symbols_exact': ('find_symbols', {'pattern': 'Parser'}),
+    'symbols_prefix': ('find_symbols', {'pattern': 'Parse*', 'kind': 'class'}),
+    'symbols_suffix': ('find_symbols', {'pattern': '*Parser'}),
+    'importers': ('find_importers', {'module': 'asyncio'}),
+}
+
+# 전체 스캔해도 되는 작은 조회용 테이블 (실행 계획 검사에서 제외)
+SMALL_TABLES = ('tags', 'suitability_profiles', 'sync_state', 'statistics_counters')
+
+
+def iter_metadata(metadata_file, read_size=METADATA_READ_SIZE):
+    """
+    메타데이터 파일(JSON 배열)의 항목을 앞에서부터 하나씩 읽기
+    
+    파일 전체를 한 번에 파싱하지 않으므로 항목 수와 관계없이 메모리 사용량이 일정합니다.
+    
+    Args:
+        metadata_file (str): 메타데이터 파일 경로
+        read_size (int): 한 번에 읽을 문자 수
+        
+    Yields:
+        dict: 메타데이터 항목
+    """
+    decoder = json.JSONDecoder()
+    with open(metadata_file, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+        started = False
+        while True:
+            # 항목 사이의 공백과 쉼표 건너뛰기 (버퍼가 비면 더 읽음)
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    return
+                chunk = f.read(read_size)
+                buffer, pos, eof = chunk, 0, not chunk
+                continue
+            
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("메타데이터 파일이 JSON 배열이 아닙니다.")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 항목이 버퍼 경계에 걸쳐 있으면 더 읽어서 다시 시도
+                chunk = f.read(read_size)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield item
+            pos = end
+
+
+def encode_search_cursor(sort, values):
+    """
+    다음 페이지 커서 생성
+    
+    Args:
+        sort (str): 정렬 기준
+        values (list): 마지막 결과의 정렬 키 (정렬 값, 파일 ID)
+        
+    Returns:
+        str: URL에 그대로 쓸 수 있는 커서 문자열
+    """
+    data = json.dumps([sort] + list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_search_cursor(cursor, sort):
+    """
+    다음 페이지 커서 해석
+    
+    Args:
+        cursor (str): encode_search_cursor로 만든 커서
+        sort (str): 현재 정렬 기준 (커서의 정렬 기준과 같아야 함)
+        
+    Returns:
+        tuple: 정렬 키 (정렬 값, 파일 ID) 또는 (파일 ID,)
+        
+    Raises:
+        ValueError: 커서가 올바르지 않거나 다른 정렬 기준의 커서인 경우
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"올바르지 않은 커서: {cursor}") from e
+    
+    size = 2 if SEARCH_SORTS.get(sort, (None,))[0] is None else 3
+    if (not isinstance(data, list) or len(data) != size or data[0] != sort
+            or not isinstance(data[-1], int)
+            or not all(value is None or isinstance(value, (int, float)) for value in data[1:])):
+        raise ValueError(f"올바르지 않은 커서: {cursor}")
+    return tuple(data[1:])
+
 
 class CodeStorageManager:
     """파이썬 코드 저장 및 관리 클래스"""
@@ -28,6 +417,10 @@ class CodeStorageManager:
         self.metadata_file = os.path.join(base_dir, "metadata.json")
         self.db_file = os.path.join(base_dir, db_file)
         
+        # 같은 데이터베이스를 쓰는 모든 인스턴스가 공유하는 연결 풀
+        self.pool = get_pool(self.db_file)
+        self.import_stats = None
+        
         # 기본 디렉토리 생성
         os.makedirs(base_dir, exist_ok=True)
         
@@ -37,161 +430,1174 @@ class CodeStorageManager:
     def init_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                # 저장소 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS repositories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    full_name TEXT NOT NULL UNIQUE,
+                    url TEXT NOT NULL,
+                    description TEXT,
+                    stars INTEGER,
+                    forks INTEGER,
+                    license TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    added_at TEXT,
+                    file_count INTEGER DEFAULT 0
+                )
+                ''')
+                self._ensure_columns(cursor, 'repositories', {'file_count': 'INTEGER DEFAULT 0'})
+                
+                # 파일 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    repo_id INTEGER,
+                    name TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    local_path TEXT NOT NULL,
+                    quality_score REAL,
+                    code_lines INTEGER,
+                    is_suitable INTEGER,
+                    unsuitable_reason TEXT,
+                    complexity_avg REAL,
+                    complexity_max INTEGER,
+                    function_count INTEGER,
+                    downloaded_at TEXT,
+                    evaluation_tier TEXT,
+                    prescreen_reason TEXT,
+                    analysis_status TEXT,
+                    duplicate_of INTEGER,
+                    duplicate_similarity REAL,
+                    normalized_hash TEXT,
+                    has_secrets INTEGER,
+                    lint_message_total INTEGER,
+                    content_hash TEXT,
+                    sync_hash TEXT,
+                    sync_dirty INTEGER DEFAULT 0,
+                    symbol_count INTEGER,
+                    search_truncated INTEGER DEFAULT 0,
+                    FOREIGN KEY (repo_id) REFERENCES repositories (id),
+                    UNIQUE (repo_id, path)
+                )
+                ''')
+                
+                # 이전 버전에서 만든 데이터베이스에 추가된 열 반영
+                self._ensure_columns(cursor, 'files', {
+                    'evaluation_tier': 'TEXT',
+                    'prescreen_reason': 'TEXT',
+                    'analysis_status': 'TEXT',
+                    'duplicate_of': 'INTEGER',
+                    'duplicate_similarity': 'REAL',
+                    'normalized_hash': 'TEXT',
+                    'has_secrets': 'INTEGER',
+                    'lint_message_total': 'INTEGER',
+                    'content_hash': 'TEXT',
+                    'sync_hash': 'TEXT',
+                    'sync_dirty': 'INTEGER DEFAULT 0',
+                    'symbol_count': 'INTEGER',
+                    'search_truncated': 'INTEGER DEFAULT 0'
+                })
+                
+                # 태그 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tags (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE,
+                    file_count INTEGER DEFAULT 0
+                )
+                ''')
+                self._ensure_columns(cursor, 'tags', {'file_count': 'INTEGER DEFAULT 0'})
+                
+                # 파일-태그 관계 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_tags (
+                    file_id INTEGER,
+                    tag_id INTEGER,
+                    PRIMARY KEY (file_id, tag_id),
+                    FOREIGN KEY (file_id) REFERENCES files (id),
+                    FOREIGN KEY (tag_id) REFERENCES tags (id)
+                )
+                ''')
+                
+                # 적합성 기준 프로필 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS suitability_profiles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE,
+                    min_quality REAL NOT NULL,
+                    min_lines INTEGER NOT NULL,
+                    max_lines INTEGER NOT NULL,
+                    evaluated_at TEXT
+                )
+                ''')
+                
+                # 프로필별 적합성 판정 결과 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS profile_results (
+                    profile_id INTEGER,
+                    file_id INTEGER,
+                    is_suitable INTEGER,
+                    unsuitable_reason TEXT,
+                    PRIMARY KEY (profile_id, file_id),
+                    FOREIGN KEY (profile_id) REFERENCES suitability_profiles (id),
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                )
+                ''')
+                
+                # 비밀 정보 탐지 결과 테이블 생성 (값은 앞부분만 저장)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS secret_findings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_id INTEGER NOT NULL,
+                    rule TEXT NOT NULL,
+                    line INTEGER,
+                    masked TEXT,
+                    entropy REAL,
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                )
+                ''')
+                
+                # 파일별 pylint 메시지 발생 횟수 테이블 생성
+                # (분류는 메시지 ID 첫 글자이므로 따로 저장하지 않고 ID 범위로 조회)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_lint_messages (
+                    file_id INTEGER NOT NULL,
+                    msg_id TEXT NOT NULL,
+                    symbol TEXT,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (file_id, msg_id),
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                ) WITHOUT ROWID
+                ''')
+                
+                # 파일별 정의(클래스, 함수, 메서드) 색인 테이블 생성
+                # (접미어 검색용으로 이름을 뒤집어 함께 저장)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_symbols (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    reversed_name TEXT NOT NULL,
+                    qualname TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    signature TEXT,
+                    line INTEGER,
+                    end_line INTEGER,
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                )
+                ''')
+                
+                # 파일별 가져온 모듈 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_imports (
+                    file_id INTEGER NOT NULL,
+                    module TEXT NOT NULL,
+                    PRIMARY KEY (file_id, module),
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                ) WITHOUT ROWID
+                ''')
+                
+                # 유사 중복 탐지용 MinHash 서명 테이블 생성
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_signatures (
+                    file_id INTEGER PRIMARY KEY,
+                    file_size INTEGER,
+                    file_mtime REAL,
+                    params TEXT,
+                    signature BLOB,
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                )
+                ''')
+                
+                # 유사 코드 검색용 임베딩 테이블 생성 (int8 양자화 벡터와 배율)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_embeddings (
+                    file_id INTEGER PRIMARY KEY,
+                    file_size INTEGER,
+                    file_mtime REAL,
+                    params TEXT,
+                    scale REAL,
+                    vector BLOB,
+                    FOREIGN KEY (file_id) REFERENCES files (id)
+                )
+                ''')
+                
+                # 통계 카운터 테이블 생성 (개수, 합계, 품질 점수 구간별/라이센스별 개수)
+                # 값은 정수 카운터는 정수, 합계는 실수 그대로 저장
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS statistics_counters (
+                    name TEXT PRIMARY KEY NOT NULL,
+                    value NOT NULL DEFAULT 0
+                )
+                ''')
+                
+                # 메타데이터 동기화 상태 테이블 생성 (워터마크 등)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                ''')
+                
+                # 전문 검색 색인 생성 (rowid는 파일 ID, 소스 코드 내용도 색인에 저장)
+                # 순위 함수 설정은 색인 안에 저장되므로 처음 만들 때 한 번만 씀
+                # (매번 쓰면 읽기만 하는 요청도 쓰기 잠금을 기다리게 됨)
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'files_fts'")
+                fts_exists = cursor.fetchone() is not None
+                cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                    repo_name, path, name, content,
+                    prefix = '2 3'
+                )
+                ''')
+                if not fts_exists:
+                    cursor.execute(f"INSERT INTO files_fts (files_fts, rank) VALUES ('rank', '{SEARCH_RANK}')")
+                
+                # 정규식 검색용 트라이그램 색인 생성 (code_search 모듈에서 사용)
+                # 내용은 전문 검색 색인의 소스 코드를 그대로 쓰므로 따로 저장하지 않음
+                cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS files_trigram USING fts5(
+                    content,
+                    content = 'files_fts',
+                    tokenize = 'trigram'
+                )
+                ''')
+                
+                # 파일이 어떤 경로로 삭제되든 검색 색인에서도 제거
+                # (트라이그램 색인은 지울 내용이 필요하므로 전문 검색 색인보다 먼저)
+                cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS files_search_delete AFTER DELETE ON files BEGIN
+                    INSERT INTO files_trigram (files_trigram, rowid, content)
+                    SELECT 'delete', rowid, content FROM files_fts WHERE rowid = old.id;
+                    DELETE FROM files_fts WHERE rowid = old.id;
+                END
+                ''')
+                
+                # 보조 인덱스 생성 및 스키마 버전 갱신
+                self._migrate_schema(cursor)
             
-            # 저장소 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS repositories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                full_name TEXT NOT NULL UNIQUE,
-                url TEXT NOT NULL,
-                description TEXT,
-                stars INTEGER,
-                forks INTEGER,
-                license TEXT,
-                created_at TEXT,
-                updated_at TEXT,
-                added_at TEXT
-            )
-            ''')
+            print("데이터베이스 초기화 완료")
             
-            # 파일 테이블 생성
+        except Exception as e:
+            print(f"데이터베이스 초기화 오류: {str(e)}")
+    
+    def _ensure_columns(self, cursor, table, columns):
+        """
+        기존 테이블에 없는 열 추가
+        
+        Args:
+            cursor: 데이터베이스 커서
+            table (str): 테이블 이름
+            columns (dict): 열 이름과 타입
+        """
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+    
+    def _migrate_schema(self, cursor):
+        """
+        이전 버전에서 만든 데이터베이스를 현재 스키마 버전으로 갱신
+        
+        보조 인덱스는 버전과 관계없이 없는 것만 만듭니다
+        (대량 가져오기가 중간에 멈춰 인덱스가 지워진 채 남은 경우 포함).
+        
+        Args:
+            cursor: 데이터베이스 커서
+        """
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+        
+        if version < SCHEMA_VERSION:
+            print(f"데이터베이스 스키마 갱신: 버전 {version} → {SCHEMA_VERSION}")
+        self._create_indexes(cursor)
+        
+        # 통계 트리거가 없던 동안(이전 버전, 중단된 대량 가져오기)의 변경은 카운터를 다시 계산해 반영
+        if self._create_statistics_triggers(cursor):
+            self._rebuild_statistics(cursor)
+        
+        # 이미 저장된 파일을 검색 색인에 추가
+        if version < 2:
+            indexed = self._index_search_text(cursor)
+            if indexed:
+                print(f"전문 검색 색인 생성: {indexed}개 파일")
+        elif version < 3:
+            cursor.execute('DROP TRIGGER IF EXISTS files_fts_delete')
             cursor.execute('''
-            CREATE TABLE IF NOT EXISTS files (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                repo_id INTEGER,
-                name TEXT NOT NULL,
-                path TEXT NOT NULL,
-                url TEXT NOT NULL,
-                local_path TEXT NOT NULL,
-                quality_score REAL,
-                code_lines INTEGER,
-                is_suitable INTEGER,
-                unsuitable_reason TEXT,
-                complexity_avg REAL,
-                complexity_max INTEGER,
-                function_count INTEGER,
-                downloaded_at TEXT,
-                FOREIGN KEY (repo_id) REFERENCES repositories (id),
-                UNIQUE (repo_id, path)
-            )
+            INSERT INTO files_trigram (rowid, content) SELECT rowid, content FROM files_fts
             ''')
-            
-            # 태그 테이블 생성
+            print(f"트라이그램 색인 생성: {cursor.rowcount}개 파일")
+        
+        # 길이 제한으로 잘린 채 색인된 파일 표시
+        if 2 <= version < 5:
             cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tags (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE
-            )
-            ''')
+            UPDATE files SET search_truncated = 1
+            WHERE id IN (SELECT rowid FROM files_fts WHERE length(content) >= ?)
+            ''', (SEARCH_CONTENT_LIMIT,))
+        
+        if version < SCHEMA_VERSION:
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    
+    def _create_indexes(self, cursor):
+        """
+        보조 인덱스 생성 (이미 있으면 건너뜀)
+        
+        Args:
+            cursor: 데이터베이스 커서
+        """
+        for name, definition in SECONDARY_INDEXES:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {definition}')
+    
+    def _create_statistics_triggers(self, cursor):
+        """
+        통계 카운터 갱신 트리거 생성 (이미 있으면 건너뜀)
+        
+        Args:
+            cursor: 데이터베이스 커서
             
-            # 파일-태그 관계 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS file_tags (
-                file_id INTEGER,
-                tag_id INTEGER,
-                PRIMARY KEY (file_id, tag_id),
-                FOREIGN KEY (file_id) REFERENCES files (id),
-                FOREIGN KEY (tag_id) REFERENCES tags (id)
-            )
-            ''')
+        Returns:
+            int: 새로 만든 트리거 수 (0이 아니면 카운터를 다시 계산해야 함)
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {row[0] for row in cursor.fetchall()}
+        created = 0
+        for name, definition in STATISTICS_TRIGGERS.items():
+            if name not in existing:
+                cursor.execute(f'CREATE TRIGGER {name} {definition}')
+                created += 1
+        return created
+    
+    def _drop_statistics_triggers(self, cursor):
+        """
+        통계 카운터 갱신 트리거 삭제 (대량 가져오기 전, 끝나면 다시 만들고 카운터를 다시 계산)
+        
+        Args:
+            cursor: 데이터베이스 커서
+        """
+        for name in STATISTICS_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    
+    def _rebuild_statistics(self, cursor):
+        """
+        통계 카운터와 저장소/태그별 파일 수를 테이블 전체 집계로 다시 계산
+        
+        Args:
+            cursor: 데이터베이스 커서
+        """
+        counters = []
+        for name, sql in STATISTICS_QUERIES.items():
+            cursor.execute(sql)
+            counters.append((name, cursor.fetchone()[0]))
+        for sql in STATISTICS_GROUP_QUERIES.values():
+            cursor.execute(sql)
+            counters.extend(cursor.fetchall())
+        
+        cursor.execute('DELETE FROM statistics_counters')
+        cursor.executemany('INSERT INTO statistics_counters (name, value) VALUES (?, ?)', counters)
+        cursor.execute('''
+        UPDATE repositories SET file_count = (SELECT COUNT(*) FROM files WHERE repo_id = repositories.id)
+        ''')
+        cursor.execute('''
+        UPDATE tags SET file_count = (SELECT COUNT(*) FROM file_tags WHERE tag_id = tags.id)
+        ''')
+    
+    def rebuild_statistics(self):
+        """
+        통계 카운터를 테이블 전체 집계로 다시 계산 (트리거 밖에서 직접 수정한 경우 등)
+        
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            with self.pool.connection() as conn:
+                self._rebuild_statistics(conn.cursor())
+            return True
+        except Exception as e:
+            print(f"통계 다시 계산 오류: {str(e)}")
+            return False
+    
+    def _index_search_text(self, cursor, file_ids=None):
+        """
+        파일의 저장소 이름, 경로, 파일명, 소스 코드를 전문 검색 색인과 트라이그램 색인에 반영
+        
+        Args:
+            cursor: 데이터베이스 커서
+            file_ids (list, optional): 다시 색인할 파일 ID 목록 (None이면 모든 파일)
             
-            conn.commit()
-            conn.close()
-            print("데이터베이스 초기화 완료")
+        Returns:
+            int: 색인한 파일 수
+        """
+        if file_ids is None:
+            cursor.execute('SELECT id FROM files')
+            file_ids = [row[0] for row in cursor.fetchall()]
+        
+        for start in range(0, len(file_ids), SEARCH_INDEX_BATCH):
+            chunk = file_ids[start:start + SEARCH_INDEX_BATCH]
+            placeholders = ', '.join(['?'] * len(chunk))
+            cursor.execute(f'''
+            SELECT f.id, r.full_name, f.path, f.name, f.local_path
+            FROM files f
+            LEFT JOIN repositories r ON f.repo_id = r.id
+            WHERE f.id IN ({placeholders})
+            ''', chunk)
+            rows = [
+                (file_id, repo_name, path, name, self._read_search_text(local_path))
+                for file_id, repo_name, path, name, local_path in cursor.fetchall()
+            ]
+            # 트라이그램 색인은 이전 내용으로 지운 뒤 새 내용으로 다시 추가
+            cursor.execute(f'''
+            INSERT INTO files_trigram (files_trigram, rowid, content)
+            SELECT 'delete', rowid, content FROM files_fts WHERE rowid IN ({placeholders})
+            ''', chunk)
+            cursor.execute(f'DELETE FROM files_fts WHERE rowid IN ({placeholders})', chunk)
+            cursor.executemany('''
+            INSERT INTO files_fts (rowid, repo_name, path, name, content) VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+            cursor.executemany('INSERT INTO files_trigram (rowid, content) VALUES (?, ?)',
+                               [(row[0], row[4]) for row in rows])
+            # 길이 제한까지 채운 내용은 잘렸을 수 있으므로 표시 (정규식 검색이 원본을 읽음)
+            cursor.execute(f'''
+            UPDATE files SET search_truncated = 0 WHERE id IN ({placeholders}) AND search_truncated = 1
+            ''', chunk)
+            cursor.executemany('UPDATE files SET search_truncated = 1 WHERE id = ?',
+                               [(row[0],) for row in rows if len(row[4]) >= SEARCH_CONTENT_LIMIT])
+        
+        return len(file_ids)
+    
+    def _read_search_text(self, local_path):
+        """
+        전문 검색 색인에 넣을 소스 코드 읽기
+        
+        Args:
+            local_path (str): 로컬 파일 경로 또는 묶음 저장소 참조
             
+        Returns:
+            str: 소스 코드 (파일이 없거나 읽을 수 없으면 빈 문자열)
+        """
+        try:
+            if is_blob_ref(local_path):
+                return read_source(local_path)[:SEARCH_CONTENT_LIMIT]
+            with open(local_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(SEARCH_CONTENT_LIMIT)
+        except (OSError, TypeError):
+            return ''
+    
+    def update_search_index(self, file_ids=None):
+        """
+        파일 내용이 바뀐 뒤 전문 검색 색인과 트라이그램 색인 갱신
+        
+        Args:
+            file_ids (list, optional): 다시 색인할 파일 ID 목록 (None이면 모든 파일)
+            
+        Returns:
+            int: 색인한 파일 수
+        """
+        try:
+            with self.pool.connection() as conn:
+                return self._index_search_text(conn.cursor(), file_ids)
         except Exception as e:
-            print(f"데이터베이스 초기화 오류: {str(e)}")
+            print(f"전문 검색 색인 갱신 오류: {str(e)}")
+            return 0
+    
+    def _drop_indexes(self, cursor):
+        """
+        보조 인덱스 삭제 (대량 가져오기 전)
+        
+        Args:
+            cursor: 데이터베이스 커서
+        """
+        for name, _ in SECONDARY_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS {name}')
     
-    def import_from_metadata(self):
+    def import_from_metadata(self, batch_size=IMPORT_BATCH_SIZE, defer_indexes=False, prune=False):
         """
         메타데이터 파일에서 데이터베이스로 데이터 가져오기
         
+        메타데이터를 앞에서부터 읽으며 batch_size개씩 한 트랜잭션으로 일괄 반영합니다.
+        저장소와 파일 ID는 메모리에 두고 조회하므로 항목마다 SELECT를 하지 않습니다.
+        항목마다 동기화 해시(지표와 내용 해시의 요약)를 저장해 두고, 해시가 바뀐
+        항목만 갱신(upsert)하므로 변경되지 않은 항목에는 쓰기가 일어나지 않습니다.
+        결과는 import_stats에도 기록되며, 가져오기에 실패하면 import_stats는 None입니다
+        (실패 전에 커밋된 묶음은 남지만 같은 항목을 다시 가져와도 결과는 같음).
+        
+        Args:
+            batch_size (int): 한 트랜잭션에서 처리할 항목 수
+            defer_indexes (bool): 가져오는 동안 보조 인덱스를 지웠다가 마지막에 다시 생성
+                (처음 가져오기처럼 대량으로 추가할 때 유리)
+            prune (bool): 메타데이터에 없는 파일을 데이터베이스에서 삭제
+        
         Returns:
-            tuple: (가져온 저장소 수, 가져온 파일 수)
+            tuple: (새로 추가한 저장소 수, 새로 추가한 파일 수)
         """
+        self.import_stats = None
         if not os.path.exists(self.metadata_file):
             print(f"메타데이터 파일이 존재하지 않습니다: {self.metadata_file}")
             return 0, 0
             
+        start_time = time.time()
+        stats = {'repositories': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'items': 0}
         try:
-            # 메타데이터 로드
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
                 
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+                # 기존 저장소/파일 색인 (저장소는 갱신 여부 비교용 값 포함)
+                repos = {
+                    row[0]: (row[1], tuple(row[2:]))
+                    for row in cursor.execute('SELECT full_name, id, name, url, stars, license FROM repositories')
+                }
+                files = {
+                    (repo_id, path): (file_id, sync_hash)
+                    for file_id, repo_id, path, sync_hash in cursor.execute(
+                        'SELECT id, repo_id, path, sync_hash FROM files')
+                }
+                seen = set()
+                
+                if defer_indexes:
+                    self._drop_indexes(cursor)
+                    # 정확 중복 카운터 트리거는 정규화 해시 인덱스가 필요하므로 함께 멈춤
+                    self._drop_statistics_triggers(cursor)
+                
+                now = datetime.now().isoformat()
+                batch = []
+                for item in iter_metadata(self.metadata_file):
+                    if not item.get('repo_full_name'):
+                        continue
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        self._import_batch(cursor, batch, repos, files, seen, now, stats)
+                        conn.commit()
+                        batch = []
+                
+                if batch:
+                    self._import_batch(cursor, batch, repos, files, seen, now, stats)
+                
+                # 메타데이터에서 사라진 파일 삭제
+                if prune:
+                    removed = [file_id for key, (file_id, _) in files.items() if key not in seen]
+                    self._delete_files(cursor, removed)
+                    stats['deleted'] = len(removed)
+                
+                if defer_indexes:
+                    self._create_indexes(cursor)
+                    self._create_statistics_triggers(cursor)
+                    self._rebuild_statistics(cursor)
+            
+            stats['seconds'] = time.time() - start_time
+            self.import_stats = stats
+            rate = stats['items'] / stats['seconds'] if stats['seconds'] > 0 else 0
+            print(f"메타데이터 가져오기 완료: {stats['repositories']}개 저장소, {stats['inserted']}개 파일 추가, "
+                  f"{stats['updated']}개 갱신, {stats['unchanged']}개 변경 없음, {stats['deleted']}개 삭제 "
+                  f"(항목 {stats['items']}개, {stats['seconds']:.2f}초, 초당 {rate:,.0f}개)")
+            return stats['repositories'], stats['inserted']
             
-            repo_count = 0
-            file_count = 0
+        except Exception as e:
+            print(f"메타데이터 가져오기 오류: {str(e)}")
+            if defer_indexes:
+                # 중간에 실패해도 인덱스 없이 남지 않도록 다시 생성
+                with self.pool.connection() as conn:
+                    cursor = conn.cursor()
+                    self._create_indexes(cursor)
+                    if self._create_statistics_triggers(cursor):
+                        self._rebuild_statistics(cursor)
+            return 0, 0
+    
+    def _sync_hash(self, item):
+        """
+        데이터베이스에 저장되는 항목 값의 요약 해시
+        
+        Args:
+            item (dict): 메타데이터 항목
             
-            # 저장소 및 파일 정보 가져오기
-            for item in metadata:
-                # 저장소 정보 추출
-                repo_name = item.get('repo_name')
-                repo_full_name = item.get('repo_full_name')
-                
-                if not repo_full_name:
-                    continue
-                    
-                # 저장소 정보 삽입 또는 업데이트
+        Returns:
+            str: 동기화 해시
+        """
+        values = [item.get(field) for field in SYNC_FIELDS]
+        encoded = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:32]
+    
+    def _import_batch(self, cursor, batch, repos, files, seen, now, stats):
+        """
+        메타데이터 항목 묶음 중 새로 추가되거나 바뀐 항목만 일괄 반영
+        
+        Args:
+            cursor: 데이터베이스 커서
+            batch (list): 메타데이터 항목 목록
+            repos (dict): 저장소 전체 이름 -> (저장소 ID, 저장소 값) (새 저장소가 추가됨)
+            files (dict): (저장소 ID, 파일 경로) -> (파일 ID, 동기화 해시) (반영 결과로 갱신됨)
+            seen (set): 메타데이터에 있는 (저장소 ID, 파일 경로) (이번 묶음이 추가됨)
+            now (str): 다운로드 시각이 없는 항목에 기록할 시각
+            stats (dict): 갱신할 가져오기 통계
+        """
+        # 새 저장소는 삽입, 정보가 바뀐 저장소는 갱신
+        for item in batch:
+            full_name = item['repo_full_name']
+            values = (item.get('repo_name'), item.get('repo_url'), item.get('repo_stars', 0),
+                      item.get('repo_license'))
+            known = repos.get(full_name)
+            if known is None:
                 cursor.execute('''
-                INSERT OR IGNORE INTO repositories 
-                (name, full_name, url, stars, license, added_at)
+                INSERT INTO repositories 
+                (name, url, stars, license, full_name, added_at)
                 VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    repo_name,
-                    repo_full_name,
-                    item.get('repo_url'),
-                    item.get('repo_stars', 0),
-                    item.get('repo_license'),
-                    datetime.now().isoformat()
-                ))
-                
-                if cursor.rowcount > 0:
-                    repo_count += 1
-                
-                # 저장소 ID 가져오기
-                cursor.execute('SELECT id FROM repositories WHERE full_name = ?', (repo_full_name,))
-                repo_id = cursor.fetchone()[0]
-                
-                # 파일 정보 삽입 또는 업데이트
+                ''', values + (full_name, now))
+                repos[full_name] = (cursor.lastrowid, values)
+                stats['repositories'] += 1
+            elif known[1] != values:
+                cursor.execute('UPDATE repositories SET name = ?, url = ?, stars = ?, license = ? WHERE id = ?',
+                               values + (known[0],))
+                repos[full_name] = (known[0], values)
+        
+        # 동기화 해시가 바뀐 파일만 upsert
+        changed = {}
+        for item in batch:
+            key = (repos[item['repo_full_name']][0], item.get('file_path'))
+            seen.add(key)
+            sync_hash = self._sync_hash(item)
+            known = files.get(key)
+            if known is not None and known[1] == sync_hash:
+                stats['unchanged'] += 1
+                continue
+            # 같은 파일이 여러 번 나오면 마지막 항목 기준
+            changed[key] = (item, sync_hash)
+        stats['items'] += len(batch)
+        if not changed:
+            return
+        
+        rows = []
+        for (repo_id, _), (item, sync_hash) in changed.items():
+            complexity = item.get('complexity') or {}
+            rows.append((
+                repo_id,
+                item.get('file_name'),
+                item.get('file_path'),
+                item.get('file_url'),
+                item.get('local_path'),
+                item.get('quality_score'),
+                item.get('code_lines'),
+                1 if item.get('is_suitable') else 0,
+                item.get('unsuitable_reason'),
+                complexity.get('avg_complexity'),
+                complexity.get('max_complexity'),
+                complexity.get('function_count'),
+                item.get('downloaded_at', now),
+                item.get('evaluation_tier'),
+                item.get('prescreen_reason'),
+                item.get('analysis_status'),
+                item.get('normalized_hash'),
+                item.get('content_hash'),
+                sync_hash
+            ))
+        
+        # ID는 계속 증가하므로 반영 전 최대 ID 이후의 행이 이번에 추가된 파일
+        # (다운로드 시각은 처음 가져온 값을 유지)
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM files')
+        last_id = cursor.fetchone()[0]
+        cursor.executemany('''
+        INSERT INTO files 
+        (repo_id, name, path, url, local_path, quality_score, code_lines, 
+        is_suitable, unsuitable_reason, complexity_avg, complexity_max, 
+        function_count, downloaded_at, evaluation_tier, prescreen_reason,
+        analysis_status, normalized_hash, content_hash, sync_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (repo_id, path) DO UPDATE SET
+            name = excluded.name,
+            url = excluded.url,
+            local_path = excluded.local_path,
+            quality_score = excluded.quality_score,
+            code_lines = excluded.code_lines,
+            is_suitable = excluded.is_suitable,
+            unsuitable_reason = excluded.unsuitable_reason,
+            complexity_avg = excluded.complexity_avg,
+            complexity_max = excluded.complexity_max,
+            function_count = excluded.function_count,
+            evaluation_tier = excluded.evaluation_tier,
+            prescreen_reason = excluded.prescreen_reason,
+            analysis_status = excluded.analysis_status,
+            normalized_hash = excluded.normalized_hash,
+            content_hash = excluded.content_hash,
+            sync_hash = excluded.sync_hash,
+            sync_dirty = 0
+        ''', rows)
+        
+        inserted = 0
+        cursor.execute('SELECT id, repo_id, path FROM files WHERE id > ?', (last_id,))
+        for file_id, repo_id, path in cursor.fetchall():
+            files[(repo_id, path)] = (file_id, None)
+            inserted += 1
+        stats['inserted'] += inserted
+        stats['updated'] += len(changed) - inserted
+        
+        # 비밀 정보 검사 결과, pylint 메시지 통계, 전문 검색 색인도 바뀐 파일만 교체
+        secret_entries = []
+        lint_entries = []
+        symbol_entries = []
+        changed_ids = []
+        for key, (item, sync_hash) in changed.items():
+            file_id = files[key][0]
+            files[key] = (file_id, sync_hash)
+            changed_ids.append(file_id)
+            if 'has_secrets' in item:
+                secret_entries.append((file_id, item))
+            if 'lint_messages' in item:
+                lint_entries.append((file_id, item.get('lint_messages')))
+            if 'symbols' in item:
+                symbol_entries.append((file_id, item))
+        self._store_secret_findings(cursor, secret_entries)
+        self._store_lint_messages(cursor, lint_entries)
+        self._store_symbols(cursor, symbol_entries)
+        self._index_search_text(cursor, changed_ids)
+    
+    def _delete_files(self, cursor, file_ids):
+        """
+        파일과 파일에 딸린 태그, 탐지 결과, 심볼, 서명, 임베딩, 판정 결과 삭제
+        
+        Args:
+            cursor: 데이터베이스 커서
+            file_ids (list): 삭제할 파일 ID 목록
+        """
+        params = [(file_id,) for file_id in file_ids]
+        for table in ('file_tags', 'secret_findings', 'file_lint_messages', 'file_symbols',
+                      'file_imports', 'file_signatures', 'file_embeddings', 'profile_results'):
+            cursor.executemany(f'DELETE FROM {table} WHERE file_id = ?', params)
+        # 삭제된 파일을 대표로 가리키던 유사 중복 표시는 해제
+        cursor.executemany('''
+        UPDATE files SET duplicate_of = NULL, duplicate_similarity = NULL WHERE duplicate_of = ?
+        ''', params)
+        cursor.executemany('DELETE FROM files WHERE id = ?', params)
+    
+    def delete_files(self, file_ids):
+        """
+        파일 정보와 파일에 딸린 데이터를 데이터베이스에서 삭제 (로컬 파일은 그대로 둠)
+        
+        Args:
+            file_ids (list): 삭제할 파일 ID 목록
+            
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            with self.pool.connection() as conn:
+                self._delete_files(conn.cursor(), file_ids)
+            return True
+        except Exception as e:
+            print(f"파일 삭제 오류: {str(e)}")
+            return False
+    
+    def get_sync_state(self):
+        """
+        마지막 동기화 기록 조회
+        
+        Returns:
+            dict: 동기화 상태 (메타데이터 워터마크, 동기화 시각 등)
+        """
+        try:
+            with self.pool.connection() as conn:
+                return dict(conn.execute('SELECT name, value FROM sync_state'))
+        except Exception as e:
+            print(f"동기화 상태 조회 오류: {str(e)}")
+            return {}
+    
+    def _metadata_watermark(self):
+        """
+        메타데이터 파일 변경 감지용 워터마크 (수정 시각과 크기)
+        
+        Returns:
+            str: 워터마크 (파일이 없으면 None)
+        """
+        try:
+            stat = os.stat(self.metadata_file)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def sync_metadata(self, full=False, batch_size=IMPORT_BATCH_SIZE, defer_indexes=False):
+        """
+        메타데이터와 데이터베이스의 변경분만 양방향 동기화
+        
+        메타데이터 파일이 마지막 동기화 이후 바뀌었으면 바뀐 항목만 가져오고 사라진
+        파일은 삭제합니다. 데이터베이스에서 재판정으로 바뀐 적합성은 해당 항목만
+        메타데이터에 반영합니다. 동기화가 끝나면 메타데이터 워터마크를 기록합니다.
+        
+        Args:
+            full (bool): 워터마크와 관계없이 모든 항목 비교
+            batch_size (int): 한 트랜잭션에서 처리할 항목 수
+            defer_indexes (bool): 가져오는 동안 보조 인덱스를 지웠다가 마지막에 다시 생성
+            
+        Returns:
+            dict: 동기화 결과 (가져오기 통계, 내보낸 항목 수, 가져오기 생략 여부, 실패 여부)
+        """
+        watermark = self._metadata_watermark()
+        if watermark is None:
+            print(f"메타데이터 파일이 존재하지 않습니다: {self.metadata_file}")
+            return {'imported': None, 'exported': 0, 'skipped': True, 'failed': False}
+        
+        result = {'imported': None, 'exported': 0, 'skipped': False, 'failed': False}
+        if full or self.get_sync_state().get('metadata_watermark') != watermark:
+            self.import_from_metadata(batch_size=batch_size, defer_indexes=defer_indexes, prune=True)
+            if self.import_stats is None:
+                # 워터마크를 남기지 않아 다음 동기화에서 모든 항목을 다시 비교
+                print("메타데이터 가져오기 실패: 동기화 중단")
+                result['failed'] = True
+                return result
+            result['imported'] = self.import_stats
+        else:
+            result['skipped'] = True
+            print("메타데이터 변경 없음: 가져오기 생략")
+        
+        result['exported'] = self.export_changes_to_metadata()
+        if result['exported']:
+            # 방금 쓴 메타데이터는 이미 데이터베이스와 같으므로 다시 가져오지 않음
+            watermark = self._metadata_watermark()
+        
+        with self.pool.connection() as conn:
+            conn.executemany('INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)', [
+                ('metadata_watermark', watermark),
+                ('synced_at', datetime.now().isoformat())
+            ])
+        return result
+    
+    def export_changes_to_metadata(self):
+        """
+        데이터베이스에서 바뀐 적합성 판정만 메타데이터 파일에 반영
+        
+        재판정 등으로 데이터베이스에서 바뀐 행만 메타데이터 항목에 덮어쓰며,
+        바뀐 행이 없으면 메타데이터 파일을 다시 쓰지 않습니다.
+        
+        Returns:
+            int: 반영한 항목 수
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                SELECT f.id, r.full_name, f.path, f.is_suitable, f.unsuitable_reason
+                FROM files f
+                JOIN repositories r ON f.repo_id = r.id
+                WHERE f.sync_dirty = 1
+                ''')
+                dirty = {(full_name, path): (file_id, is_suitable, reason)
+                         for file_id, full_name, path, is_suitable, reason in cursor.fetchall()}
+                if not dirty:
+                    return 0
+                
+                with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                
+                updates = []
+                for item in metadata:
+                    row = dirty.get((item.get('repo_full_name'), item.get('file_path')))
+                    if row is None:
+                        continue
+                    file_id, is_suitable, reason = row
+                    item['is_suitable'] = bool(is_suitable)
+                    item['unsuitable_reason'] = reason
+                    updates.append((self._sync_hash(item), file_id))
+                
+                with open(self.metadata_file, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, indent=2)
+                
+                # 메타데이터에 없어 반영하지 못한 행도 다음 가져오기에서 정리되므로 표시 해제
+                cursor.executemany('UPDATE files SET sync_hash = ?, sync_dirty = 0 WHERE id = ?', updates)
+                cursor.executemany('UPDATE files SET sync_dirty = 0 WHERE id = ?',
+                                   [(row[0],) for row in dirty.values()])
+            
+            print(f"메타데이터에 판정 변경 반영 완료: {len(updates)}개 항목")
+            return len(updates)
+            
+        except Exception as e:
+            print(f"메타데이터 변경 반영 오류: {str(e)}")
+            return 0
+    
+    def _store_secret_findings(self, cursor, entries):
+        """
+        파일들의 비밀 정보 검사 결과 저장
+        
+        Args:
+            cursor: 데이터베이스 커서
+            entries (list): (파일 ID, 메타데이터 항목) 목록
+        """
+        cursor.executemany('UPDATE files SET has_secrets = ? WHERE id = ?', [
+            (1 if item.get('has_secrets') else 0, file_id) for file_id, item in entries
+        ])
+        cursor.executemany('DELETE FROM secret_findings WHERE file_id = ?',
+                           [(file_id,) for file_id, _ in entries])
+        cursor.executemany('''
+        INSERT INTO secret_findings (file_id, rule, line, masked, entropy)
+        VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (file_id, finding.get('rule'), finding.get('line'), finding.get('masked'), finding.get('entropy'))
+            for file_id, item in entries
+            for finding in item.get('secret_findings') or []
+        ])
+    
+    def _store_lint_messages(self, cursor, entries):
+        """
+        파일들의 pylint 메시지 발생 횟수 저장
+        
+        Args:
+            cursor: 데이터베이스 커서
+            entries (list): (파일 ID, 메시지 ID별 심볼과 발생 횟수) 목록
+                (발생 횟수가 None이면 pylint를 실행하지 않은 파일)
+        """
+        cursor.executemany('DELETE FROM file_lint_messages WHERE file_id = ?',
+                           [(file_id,) for file_id, _ in entries])
+        cursor.executemany('''
+        INSERT INTO file_lint_messages (file_id, msg_id, symbol, count)
+        VALUES (?, ?, ?, ?)
+        ''', [
+            (file_id, msg_id, entry.get('symbol'), entry.get('count', 0))
+            for file_id, lint_messages in entries
+            for msg_id, entry in (lint_messages or {}).items()
+        ])
+        cursor.executemany('UPDATE files SET lint_message_total = ? WHERE id = ?', [
+            (None if lint_messages is None else sum(entry.get('count', 0) for entry in lint_messages.values()),
+             file_id)
+            for file_id, lint_messages in entries
+        ])
+    
+    def _store_symbols(self, cursor, entries):
+        """
+        파일들의 정의와 가져온 모듈 저장 (기존 기록은 교체)
+        
+        Args:
+            cursor: 데이터베이스 커서
+            entries (list): (파일 ID, 메타데이터 항목) 목록
+                (symbols가 None이면 구문 분석에 실패해 추출하지 못한 파일)
+        """
+        params = [(file_id,) for file_id, _ in entries]
+        cursor.executemany('DELETE FROM file_symbols WHERE file_id = ?', params)
+        cursor.executemany('DELETE FROM file_imports WHERE file_id = ?', params)
+        cursor.executemany('''
+        INSERT INTO file_symbols
+        (file_id, name, reversed_name, qualname, kind, signature, line, end_line)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (file_id, symbol['name'], symbol['name'][::-1], symbol.get('qualname', symbol['name']),
+             symbol.get('kind'), symbol.get('signature'), symbol.get('line'), symbol.get('end_line'))
+            for file_id, item in entries
+            for symbol in item.get('symbols') or []
+        ])
+        cursor.executemany('INSERT OR IGNORE INTO file_imports (file_id, module) VALUES (?, ?)', [
+            (file_id, module)
+            for file_id, item in entries
+            for module in item.get('imports') or []
+        ])
+        cursor.executemany('UPDATE files SET symbol_count = ? WHERE id = ?', [
+            (None if item.get('symbols') is None else len(item['symbols']), file_id)
+            for file_id, item in entries
+        ])
+    
+    def _symbol_query(self, pattern, kind=None, limit=100):
+        """
+        심볼 검색 SQL 생성 (인자는 find_symbols와 같음)
+        
+        Returns:
+            tuple: (SQL 문, 매개변수 목록)
+        """
+        conditions = []
+        params = []
+        
+        # 와일드카드 앞의 고정 부분은 이름 인덱스 범위로, '*'로 시작하면 뒤집은 이름 범위로 찾음
+        prefix = re.split(r'[*?\[]', pattern, maxsplit=1)[0]
+        if prefix == pattern:
+            conditions.append('s.name = ?')
+            params.append(pattern)
+        else:
+            if prefix:
+                conditions.append('s.name >= ? AND s.name < ?')
+                params.extend([prefix, prefix + '\U0010ffff'])
+            else:
+                suffix = re.split(r'[*?\]]', pattern)[-1]
+                if suffix:
+                    conditions.append('s.reversed_name >= ? AND s.reversed_name < ?')
+                    params.extend([suffix[::-1], suffix[::-1] + '\U0010ffff'])
+            conditions.append('s.name GLOB ?')
+            params.append(pattern)
+        
+        # 비동기 여부와 관계없이 찾도록 async_ 종류도 포함
+        if kind:
+            conditions.append('s.kind IN (?, ?)')
+            params.extend([kind, f'async_{kind}'])
+        
+        sql = f'''
+        SELECT s.file_id, r.full_name as repo_name, f.path, s.name, s.qualname, s.kind,
+               s.signature, s.line, s.end_line
+        FROM file_symbols s
+        JOIN files f ON f.id = s.file_id
+        JOIN repositories r ON r.id = f.repo_id
+        WHERE {' AND '.join(conditions)}
+        LIMIT ?
+        '''
+        params.append(limit)
+        return sql, params
+    
+    def find_symbols(self, pattern, kind=None, limit=100):
+        """
+        이름으로 정의(클래스, 함수, 메서드) 찾기
+        
+        Args:
+            pattern (str): 이름 또는 GLOB 패턴 (대소문자 구분, 예: 'Parser', 'Parse*', '*Parser')
+            kind (str, optional): 종류 (class, function, method)
+            limit (int, optional): 최대 결과 수
+            
+        Returns:
+            list: 파일 ID, 저장소, 경로, 이름, qualname, 종류, 시그니처, 시작/끝 줄 목록
+        """
+        try:
+            sql, params = self._symbol_query(pattern, kind=kind, limit=limit)
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(sql, params)
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"심볼 검색 오류: {str(e)}")
+            return []
+    
+    def _importer_query(self, module, limit=100):
+        """
+        모듈을 가져오는 파일 검색 SQL 생성 (인자는 find_importers와 같음)
+        
+        Returns:
+            tuple: (SQL 문, 매개변수 목록)
+        """
+        # 하위 모듈(예: asyncio.subprocess)은 'asyncio.' 이상 'asyncio/' 미만 범위
+        sql = '''
+        SELECT i.file_id, r.full_name as repo_name, f.path, i.module
+        FROM file_imports i
+        JOIN files f ON f.id = i.file_id
+        JOIN repositories r ON r.id = f.repo_id
+        WHERE i.module = ? OR (i.module > ? AND i.module < ?)
+        LIMIT ?
+        '''
+        return sql, [module, module + '.', module + '/', limit]
+    
+    def find_importers(self, module, limit=100):
+        """
+        모듈(하위 모듈 포함)을 가져오는 파일 찾기
+        
+        Args:
+            module (str): 모듈 이름 (예: 'asyncio', 'os.path')
+            limit (int, optional): 최대 결과 수
+            
+        Returns:
+            list: 파일 ID, 저장소, 경로, 가져온 모듈 이름 목록
+        """
+        try:
+            sql, params = self._importer_query(module, limit=limit)
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(sql, params)
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"모듈 가져오기 검색 오류: {str(e)}")
+            return []
+    
+    def find_similar(self, file_id=None, content=None, limit=10, exact=False):
+        """
+        파일 또는 코드 조각과 내용이 유사한 파일 찾기 (update_embeddings/build_index로 만든 색인 사용)
+        
+        Args:
+            file_id (int, optional): 기준 파일 ID
+            content (str, optional): 기준 코드 조각 (file_id가 없을 때 사용)
+            limit (int, optional): 최대 결과 수
+            exact (bool, optional): True이면 근사 검색 대신 모든 파일과 비교
+            
+        Returns:
+            list: 유사도 내림차순 결과 목록
+        """
+        return CodeEmbedder(self.db_file).find_similar(
+            file_id=file_id, content=content, limit=limit, exact=exact
+        )
+    
+    def get_lint_messages(self, file_id):
+        """
+        파일의 pylint 메시지 발생 횟수 조회
+        
+        Args:
+            file_id (int): 파일 ID
+            
+        Returns:
+            list: 메시지 ID, 심볼, 발생 횟수 목록 (많이 발생한 순)
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute('''
+                SELECT msg_id, symbol, count
+                FROM file_lint_messages
+                WHERE file_id = ?
+                ORDER BY count DESC, msg_id
+                ''', (file_id,))
+                messages = [dict(row) for row in cursor.fetchall()]
+            
+            return messages
+            
+        except Exception as e:
+            print(f"pylint 메시지 조회 오류: {str(e)}")
+            return []
+    
+    def _lint_message_condition(self, identifier):
+        """
+        pylint 메시지 식별자를 file_lint_messages 조회 조건으로 변환
+        
+        메시지 ID(W0611), 심볼(unused-import), 분류(warning 또는 W)를 모두 받으며,
+        각각 인덱스를 탈 수 있는 조건으로 바꿉니다.
+        
+        Args:
+            identifier (str): 메시지 식별자
+            
+        Returns:
+            tuple: (SQL 조건, 매개변수 목록)
+        """
+        identifier = identifier.strip()
+        letter = LINT_CATEGORIES.get(identifier.lower())
+        if letter is None and len(identifier) == 1 and identifier.upper() in LINT_CATEGORIES.values():
+            letter = identifier.upper()
+        if letter is not None:
+            # 같은 분류의 메시지 ID는 'W0000' 이상 'X' 미만 범위에 모여 있음
+            return 'msg_id >= ? AND msg_id < ?', [letter, chr(ord(letter) + 1)]
+        if len(identifier) == 5 and identifier[0].upper() in LINT_CATEGORIES.values() \
+                and identifier[1:].isdigit():
+            return 'msg_id = ?', [identifier.upper()]
+        return 'symbol = ?', [identifier]
+    
+    def get_secret_findings(self, file_id):
+        """
+        파일의 비밀 정보 탐지 결과 조회
+        
+        Args:
+            file_id (int): 파일 ID
+            
+        Returns:
+            list: 탐지 결과 목록 (규칙, 라인, 가려진 값, 엔트로피)
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
                 cursor.execute('''
-                INSERT OR IGNORE INTO files 
-                (repo_id, name, path, url, local_path, quality_score, code_lines, 
-                is_suitable, unsuitable_reason, complexity_avg, complexity_max, 
-                function_count, downloaded_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    repo_id,
-                    item.get('file_name'),
-                    item.get('file_path'),
-                    item.get('file_url'),
-                    item.get('local_path'),
-                    item.get('quality_score'),
-                    item.get('code_lines'),
-                    1 if item.get('is_suitable') else 0,
-                    item.get('unsuitable_reason'),
-                    item.get('complexity', {}).get('avg_complexity'),
-                    item.get('complexity', {}).get('max_complexity'),
-                    item.get('complexity', {}).get('function_count'),
-                    item.get('downloaded_at', datetime.now().isoformat())
-                ))
-                
-                if cursor.rowcount > 0:
-                    file_count += 1
-            
-            conn.commit()
-            conn.close()
+                SELECT rule, line, masked, entropy
+                FROM secret_findings
+                WHERE file_id = ?
+                ORDER BY line
+                ''', (file_id,))
+                findings = [dict(row) for row in cursor.fetchall()]
             
-            print(f"메타데이터 가져오기 완료: {repo_count}개 저장소, {file_count}개 파일")
-            return repo_count, file_count
+            return findings
             
         except Exception as e:
-            print(f"메타데이터 가져오기 오류: {str(e)}")
-            return 0, 0
+            print(f"비밀 정보 탐지 결과 조회 오류: {str(e)}")
+            return []
     
     def export_to_metadata(self):
         """
@@ -201,41 +1607,75 @@ class CodeStorageManager:
             int: 내보낸 파일 수
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 저장소 및 파일 정보 조회
-            cursor.execute('''
-            SELECT 
-                r.name as repo_name, 
-                r.full_name as repo_full_name,
-                r.url as repo_url,
-                r.stars as repo_stars,
-                r.license as repo_license,
-                f.name as file_name,
-                f.path as file_path,
-                f.url as file_url,
-                f.local_path,
-                f.quality_score,
-                f.code_lines,
-                f.is_suitable,
-                f.unsuitable_reason,
-                f.complexity_avg,
-                f.complexity_max,
-                f.function_count,
-                f.downloaded_at
-            FROM files f
-            JOIN repositories r ON f.repo_id = r.id
-            ''')
-            
-            rows = cursor.fetchall()
-            conn.close()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                
+                # 저장소 및 파일 정보 조회
+                cursor.execute('''
+                SELECT 
+                    f.id as file_id,
+                    r.name as repo_name, 
+                    r.full_name as repo_full_name,
+                    r.url as repo_url,
+                    r.stars as repo_stars,
+                    r.license as repo_license,
+                    f.name as file_name,
+                    f.path as file_path,
+                    f.url as file_url,
+                    f.local_path,
+                    f.quality_score,
+                    f.code_lines,
+                    f.is_suitable,
+                    f.unsuitable_reason,
+                    f.complexity_avg,
+                    f.complexity_max,
+                    f.function_count,
+                    f.downloaded_at,
+                    f.evaluation_tier,
+                    f.prescreen_reason,
+                    f.analysis_status,
+                    f.normalized_hash,
+                    f.has_secrets,
+                    f.content_hash,
+                    f.lint_message_total,
+                    f.symbol_count
+                FROM files f
+                JOIN repositories r ON f.repo_id = r.id
+                ''')
+                
+                rows = cursor.fetchall()
+                
+                # pylint 메시지 통계는 한 번에 읽어 파일별로 묶음
+                lint_messages = {}
+                cursor.execute('SELECT file_id, msg_id, symbol, count FROM file_lint_messages')
+                for file_id, msg_id, symbol, count in cursor.fetchall():
+                    lint_messages.setdefault(file_id, {})[msg_id] = {'symbol': symbol, 'count': count}
+                
+                # 정의와 가져온 모듈도 파일별로 묶음 (저장한 순서 유지)
+                symbols = {}
+                cursor.execute('''
+                SELECT file_id, name, qualname, kind, signature, line, end_line
+                FROM file_symbols ORDER BY id
+                ''')
+                for file_id, *values in cursor.fetchall():
+                    symbols.setdefault(file_id, []).append(dict(zip(
+                        ('name', 'qualname', 'kind', 'signature', 'line', 'end_line'), values)))
+                imports = {}
+                cursor.execute('SELECT file_id, module FROM file_imports ORDER BY file_id, module')
+                for file_id, module in cursor.fetchall():
+                    imports.setdefault(file_id, []).append(module)
             
             # 메타데이터 형식으로 변환
             metadata = []
             for row in rows:
                 item = dict(row)
+                file_id = item.pop('file_id')
+                if item.pop('lint_message_total') is not None:
+                    item['lint_messages'] = lint_messages.get(file_id, {})
+                if item.pop('symbol_count') is not None:
+                    item['symbols'] = symbols.get(file_id, [])
+                    item['imports'] = imports.get(file_id, [])
                 
                 # 복잡도 정보 추가
                 item['complexity'] = {
@@ -246,12 +1686,20 @@ class CodeStorageManager:
                 
                 # 불리언 값 변환
                 item['is_suitable'] = bool(item['is_suitable'])
+                if item['has_secrets'] is None:
+                    item.pop('has_secrets')
+                else:
+                    item['has_secrets'] = bool(item['has_secrets'])
                 
                 metadata.append(item)
             
             # 메타데이터 파일 저장
             with open(self.metadata_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, indent=2)
+            
+            # 데이터베이스의 판정이 모두 메타데이터에 반영됨
+            with self.pool.connection() as conn:
+                conn.execute('UPDATE files SET sync_dirty = 0 WHERE sync_dirty = 1')
                 
             print(f"메타데이터 내보내기 완료: {len(metadata)}개 파일")
             return len(metadata)
@@ -260,6 +1708,186 @@ class CodeStorageManager:
             print(f"메타데이터 내보내기 오류: {str(e)}")
             return 0
     
+    def _suitability_reason_sql(self, cursor, quality_filter):
+        """
+        적합성 판정 이유를 계산하는 SQL 식 생성
+        
+        라이센스 호환성은 check_license_compatibility로 저장소 단위로 한 번만
+        판정하여 임시 테이블에 넣고, 나머지 기준은 저장된 지표로 계산합니다.
+        판정 순서와 이유 문구는 CodeQualityFilter.judge_suitability와 같습니다.
+        
+        Args:
+            cursor: 데이터베이스 커서
+            quality_filter (CodeQualityFilter): 판정 기준을 가진 필터
+            
+        Returns:
+            tuple: (SQL 식, 매개변수 딕셔너리)
+        """
+        cursor.execute('CREATE TEMP TABLE IF NOT EXISTS license_ok (repo_id INTEGER PRIMARY KEY)')
+        cursor.execute('DELETE FROM temp.license_ok')
+        cursor.execute('SELECT id, license FROM repositories')
+        allowed = [(row[0],) for row in cursor.fetchall()
+                   if quality_filter.check_license_compatibility(row[1])]
+        cursor.executemany('INSERT INTO temp.license_ok (repo_id) VALUES (?)', allowed)
+        
+        expression = '''
+        CASE
+            WHEN f.repo_id NOT IN (SELECT repo_id FROM temp.license_ok)
+                THEN '라이센스 호환성 문제 (' || COALESCE(
+                    (SELECT r.license FROM repositories r WHERE r.id = f.repo_id), 'None') || ')'
+            WHEN f.prescreen_reason IS NOT NULL
+                THEN f.prescreen_reason
+            {failure_cases}
+            WHEN COALESCE(f.code_lines, 0) < :min_lines
+                THEN '코드 라인 수 부족 (' || COALESCE(f.code_lines, 0) || ' < ' || :min_lines || ')'
+            WHEN COALESCE(f.code_lines, 0) > :max_lines
+                THEN '코드 라인 수 초과 (' || COALESCE(f.code_lines, 0) || ' > ' || :max_lines || ')'
+            WHEN f.quality_score IS NULL AND :min_quality > 0
+                THEN :needs_analysis
+            WHEN COALESCE(f.quality_score, 0) < :min_quality
+                THEN '품질 점수 미달 (' || printf('%.1f', COALESCE(f.quality_score, 0))
+                     || ' < ' || :min_quality || ')'
+            ELSE NULL
+        END
+        '''
+        # 격리 분석이 제한에 걸린 파일은 기준과 관계없이 부적합
+        failure_cases = '\n'.join(
+            f"WHEN f.analysis_status = :status_{status} THEN :reason_{status}"
+            for status in ANALYSIS_FAILURE_REASONS
+        )
+        expression = expression.replace('{failure_cases}', failure_cases)
+        
+        params = {
+            'needs_analysis': NEEDS_ANALYSIS_REASON,
+            'min_quality': float(quality_filter.min_quality_score),
+            'min_lines': int(quality_filter.min_code_lines),
+            'max_lines': int(quality_filter.max_code_lines)
+        }
+        for status, reason in ANALYSIS_FAILURE_REASONS.items():
+            params[f'status_{status}'] = status
+            params[f'reason_{status}'] = reason
+        return expression, params
+    
+    def reevaluate_suitability(self, quality_filter):
+        """
+        저장된 지표만으로 모든 파일의 적합성을 다시 판정 (분석기 재실행 없음)
+        
+        pylint/radon 결과는 그대로 두고 files 테이블 전체를 집합 단위
+        UPDATE 한 번으로 갱신합니다.
+        
+        Args:
+            quality_filter (CodeQualityFilter): 판정 기준을 가진 필터
+            
+        Returns:
+            tuple: (적합한 파일 수, 부적합한 파일 수)
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                expression, params = self._suitability_reason_sql(cursor, quality_filter)
+                
+                # 파일 자체가 없어 판정된 항목은 지표가 없으므로 그대로 둠
+                # 판정이 바뀐 행만 갱신하고 메타데이터에 반영할 행으로 표시
+                cursor.execute(f'''
+                UPDATE files AS f
+                SET unsuitable_reason = {expression}, sync_dirty = 1
+                WHERE f.unsuitable_reason IS NOT '파일이 존재하지 않음'
+                  AND f.unsuitable_reason IS NOT ({expression})
+                ''', params)
+                cursor.execute('''
+                UPDATE files SET is_suitable = (unsuitable_reason IS NULL), sync_dirty = 1
+                WHERE is_suitable IS NOT (unsuitable_reason IS NULL)
+                ''')
+                
+                cursor.execute('SELECT SUM(is_suitable = 1), SUM(is_suitable = 0) FROM files')
+                suitable_count, unsuitable_count = cursor.fetchone()
+            
+            suitable_count = suitable_count or 0
+            unsuitable_count = unsuitable_count or 0
+            print(f"적합성 재판정 완료: 적합한 파일 {suitable_count}개, 부적합한 파일 {unsuitable_count}개")
+            return suitable_count, unsuitable_count
+            
+        except Exception as e:
+            print(f"적합성 재판정 오류: {str(e)}")
+            return 0, 0
+    
+    def evaluate_profile(self, profile_name, quality_filter):
+        """
+        이름 붙은 기준 프로필로 적합성을 판정하여 별도 테이블에 저장
+        
+        files 테이블의 현재 판정은 바꾸지 않으므로 여러 기준을 나란히
+        비교해 볼 수 있습니다.
+        
+        Args:
+            profile_name (str): 프로필 이름
+            quality_filter (CodeQualityFilter): 판정 기준을 가진 필터
+            
+        Returns:
+            dict: 프로필 판정 요약 (실패 시 None)
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                expression, params = self._suitability_reason_sql(cursor, quality_filter)
+                
+                cursor.execute('''
+                INSERT INTO suitability_profiles (name, min_quality, min_lines, max_lines, evaluated_at)
+                VALUES (:name, :min_quality, :min_lines, :max_lines, :evaluated_at)
+                ON CONFLICT (name) DO UPDATE SET
+                    min_quality = excluded.min_quality,
+                    min_lines = excluded.min_lines,
+                    max_lines = excluded.max_lines,
+                    evaluated_at = excluded.evaluated_at
+                ''', dict(params, name=profile_name, evaluated_at=datetime.now().isoformat()))
+                cursor.execute('SELECT id FROM suitability_profiles WHERE name = ?', (profile_name,))
+                profile_id = cursor.fetchone()[0]
+                
+                cursor.execute('DELETE FROM profile_results WHERE profile_id = ?', (profile_id,))
+                cursor.execute(f'''
+                INSERT INTO profile_results (profile_id, file_id, is_suitable, unsuitable_reason)
+                SELECT :profile_id, id, reason IS NULL, reason
+                FROM (SELECT f.id, {expression} AS reason FROM files f)
+                ''', dict(params, profile_id=profile_id))
+            
+            return next((p for p in self.compare_profiles() if p['name'] == profile_name), None)
+            
+        except Exception as e:
+            print(f"프로필 판정 오류: {str(e)}")
+            return None
+    
+    def compare_profiles(self):
+        """
+        저장된 기준 프로필들의 판정 결과 비교
+        
+        Returns:
+            list: 프로필별 기준 및 적합/부적합 파일 수
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                
+                cursor.execute('''
+                SELECT 
+                    p.name, p.min_quality, p.min_lines, p.max_lines, p.evaluated_at,
+                    COALESCE(SUM(pr.is_suitable = 1), 0) as suitable_count,
+                    COALESCE(SUM(pr.is_suitable = 0), 0) as unsuitable_count
+                FROM suitability_profiles p
+                LEFT JOIN profile_results pr ON pr.profile_id = p.id
+                GROUP BY p.id
+                ORDER BY p.name
+                ''')
+                
+                profiles = [dict(row) for row in cursor.fetchall()]
+            
+            return profiles
+            
+        except Exception as e:
+            print(f"프로필 비교 오류: {str(e)}")
+            return []
+    
     def add_tag(self, file_id, tag_name):
         """
         파일에 태그 추가
@@ -272,20 +1900,18 @@ class CodeStorageManager:
             bool: 성공 여부
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # 태그 추가 또는 ID 가져오기
-            cursor.execute('INSERT OR IGNORE INTO tags (name) VALUES (?)', (tag_name,))
-            cursor.execute('SELECT id FROM tags WHERE name = ?', (tag_name,))
-            tag_id = cursor.fetchone()[0]
-            
-            # 파일-태그 관계 추가
-            cursor.execute('INSERT OR IGNORE INTO file_tags (file_id, tag_id) VALUES (?, ?)', 
-                          (file_id, tag_id))
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                # 태그 추가 또는 ID 가져오기
+                cursor.execute('INSERT OR IGNORE INTO tags (name) VALUES (?)', (tag_name,))
+                cursor.execute('SELECT id FROM tags WHERE name = ?', (tag_name,))
+                tag_id = cursor.fetchone()[0]
+                
+                # 파일-태그 관계 추가
+                cursor.execute('INSERT OR IGNORE INTO file_tags (file_id, tag_id) VALUES (?, ?)', 
+                              (file_id, tag_id))
             
-            conn.commit()
-            conn.close()
             return True
             
         except Exception as e:
@@ -304,23 +1930,20 @@ class CodeStorageManager:
             bool: 성공 여부
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # 태그 ID 가져오기
-            cursor.execute('SELECT id FROM tags WHERE name = ?', (tag_name,))
-            result = cursor.fetchone()
-            
-            if result:
-                tag_id = result[0]
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
                 
-                # 파일-태그 관계 제거
-                cursor.execute('DELETE FROM file_tags WHERE file_id = ? AND tag_id = ?', 
-                              (file_id, tag_id))
+                # 태그 ID 가져오기
+                cursor.execute('SELECT id FROM tags WHERE name = ?', (tag_name,))
+                result = cursor.fetchone()
                 
-                conn.commit()
+                if result:
+                    tag_id = result[0]
+                    
+                    # 파일-태그 관계 제거
+                    cursor.execute('DELETE FROM file_tags WHERE file_id = ? AND tag_id = ?', 
+                                  (file_id, tag_id))
             
-            conn.close()
             return True
             
         except Exception as e:
@@ -338,211 +1961,496 @@ class CodeStorageManager:
             list: 태그 이름 목록
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                return self._load_tags(conn.cursor(), [file_id]).get(file_id, [])
             
-            cursor.execute('''
-            SELECT t.name 
-            FROM tags t
-            JOIN file_tags ft ON t.id = ft.tag_id
-            WHERE ft.file_id = ?
-            ''', (file_id,))
+        except Exception as e:
+            print(f"태그 목록 가져오기 오류: {str(e)}")
+            return []
+    
+    def _load_tags(self, cursor, file_ids):
+        """
+        여러 파일의 태그 목록을 묶음 단위 쿼리로 한 번에 가져오기
+        
+        Args:
+            cursor: 데이터베이스 커서
+            file_ids (list): 파일 ID 목록
             
-            tags = [row[0] for row in cursor.fetchall()]
-            conn.close()
+        Returns:
+            dict: 파일 ID별 태그 이름 목록 (태그가 없는 파일은 없음)
+        """
+        tags = {}
+        file_ids = list(dict.fromkeys(file_ids))
+        for start in range(0, len(file_ids), TAG_LOOKUP_BATCH):
+            chunk = file_ids[start:start + TAG_LOOKUP_BATCH]
+            placeholders = ', '.join(['?'] * len(chunk))
+            cursor.execute(f'''
+            SELECT ft.file_id, t.name
+            FROM file_tags ft
+            JOIN tags t ON t.id = ft.tag_id
+            WHERE ft.file_id IN ({placeholders})
+            ORDER BY ft.file_id, ft.tag_id
+            ''', chunk)
+            for file_id, name in cursor.fetchall():
+                tags.setdefault(file_id, []).append(name)
+        return tags
+    
+    def get_file(self, file_id):
+        """
+        파일 ID로 파일 정보 조회 (검색 결과와 같은 형식)
+        
+        Args:
+            file_id (int): 파일 ID
             
-            return tags
+        Returns:
+            dict: 파일 정보 (없으면 None)
+        """
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute('''
+                SELECT 
+                    f.id, f.name, f.path, f.local_path, f.quality_score, 
+                    f.code_lines, f.is_suitable, r.full_name as repo_name
+                FROM files f
+                JOIN repositories r ON f.repo_id = r.id
+                WHERE f.id = ?
+                ''', (file_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                
+                result = dict(row)
+                result['tags'] = self._load_tags(conn.cursor(), [file_id]).get(file_id, [])
+                result['is_suitable'] = bool(result['is_suitable'])
+            
+            return result
             
         except Exception as e:
-            print(f"태그 목록 가져오기 오류: {str(e)}")
-            return []
+            print(f"파일 조회 오류: {str(e)}")
+            return None
     
     def search_files(self, query=None, tags=None, min_quality=None, 
-                    suitable_only=False, limit=100):
+                    suitable_only=False, limit=100, collapse_duplicates=False,
+                    with_lint=None, without_lint=None, sort=None, cursor=None,
+                    exclude_secrets=False):
         """
         파일 검색
         
         Args:
-            query (str, optional): 검색어
+            query (str, optional): 검색어 (저장소 이름, 경로, 파일명, 소스 코드에서 전문 검색,
+                '*'로 끝나는 단어는 접두어 검색)
             tags (list, optional): 태그 목록
             min_quality (float, optional): 최소 품질 점수
             suitable_only (bool, optional): 적합한 파일만 검색
             limit (int, optional): 최대 결과 수
+            collapse_duplicates (bool, optional): 정규화 내용이 같은 파일은 하나만 표시
+            with_lint (list, optional): 모두 발생한 파일만 검색할 pylint 메시지
+                (메시지 ID, 심볼 또는 분류)
+            without_lint (list, optional): 하나도 발생하지 않은 파일만 검색할 pylint 메시지
+                (pylint로 검사한 파일만 대상)
+            sort (str, optional): 정렬 기준 (SEARCH_SORTS, 기본값: 검색어가 있으면
+                'relevance', 없으면 'quality')
+            cursor (str, optional): 이전 페이지의 다음 페이지 커서 (search_page 참고)
+            exclude_secrets (bool, optional): 비밀 정보가 발견된 파일 제외
             
         Returns:
-            list: 검색 결과 목록
+            list: 검색 결과 목록 (검색어가 있으면 관련도 순이고 일치한 부분 발췌(snippet) 포함)
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 기본 쿼리
-            sql = '''
-            SELECT 
-                f.id, f.name, f.path, f.local_path, f.quality_score, 
-                f.code_lines, f.is_suitable, r.full_name as repo_name
-            FROM files f
-            JOIN repositories r ON f.repo_id = r.id
-            '''
-            
-            conditions = []
-            params = []
-            
-            # 검색어 조건
-            if query:
-                conditions.append('''
-                (f.name LIKE ? OR f.path LIKE ? OR r.name LIKE ? OR r.full_name LIKE ?)
-                ''')
-                params.extend([f'%{query}%'] * 4)
-            
-            # 태그 조건
-            if tags:
-                placeholders = ', '.join(['?'] * len(tags))
-                sql += f'''
-                JOIN file_tags ft ON f.id = ft.file_id
-                JOIN tags t ON ft.tag_id = t.id
-                '''
-                conditions.append(f't.name IN ({placeholders})')
-                params.extend(tags)
+            return self.search_page(
+                query=query, tags=tags, min_quality=min_quality, suitable_only=suitable_only,
+                limit=limit, collapse_duplicates=collapse_duplicates,
+                with_lint=with_lint, without_lint=without_lint, sort=sort, cursor=cursor,
+                exclude_secrets=exclude_secrets
+            )['results']
+        except ValueError as e:
+            print(f"파일 검색 오류: {str(e)}")
+            return []
+    
+    def search_page(self, limit=100, sort=None, cursor=None, **filters):
+        """
+        파일 검색 결과 한 페이지와 다음 페이지 커서 조회
+        
+        OFFSET 대신 마지막 결과의 정렬 키 (정렬 값, 파일 ID) 다음부터 읽으므로 (keyset 페이지 나누기)
+        인덱스 순서로 읽는 정렬에서는 몇 번째 페이지든 한 페이지를 읽는 비용이 같습니다.
+        
+        Args:
+            limit (int, optional): 페이지 크기
+            sort (str, optional): 정렬 기준 (search_files와 같음)
+            cursor (str, optional): 이전 페이지가 반환한 커서 (없으면 첫 페이지)
+            **filters: search_files의 검색 조건 (query, tags, min_quality 등)
             
-            # 품질 점수 조건
-            if min_quality is not None:
-                conditions.append('f.quality_score >= ?')
-                params.append(min_quality)
+        Returns:
+            dict: 'results' (검색 결과 목록), 'next_cursor' (다음 페이지 커서, 마지막 페이지면 None)
             
-            # 적합성 조건
-            if suitable_only:
-                conditions.append('f.is_suitable = 1')
+        Raises:
+            ValueError: 알 수 없는 정렬 기준이거나 커서가 올바르지 않거나 다른 정렬 기준의 커서인 경우
+        """
+        match = self._fts_query(filters['query']) if filters.get('query') else None
+        sort = sort or ('relevance' if match else 'quality')
+        if sort not in SEARCH_SORTS:
+            raise ValueError(f"알 수 없는 정렬 기준: {sort}")
+        if sort == 'relevance' and not match:
+            raise ValueError("관련도 순 정렬에는 검색어가 필요합니다")
+        after = decode_search_cursor(cursor, sort) if cursor else None
+        
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                sql, params = self._search_query(limit=limit, sort=sort, after=after, **filters)
+                cursor.execute(sql, params)
+                results = [dict(row) for row in cursor.fetchall()]
+                
+                # 정렬 값이 NULL인 파일은 맨 뒤에 오지만 행 값 비교 (값, ID) < (?, ?)에서는 빠지므로
+                # 앞 구간을 다 읽은 페이지는 NULL 구간을 처음부터 이어서 읽음
+                if (SEARCH_SORTS[sort][1] and after is not None and after[0] is not None
+                        and len(results) < limit):
+                    sql, params = self._search_query(limit=limit - len(results), sort=sort,
+                                                     after=(None, None), **filters)
+                    cursor.execute(sql, params)
+                    results.extend(dict(row) for row in cursor.fetchall())
+                
+                # 태그 정보 추가 (결과 전체의 태그를 한 번에 조회)
+                tags = self._load_tags(conn.cursor(), [result['id'] for result in results])
+                for result in results:
+                    result['tags'] = tags.get(result['id'], [])
+                    result['is_suitable'] = bool(result['is_suitable'])
             
-            # 조건 추가
-            if conditions:
-                sql += ' WHERE ' + ' AND '.join(conditions)
+            next_cursor = None
+            if results and len(results) >= limit:
+                last = results[-1]
+                key = SEARCH_SORT_COLUMNS[sort]
+                values = [last[key], last['id']] if key else [last['id']]
+                next_cursor = encode_search_cursor(sort, values)
             
-            # 그룹화 및 정렬
-            sql += ' GROUP BY f.id ORDER BY f.quality_score DESC LIMIT ?'
-            params.append(limit)
+            return {'results': results, 'next_cursor': next_cursor}
             
-            cursor.execute(sql, params)
-            results = [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"파일 검색 오류: {str(e)}")
+            return {'results': [], 'next_cursor': None}
+    
+    def iter_search_files(self, page_size=SEARCH_PAGE_SIZE, **filters):
+        """
+        검색 결과 전체를 페이지 단위로 읽으며 하나씩 반환
+        
+        Args:
+            page_size (int, optional): 한 번에 읽을 결과 수
+            **filters: search_files의 검색 조건과 정렬 기준
             
-            # 태그 정보 추가
-            for result in results:
-                result['tags'] = self.get_file_tags(result['id'])
-                result['is_suitable'] = bool(result['is_suitable'])
+        Yields:
+            dict: 검색 결과
+        """
+        cursor = None
+        while True:
+            page = self.search_page(limit=page_size, cursor=cursor, **filters)
+            yield from page['results']
+            cursor = page['next_cursor']
+            if cursor is None:
+                return
+    
+    def _search_query(self, query=None, tags=None, min_quality=None, suitable_only=False,
+                      limit=100, collapse_duplicates=False, with_lint=None, without_lint=None,
+                      sort=None, after=None, exclude_secrets=False):
+        """
+        파일 검색 SQL 생성 (after 외의 인자는 search_files와 같음)
+        
+        Args:
+            after (tuple, optional): 이 정렬 키 다음부터 검색 ((정렬 값, 파일 ID) 또는 (파일 ID,),
+                정렬 값이 None이면 정렬 값이 NULL인 구간, 파일 ID까지 None이면 그 구간의 처음부터)
+        
+        Returns:
+            tuple: (SQL 문, 매개변수 목록)
+        """
+        match = self._fts_query(query) if query else None
+        sort = sort or ('relevance' if match else 'quality')
+        if sort == 'relevance' and not match:
+            sort = 'quality'
+        
+        # 기본 쿼리
+        sql = '''
+        SELECT 
+            f.id, f.name, f.path, f.local_path, f.quality_score, 
+            f.code_lines, f.is_suitable, r.full_name as repo_name
+        '''
+        params = []
+        
+        # 검색어 조건 (전문 검색 색인에서 찾고 일치한 부분 발췌)
+        if match:
+            sql += ", snippet(files_fts, -1, ?, ?, '...', 16) as snippet, s.rank as rank"
+            params.extend(SNIPPET_MARKERS)
+        sql += '''
+        FROM files f
+        JOIN repositories r ON f.repo_id = r.id
+        '''
+        
+        conditions = []
+        
+        if match:
+            sql += ' JOIN files_fts s ON s.rowid = f.id'
+            conditions.append('files_fts MATCH ?')
+            params.append(match)
+        
+        # 태그 조건 (조인 대신 하위 쿼리로 걸러 파일이 여러 태그에 걸려도 한 번만 나옴)
+        if tags:
+            placeholders = ', '.join(['?'] * len(tags))
+            conditions.append(f'''
+            f.id IN (
+                SELECT ft.file_id FROM file_tags ft
+                JOIN tags t ON ft.tag_id = t.id
+                WHERE t.name IN ({placeholders})
+            )
+            ''')
+            params.extend(tags)
+        
+        # 품질 점수 조건
+        if min_quality is not None:
+            conditions.append('f.quality_score >= ?')
+            params.append(min_quality)
+        
+        # 적합성 조건
+        if suitable_only:
+            conditions.append('f.is_suitable = 1')
+        
+        # 정확 중복 제외 조건
+        if collapse_duplicates:
+            conditions.append(self._canonical_file_condition('f'))
+        
+        # 비밀 정보 제외 조건
+        if exclude_secrets:
+            conditions.append('COALESCE(f.has_secrets, 0) = 0')
+        
+        # pylint 메시지 조건
+        for identifier in with_lint or []:
+            condition, values = self._lint_message_condition(identifier)
+            conditions.append(f'f.id IN (SELECT file_id FROM file_lint_messages WHERE {condition})')
+            params.extend(values)
+        if without_lint:
+            conditions.append('f.lint_message_total IS NOT NULL')
+        for identifier in without_lint or []:
+            condition, values = self._lint_message_condition(identifier)
+            conditions.append(f'f.id NOT IN (SELECT file_id FROM file_lint_messages WHERE {condition})')
+            params.extend(values)
+        
+        # 이전 페이지 마지막 결과 다음부터 (정렬 인덱스 범위 검색이 되도록 행 값으로 비교)
+        key = SEARCH_SORTS[sort][0]
+        if after is not None:
+            if key is None:
+                conditions.append(f"f.id {'>' if sort == 'oldest' else '<'} ?")
+                params.append(after[-1])
+            elif after[0] is None:
+                conditions.append(f'{key} IS NULL')
+                if after[1] is not None:
+                    conditions.append('f.id < ?')
+                    params.append(after[1])
+            else:
+                conditions.append(f"({key}, f.id) {'>' if sort == 'relevance' else '<'} (?, ?)")
+                params.extend(after)
+        
+        # 조건 추가
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        
+        # 정렬 (검색어가 있으면 BM25 관련도 순, 없으면 정렬 기준 인덱스 순서대로 읽다가 LIMIT에서 멈춤,
+        # 같은 값끼리는 파일 ID 순서로 페이지 경계를 정함)
+        if sort == 'relevance':
+            sql += ' ORDER BY s.rank, f.id LIMIT ?'
+        elif sort == 'oldest':
+            sql += ' ORDER BY f.id LIMIT ?'
+        elif key is None:
+            sql += ' ORDER BY f.id DESC LIMIT ?'
+        else:
+            sql += f' ORDER BY {key} DESC, f.id DESC LIMIT ?'
+        params.append(limit)
+        
+        return sql, params
+    
+    def _fts_query(self, query):
+        """
+        검색어를 FTS5 검색식으로 변환
+        
+        공백으로 나눈 단어를 모두 포함하는 파일을 찾습니다. 각 단어는 그대로 (구두점이
+        있으면 구절로) 찾고, '*'로 끝나는 단어는 그 단어로 시작하는 토큰을 찾습니다.
+        
+        Args:
+            query (str): 검색어
             
-            conn.close()
-            return results
+        Returns:
+            str: FTS5 검색식 (찾을 단어가 없으면 None)
+        """
+        terms = []
+        for word in query.split():
+            prefix = word.endswith('*')
+            word = word.rstrip('*')
+            if not word:
+                continue
+            word = word.replace('"', '""')
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+        return ' '.join(terms) if terms else None
+    
+    def _canonical_file_condition(self, alias):
+        """
+        정규화 내용이 같은 파일 중 가장 먼저 추가된 파일만 남기는 SQL 조건
+        
+        Args:
+            alias (str): files 테이블 별칭
             
-        except Exception as e:
-            print(f"파일 검색 오류: {str(e)}")
-            return []
+        Returns:
+            str: WHERE 절 조건
+        """
+        return f'''
+        ({alias}.normalized_hash IS NULL OR NOT EXISTS (
+            SELECT 1 FROM files d
+            WHERE d.normalized_hash = {alias}.normalized_hash AND d.id < {alias}.id
+        ))
+        '''
     
     def get_statistics(self):
         """
         데이터 통계 정보 가져오기
         
+        파일, 저장소, 태그가 바뀔 때 트리거가 같은 트랜잭션에서 갱신한 카운터를 읽으므로
+        데이터 양과 관계없이 테이블 전체를 읽지 않습니다.
+        
         Returns:
-            dict: 통계 정보
+            dict: 통계 정보 (개수, 평균, 품질 점수 1점 단위 분포, 라이센스 분포,
+                파일 수가 많은 저장소/태그 상위 10개)
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # 저장소 수
-            cursor.execute('SELECT COUNT(*) FROM repositories')
-            repo_count = cursor.fetchone()[0]
-            
-            # 파일 수
-            cursor.execute('SELECT COUNT(*) FROM files')
-            file_count = cursor.fetchone()[0]
-            
-            # 적합한 파일 수
-            cursor.execute('SELECT COUNT(*) FROM files WHERE is_suitable = 1')
-            suitable_count = cursor.fetchone()[0]
-            
-            # 태그 수
-            cursor.execute('SELECT COUNT(*) FROM tags')
-            tag_count = cursor.fetchone()[0]
-            
-            # 평균 품질 점수
-            cursor.execute('SELECT AVG(quality_score) FROM files')
-            avg_quality = cursor.fetchone()[0]
-            
-            # 평균 코드 라인 수
-            cursor.execute('SELECT AVG(code_lines) FROM files')
-            avg_lines = cursor.fetchone()[0]
-            
-            # 라이센스 분포
-            cursor.execute('''
-            SELECT license, COUNT(*) as count
-            FROM repositories
-            GROUP BY license
-            ORDER BY count DESC
-            ''')
-            licenses = {row[0] if row[0] else 'Unknown': row[1] for row in cursor.fetchall()}
-            
-            conn.close()
-            
-            return {
-                'repository_count': repo_count,
-                'file_count': file_count,
-                'suitable_file_count': suitable_count,
-                'tag_count': tag_count,
-                'average_quality_score': round(avg_quality, 2) if avg_quality else 0,
-                'average_code_lines': round(avg_lines, 2) if avg_lines else 0,
-                'license_distribution': licenses
-            }
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                # 개수, 합계, 분포 (트리거가 갱신한 카운터만 읽음)
+                cursor.execute('SELECT name, value FROM statistics_counters')
+                counters = dict(cursor.fetchall())
+                
+                cursor.execute(TOP_REPOSITORIES_SQL)
+                top_repositories = [{'name': name, 'full_name': full_name, 'file_count': count}
+                                    for name, full_name, count in cursor.fetchall()]
+                cursor.execute(TOP_TAGS_SQL)
+                top_tags = [{'name': name, 'count': count} for name, count in cursor.fetchall()]
+            
+            stats = {name: counters.get(name, 0) for name in STATISTICS_QUERIES}
+            for name, prefix in (('average_quality_score', 'quality'), ('average_code_lines', 'code_lines')):
+                count = stats.pop(f'{prefix}_count')
+                total = stats.pop(f'{prefix}_sum')
+                stats[name] = round(total / count, 2) if count else 0
+            
+            stats['quality_histogram'] = [counters.get(f'quality_bucket:{bucket}', 0)
+                                          for bucket in range(QUALITY_HISTOGRAM_BUCKETS)]
+            licenses = [(name[len('license:'):] or 'Unknown', count)
+                        for name, count in counters.items() if name.startswith('license:') and count]
+            stats['license_distribution'] = dict(sorted(licenses, key=lambda item: -item[1]))
+            stats['top_repositories'] = top_repositories
+            stats['top_tags'] = top_tags
+            return stats
             
         except Exception as e:
             print(f"통계 정보 가져오기 오류: {str(e)}")
             return {}
     
-    def export_to_csv(self, output_file="code_data.csv"):
+    def check_query_plans(self):
+        """
+        자주 쓰는 검색/통계 쿼리의 실행 계획 검사
+        
+        인덱스 없이 테이블 전체를 읽는 단계(EXPLAIN QUERY PLAN의 'SCAN 테이블')가 있으면
+        인덱스가 빠졌거나 쿼리가 인덱스를 못 쓰게 바뀐 것으로 봅니다.
+        작은 조회용 테이블(SMALL_TABLES)의 전체 스캔과 자체 색인을 쓰는 전문 검색 가상
+        테이블은 허용합니다.
+        
+        Returns:
+            dict: 전체 스캔이 있는 쿼리 이름과 해당 실행 계획 단계 목록 (없으면 빈 dict)
+        """
+        queries = {name: (sql, []) for name, sql in STATISTICS_QUERIES.items()}
+        queries.update((name, (sql, [])) for name, sql in STATISTICS_GROUP_QUERIES.items())
+        queries['top_repositories'] = (TOP_REPOSITORIES_SQL, [])
+        queries['top_tags'] = (TOP_TAGS_SQL, [])
+        for name, kwargs in HOT_SEARCHES.items():
+            queries[name] = self._search_query(**kwargs)
+        builders = {'find_symbols': self._symbol_query, 'find_importers': self._importer_query}
+        for name, (method, kwargs) in HOT_SYMBOL_LOOKUPS.items():
+            queries[name] = builders[method](**kwargs)
+        
+        # 캐시된 EXPLAIN 문은 스키마가 바뀌어도 다시 준비되지 않으므로
+        # 문장 캐시를 쓰지 않는 별도 연결에서 검사
+        regressions = {}
+        conn = sqlite3.connect(self.db_file, cached_statements=0)
+        try:
+            cursor = conn.cursor()
+            for name, (sql, params) in queries.items():
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                scans = []
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    words = detail.split()
+                    if (words[0] == 'SCAN' and 'USING' not in words and 'VIRTUAL' not in words
+                            and words[1] not in SMALL_TABLES):
+                        scans.append(detail)
+                if scans:
+                    regressions[name] = scans
+        finally:
+            conn.close()
+        
+        return regressions
+    
+    def export_to_csv(self, output_file="code_data.csv", collapse_duplicates=False,
+                      include_secrets=False):
         """
         데이터를 CSV 파일로 내보내기
         
+        비밀 정보가 발견된 파일은 기본적으로 내보내지 않습니다.
+        (소스 코드를 포함하거나 학습 작업에서 바로 읽으려면 export_columnar 사용)
+        
         Args:
             output_file (str): 출력 파일 경로
+            collapse_duplicates (bool): 정규화 내용이 같은 파일은 하나만 내보내기
+            include_secrets (bool): 비밀 정보가 발견된 파일도 내보내기
             
         Returns:
             bool: 성공 여부
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            
-            # 데이터 쿼리
-            query = '''
-            SELECT 
-                r.name as repo_name, 
-                r.full_name as repo_full_name,
-                r.url as repo_url,
-                r.stars as repo_stars,
-                r.license as repo_license,
-                f.name as file_name,
-                f.path as file_path,
-                f.url as file_url,
-                f.local_path,
-                f.quality_score,
-                f.code_lines,
-                f.is_suitable,
-                f.unsuitable_reason,
-                f.complexity_avg,
-                f.complexity_max,
-                f.function_count,
-                f.downloaded_at
-            FROM files f
-            JOIN repositories r ON f.repo_id = r.id
-            '''
-            
-            # pandas로 데이터 로드
-            df = pd.read_sql_query(query, conn)
-            
-            # CSV 파일로 저장
-            output_path = os.path.join(self.base_dir, output_file)
-            df.to_csv(output_path, index=False)
+            with self.pool.connection() as conn:
+                
+                # 데이터 쿼리
+                query = '''
+                SELECT 
+                    r.name as repo_name, 
+                    r.full_name as repo_full_name,
+                    r.url as repo_url,
+                    r.stars as repo_stars,
+                    r.license as repo_license,
+                    f.name as file_name,
+                    f.path as file_path,
+                    f.url as file_url,
+                    f.local_path,
+                    f.quality_score,
+                    f.code_lines,
+                    f.is_suitable,
+                    f.unsuitable_reason,
+                    f.complexity_avg,
+                    f.complexity_max,
+                    f.function_count,
+                    f.downloaded_at
+                FROM files f
+                JOIN repositories r ON f.repo_id = r.id
+                '''
+                conditions = []
+                if collapse_duplicates:
+                    conditions.append(self._canonical_file_condition('f'))
+                if not include_secrets:
+                    conditions.append('COALESCE(f.has_secrets, 0) = 0')
+                if conditions:
+                    query += ' WHERE ' + ' AND '.join(conditions)
+                
+                # 전체를 한 번에 올리지 않고 EXPORT_CHUNK_ROWS행씩 읽어 CSV 파일에 이어 씀
+                output_path = os.path.join(self.base_dir, output_file)
+                chunks = pd.read_sql_query(query, conn, chunksize=EXPORT_CHUNK_ROWS)
+                for index, df in enumerate(chunks):
+                    df.to_csv(output_path, mode='a' if index else 'w', header=index == 0, index=False)
             
-            conn.close()
             print(f"CSV 파일 내보내기 완료: {output_path}")
             return True
             
@@ -550,6 +2458,103 @@ class CodeStorageManager:
             print(f"CSV 파일 내보내기 오류: {str(e)}")
             return False
     
+    def export_columnar(self, output_file, fmt='parquet', include_content=False, compression='zstd',
+                        query=None, min_quality=None, suitable_only=False,
+                        collapse_duplicates=False, include_secrets=False):
+        """
+        데이터를 Parquet 또는 Arrow IPC 파일로 스트리밍 내보내기 (pyarrow 필요)
+        
+        비밀 정보가 발견된 파일은 기본적으로 내보내지 않습니다.
+        
+        Args:
+            output_file (str): 출력 파일 경로 (base_dir 기준)
+            fmt (str): 'parquet' 또는 'arrow'
+            include_content (bool): 소스 코드 열 포함
+            compression (str): 압축 방식 (None이면 압축 안 함)
+            query (str, optional): 검색어 (search_files와 같은 형식)
+            min_quality (float, optional): 최소 품질 점수
+            suitable_only (bool): 적합한 파일만 내보내기
+            collapse_duplicates (bool): 정규화 내용이 같은 파일은 하나만 내보내기
+            include_secrets (bool): 비밀 정보가 발견된 파일도 내보내기
+            
+        Returns:
+            dict: 출력 경로, 행 수, 행 그룹 수, 파일 크기 (실패하면 None)
+        """
+        return ColumnarExporter(self.db_file, self.base_dir).export(
+            output_file, fmt=fmt, include_content=include_content, compression=compression,
+            query=self._fts_query(query) if query else None, min_quality=min_quality,
+            suitable_only=suitable_only, collapse_duplicates=collapse_duplicates,
+            include_secrets=include_secrets
+        )
+    
+    def pack_sources(self, remove_files=True):
+        """
+        개별 소스 파일을 묶음 저장소(pack 파일)로 옮기고 local_path를 저장소 참조로 바꾸기
+        
+        메타데이터의 local_path를 바꾼 뒤 다시 가져오므로 데이터베이스에도 반영됩니다.
+        가져오기에 실패하면 개별 파일은 지우지 않습니다.
+        
+        Args:
+            remove_files (bool): 옮긴 개별 파일과 비게 된 디렉토리 삭제
+            
+        Returns:
+            int: 옮긴 파일 수
+        """
+        try:
+            with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            
+            store = get_store(os.path.join(self.base_dir, PACK_DIR_NAME))
+            moved = {}
+            for item in metadata:
+                local_path = item.get('local_path')
+                if not local_path or is_blob_ref(local_path):
+                    continue
+                if local_path not in moved:
+                    try:
+                        with open(local_path, 'rb') as f:
+                            data = f.read()
+                    except OSError:
+                        continue
+                    moved[local_path] = store.put(source_key(item['repo_full_name'], item['file_path']), data)
+                item['local_path'] = moved[local_path]
+            
+            if not moved:
+                print("묶음 저장소로 옮길 파일이 없습니다.")
+                return 0
+            
+            # 중간에 멈춰도 메타데이터가 반쯤 쓰인 채 남지 않도록 임시 파일에 쓴 뒤 바꿈
+            temp_file = self.metadata_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2)
+            os.replace(temp_file, self.metadata_file)
+            
+            self.import_from_metadata()
+            if self.import_stats is None:
+                # 저장소 참조도 개별 파일도 모두 읽을 수 있으므로 파일은 지우지 않고 남김
+                print("묶음 저장소로 옮기기 중단: 데이터베이스에 반영하지 못해 개별 파일을 남김")
+                return 0
+            
+            if remove_files:
+                base_dir = os.path.abspath(self.base_dir)
+                for local_path in moved:
+                    os.remove(local_path)
+                    # 저장소 디렉토리 아래에서 비게 된 상위 디렉토리 정리
+                    parent = os.path.dirname(os.path.abspath(local_path))
+                    while parent.startswith(base_dir + os.sep):
+                        try:
+                            os.rmdir(parent)
+                        except OSError:
+                            break
+                        parent = os.path.dirname(parent)
+            
+            print(f"묶음 저장소로 옮기기 완료: {len(moved)}개 파일")
+            return len(moved)
+            
+        except Exception as e:
+            print(f"묶음 저장소로 옮기기 오류: {str(e)}")
+            return 0
+    
     def backup_data(self, backup_dir=None):
         """
         데이터 백업
@@ -568,14 +2573,22 @@ class CodeStorageManager:
             
             os.makedirs(backup_dir, exist_ok=True)
             
-            # 데이터베이스 파일 백업
+            # 데이터베이스 파일 백업 (WAL에 남은 변경까지 포함하도록 백업 API 사용)
             if os.path.exists(self.db_file):
-                shutil.copy2(self.db_file, os.path.join(backup_dir, os.path.basename(self.db_file)))
+                target = sqlite3.connect(os.path.join(backup_dir, os.path.basename(self.db_file)))
+                with self.pool.connection() as conn:
+                    conn.backup(target)
+                target.close()
             
             # 메타데이터 파일 백업
             if os.path.exists(self.metadata_file):
                 shutil.copy2(self.metadata_file, os.path.join(backup_dir, os.path.basename(self.metadata_file)))
             
+            # 묶음 저장소 백업 (파일 수가 적어 개별 소스 파일보다 빠르게 복사됨)
+            pack_dir = os.path.join(self.base_dir, PACK_DIR_NAME)
+            if os.path.isdir(pack_dir):
+                get_store(pack_dir).backup(os.path.join(backup_dir, PACK_DIR_NAME))
+            
             print(f"데이터 백업 완료: {backup_dir}")
             return backup_dir
             
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+파일 내용 캐시 모듈
+
+웹 코드 뷰어와 파일 API가 같은 파일을 열 때마다 디스크(또는 묶음 저장소)에서 다시
+읽지 않도록, 최근에 본 파일의 내용과 구문 강조 HTML을 메모리에 보관합니다.
+
+- 키: (파일 ID, 내용 버전) — 내용 버전은 파일 크기와 수정 시각(묶음 저장소는 저장 시각)
+  이므로 어느 프로세스에서 내용을 바꾸든 이전 항목은 쓰이지 않음
+- 전체 크기(바이트)에 상한을 두고 가장 오래 쓰지 않은 항목부터 내보냄 (LRU)
+- 구문 강조 HTML은 처음 요청될 때 한 번 만들어 내용과 함께 보관
+- 내용을 고치거나 지우면 invalidate()로 그 파일의 항목을 모두 지움
+
+캐시는 프로세스마다 따로 있으므로 invalidate()는 호출한 프로세스의 항목만 지웁니다.
+다른 프로세스에서 고친 내용은 내용 버전(크기/수정 시각)이 바뀌어 다음 요청부터 새로 읽습니다.
+
+구문 강조에는 pygments를 사용합니다 (없으면 HTML 이스케이프만 하고 브라우저에서 강조).
+"""
+
+import sys
+import html
+import threading
+from collections import OrderedDict
+
+try:
+    from pygments import highlight
+    from pygments.lexers import PythonLexer
+    from pygments.formatters import HtmlFormatter
+except ImportError:  # 서버 쪽 구문 강조에만 필요
+    highlight = None
+
+# 캐시 전체 크기 상한 (바이트)
+CACHE_BYTES = 64 * 1024 * 1024
+
+# 구문 강조 HTML의 CSS 클래스
+HIGHLIGHT_CLASS = 'highlight'
+
+# 웹 앱 프로세스에서 공유하는 캐시
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def render_highlighted(content):
+    """
+    소스 코드를 구문 강조 HTML로 변환
+
+    Args:
+        content (str): 소스 코드
+
+    Returns:
+        str: <pre>로 감싼 HTML (pygments가 없으면 이스케이프만 한 HTML)
+    """
+    if highlight is None:
+        return f'<pre><code class="language-python">{html.escape(content)}</code></pre>'
+    return highlight(content, PythonLexer(), HtmlFormatter(cssclass=HIGHLIGHT_CLASS))
+
+
+def highlight_css():
+    """
+    구문 강조 HTML에 필요한 CSS (pygments가 없으면 빈 문자열)
+
+    Returns:
+        str: CSS 규칙
+    """
+    if highlight is None:
+        return ''
+    return HtmlFormatter(cssclass=HIGHLIGHT_CLASS).get_style_defs(f'.{HIGHLIGHT_CLASS}')
+
+
+class ContentCache:
+    """크기 제한이 있는 파일 내용 및 구문 강조 HTML LRU 캐시"""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        """
+        내용 캐시 초기화
+
+        Args:
+            max_bytes (int): 보관할 내용과 HTML의 최대 크기 합계 (바이트)
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.stats_counts = {'hits': 0, 'misses': 0, 'html_hits': 0, 'html_misses': 0,
+                             'evictions': 0, 'invalidations': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(entry):
+        """항목이 차지하는 메모리 크기"""
+        return sys.getsizeof(entry['content']) + (sys.getsizeof(entry['html']) if entry['html'] else 0)
+
+    def _store(self, key, entry):
+        """항목을 가장 최근 위치에 넣고 상한을 넘으면 오래된 항목부터 내보내기 (잠금을 잡은 상태로 호출)"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old['size']
+        entry['size'] = self._size(entry)
+        if entry['size'] > self.max_bytes:
+            # 캐시보다 큰 파일은 보관하지 않음
+            return
+        self._entries[key] = entry
+        self.bytes += entry['size']
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted['size']
+            self.stats_counts['evictions'] += 1
+
+    def get(self, file_id, version, loader):
+        """
+        파일 내용 조회 (없으면 loader로 읽어 보관)
+
+        Args:
+            file_id (int): 파일 ID
+            version (str): 내용 버전 (파일 크기와 수정 시각 등)
+            loader (callable): 내용을 읽는 함수 (인수 없음, 실패하면 예외)
+
+        Returns:
+            str: 파일 내용
+        """
+        key = (file_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats_counts['hits'] += 1
+                return entry['content']
+            self.stats_counts['misses'] += 1
+
+        # 읽는 동안 다른 요청을 막지 않도록 잠금 밖에서 읽음
+        content = loader()
+        with self._lock:
+            self._store(key, {'content': content, 'html': None})
+        return content
+
+    def get_highlighted(self, file_id, version, loader):
+        """
+        파일 내용과 구문 강조 HTML 조회 (HTML은 처음 요청될 때 만들어 보관)
+
+        Args:
+            file_id (int): 파일 ID
+            version (str): 내용 버전
+            loader (callable): 내용을 읽는 함수
+
+        Returns:
+            tuple: (파일 내용, 구문 강조 HTML)
+        """
+        content = self.get(file_id, version, loader)
+        key = (file_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['html'] is not None:
+                self.stats_counts['html_hits'] += 1
+                return content, entry['html']
+            self.stats_counts['html_misses'] += 1
+
+        rendered = render_highlighted(content)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['html'] = rendered
+                self._store(key, entry)
+        return content, rendered
+
+    def invalidate(self, file_id):
+        """
+        파일의 모든 버전 항목 삭제 (내용을 고치거나 지운 뒤 호출)
+
+        Args:
+            file_id (int): 파일 ID
+
+        Returns:
+            int: 지운 항목 수
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == file_id]
+            for key in keys:
+                self.bytes -= self._entries.pop(key)['size']
+            self.stats_counts['invalidations'] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """
+        캐시 사용 통계
+
+        Returns:
+            dict: 항목 수, 크기, 적중/실패 횟수와 적중률, 내보낸 항목 수 등
+        """
+        with self._lock:
+            result = dict(self.stats_counts)
+            result.update(entries=len(self._entries), bytes=self.bytes, max_bytes=self.max_bytes)
+        lookups = result['hits'] + result['misses']
+        renders = result['html_hits'] + result['html_misses']
+        result['hit_rate'] = result['hits'] / lookups if lookups else 0.0
+        result['html_hit_rate'] = result['html_hits'] / renders if renders else 0.0
+        return result
+
+
+def get_content_cache():
+    """
+    프로세스에서 공유하는 내용 캐시
+
+    Returns:
+        ContentCache: 내용 캐시
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ContentCache()
+        return _cache
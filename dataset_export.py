@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+학습용 데이터셋 샤드 내보내기 모듈
+
+검색 조건(search_files와 같은 필터)에 맞는 파일의 메타데이터와 소스 코드를
+한 줄에 파일 하나인 JSONL로 만들어 일정 크기의 zstd 또는 gzip 압축 샤드로 나눠 씁니다.
+
+- 결정적: 파일 ID 순(오래된 파일부터)으로 읽고 소스 크기(압축 전) 기준으로 샤드를 나누며,
+  압축 헤더에 시각을 넣지 않으므로 같은 데이터베이스와 설정이면 항상 같은 샤드 파일이 만들어집니다.
+  새로 추가된 파일은 ID가 가장 크므로 마지막 샤드에만 들어갑니다.
+- 병렬: 샤드마다 서로 독립적이므로 여러 작업자 프로세스가 동시에 압축해서 쓰고,
+  작업자 안에서는 소스 파일을 여러 스레드로 읽습니다.
+- 이어쓰기: 샤드를 다 쓸 때마다 매니페스트(manifest.json)에 파일 수, 크기, SHA-256과
+  샤드에 담은 소스 파일들의 크기/수정 시각 해시를 기록하므로, 중단된 내보내기를 다시
+  실행하면 파일 목록과 소스가 그대로이고 이미 완성된 샤드는 건너뜁니다.
+
+zstd 압축에는 zstandard 패키지가 필요합니다 (없으면 gzip 사용).
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from blob_store import read_source_bytes, source_stat
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축에만 필요
+    zstandard = None
+
+# 압축 방식별 샤드 파일 확장자와 압축 수준
+SHARD_EXTENSIONS = {
+    'zstd': '.jsonl.zst',
+    'gzip': '.jsonl.gz'
+}
+COMPRESSION_LEVELS = {
+    'zstd': 10,
+    'gzip': 6
+}
+DEFAULT_COMPRESSION = 'zstd' if zstandard is not None else 'gzip'
+
+# 샤드 하나에 담을 소스 코드 크기 (압축 전, MB)
+SHARD_MB = 64
+
+# 작업자 하나가 소스 파일을 동시에 읽는 스레드 수
+READ_THREADS = 8
+
+# 매니페스트 파일 이름과 형식 버전
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+
+# 샤드 파일 이름 (shard-00000.jsonl.zst)
+SHARD_PATTERN = re.compile(r'^shard-\d{5}\.jsonl\.(zst|gz)(\.tmp)?$')
+
+# JSONL 한 줄에 기록하는 검색 결과 필드 (이 순서로 기록, 마지막에 content 추가)
+RECORD_FIELDS = ('id', 'repo_name', 'path', 'name', 'quality_score', 'code_lines', 'is_suitable', 'tags')
+
+# 체크섬 계산 시 한 번에 읽는 크기
+HASH_CHUNK = 1024 * 1024
+
+
+class _HashingWriter:
+    """쓰는 내용의 SHA-256과 크기를 함께 계산하는 파일 래퍼"""
+
+    def __init__(self, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.file.write(data)
+        self.sha256.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        # 실제 파일은 샤드를 쓰는 쪽에서 닫음
+        pass
+
+
+def _open_compressor(sink, compression, level):
+    """
+    압축 스트림 생성 (헤더에 파일 이름/시각을 넣지 않아 결과가 항상 같음)
+
+    Args:
+        sink: 압축 결과를 받을 파일 객체
+        compression (str): 'zstd' 또는 'gzip'
+        level (int): 압축 수준
+
+    Returns:
+        write/close를 제공하는 압축 스트림
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(filename='', mode='wb', fileobj=sink, compresslevel=level, mtime=0)
+    return zstandard.ZstdCompressor(level=level).stream_writer(sink, closefd=False)
+
+
+def _read_source(path):
+    """소스 파일 읽기 (읽을 수 없으면 None)"""
+    try:
+        return read_source_bytes(path).decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _write_shard(task):
+    """
+    샤드 하나를 임시 파일에 쓴 뒤 이름 바꾸기 (작업자 프로세스에서 실행)
+
+    Args:
+        task (dict): 샤드 번호, 경로, 검색 결과 목록, 압축 방식/수준, 읽기 스레드 수
+
+    Returns:
+        dict: 매니페스트에 기록할 샤드 정보 중 쓰기 결과 (기록 수, 크기, 체크섬 등)
+    """
+    records = task['records']
+    with ThreadPoolExecutor(max_workers=task['read_threads']) as pool:
+        contents = list(pool.map(_read_source, [record['local_path'] for record in records]))
+
+    temp_path = task['path'] + '.tmp'
+    written = missing = raw_bytes = 0
+    with open(temp_path, 'wb') as f:
+        sink = _HashingWriter(f)
+        stream = _open_compressor(sink, task['compression'], task['level'])
+        for record, content in zip(records, contents):
+            if content is None:
+                missing += 1
+                continue
+            line = {field: record.get(field) for field in RECORD_FIELDS}
+            line['content'] = content
+            data = (json.dumps(line, ensure_ascii=False) + '\n').encode('utf-8')
+            stream.write(data)
+            raw_bytes += len(data)
+            written += 1
+        stream.close()
+    os.replace(temp_path, task['path'])
+
+    return {
+        'index': task['index'],
+        'records': written,
+        'missing': missing,
+        'raw_bytes': raw_bytes,
+        'bytes': sink.size,
+        'sha256': sink.sha256.hexdigest()
+    }
+
+
+def _file_sha256(path):
+    """파일 전체의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir):
+    """
+    데이터셋 매니페스트 읽기
+
+    Args:
+        output_dir (str): 데이터셋 디렉토리
+
+    Returns:
+        dict: 매니페스트 (없거나 읽을 수 없으면 None)
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def verify_dataset(output_dir):
+    """
+    매니페스트의 체크섬과 크기로 샤드 파일 확인
+
+    Args:
+        output_dir (str): 데이터셋 디렉토리
+
+    Returns:
+        list: 없거나 내용이 다른 샤드 파일 이름 목록 (매니페스트가 없으면 None)
+    """
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        return None
+
+    problems = []
+    for shard in manifest['shards']:
+        path = os.path.join(output_dir, shard['file'])
+        if (not os.path.exists(path) or os.path.getsize(path) != shard['bytes']
+                or _file_sha256(path) != shard['sha256']):
+            problems.append(shard['file'])
+    return problems
+
+
+class DatasetExporter:
+    """검색 조건에 맞는 파일을 압축 JSONL 샤드와 매니페스트로 내보내는 클래스"""
+
+    def __init__(self, storage, output_dir, shard_mb=SHARD_MB, compression=DEFAULT_COMPRESSION,
+                 workers=None, read_threads=READ_THREADS):
+        """
+        데이터셋 내보내기 초기화
+
+        Args:
+            storage (CodeStorageManager): 파일을 고를 저장소 관리자
+            output_dir (str): 샤드와 매니페스트를 쓸 디렉토리
+            shard_mb (float): 샤드 하나에 담을 소스 코드 크기 (압축 전, MB)
+            compression (str): 'zstd' 또는 'gzip'
+            workers (int, optional): 샤드를 쓰는 작업자 프로세스 수 (기본값: CPU 수, 1이면 현재 프로세스)
+            read_threads (int): 작업자 하나가 소스 파일을 동시에 읽는 스레드 수
+        """
+        self.storage = storage
+        self.output_dir = output_dir
+        self.shard_bytes = int(shard_mb * 1024 * 1024)
+        self.compression = compression
+        self.workers = workers or os.cpu_count() or 1
+        self.read_threads = read_threads
+        self.stats = {'shards': 0, 'written': 0, 'resumed': 0, 'records': 0, 'missing': 0, 'bytes': 0}
+
+    def _plan_shards(self, filters):
+        """
+        검색 결과를 파일 ID 순으로 읽으며 소스 크기 기준으로 샤드 나누기
+
+        Args:
+            filters (dict): search_files의 검색 조건
+
+        Yields:
+            tuple: (샤드 하나에 들어갈 검색 결과 목록, 소스 파일들의 크기/수정 시각 SHA-256)
+        """
+        records = []
+        sources = hashlib.sha256()
+        size = 0
+        for record in self.storage.iter_search_files(sort='oldest', **filters):
+            records.append(record)
+            try:
+                stat = source_stat(record['local_path'])
+                size += stat.st_size
+                sources.update(f"{record['id']}:{stat.st_size}:{stat.st_mtime!r}\n".encode('ascii'))
+            except OSError:
+                sources.update(f"{record['id']}:missing\n".encode('ascii'))
+            if size >= self.shard_bytes:
+                yield records, sources.hexdigest()
+                records = []
+                sources = hashlib.sha256()
+                size = 0
+        if records:
+            yield records, sources.hexdigest()
+
+    def _write_manifest(self, manifest):
+        """매니페스트를 임시 파일에 쓴 뒤 이름 바꾸기"""
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def export(self, include_secrets=False, **filters):
+        """
+        데이터셋 샤드와 매니페스트 쓰기 (이전에 중단된 내보내기는 이어서)
+
+        Args:
+            include_secrets (bool): 비밀 정보가 발견된 파일도 내보내기
+            **filters: search_files의 검색 조건 (query, tags, min_quality, suitable_only,
+                collapse_duplicates, with_lint, without_lint)
+
+        Returns:
+            dict: 매니페스트 (실패하면 None)
+        """
+        if self.compression not in SHARD_EXTENSIONS:
+            print(f"지원하지 않는 압축 방식: {self.compression}")
+            return None
+        if self.compression == 'zstd' and zstandard is None:
+            print("zstd 압축에는 zstandard가 필요합니다: pip install zstandard (또는 gzip 사용)")
+            return None
+
+        start_time = time.time()
+        level = COMPRESSION_LEVELS[self.compression]
+        extension = SHARD_EXTENSIONS[self.compression]
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'compression': self.compression,
+            'level': level,
+            'shard_bytes': self.shard_bytes,
+            'filters': dict(filters, include_secrets=include_secrets),
+            'complete': False,
+            'shards': []
+        }
+
+        # 설정이 같은 이전 내보내기의 샤드만 다시 쓸 수 있음
+        previous = load_manifest(self.output_dir)
+        settings = ('version', 'compression', 'level', 'shard_bytes', 'filters')
+        reusable = {}
+        if previous and all(previous.get(key) == manifest[key] for key in settings):
+            reusable = {shard['file']: shard for shard in previous['shards']}
+
+        shards = {}
+        planned = set()
+        executor = None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if self.workers > 1:
+                # 웹 앱의 스레드에서 fork하면 잠금 상태가 복제될 수 있으므로 spawn 사용
+                executor = ProcessPoolExecutor(max_workers=self.workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+            pending = {}
+
+            def finish(done):
+                for future in done:
+                    shard = pending.pop(future)
+                    shard.update(future.result())
+                    shards[shard['index']] = shard
+                    self.stats['written'] += 1
+                manifest['shards'] = [shards[index] for index in sorted(shards)]
+                self._write_manifest(manifest)
+
+            plan = self._plan_shards(dict(filters, exclude_secrets=not include_secrets))
+            for index, (records, sources_sha256) in enumerate(plan):
+                ids = [record['id'] for record in records]
+                name = f'shard-{index:05d}{extension}'
+                path = os.path.join(self.output_dir, name)
+                planned.add(name)
+                shard = {
+                    'index': index,
+                    'file': name,
+                    'files': len(ids),
+                    'first_id': ids[0],
+                    'last_id': ids[-1],
+                    'ids_sha256': hashlib.sha256(','.join(map(str, ids)).encode('ascii')).hexdigest(),
+                    'sources_sha256': sources_sha256
+                }
+
+                # 같은 파일 목록과 소스로 이미 완성된 샤드는 건너뜀
+                known = reusable.get(name)
+                if (known and known.get('ids_sha256') == shard['ids_sha256']
+                        and known.get('sources_sha256') == sources_sha256
+                        and os.path.exists(path) and os.path.getsize(path) == known['bytes']):
+                    shards[index] = known
+                    self.stats['resumed'] += 1
+                    continue
+
+                task = {'index': index, 'path': path, 'records': records, 'compression': self.compression,
+                        'level': level, 'read_threads': self.read_threads}
+                if executor is None:
+                    shard.update(_write_shard(task))
+                    shards[index] = shard
+                    self.stats['written'] += 1
+                    manifest['shards'] = [shards[i] for i in sorted(shards)]
+                    self._write_manifest(manifest)
+                    continue
+
+                # 메모리에 올라가는 샤드 수를 제한 (작업자마다 하나씩 대기)
+                pending[executor.submit(_write_shard, task)] = shard
+                if len(pending) >= self.workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    finish(done)
+
+            if pending:
+                finish(wait(pending)[0])
+
+            # 이전 내보내기에서 남은 (이번 계획에 없는) 샤드와 임시 파일 정리
+            for name in os.listdir(self.output_dir):
+                if SHARD_PATTERN.match(name) and name not in planned:
+                    os.remove(os.path.join(self.output_dir, name))
+
+            manifest['shards'] = [shards[index] for index in sorted(shards)]
+            for key in ('files', 'records', 'missing', 'raw_bytes', 'bytes'):
+                manifest[key] = sum(shard[key] for shard in manifest['shards'])
+            manifest['complete'] = True
+            self._write_manifest(manifest)
+
+        except Exception as e:
+            print(f"데이터셋 내보내기 오류: {str(e)}")
+            return None
+
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        self.stats.update(shards=len(manifest['shards']), records=manifest['records'],
+                          missing=manifest['missing'], bytes=manifest['bytes'])
+        seconds = time.time() - start_time
+        print(f"데이터셋 내보내기 완료: {self.output_dir} (샤드 {self.stats['shards']}개 중 "
+              f"{self.stats['written']}개 작성, {self.stats['resumed']}개 이어쓰기 생략, "
+              f"파일 {manifest['records']}개, 읽지 못한 파일 {manifest['missing']}개, "
+              f"{manifest['bytes'] / 1024 / 1024:.1f}MB, {seconds:.2f}초)")
+        return manifest
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SQLite 연결 관리 모듈
+
+데이터베이스 파일마다 하나의 연결 풀을 두고 CLI와 웹 앱이 함께 사용합니다.
+연결은 트랜잭션 단위로 빌려 쓰고 반납하므로 요청마다 새로 연결하지 않으며,
+연결별 문장 캐시에 준비된 SQL 문이 그대로 남아 다시 사용됩니다.
+WAL 모드로 열어 웹 앱의 읽기와 크롤러/필터의 쓰기가 서로 막지 않습니다.
+"""
+
+import os
+import sqlite3
+import threading
+import contextlib
+
+# 잠금이 풀리기를 기다릴 최대 시간 (초)
+BUSY_TIMEOUT = 30
+
+# 연결마다 유지할 준비된 SQL 문 수
+STATEMENT_CACHE_SIZE = 256
+
+# 새 연결에 적용하는 PRAGMA 설정
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),        # 읽기와 쓰기가 서로 막지 않음
+    ('synchronous', 'NORMAL'),      # WAL에서는 체크포인트 때만 fsync해도 손상되지 않음
+    ('cache_size', -64000),         # 연결당 페이지 캐시 약 64MB
+    ('mmap_size', 256 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+)
+
+# 데이터베이스 경로별 공유 연결 풀
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """데이터베이스 파일 하나에 대한 SQLite 연결 풀"""
+
+    def __init__(self, db_file, max_idle=8):
+        """
+        연결 풀 초기화
+
+        Args:
+            db_file (str): 데이터베이스 파일 경로
+            max_idle (int): 반납 후 보관할 최대 유휴 연결 수
+        """
+        self.db_file = db_file
+        self.max_idle = max_idle
+        self.stats = {'created': 0, 'reused': 0}
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _create(self):
+        """
+        PRAGMA를 적용한 새 연결 생성
+
+        Returns:
+            sqlite3.Connection: 데이터베이스 연결
+        """
+        # 반납된 연결은 다른 스레드가 이어 쓰므로 스레드 검사는 끔
+        # (한 연결을 동시에 두 스레드가 쓰지는 않음)
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for name, value in CONNECTION_PRAGMAS:
+            conn.execute(f'PRAGMA {name} = {value}')
+        self.stats['created'] += 1
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        트랜잭션 단위로 연결 빌려 쓰기
+
+        블록이 정상 종료되면 커밋하고 예외가 나면 롤백한 뒤 연결을 풀에 반납합니다.
+        같은 스레드에서 중첩해서 호출하면 바깥 블록의 연결과 트랜잭션을 그대로 씁니다.
+
+        Yields:
+            sqlite3.Connection: 데이터베이스 연결
+        """
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            yield held
+            return
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._create()
+        else:
+            self.stats['reused'] += 1
+
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        """유휴 연결 모두 닫기 (사용 중인 연결은 반납될 때 다시 보관됨)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def get_pool(db_file):
+    """
+    데이터베이스 파일의 공유 연결 풀 가져오기
+
+    Args:
+        db_file (str): 데이터베이스 파일 경로
+
+    Returns:
+        ConnectionPool: 연결 풀 (같은 경로면 같은 객체)
+    """
+    key = os.path.abspath(db_file)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def close_all():
+    """모든 연결 풀의 유휴 연결 닫기"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -16,6 +16,7 @@ import requests
 from dotenv import load_dotenv
 import os
 from code_filter import CodeQualityFilter
+from blob_store import get_store, source_key, PACK_DIR_NAME
 
 load_dotenv()  # ⬅️ .env 파일을 읽어서 os.environ 에 등록
 token = os.getenv("GITHUB_TOKEN") 
@@ -24,16 +25,18 @@ print(f"[DEBUG] Loaded token: {token}")
 class GitHubPythonCrawler:
     """GitHub에서 파이썬 코드를 크롤링하는 클래스"""
     
-    def __init__(self, token=None, output_dir="collected_code"):
+    def __init__(self, token=None, output_dir="collected_code", pack_sources=False):
         """
         크롤러 초기화
         
         Args:
             token (str, optional): GitHub API 토큰. 없으면 제한된 API 사용
             output_dir (str, optional): 수집된 코드를 저장할 디렉토리
+            pack_sources (bool, optional): 파일마다 따로 저장하지 않고 묶음 저장소(pack 파일)에 저장
         """
         self.github = Github(token) if token else Github()
         self.output_dir = output_dir
+        self.pack_sources = pack_sources
         self.metadata_file = os.path.join(output_dir, "metadata.json")
         self.quality_filter = CodeQualityFilter(metadata_file=self.metadata_file)
         # 출력 디렉토리 생성
@@ -208,10 +211,18 @@ class GitHubPythonCrawler:
             content (str): 파일 내용
             
         Returns:
-            str: 저장된 파일 경로
+            str: 저장된 파일 경로 (묶음 저장소에 저장하면 저장소 참조)
         """
         if content is None:
             return None
+        
+        if self.pack_sources:
+            try:
+                store = get_store(os.path.join(self.output_dir, PACK_DIR_NAME))
+                return store.put(source_key(repo_name, file_path), content)
+            except Exception as e:
+                print(f"파일 저장 오류: {str(e)}")
+                return None
             
         # 저장 경로 생성 (원본 디렉토리 구조 유지)
         repo_dir = os.path.join(self.output_dir, repo_name.replace('/', '_'))
@@ -278,8 +289,9 @@ class GitHubPythonCrawler:
         Returns:
             list: 다운로드된 파일 정보 목록
         """
-        # 품질 평가 도구 초기화
+        # 품질 평가 도구 초기화 (이미 수집한 코드와 같은 파일은 분석 결과 재사용)
         quality_filter = CodeQualityFilter(metadata_file=self.metadata_file)
+        hash_index = quality_filter.build_hash_index(quality_filter.load_metadata())
 
         # 저장소 검색
         repositories = self.search_repositories(query=query, max_results=max_repos)
@@ -296,28 +308,19 @@ class GitHubPythonCrawler:
                 if content:
                     local_path = self.save_file(repo['full_name'], file_info['path'], content)
                     if local_path:
-                        # ✅ 품질 분석 수행
-                        quality_score = quality_filter.evaluate_code_quality(local_path)
-                        code_lines = quality_filter.count_code_lines(local_path)
-                        complexity_info = quality_filter.check_code_complexity(local_path)
-                        is_suitable, reason = quality_filter.is_suitable_for_learning(local_path, repo)
-
                         # 메타데이터 저장
                         self.update_metadata(
                             repo_info=repo,
                             file_info=file_info,
-                            local_path=local_path,
-                            quality_score=quality_score
+                            local_path=local_path
                         )
 
-                        # 👉 메타데이터에 부가 정보 직접 추가
+                        # ✅ 품질 분석 수행 후 결과와 파일 지문을 함께 기록
+                        # (이후 filter_code가 같은 파일을 다시 분석하지 않도록)
                         with open(self.metadata_file, 'r', encoding='utf-8') as f:
                             metadata = json.load(f)
                         if metadata:
-                            metadata[-1]['code_lines'] = code_lines
-                            metadata[-1]['complexity'] = complexity_info
-                            metadata[-1]['is_suitable'] = is_suitable
-                            metadata[-1]['unsuitable_reason'] = None if is_suitable else reason
+                            metadata[-1].update(quality_filter.analyze_file(local_path, metadata[-1], hash_index))
                             with open(self.metadata_file, 'w', encoding='utf-8') as f:
                                 json.dump(metadata, f, indent=2)
 
@@ -328,6 +331,7 @@ class GitHubPythonCrawler:
                         })
                         print(f"파일 다운로드 및 품질 분석 완료: {file_info['path']}")
 
+        quality_filter.close()
         print(f"\n총 {len(downloaded_files)}개의 파일을 다운로드했습니다.")
         return downloaded_files
 
@@ -376,6 +380,9 @@ class GitHubPythonCrawler:
         downloaded_files = []
         total_files = len(python_files)
         
+        # 이미 수집한 코드와 같은 파일은 분석 결과 재사용
+        hash_index = self.quality_filter.build_hash_index(self.quality_filter.load_metadata())
+        
         print(f"총 {total_files}개의 파이썬 파일을 발견했습니다. 다운로드를 시작합니다...")
 
         for i, file_info in enumerate(python_files):
@@ -391,32 +398,28 @@ class GitHubPythonCrawler:
                 if content:
                     local_path = self.save_file(full_name, file_info['path'], content)
                     if local_path:
+                        # 메타데이터 업데이트
+                        self.update_metadata(repo_info, file_info, local_path)
+                        
+                        with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                            metadata = json.load(f)
+                        
                         # 품질 분석 수행 (선택적)
                         try:
-                            quality_filter = CodeQualityFilter(metadata_file=self.metadata_file)
-                            quality_score = quality_filter.evaluate_code_quality(local_path)
-                            code_lines = quality_filter.count_code_lines(local_path)
-                            complexity_info = quality_filter.check_code_complexity(local_path)
-                            is_suitable, reason = quality_filter.is_suitable_for_learning(local_path, repo_info)
+                            analysis = self.quality_filter.analyze_file(local_path, metadata[-1], hash_index)
                         except Exception as e:
                             print(f"\n품질 분석 오류 ({file_info['path']}): {str(e)}")
-                            quality_score = None
-                            code_lines = 0
-                            complexity_info = {}
-                            is_suitable = None
-                            reason = f"분석 오류: {str(e)}"
-                        
-                        # 메타데이터 업데이트
-                        self.update_metadata(repo_info, file_info, local_path, quality_score)
+                            analysis = {
+                                'quality_score': None,
+                                'code_lines': 0,
+                                'complexity': {},
+                                'is_suitable': None,
+                                'unsuitable_reason': f"분석 오류: {str(e)}"
+                            }
                         
                         # 품질 분석 정보 추가
-                        with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
                         if metadata:
-                            metadata[-1]['code_lines'] = code_lines
-                            metadata[-1]['complexity'] = complexity_info
-                            metadata[-1]['is_suitable'] = is_suitable
-                            metadata[-1]['unsuitable_reason'] = None if is_suitable else reason
+                            metadata[-1].update(analysis)
                             with open(self.metadata_file, 'w', encoding='utf-8') as f:
                                 json.dump(metadata, f, indent=2)
                         
@@ -428,6 +431,7 @@ class GitHubPythonCrawler:
             except Exception as e:
                 print(f"\n파일 처리 중 오류 발생 ({file_info['path']}): {str(e)}")
 
+        self.quality_filter.close()
         print(f"\n✅ 저장소 크롤링 완료: {len(downloaded_files)}개의 파일 다운로드됨")
         return downloaded_files
 
@@ -7,6 +7,7 @@ GitHub에서 수집한 파이썬 코드를 관리하기 위한 명령줄 인터
 """
 
 import os
+import re
 import sys
 import argparse
 import json
@@ -14,7 +15,15 @@ import textwrap
 from tabulate import tabulate
 from github_crawler import GitHubPythonCrawler
 from code_filter import CodeQualityFilter
-from code_storage import CodeStorageManager
+from code_storage import CodeStorageManager, IMPORT_BATCH_SIZE, SEARCH_SORTS
+from code_search import CodeGrep
+from quality_model import QualityPredictor, train_from_database, evaluate_model_file
+from code_dedup import CodeDeduplicator
+from code_embedding import CodeEmbedder
+from code_export import EXPORT_FORMATS, DEFAULT_COMPRESSION
+from dataset_export import (DatasetExporter, verify_dataset, SHARD_MB, SHARD_EXTENSIONS,
+                            DEFAULT_COMPRESSION as DATASET_COMPRESSION)
+from blob_store import get_store, read_source, PACK_DIR_NAME
 
 class CodeManagementInterface:
     """파이썬 코드 관리 인터페이스 클래스"""
@@ -45,9 +54,29 @@ class CodeManagementInterface:
             사용 예시:
               python manager.py crawl --query "language:python stars:>1000" --max-repos 5
               python manager.py filter
+              python manager.py filter --full
+              python manager.py filter --rescore --min-quality 7.5
+              python manager.py filter --profile strict --min-quality 8 --min-lines 30
+              python manager.py model train
+              python manager.py filter --model collected_code/quality_model.json
+              python manager.py dedup --threshold 0.8
+              python manager.py embed
+              python manager.py similar --id 42
+              python manager.py similar --file snippet.py --exact
               python manager.py search --query "algorithm" --suitable-only
+              python manager.py search --query "asyncio gather pars*"
+              python manager.py search --without-lint W0611,broad-exception-caught
+              python manager.py search --sort lines --limit 100 --cursor <이전 검색이 출력한 커서>
+              python manager.py grep "def \\w+_async\\(" -C 2
+              python manager.py symbols --name "*Parser" --kind class
+              python manager.py symbols --imports asyncio
               python manager.py view --id 1
               python manager.py stats
+              python manager.py stats --rebuild
+              python manager.py check-plans
+              python manager.py export --format parquet --include-content --suitable-only
+              python manager.py dataset --suitable-only --min-quality 7 --shard-mb 256
+              python manager.py pack --compact
             ''')
         )
         
@@ -61,6 +90,8 @@ class CodeManagementInterface:
                                 help='최대 저장소 수 (기본값: 5)')
         crawl_parser.add_argument('--max-files', type=int, default=10,
                                 help='저장소당 최대 파일 수 (기본값: 10)')
+        crawl_parser.add_argument('--pack', action='store_true',
+                                help='파일마다 따로 저장하지 않고 묶음 저장소(pack 파일)에 저장')
         
         # 필터링 명령
         filter_parser = subparsers.add_parser('filter', help='수집된 코드 필터링')
@@ -70,16 +101,101 @@ class CodeManagementInterface:
                                  help='최소 코드 라인 수 (기본값: 10)')
         filter_parser.add_argument('--max-lines', type=int, default=1000,
                                  help='최대 코드 라인 수 (기본값: 1000)')
+        filter_parser.add_argument('--full', action='store_true',
+                                 help='변경 여부와 관계없이 모든 파일을 다시 분석')
+        filter_parser.add_argument('--rescore', action='store_true',
+                                 help='분석기 실행 없이 저장된 지표로 적합성만 다시 판정')
+        filter_parser.add_argument('--profile', type=str,
+                                 help='기준 프로필 이름 (현재 판정은 유지하고 프로필 결과만 저장/비교)')
+        filter_parser.add_argument('--model', type=str,
+                                 help='품질 예측 모델 파일 (확신할 수 있는 파일은 pylint 생략)')
+        filter_parser.add_argument('--model-confidence', type=float, default=0.95,
+                                 help='pylint를 생략할 예측 판정 최소 신뢰도 (기본값: 0.95)')
+        filter_parser.add_argument('--timeout', type=float, default=60,
+                                 help='파일 하나당 최대 분석 시간 (초, 기본값: 60)')
+        filter_parser.add_argument('--memory-mb', type=int, default=2048,
+                                 help='분석 작업자 메모리 제한 (MB, 기본값: 2048)')
+        filter_parser.add_argument('--no-isolation', action='store_true',
+                                 help='분석을 별도 프로세스로 격리하지 않음 (디버깅용)')
+        
+        # 품질 예측 모델 명령
+        model_parser = subparsers.add_parser('model', help='품질 예측 모델 학습 및 평가')
+        model_parser.add_argument('action', choices=['train', 'eval'], help='작업')
+        model_parser.add_argument('--file', type=str, default=None,
+                                help='모델 파일 경로 (기본값: <기본 디렉토리>/quality_model.json)')
+        model_parser.add_argument('--min-quality', type=float, default=6.0,
+                                help='판정 일치율을 계산할 최소 품질 점수 (기본값: 6.0)')
+        model_parser.add_argument('--holdout', type=float, default=0.2,
+                                help='검증용 데이터 비율 (기본값: 0.2)')
+        model_parser.add_argument('--confidence', type=float, default=0.95,
+                                help='pylint를 생략할 최소 신뢰도 (기본값: 0.95)')
+        
+        # 유사 중복 탐지 명령
+        dedup_parser = subparsers.add_parser('dedup', help='유사 중복 코드 탐지')
+        dedup_parser.add_argument('--threshold', type=float, default=0.8,
+                                help='중복으로 볼 최소 Jaccard 유사도 (기본값: 0.8)')
+        dedup_parser.add_argument('--num-perm', type=int, default=128,
+                                help='MinHash 해시 함수 수 (기본값: 128)')
+        dedup_parser.add_argument('--full', action='store_true',
+                                help='저장된 서명을 무시하고 모든 파일의 서명을 다시 계산')
+        
+        # 임베딩 계산 명령
+        embed_parser = subparsers.add_parser('embed', help='유사 코드 검색용 임베딩 계산 및 색인 생성')
+        embed_parser.add_argument('--full', action='store_true',
+                                help='저장된 임베딩을 무시하고 모든 파일의 임베딩을 다시 계산')
+        embed_parser.add_argument('--lists', type=int,
+                                help='근사 검색 묶음 수 (기본값: 파일이 2만 개 이하이면 1, 그보다 많으면 파일 수의 제곱근)')
+        
+        # 유사 코드 검색 명령
+        similar_parser = subparsers.add_parser('similar', help='내용이 유사한 코드 검색')
+        similar_group = similar_parser.add_mutually_exclusive_group(required=True)
+        similar_group.add_argument('--id', type=int, help='기준 파일 ID')
+        similar_group.add_argument('--file', type=str, help='기준 코드 조각 파일 경로')
+        similar_parser.add_argument('--limit', type=int, default=10,
+                                  help='최대 결과 수 (기본값: 10)')
+        similar_parser.add_argument('--exact', action='store_true',
+                                  help='근사 검색 대신 모든 파일과 비교')
         
         # 검색 명령
         search_parser = subparsers.add_parser('search', help='코드 검색')
-        search_parser.add_argument('--query', type=str, help='검색어')
+        search_parser.add_argument('--query', type=str,
+                                 help='검색어 (경로, 파일명, 소스 코드 전문 검색, 단어 끝 *는 접두어 검색)')
         search_parser.add_argument('--tags', type=str, help='태그 (쉼표로 구분)')
         search_parser.add_argument('--min-quality', type=float, help='최소 품질 점수')
         search_parser.add_argument('--suitable-only', action='store_true',
                                  help='학습용으로 적합한 코드만 검색')
         search_parser.add_argument('--limit', type=int, default=20,
                                  help='최대 결과 수 (기본값: 20)')
+        search_parser.add_argument('--collapse-duplicates', action='store_true',
+                                 help='공백/주석/독스트링만 다른 중복 파일은 하나만 표시')
+        search_parser.add_argument('--with-lint', type=str,
+                                 help='모두 발생한 파일만 검색할 pylint 메시지 (ID, 심볼 또는 분류, 쉼표로 구분)')
+        search_parser.add_argument('--without-lint', type=str,
+                                 help='하나도 발생하지 않은 파일만 검색할 pylint 메시지 (쉼표로 구분)')
+        search_parser.add_argument('--sort', type=str, choices=list(SEARCH_SORTS),
+                                 help='정렬 기준 (기본값: 검색어가 있으면 relevance, 없으면 quality)')
+        search_parser.add_argument('--cursor', type=str,
+                                 help='이전 검색이 출력한 다음 페이지 커서')
+        
+        # 정규식 검색 명령
+        grep_parser = subparsers.add_parser('grep', help='정규식 코드 검색 (트라이그램 색인 사용)')
+        grep_parser.add_argument('pattern', type=str, help='정규식')
+        grep_parser.add_argument('-i', '--ignore-case', action='store_true', help='대소문자 무시')
+        grep_parser.add_argument('-C', '--context', type=int, default=0,
+                                 help='일치한 줄 앞뒤로 함께 표시할 줄 수 (기본값: 0)')
+        grep_parser.add_argument('--max-count', type=int, default=100,
+                                 help='최대 일치 줄 수 (기본값: 100)')
+        
+        # 심볼 검색 명령
+        symbols_parser = subparsers.add_parser('symbols', help='정의 이름 또는 가져온 모듈로 파일 찾기')
+        symbols_group = symbols_parser.add_mutually_exclusive_group(required=True)
+        symbols_group.add_argument('--name', type=str,
+                                   help='정의 이름 또는 GLOB 패턴 (대소문자 구분, 예: "*Parser")')
+        symbols_group.add_argument('--imports', type=str, help='가져오는 모듈 이름 (하위 모듈 포함)')
+        symbols_parser.add_argument('--kind', type=str, choices=['class', 'function', 'method'],
+                                    help='정의 종류')
+        symbols_parser.add_argument('--limit', type=int, default=50,
+                                    help='최대 결과 수 (기본값: 50)')
         
         # 파일 조회 명령
         view_parser = subparsers.add_parser('view', help='파일 조회')
@@ -93,20 +209,73 @@ class CodeManagementInterface:
         tag_parser.add_argument('--list', action='store_true', help='태그 목록 조회')
         
         # 통계 명령
-        subparsers.add_parser('stats', help='데이터 통계 조회')
+        stats_parser = subparsers.add_parser('stats', help='데이터 통계 조회')
+        stats_parser.add_argument('--rebuild', action='store_true',
+                                help='통계 카운터를 테이블 전체 집계로 다시 계산한 뒤 조회')
+        
+        # 실행 계획 검사 명령
+        subparsers.add_parser('check-plans', help='자주 쓰는 쿼리가 테이블 전체 스캔으로 바뀌었는지 검사')
         
         # 내보내기 명령
         export_parser = subparsers.add_parser('export', help='데이터 내보내기')
-        export_parser.add_argument('--format', type=str, choices=['csv', 'json'],
-                                 default='csv', help='내보내기 형식 (기본값: csv)')
+        export_parser.add_argument('--format', type=str, choices=['csv', 'json'] + list(EXPORT_FORMATS),
+                                 default='csv', help='내보내기 형식 (기본값: csv, parquet/arrow는 pyarrow 필요)')
         export_parser.add_argument('--output', type=str, help='출력 파일 경로')
+        export_parser.add_argument('--collapse-duplicates', action='store_true',
+                                 help='공백/주석/독스트링만 다른 중복 파일은 하나만 내보내기 (CSV, Parquet/Arrow)')
+        export_parser.add_argument('--include-secrets', action='store_true',
+                                 help='비밀 정보가 발견된 파일도 내보내기 (CSV, Parquet/Arrow, 기본값: 제외)')
+        export_parser.add_argument('--include-content', action='store_true',
+                                 help='소스 코드 열 포함 (Parquet/Arrow)')
+        export_parser.add_argument('--compression', type=str, default=DEFAULT_COMPRESSION,
+                                 help=f'열 압축 방식 (Parquet/Arrow, 기본값: {DEFAULT_COMPRESSION}, none이면 압축 안 함)')
+        export_parser.add_argument('--suitable-only', action='store_true',
+                                 help='적합한 파일만 내보내기 (Parquet/Arrow)')
+        
+        # 학습용 데이터셋 샤드 내보내기 명령
+        dataset_parser = subparsers.add_parser('dataset', help='학습용 데이터셋을 압축 JSONL 샤드로 내보내기')
+        dataset_parser.add_argument('--output', type=str,
+                                  help='샤드와 매니페스트를 쓸 디렉토리 (기본값: <기본 디렉토리>/dataset)')
+        dataset_parser.add_argument('--query', type=str, help='검색어 (search와 같은 형식)')
+        dataset_parser.add_argument('--tags', type=str, help='태그 (쉼표로 구분)')
+        dataset_parser.add_argument('--min-quality', type=float, help='최소 품질 점수')
+        dataset_parser.add_argument('--suitable-only', action='store_true',
+                                  help='학습용으로 적합한 코드만 내보내기')
+        dataset_parser.add_argument('--collapse-duplicates', action='store_true',
+                                  help='공백/주석/독스트링만 다른 중복 파일은 하나만 내보내기')
+        dataset_parser.add_argument('--include-secrets', action='store_true',
+                                  help='비밀 정보가 발견된 파일도 내보내기 (기본값: 제외)')
+        dataset_parser.add_argument('--shard-mb', type=float, default=SHARD_MB,
+                                  help=f'샤드 하나의 소스 코드 크기 (압축 전 MB, 기본값: {SHARD_MB})')
+        dataset_parser.add_argument('--compression', type=str, choices=list(SHARD_EXTENSIONS),
+                                  default=DATASET_COMPRESSION,
+                                  help=f'압축 방식 (기본값: {DATASET_COMPRESSION})')
+        dataset_parser.add_argument('--workers', type=int,
+                                  help='샤드를 쓰는 작업자 프로세스 수 (기본값: CPU 수)')
+        dataset_parser.add_argument('--verify', action='store_true',
+                                  help='내보내지 않고 매니페스트의 체크섬으로 기존 샤드만 확인')
+        
+        # 묶음 저장소 명령
+        pack_parser = subparsers.add_parser('pack', help='개별 소스 파일을 묶음 저장소(pack 파일)로 옮기기')
+        pack_parser.add_argument('--keep-files', action='store_true',
+                               help='옮긴 개별 파일을 지우지 않고 남겨 둠')
+        pack_parser.add_argument('--compact', action='store_true',
+                               help='삭제되거나 덮어쓴 항목이 차지하는 pack 파일 공간 회수')
+        pack_parser.add_argument('--stats', action='store_true',
+                               help='옮기지 않고 저장소 사용량만 출력')
         
         # 백업 명령
         backup_parser = subparsers.add_parser('backup', help='데이터 백업')
         backup_parser.add_argument('--dir', type=str, help='백업 디렉토리 경로')
         
         # 데이터베이스 동기화 명령
-        subparsers.add_parser('sync', help='메타데이터와 데이터베이스 동기화')
+        sync_parser = subparsers.add_parser('sync', help='메타데이터와 데이터베이스 동기화')
+        sync_parser.add_argument('--full', action='store_true',
+                                 help='마지막 동기화 이후 변경 여부와 관계없이 모든 항목 비교')
+        sync_parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                                 help=f'한 트랜잭션에서 가져올 항목 수 (기본값: {IMPORT_BATCH_SIZE})')
+        sync_parser.add_argument('--defer-indexes', action='store_true',
+                                 help='가져오는 동안 보조 인덱스를 지웠다가 마지막에 다시 생성 (대량 가져오기용)')
         
         return parser
     
@@ -118,6 +287,7 @@ class CodeManagementInterface:
             args: 명령줄 인수
         """
         print(f"GitHub에서 파이썬 코드 크롤링 시작 (쿼리: {args.query})")
+        self.crawler.pack_sources = args.pack
         
         # 크롤링 실행
         downloaded_files = self.crawler.crawl(
@@ -144,15 +314,148 @@ class CodeManagementInterface:
         self.filter.min_quality_score = args.min_quality
         self.filter.min_code_lines = args.min_lines
         self.filter.max_code_lines = args.max_lines
+        self.filter.analysis_timeout = args.timeout
+        self.filter.analysis_memory_mb = args.memory_mb
+        self.filter.isolate_analysis = not args.no_isolation
+        
+        # 품질 예측 모델 사용 설정
+        if args.model:
+            self.filter.quality_model = QualityPredictor.load(args.model)
+            self.filter.model_min_confidence = args.model_confidence
+        
+        # 기준 프로필 비교 (데이터베이스에 저장된 지표만 사용)
+        if args.profile:
+            self.storage.evaluate_profile(args.profile, self.filter)
+            profiles = self.storage.compare_profiles()
+            table_data = [[
+                p['name'], p['min_quality'], p['min_lines'], p['max_lines'],
+                p['suitable_count'], p['unsuitable_count']
+            ] for p in profiles]
+            headers = ['프로필', '최소 품질', '최소 라인', '최대 라인', '적합', '부적합']
+            print(tabulate(table_data, headers=headers, tablefmt='grid'))
+            return
+        
+        # 기준만 바뀐 경우 분석기 없이 재판정
+        if args.rescore:
+            suitable, unsuitable = self.storage.reevaluate_suitability(self.filter)
+            self.filter.rescore()
+            print(f"재판정 완료: 적합한 파일 {suitable}개, 부적합한 파일 {unsuitable}개")
+            return
         
-        # 필터링 실행
-        suitable, unsuitable = self.filter.filter_code()
+        # 필터링 실행 (기본은 새 파일/변경된 파일만 분석)
+        suitable, unsuitable = self.filter.filter_code(full=args.full)
         
         print(f"필터링 완료: 적합한 파일 {suitable}개, 부적합한 파일 {unsuitable}개")
         
         # 데이터베이스 동기화
         self.storage.import_from_metadata()
     
+    def quality_model(self, args):
+        """
+        품질 예측 모델 학습 및 평가
+        
+        Args:
+            args: 명령줄 인수
+        """
+        model_file = args.file or os.path.join(self.base_dir, "quality_model.json")
+        
+        if args.action == 'train':
+            report = train_from_database(
+                self.storage.db_file, model_file,
+                threshold=args.min_quality,
+                holdout=args.holdout,
+                min_confidence=args.confidence
+            )
+            if not report:
+                return
+            print(f"모델 학습 완료: {model_file} (학습 {report['train_count']}개)")
+        else:
+            if not os.path.exists(model_file):
+                print(f"모델 파일이 존재하지 않습니다: {model_file}")
+                return
+            report = evaluate_model_file(
+                self.storage.db_file, model_file,
+                threshold=args.min_quality,
+                min_confidence=args.confidence
+            )
+        
+        print("\n=== pylint 점수 대비 예측 성능 ===")
+        if report.get('in_sample'):
+            print("평가 대상: 학습에 쓴 파일 (검증용 파일이 없어 실제보다 좋게 나올 수 있음)")
+        else:
+            print("평가 대상: 학습에 쓰지 않은 검증용 파일")
+        print(f"평가 파일 수: {report.get('sample_count', 0)}")
+        if report.get('sample_count'):
+            print(f"평균 절대 오차: {report['mae']}")
+            print(f"RMSE: {report['rmse']}")
+            print(f"결정 계수(R²): {report['r2']}")
+            print(f"적합성 판정 일치율: {report['decision_agreement']:.1%}")
+            print(f"pylint 생략 비율: {report['skipped_ratio']:.1%}")
+            if report['confident_agreement'] is not None:
+                print(f"생략된 파일의 판정 일치율: {report['confident_agreement']:.1%}")
+    
+    def deduplicate(self, args):
+        """
+        유사 중복 코드 탐지
+        
+        Args:
+            args: 명령줄 인수
+        """
+        print(f"유사 중복 코드 탐지 시작 (기준 유사도: {args.threshold})")
+        
+        deduplicator = CodeDeduplicator(
+            self.storage.db_file,
+            threshold=args.threshold,
+            num_perm=args.num_perm
+        )
+        clusters, duplicates = deduplicator.mark_duplicates(full=args.full)
+        
+        print(f"중복 탐지 완료: {clusters}개 묶음, 중복 파일 {duplicates}개")
+    
+    def embed(self, args):
+        """
+        유사 코드 검색용 임베딩 계산 및 색인 생성
+        
+        Args:
+            args: 명령줄 인수
+        """
+        embedder = CodeEmbedder(self.storage.db_file)
+        computed = embedder.update_embeddings(full=args.full)
+        print(f"임베딩 계산: {computed}개 파일")
+        
+        count, lists = embedder.build_index(lists=args.lists)
+        print(f"색인 생성 완료: {count}개 파일, 묶음 {lists}개")
+    
+    def find_similar(self, args):
+        """
+        내용이 유사한 코드 검색
+        
+        Args:
+            args: 명령줄 인수
+        """
+        content = None
+        if args.file:
+            try:
+                with open(args.file, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            except OSError as e:
+                print(f"파일을 읽을 수 없습니다: {str(e)}")
+                return
+        
+        results = self.storage.find_similar(file_id=args.id, content=content,
+                                            limit=args.limit, exact=args.exact)
+        if not results:
+            print("검색 결과가 없습니다. (색인이 없으면 먼저 embed 명령을 실행하세요)")
+            return
+        
+        table_data = [[item['id'], item['repo_name'], item['path'],
+                       f"{item['quality_score']:.1f}" if item['quality_score'] else 'N/A',
+                       f"{item['similarity']:.3f}"]
+                      for item in results]
+        headers = ['ID', '저장소', '경로', '품질 점수', '유사도']
+        print(tabulate(table_data, headers=headers, tablefmt='grid'))
+        print(f"총 {len(results)}개 결과")
+    
     def search(self, args):
         """
         코드 검색
@@ -162,15 +465,27 @@ class CodeManagementInterface:
         """
         # 태그 목록 변환
         tags = args.tags.split(',') if args.tags else None
+        with_lint = args.with_lint.split(',') if args.with_lint else None
+        without_lint = args.without_lint.split(',') if args.without_lint else None
         
         # 검색 실행
-        results = self.storage.search_files(
-            query=args.query,
-            tags=tags,
-            min_quality=args.min_quality,
-            suitable_only=args.suitable_only,
-            limit=args.limit
-        )
+        try:
+            page = self.storage.search_page(
+                query=args.query,
+                tags=tags,
+                min_quality=args.min_quality,
+                suitable_only=args.suitable_only,
+                limit=args.limit,
+                collapse_duplicates=args.collapse_duplicates,
+                with_lint=with_lint,
+                without_lint=without_lint,
+                sort=args.sort,
+                cursor=args.cursor
+            )
+        except ValueError as e:
+            print(f"검색 오류: {str(e)}")
+            return
+        results = page['results']
         
         if not results:
             print("검색 결과가 없습니다.")
@@ -188,8 +503,72 @@ class CodeManagementInterface:
                 '✓' if item['is_suitable'] else '✗',
                 ', '.join(item['tags']) if item['tags'] else ''
             ])
+            if 'snippet' in item:
+                table_data[-1].append(' '.join((item['snippet'] or '').split()))
         
         headers = ['ID', '파일명', '저장소', '품질 점수', '코드 라인', '적합성', '태그']
+        if args.query:
+            headers.append('일치 부분')
+        print(tabulate(table_data, headers=headers, tablefmt='grid'))
+        print(f"총 {len(results)}개 결과")
+        if page['next_cursor']:
+            print(f"다음 페이지: --cursor {page['next_cursor']}")
+    
+    def grep(self, args):
+        """
+        정규식 코드 검색 (grep 형식으로 찾는 대로 출력)
+        
+        Args:
+            args: 명령줄 인수
+        """
+        searcher = CodeGrep(self.storage.db_file)
+        try:
+            matches = searcher.grep(args.pattern, ignore_case=args.ignore_case,
+                                    context=args.context, max_matches=args.max_count)
+            for count, match in enumerate(matches):
+                name = f"{match['repo_name']}/{match['path']}"
+                if args.context and count:
+                    print('--')
+                first = match['line'] - len(match['before'])
+                for offset, line in enumerate(match['before']):
+                    print(f"{name}-{first + offset}-{line}")
+                print(f"{name}:{match['line']}:{match['text']}")
+                for offset, line in enumerate(match['after'], 1):
+                    print(f"{name}-{match['line'] + offset}-{line}")
+        except re.error as e:
+            print(f"올바르지 않은 정규식: {str(e)}")
+            return
+        
+        stats = searcher.stats
+        print(f"총 {stats['matches']}줄 일치 ({stats['matched_files']}개 파일, "
+              f"후보 {stats['candidates']}개 / 전체 {stats['files']}개 파일 확인)")
+        if stats['unreadable']:
+            print(f"경고: 원본을 읽지 못한 큰 파일 {stats['unreadable']}개는 색인된 앞부분만 확인했습니다 "
+                  f"(결과가 불완전할 수 있음)")
+    
+    def find_symbols(self, args):
+        """
+        정의 이름 또는 가져온 모듈로 파일 찾기
+        
+        Args:
+            args: 명령줄 인수
+        """
+        if args.imports:
+            results = self.storage.find_importers(args.imports, limit=args.limit)
+            table_data = [[item['file_id'], item['repo_name'], item['path'], item['module']]
+                          for item in results]
+            headers = ['ID', '저장소', '경로', '모듈']
+        else:
+            results = self.storage.find_symbols(args.name, kind=args.kind, limit=args.limit)
+            table_data = [[item['file_id'], item['repo_name'], f"{item['path']}:{item['line']}",
+                           item['kind'], f"{item['qualname']}{item['signature'] or ''}"]
+                          for item in results]
+            headers = ['ID', '저장소', '위치', '종류', '정의']
+        
+        if not results:
+            print("검색 결과가 없습니다.")
+            return
+        
         print(tabulate(table_data, headers=headers, tablefmt='grid'))
         print(f"총 {len(results)}개 결과")
     
@@ -200,14 +579,8 @@ class CodeManagementInterface:
         Args:
             args: 명령줄 인수
         """
-        # 파일 정보 검색
-        results = self.storage.search_files(limit=1)
-        file_info = None
-        
-        for item in results:
-            if item['id'] == args.id:
-                file_info = item
-                break
+        # 파일 정보 조회
+        file_info = self.storage.get_file(args.id)
         
         if not file_info:
             print(f"ID가 {args.id}인 파일을 찾을 수 없습니다.")
@@ -225,9 +598,8 @@ class CodeManagementInterface:
         
         # 파일 내용 출력
         try:
-            with open(file_info['local_path'], 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                print(content[:1000] + ('...' if len(content) > 1000 else ''))
+            content = read_source(file_info['local_path'])
+            print(content[:1000] + ('...' if len(content) > 1000 else ''))
         except Exception as e:
             print(f"파일 내용 읽기 오류: {str(e)}")
     
@@ -256,8 +628,10 @@ class CodeManagementInterface:
             else:
                 print(f"파일 {args.id}에 태그가 없습니다.")
     
-    def show_stats(self):
+    def show_stats(self, args):
         """데이터 통계 조회"""
+        if args.rebuild and self.storage.rebuild_statistics():
+            print("통계 카운터를 다시 계산했습니다.")
         stats = self.storage.get_statistics()
         
         if not stats:
@@ -268,6 +642,9 @@ class CodeManagementInterface:
         print(f"저장소 수: {stats['repository_count']}")
         print(f"파일 수: {stats['file_count']}")
         print(f"학습용으로 적합한 파일 수: {stats['suitable_file_count']}")
+        print(f"유사 중복 파일 수: {stats['duplicate_file_count']}")
+        print(f"정확 중복 파일 수: {stats['exact_duplicate_count']}")
+        print(f"비밀 정보 포함 파일 수: {stats['secret_file_count']}")
         print(f"태그 수: {stats['tag_count']}")
         print(f"평균 품질 점수: {stats['average_quality_score']:.2f}")
         print(f"평균 코드 라인 수: {stats['average_code_lines']:.1f}")
@@ -277,6 +654,19 @@ class CodeManagementInterface:
             for license_name, count in stats['license_distribution'].items():
                 print(f"- {license_name}: {count}개")
     
+    def check_plans(self):
+        """자주 쓰는 쿼리의 실행 계획 검사 (전체 스캔이 있으면 종료 코드 1)"""
+        regressions = self.storage.check_query_plans()
+        
+        if not regressions:
+            print("모든 쿼리가 인덱스를 사용합니다.")
+            return
+        
+        print("테이블 전체를 스캔하는 쿼리:")
+        for name, scans in regressions.items():
+            print(f"- {name}: {', '.join(scans)}")
+        sys.exit(1)
+    
     def export_data(self, args):
         """
         데이터 내보내기
@@ -286,12 +676,70 @@ class CodeManagementInterface:
         """
         if args.format == 'csv':
             output_file = args.output if args.output else "code_data.csv"
-            if self.storage.export_to_csv(output_file):
+            if self.storage.export_to_csv(output_file, collapse_duplicates=args.collapse_duplicates,
+                                          include_secrets=args.include_secrets):
                 print(f"CSV 파일로 내보내기 완료: {os.path.join(self.base_dir, output_file)}")
         elif args.format == 'json':
             output_file = args.output if args.output else "code_data.json"
             if self.storage.export_to_metadata():
                 print(f"JSON 파일로 내보내기 완료: {self.storage.metadata_file}")
+        else:
+            output_file = args.output if args.output else "code_data" + EXPORT_FORMATS[args.format]
+            self.storage.export_columnar(
+                output_file, fmt=args.format, include_content=args.include_content,
+                compression=None if args.compression == 'none' else args.compression,
+                suitable_only=args.suitable_only, collapse_duplicates=args.collapse_duplicates,
+                include_secrets=args.include_secrets
+            )
+    
+    def export_dataset(self, args):
+        """
+        학습용 데이터셋 샤드 내보내기 (같은 디렉토리로 다시 실행하면 완성된 샤드는 건너뜀)
+        
+        Args:
+            args: 명령줄 인수
+        """
+        output_dir = args.output if args.output else os.path.join(self.base_dir, "dataset")
+        
+        if args.verify:
+            problems = verify_dataset(output_dir)
+            if problems is None:
+                print(f"매니페스트가 없습니다: {output_dir}")
+                sys.exit(1)
+            if problems:
+                print(f"체크섬이 맞지 않거나 없는 샤드: {', '.join(problems)}")
+                sys.exit(1)
+            print("모든 샤드의 체크섬이 매니페스트와 일치합니다.")
+            return
+        
+        exporter = DatasetExporter(self.storage, output_dir, shard_mb=args.shard_mb,
+                                   compression=args.compression, workers=args.workers)
+        exporter.export(
+            include_secrets=args.include_secrets,
+            query=args.query,
+            tags=args.tags.split(',') if args.tags else None,
+            min_quality=args.min_quality,
+            suitable_only=args.suitable_only,
+            collapse_duplicates=args.collapse_duplicates
+        )
+    
+    def pack_sources(self, args):
+        """
+        개별 소스 파일을 묶음 저장소로 옮기고 저장소 사용량 출력
+        
+        Args:
+            args: 명령줄 인수
+        """
+        store = get_store(os.path.join(self.base_dir, PACK_DIR_NAME))
+        if not args.stats:
+            self.storage.pack_sources(remove_files=not args.keep_files)
+        if args.compact:
+            store.compact()
+        
+        stats = store.stats()
+        print(f"항목: {stats['entries']}개 (삭제 표시 {stats['deleted']}개), pack 파일: {stats['packs']}개")
+        print(f"pack 파일 크기: {stats['pack_bytes'] / 1024 / 1024:.1f}MB "
+              f"(원본 {stats['raw_bytes'] / 1024 / 1024:.1f}MB)")
     
     def backup(self, args):
         """
@@ -304,13 +752,26 @@ class CodeManagementInterface:
         if backup_dir:
             print(f"데이터 백업 완료: {backup_dir}")
     
-    def sync_database(self):
-        """메타데이터와 데이터베이스 동기화"""
-        repo_count, file_count = self.storage.import_from_metadata()
-        print(f"메타데이터에서 데이터베이스로 가져오기 완료: {repo_count}개 저장소, {file_count}개 파일")
+    def sync_database(self, args):
+        """
+        메타데이터와 데이터베이스 동기화
         
-        file_count = self.storage.export_to_metadata()
-        print(f"데이터베이스에서 메타데이터로 내보내기 완료: {file_count}개 파일")
+        Args:
+            args: 명령줄 인수
+        """
+        result = self.storage.sync_metadata(
+            full=args.full,
+            batch_size=args.batch_size,
+            defer_indexes=args.defer_indexes
+        )
+        if result['failed']:
+            sys.exit(1)
+        
+        imported = result['imported']
+        if imported is not None:
+            print(f"메타데이터에서 데이터베이스로 가져오기 완료: 추가 {imported['inserted']}개, "
+                  f"갱신 {imported['updated']}개, 삭제 {imported['deleted']}개, 변경 없음 {imported['unchanged']}개")
+        print(f"데이터베이스에서 메타데이터로 내보내기 완료: 판정 변경 {result['exported']}개 항목")
     
     def run(self, args=None):
         """
@@ -331,20 +792,38 @@ class CodeManagementInterface:
             self.crawl(args)
         elif args.command == 'filter':
             self.filter_code(args)
+        elif args.command == 'model':
+            self.quality_model(args)
+        elif args.command == 'dedup':
+            self.deduplicate(args)
+        elif args.command == 'embed':
+            self.embed(args)
+        elif args.command == 'similar':
+            self.find_similar(args)
         elif args.command == 'search':
             self.search(args)
+        elif args.command == 'grep':
+            self.grep(args)
+        elif args.command == 'symbols':
+            self.find_symbols(args)
         elif args.command == 'view':
             self.view_file(args)
         elif args.command == 'tag':
             self.manage_tags(args)
         elif args.command == 'stats':
-            self.show_stats()
+            self.show_stats(args)
+        elif args.command == 'check-plans':
+            self.check_plans()
         elif args.command == 'export':
             self.export_data(args)
+        elif args.command == 'dataset':
+            self.export_dataset(args)
+        elif args.command == 'pack':
+            self.pack_sources(args)
         elif args.command == 'backup':
             self.backup(args)
         elif args.command == 'sync':
-            self.sync_database()
+            self.sync_database(args)
         else:
             parser.print_help()
 
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+코드 품질 예측 모델
+
+AST에서 얻을 수 있는 저비용 정적 지표로 pylint 점수를 예측하는 선형 모델입니다.
+데이터베이스에 저장된 실제 pylint 점수로 학습하며, 예측값이 최소 품질 점수에
+가까워 판정이 불확실한 파일만 pylint를 실행하도록 하는 데 사용합니다.
+"""
+
+import os
+import ast
+import json
+import math
+import hashlib
+from datetime import datetime
+import numpy as np
+from db_connection import get_pool
+from blob_store import read_source
+
+# 모델 입력 지표 (순서가 모델 가중치 순서와 같아야 함)
+FEATURE_NAMES = [
+    'log_code_lines',
+    'comment_ratio',
+    'blank_ratio',
+    'avg_line_length',
+    'long_line_ratio',
+    'trailing_whitespace_ratio',
+    'function_density',
+    'class_density',
+    'docstring_ratio',
+    'avg_function_length',
+    'max_nesting_depth',
+    'import_density',
+    'wildcard_imports',
+    'bare_except_count',
+    'broad_except_count',
+    'global_statements',
+    'many_arguments_ratio',
+    'avg_identifier_length',
+    'short_identifier_ratio',
+    'statement_density'
+]
+
+# pylint 기본 최대 라인 길이
+MAX_LINE_LENGTH = 100
+
+# 이 개수를 넘는 인자를 가진 함수 비율
+MAX_ARGUMENTS = 5
+
+NESTING_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try)
+
+
+def _nesting_depth(tree):
+    """제어 구문의 최대 중첩 깊이 계산 (깊은 AST에서도 재귀 한도에 걸리지 않도록 반복 처리)"""
+    deepest = 0
+    stack = [(tree, 0)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        for child in ast.iter_child_nodes(node):
+            stack.append((child, depth + 1 if isinstance(child, NESTING_NODES) else depth))
+    return deepest
+
+
+def extract_features(content, tree=None):
+    """
+    파일 내용에서 모델 입력 지표 추출
+
+    Args:
+        content (str): 파일 내용
+        tree (ast.Module, optional): 이미 파싱된 AST (있으면 다시 파싱하지 않음)
+
+    Returns:
+        list: FEATURE_NAMES 순서의 지표 값 (구문 오류면 None)
+    """
+    if tree is None:
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return None
+
+    lines = content.splitlines() or ['']
+    total_lines = len(lines)
+    stripped = [line.strip() for line in lines]
+    blank_lines = sum(1 for line in stripped if not line)
+    comment_lines = sum(1 for line in stripped if line.startswith('#'))
+    non_blank = max(total_lines - blank_lines, 1)
+    code_lines = max(non_blank - comment_lines, 1)
+
+    functions = []
+    classes = 0
+    documented = 0
+    imports = 0
+    wildcard_imports = 0
+    bare_excepts = 0
+    broad_excepts = 0
+    global_statements = 0
+    statements = 0
+    identifiers = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.stmt):
+            statements += 1
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node)
+            identifiers.append(node.name)
+            if ast.get_docstring(node):
+                documented += 1
+        elif isinstance(node, ast.ClassDef):
+            classes += 1
+            identifiers.append(node.name)
+            if ast.get_docstring(node):
+                documented += 1
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports += 1
+            if any(alias.name == '*' for alias in node.names):
+                wildcard_imports += 1
+        elif isinstance(node, ast.ExceptHandler):
+            if node.type is None:
+                bare_excepts += 1
+            elif isinstance(node.type, ast.Name) and node.type.id in ('Exception', 'BaseException'):
+                broad_excepts += 1
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            global_statements += 1
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            identifiers.append(node.id)
+        elif isinstance(node, ast.arg):
+            identifiers.append(node.arg)
+
+    definitions = len(functions) + classes
+    function_lengths = [
+        (getattr(f, 'end_lineno', f.lineno) or f.lineno) - f.lineno + 1 for f in functions
+    ]
+    many_arguments = sum(
+        1 for f in functions
+        if len(f.args.args) + len(f.args.kwonlyargs) + len(f.args.posonlyargs) > MAX_ARGUMENTS
+    )
+
+    return [
+        math.log1p(code_lines),
+        comment_lines / non_blank,
+        blank_lines / total_lines,
+        sum(len(line) for line in lines) / total_lines,
+        sum(1 for line in lines if len(line) > MAX_LINE_LENGTH) / total_lines,
+        sum(1 for line in lines if line != line.rstrip()) / total_lines,
+        len(functions) / code_lines * 100,
+        classes / code_lines * 100,
+        (documented + (1 if ast.get_docstring(tree) else 0)) / (definitions + 1),
+        sum(function_lengths) / len(function_lengths) if function_lengths else 0.0,
+        _nesting_depth(tree),
+        imports / code_lines * 100,
+        wildcard_imports,
+        bare_excepts,
+        broad_excepts,
+        global_statements,
+        many_arguments / len(functions) if functions else 0.0,
+        sum(len(name) for name in identifiers) / len(identifiers) if identifiers else 0.0,
+        sum(1 for name in identifiers if len(name) <= 2) / len(identifiers) if identifiers else 0.0,
+        statements / code_lines
+    ]
+
+
+class QualityPredictor:
+    """pylint 점수를 예측하는 릿지 회귀 모델 클래스"""
+
+    def __init__(self, l2=1.0):
+        """
+        예측 모델 초기화
+
+        Args:
+            l2 (float): 릿지 정규화 강도
+        """
+        self.l2 = l2
+        self.feature_names = list(FEATURE_NAMES)
+        self.means = [0.0] * len(FEATURE_NAMES)
+        self.scales = [1.0] * len(FEATURE_NAMES)
+        self.weights = [0.0] * len(FEATURE_NAMES)
+        self.bias = 0.0
+        self.residual_std = 10.0
+        self.trained_at = None
+        self.sample_count = 0
+        # 학습에서 뺀 검증용 비율 (split_holdout 기준, 0이면 검증용 데이터 없음)
+        self.holdout = 0.0
+
+    @property
+    def is_trained(self):
+        """학습 여부"""
+        return self.sample_count > 0
+
+    def fit(self, features, scores):
+        """
+        지표와 실제 pylint 점수로 모델 학습
+
+        Args:
+            features (list): 파일별 지표 목록
+            scores (list): 파일별 pylint 점수
+
+        Returns:
+            QualityPredictor: 학습된 모델
+        """
+        X = np.asarray(features, dtype=np.float64)
+        y = np.asarray(scores, dtype=np.float64)
+
+        means = X.mean(axis=0)
+        scales = X.std(axis=0)
+        scales[scales == 0] = 1.0
+        Xs = (X - means) / scales
+
+        # 표준화된 입력에 대한 릿지 회귀 닫힌 해
+        bias = y.mean()
+        gram = Xs.T @ Xs + self.l2 * np.eye(Xs.shape[1])
+        weights = np.linalg.solve(gram, Xs.T @ (y - bias))
+
+        residuals = y - (Xs @ weights + bias)
+
+        self.means = means.tolist()
+        self.scales = scales.tolist()
+        self.weights = weights.tolist()
+        self.bias = float(bias)
+        self.residual_std = max(float(residuals.std()), 1e-3)
+        self.trained_at = datetime.now().isoformat()
+        self.sample_count = len(y)
+        return self
+
+    def predict(self, features):
+        """
+        지표로 품질 점수 예측
+
+        Args:
+            features (list): 파일 하나의 지표
+
+        Returns:
+            float: 예측 품질 점수 (0-10)
+        """
+        score = self.bias
+        for value, mean, scale, weight in zip(features, self.means, self.scales, self.weights):
+            score += (value - mean) / scale * weight
+        return min(10.0, max(0.0, score))
+
+    def decision_confidence(self, predicted_score, threshold):
+        """
+        예측 점수로 내린 적합성 판정이 pylint 판정과 같을 확률 추정
+
+        예측 오차를 잔차 표준편차를 가진 정규분포로 가정합니다.
+
+        Args:
+            predicted_score (float): 예측 품질 점수
+            threshold (float): 최소 품질 점수
+
+        Returns:
+            float: 신뢰도 (0.5-1.0)
+        """
+        z = abs(predicted_score - threshold) / self.residual_std
+        return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+    def evaluate(self, features, scores, threshold, min_confidence=0.95):
+        """
+        실제 pylint 점수 대비 예측 성능 평가
+
+        Args:
+            features (list): 파일별 지표 목록
+            scores (list): 파일별 실제 pylint 점수
+            threshold (float): 최소 품질 점수
+            min_confidence (float): pylint를 생략할 최소 신뢰도
+
+        Returns:
+            dict: 평균 절대 오차, 결정 계수, 판정 일치율, pylint 생략 비율 등
+        """
+        predictions = np.array([self.predict(f) for f in features])
+        actual = np.asarray(scores, dtype=np.float64)
+        if len(actual) == 0:
+            return {'sample_count': 0}
+
+        errors = predictions - actual
+        variance = float(((actual - actual.mean()) ** 2).sum())
+        agree = (predictions >= threshold) == (actual >= threshold)
+        confident = np.array([
+            self.decision_confidence(p, threshold) >= min_confidence for p in predictions
+        ])
+
+        return {
+            'sample_count': int(len(actual)),
+            'mae': round(float(np.abs(errors).mean()), 3),
+            'rmse': round(float(np.sqrt((errors ** 2).mean())), 3),
+            'r2': round(1.0 - float((errors ** 2).sum()) / variance, 3) if variance else 0.0,
+            'decision_agreement': round(float(agree.mean()), 3),
+            'skipped_ratio': round(float(confident.mean()), 3),
+            'confident_agreement': round(float(agree[confident].mean()), 3) if confident.any() else None
+        }
+
+    def save(self, model_file):
+        """
+        모델을 JSON 파일로 저장
+
+        Args:
+            model_file (str): 모델 파일 경로
+        """
+        with open(model_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'feature_names': self.feature_names,
+                'l2': self.l2,
+                'means': self.means,
+                'scales': self.scales,
+                'weights': self.weights,
+                'bias': self.bias,
+                'residual_std': self.residual_std,
+                'trained_at': self.trained_at,
+                'sample_count': self.sample_count,
+                'holdout': self.holdout
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, model_file):
+        """
+        JSON 파일에서 모델 불러오기
+
+        Args:
+            model_file (str): 모델 파일 경로
+
+        Returns:
+            QualityPredictor: 불러온 모델
+        """
+        with open(model_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('feature_names') != FEATURE_NAMES:
+            raise ValueError("모델의 지표 구성이 현재 버전과 다릅니다. 다시 학습하세요.")
+
+        model = cls(l2=data.get('l2', 1.0))
+        model.means = data['means']
+        model.scales = data['scales']
+        model.weights = data['weights']
+        model.bias = data['bias']
+        model.residual_std = data['residual_std']
+        model.trained_at = data.get('trained_at')
+        model.sample_count = data.get('sample_count', 0)
+        model.holdout = data.get('holdout', 0.0)
+        return model
+
+
+def load_training_data(db_file):
+    """
+    데이터베이스에서 pylint로 평가된 파일의 지표와 점수 불러오기
+
+    Args:
+        db_file (str): 데이터베이스 파일 경로
+
+    Returns:
+        tuple: (파일 키 목록, 지표 목록, 점수 목록)
+            파일 키는 '저장소 전체 이름/파일 경로'로, 소스를 묶음 저장소로 옮겨도 바뀌지 않음
+    """
+    with get_pool(db_file).connection() as conn:
+        cursor = conn.cursor()
+        # 모델이 예측한 점수와 유사 중복 파일은 학습에 쓰지 않음
+        cursor.execute('''
+        SELECT r.full_name || '/' || f.path, f.local_path, f.quality_score, f.normalized_hash
+        FROM files f
+        JOIN repositories r ON f.repo_id = r.id
+        WHERE f.quality_score IS NOT NULL
+          AND (f.evaluation_tier IS NULL OR f.evaluation_tier = 'pylint')
+          AND f.duplicate_of IS NULL
+        ORDER BY f.id
+        ''')
+        rows = cursor.fetchall()
+
+    keys, features, scores = [], [], []
+    seen_hashes = set()
+    for key, local_path, score, normalized_hash in rows:
+        # 정규화 내용이 같은 파일은 한 번만 사용
+        if normalized_hash is not None:
+            if normalized_hash in seen_hashes:
+                continue
+            seen_hashes.add(normalized_hash)
+        try:
+            content = read_source(local_path)
+        except OSError:
+            continue
+
+        row_features = extract_features(content)
+        if row_features is None:
+            continue
+        keys.append(key)
+        features.append(row_features)
+        scores.append(score)
+
+    return keys, features, scores
+
+
+def split_holdout(keys, holdout=0.2):
+    """
+    파일 키 해시 기반의 결정적인 학습/검증 분할
+
+    Args:
+        keys (list): 파일 키 목록
+        holdout (float): 검증용 비율
+
+    Returns:
+        list: 각 항목이 검증용인지 여부
+    """
+    return [
+        int(hashlib.md5(key.encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF < holdout
+        for key in keys
+    ]
+
+
+def train_from_database(db_file, model_file, threshold=6.0, holdout=0.2, min_confidence=0.95):
+    """
+    데이터베이스의 pylint 점수로 모델을 학습하고 검증 결과와 함께 저장
+
+    Args:
+        db_file (str): 데이터베이스 파일 경로
+        model_file (str): 저장할 모델 파일 경로
+        threshold (float): 판정 일치율을 계산할 최소 품질 점수
+        holdout (float): 검증용 비율
+        min_confidence (float): pylint를 생략할 최소 신뢰도
+
+    검증용 파일은 저장하는 모델의 학습에도 쓰지 않으므로, 나중에 evaluate_model_file로
+    같은 검증용 파일에서 다시 평가할 수 있습니다.
+
+    Returns:
+        dict: 검증 결과 (학습 데이터가 없으면 None, in_sample이 참이면 학습 데이터로 평가한 결과)
+    """
+    keys, features, scores = load_training_data(db_file)
+    if len(scores) < len(FEATURE_NAMES):
+        print(f"학습 데이터가 부족합니다: {len(scores)}개")
+        return None
+
+    is_holdout = split_holdout(keys, holdout)
+    train_x = [f for f, h in zip(features, is_holdout) if not h]
+    train_y = [s for s, h in zip(scores, is_holdout) if not h]
+    test_x = [f for f, h in zip(features, is_holdout) if h]
+    test_y = [s for s, h in zip(scores, is_holdout) if h]
+
+    model = QualityPredictor().fit(train_x, train_y)
+    report = model.evaluate(test_x or train_x, test_y or train_y, threshold, min_confidence)
+    report['in_sample'] = not test_y
+
+    # 신뢰도 계산에는 학습 잔차보다 큰 검증 오차를 사용
+    if test_y:
+        model.residual_std = max(model.residual_std, report['rmse'])
+        model.holdout = holdout
+    model.save(model_file)
+    report['train_count'] = len(train_y)
+    report['model_file'] = os.path.abspath(model_file)
+    return report
+
+
+def evaluate_model_file(db_file, model_file, threshold=6.0, min_confidence=0.95):
+    """
+    저장된 모델을 데이터베이스의 실제 pylint 점수와 비교 평가
+
+    Args:
+        db_file (str): 데이터베이스 파일 경로
+        model_file (str): 모델 파일 경로
+        threshold (float): 최소 품질 점수
+        min_confidence (float): pylint를 생략할 최소 신뢰도
+
+    학습할 때 뺀 검증용 파일(과 그 뒤 추가된 같은 분할의 파일)로만 평가합니다.
+    검증용 비율이 기록되지 않은 모델은 모든 파일로 평가하며, 학습 데이터가 섞여
+    실제보다 좋게 나오므로 결과에 in_sample로 표시합니다.
+
+    Returns:
+        dict: 평가 결과
+    """
+    model = QualityPredictor.load(model_file)
+    keys, features, scores = load_training_data(db_file)
+    if model.holdout:
+        is_holdout = split_holdout(keys, model.holdout)
+        features = [f for f, h in zip(features, is_holdout) if h]
+        scores = [s for s, h in zip(scores, is_holdout) if h]
+    report = model.evaluate(features, scores, threshold, min_confidence)
+    report['in_sample'] = not model.holdout
+    return report
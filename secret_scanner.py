@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+비밀 정보 탐지 모듈
+
+API 키, 개인 키, 토큰, 비밀번호처럼 학습 데이터에 들어가면 안 되는 값을 찾습니다.
+모든 규칙의 고정 문자열(앵커)을 하나의 정규식으로 컴파일하여 파일을 한 번만 훑고,
+앵커가 나온 줄에서만 해당 규칙의 정규식으로 확인합니다. 대부분의 파일에는 앵커가
+없으므로 검사 비용은 사실상 한 번의 문자열 탐색입니다.
+형식이 느슨한 규칙(일반 비밀번호 대입 등)은 값의 엔트로피와 자리표시자 여부로
+오탐을 거르며, 탐지 결과에는 값 전체를 남기지 않고 앞부분만 기록합니다.
+"""
+
+import re
+import math
+import string
+from collections import Counter
+
+# 비밀 정보가 발견된 파일의 부적합 이유
+SECRET_REASON = "비밀 정보 포함"
+
+# 탐지 결과에 남길 값 앞부분 길이
+MASK_PREFIX = 4
+
+# 소문자로 바꾸면 길이가 달라지는 유니코드 문자가 있을 때 쓰는 ASCII 전용 변환표
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# (규칙 이름, 앵커 목록(소문자), 정규식, 최소 엔트로피) - 값은 'value' 그룹, 없으면 전체 일치
+SECRET_RULES = [
+    ('private_key', ['-----begin'],
+     r'-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----', None),
+    ('aws_access_key', ['akia', 'asia'], r'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b', None),
+    ('aws_secret_key', ['aws_secret', 'awssecret'],
+     r'(?i:aws_?secret_?access_?key)\w*[\'"]?\s*[:=]\s*[\'"](?P<value>[A-Za-z0-9/+=]{40})[\'"]', 4.0),
+    ('github_token', ['ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_', 'github_pat_'],
+     r'\b(?:gh[pousr]_[A-Za-z0-9]{36,}|github_pat_[A-Za-z0-9_]{60,})', None),
+    ('slack_token', ['xox'], r'\bxox[abposr]-[A-Za-z0-9-]{10,}', None),
+    ('google_api_key', ['aiza'], r'\bAIza[0-9A-Za-z_\-]{35}', None),
+    ('stripe_key', ['k_live_'], r'\b[sr]k_live_[0-9A-Za-z]{20,}', None),
+    ('jwt', ['eyj'], r'\beyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}', None),
+    ('url_credentials', ['://'],
+     r'\b[a-z][a-z0-9+.-]{1,15}://[^/\s:@\'"]{1,64}:(?P<value>[^/\s:@\'"]{6,})@', 3.0),
+    ('generic_secret',
+     ['password', 'passwd', 'pwd', 'secret', 'aws_secret', 'awssecret', 'api_key', 'apikey',
+      'access_token', 'auth_token', 'private_key', 'privatekey'],
+     r'(?i:password|passwd|pwd|secret|api_?key|access_?token|auth_?token|client_?secret|private_?key)'
+     r'\w*[\'"]?\s*[:=]\s*[rbuRBU]?[\'"](?P<value>[^\'"\s]{8,})[\'"]', 3.5),
+]
+
+# 예제 코드에 흔한 자리표시자 값
+PLACEHOLDER_PATTERN = re.compile(
+    r'(example|sample|dummy|placeholder|changeme|change_me|your|xxx|\*\*\*|<|>|\$\{|\{\{|%\(|'
+    r'os\.environ|getenv|test|fake|secret|password|token|redacted|none|null)',
+    re.IGNORECASE
+)
+
+
+def shannon_entropy(value):
+    """
+    문자열의 문자 단위 섀넌 엔트로피 계산
+
+    Args:
+        value (str): 문자열
+
+    Returns:
+        float: 문자당 엔트로피 (비트)
+    """
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum(count / length * math.log2(count / length) for count in Counter(value).values())
+
+
+def mask_secret(value):
+    """
+    비밀 값의 앞부분만 남기고 가리기
+
+    Args:
+        value (str): 비밀 값
+
+    Returns:
+        str: 가려진 값
+    """
+    return value[:MASK_PREFIX] + '*' * min(8, max(0, len(value) - MASK_PREFIX))
+
+
+class SecretScanner:
+    """여러 규칙을 한 번에 검사하는 비밀 정보 탐지 클래스"""
+
+    def __init__(self, rules=None):
+        """
+        탐지기 초기화
+
+        Args:
+            rules (list, optional): (규칙 이름, 앵커 목록, 정규식, 최소 엔트로피) 목록
+                (없으면 기본 규칙)
+        """
+        self.rules = list(rules or SECRET_RULES)
+        self._anchor_rules = {}
+        self._rule_patterns = []
+        for index, (name, anchors, pattern, min_entropy) in enumerate(self.rules):
+            self._rule_patterns.append((name, re.compile(pattern), min_entropy))
+            for anchor in anchors:
+                self._anchor_rules.setdefault(anchor.lower(), []).append(index)
+
+        # 긴 앵커를 먼저 두어 겹치는 앵커 중 더 구체적인 쪽이 일치하도록 함
+        anchors = sorted(self._anchor_rules, key=len, reverse=True)
+        self._trigger = re.compile('|'.join(re.escape(anchor) for anchor in anchors))
+
+    def scan(self, content):
+        """
+        코드 내용에서 비밀 정보 탐지
+
+        Args:
+            content (str): 코드 내용
+
+        Returns:
+            list: 탐지 결과 목록 (규칙 이름, 라인 번호, 가려진 값, 엔트로피)
+        """
+        # 1단계: 모든 앵커를 한 번에 찾아 확인할 (규칙, 줄) 목록 생성
+        lowered = content.lower()
+        if len(lowered) != len(content):
+            lowered = content.translate(ASCII_LOWER)
+
+        candidates = {}
+        for match in self._trigger.finditer(lowered):
+            line_start = content.rfind('\n', 0, match.start()) + 1
+            for index in self._anchor_rules[match.group()]:
+                candidates.setdefault((line_start, index), None)
+        if not candidates:
+            return []
+
+        # 2단계: 앵커가 나온 줄에서만 규칙 정규식으로 확인
+        # (같은 값이 여러 규칙에 걸리면 먼저 정의된 구체적인 규칙만 기록)
+        findings = []
+        reported = set()
+        for line_start, index in sorted(candidates):
+            name, pattern, min_entropy = self._rule_patterns[index]
+            line_end = content.find('\n', line_start)
+            if line_end == -1:
+                line_end = len(content)
+
+            for match in pattern.finditer(content, line_start, line_end):
+                value = match.group('value') if 'value' in pattern.groupindex else match.group()
+                entropy = shannon_entropy(value)
+                if min_entropy is not None:
+                    if entropy < min_entropy or PLACEHOLDER_PATTERN.search(value):
+                        continue
+
+                if (line_start, value) in reported:
+                    continue
+                reported.add((line_start, value))
+                findings.append({
+                    'rule': name,
+                    'line': content.count('\n', 0, line_start) + 1,
+                    'masked': mask_secret(value),
+                    'entropy': round(entropy, 2)
+                })
+        return findings
+
+
+# 기본 규칙으로 컴파일한 공용 탐지기
+default_scanner = SecretScanner()
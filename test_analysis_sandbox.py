@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import time
+import traceback
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from analysis_sandbox import (IsolatedAnalyzer, resource, STATUS_OK, STATUS_TIMEOUT, STATUS_OOM,
+                              STATUS_ERROR)
+
+
+class SandboxTarget:
+    """작업자에서 실행할 테스트용 분석 객체"""
+
+    def pid(self):
+        return os.getpid()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+    def allocate(self, mb):
+        return len(bytearray(mb * 1024 * 1024))
+
+    def allocate_quietly(self, mb):
+        # pylint처럼 내부에서 예외를 잡고 트레이스백만 출력
+        try:
+            return len(bytearray(mb * 1024 * 1024))
+        except MemoryError:
+            traceback.print_exc()
+            return 0
+
+    def fail(self):
+        raise ValueError("분석 실패")
+
+
+def make_target():
+    return SandboxTarget()
+
+
+class IsolatedAnalyzerTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.analyzer = IsolatedAnalyzer(timeout=2, memory_mb=None, target=make_target)
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        self.analyzer.close()
+
+    def test_ok_and_error(self):
+        """결과와 예외 메시지를 돌려주고 같은 작업자를 계속 사용"""
+        status, pid = self.analyzer.call('pid')
+        self.assertEqual(status, STATUS_OK)
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(self.analyzer.call('fail'), (STATUS_ERROR, "분석 실패"))
+        self.assertEqual(self.analyzer.call('pid'), (STATUS_OK, pid))
+        self.assertEqual(self.analyzer.stats['restarts'], 0)
+
+    def test_timeout_restarts_worker(self):
+        """시간 제한을 넘으면 작업자를 종료하고 다음 호출은 새 작업자에서 실행"""
+        _, pid = self.analyzer.call('pid')
+        self.assertEqual(self.analyzer.call('sleep', 10), (STATUS_TIMEOUT, None))
+        status, new_pid = self.analyzer.call('pid')
+        self.assertEqual(status, STATUS_OK)
+        self.assertNotEqual(new_pid, pid)
+        self.assertEqual((self.analyzer.stats[STATUS_TIMEOUT], self.analyzer.stats['restarts']), (1, 1))
+
+    @unittest.skipIf(resource is None, "resource 모듈이 없어 메모리 제한을 걸 수 없음")
+    def test_memory_limit(self):
+        """메모리 제한을 넘으면 예외로 드러나든 stderr에만 남든 'oom'으로 보고하고 작업자를 교체"""
+        analyzer = IsolatedAnalyzer(timeout=30, memory_mb=512, target=make_target)
+        try:
+            self.assertEqual(analyzer.call('allocate', 1), (STATUS_OK, 1024 * 1024))
+            self.assertEqual(analyzer.call('allocate', 1024), (STATUS_OOM, None))
+            self.assertEqual(analyzer.call('allocate_quietly', 1024), (STATUS_OOM, None))
+            self.assertEqual(analyzer.call('allocate', 1)[0], STATUS_OK)
+            self.assertEqual((analyzer.stats[STATUS_OOM], analyzer.stats['restarts']), (2, 2))
+        finally:
+            analyzer.close()
+
+if __name__ == '__main__':
+    unittest.main()
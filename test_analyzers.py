@@ -0,0 +1,125 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_filter import CodeQualityFilter
+from analyzers import (
+    Analyzer, AnalysisContext, AnalysisEngine, default_registry,
+    COST_PARSE, COST_TRIVIAL, INPUT_AST, INPUT_METADATA
+)
+
+SAMPLE_CODE = "\n".join(f"value_{i} = {i}" for i in range(20)) + "\n"
+
+
+class FunctionCountAnalyzer(Analyzer):
+    """테스트용 AST 분석기"""
+
+    name = 'function_count'
+    inputs = (INPUT_AST,)
+    cost = COST_PARSE
+    outputs = {'test_function_count': int}
+
+    def __init__(self):
+        self.trees = []
+
+    def run(self, context):
+        self.trees.append(context.tree)
+        return {'test_function_count': 0}
+
+
+class BlocklistAnalyzer(Analyzer):
+    """테스트용 저비용 거부 분석기"""
+
+    name = 'blocklist'
+    inputs = (INPUT_METADATA,)
+    cost = COST_TRIVIAL
+
+    def run(self, context):
+        if context.metadata_item.get('blocked'):
+            context.reject("차단된 저장소")
+        return {}
+
+
+class AnalyzerRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.registry = default_registry.copy()
+        self.custom = FunctionCountAnalyzer()
+        self.registry.register(self.custom)
+        self.registry.register(BlocklistAnalyzer())
+
+        self.filter = CodeQualityFilter(metadata_file=os.devnull, registry=self.registry)
+        self.filter.min_quality_score = 5.0
+        self.filter.isolate_analysis = False
+
+    def _run(self, metadata_item):
+        """pylint 대신 고정 점수로 분석 실행"""
+        context = AnalysisContext(self.filter, 'sample.py', SAMPLE_CODE, metadata_item)
+        with mock.patch.object(self.filter, 'evaluate_code_quality', return_value=8.0) as evaluate, \
+             mock.patch.object(self.filter, 'check_code_complexity', return_value={}):
+            results = self.filter.engine.run(context)
+        return context, results, evaluate.call_count
+
+    def test_order_and_shared_parse(self):
+        """저비용 분석기부터 실행하고 AST는 한 번만 생성"""
+        names = [analyzer.name for analyzer in self.registry.ordered()]
+        self.assertLess(names.index('blocklist'), names.index('line_metrics'))
+        self.assertLess(names.index('syntax'), names.index('pylint'))
+
+        context, results, calls = self._run({'repo_license': 'MIT License'})
+        self.assertEqual(calls, 1)
+        self.assertEqual(results['test_function_count'], 0)
+        self.assertEqual(results['quality_score'], 8.0)
+        self.assertIs(self.custom.trees[0], context.tree)
+        self.assertEqual(self.filter.engine.stats['<ast>']['runs'], 1)
+        self.assertIn('pylint', context.timings)
+
+    def test_rejection_short_circuits_expensive_analyzers(self):
+        """거부되면 고비용 분석기는 건너뛰고 라인 지표는 계산"""
+        context, results, calls = self._run({'repo_license': 'MIT License', 'blocked': True})
+        self.assertEqual(calls, 0)
+        self.assertEqual(context.rejection, "차단된 저장소")
+        self.assertEqual(results['code_lines'], 20)
+        self.assertEqual(self.filter.engine.stats['blocklist']['rejections'], 1)
+        self.assertEqual(self.filter.engine.stats['pylint']['skipped'], 1)
+
+    def test_symbols_extracted_even_when_rejected(self):
+        """거부된 파일도 정의와 가져온 모듈을 추출"""
+        source = (
+            "import os.path\nfrom . import util\n\n"
+            "class ConfigParser(Base):\n"
+            "    async def load(self, path: str) -> dict:\n"
+            "        return {}\n"
+        )
+        context = AnalysisContext(self.filter, 'sample.py', source, {'blocked': True})
+        results = self.filter.engine.run(context)
+        self.assertEqual(results['imports'], ['.', 'os.path'])
+        self.assertEqual(
+            [(s['qualname'], s['kind'], s['signature'], s['line'], s['end_line']) for s in results['symbols']],
+            [('ConfigParser', 'class', '(Base)', 4, 6),
+             ('ConfigParser.load', 'async_method', '(self, path: str) -> dict', 5, 6)])
+
+        context = AnalysisContext(self.filter, 'broken.py', 'def broken(:\n', {'blocked': True})
+        self.assertIsNone(self.filter.engine.run(context)['symbols'])
+
+    def test_output_schema_is_enforced(self):
+        """선언하지 않은 필드를 반환하면 오류"""
+        class BadAnalyzer(Analyzer):
+            name = 'bad'
+            outputs = {'declared': int}
+
+            def run(self, context):
+                return {'undeclared': 1}
+
+        engine = AnalysisEngine(default_registry.copy())
+        engine.registry.register(BadAnalyzer())
+        with self.assertRaises(ValueError):
+            engine.run(AnalysisContext(self.filter, 'sample.py', SAMPLE_CODE, {}))
+        with self.assertRaises(ValueError):
+            engine.registry.register(BadAnalyzer())
+
+if __name__ == '__main__':
+    unittest.main()
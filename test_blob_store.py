@@ -0,0 +1,132 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+from unittest import mock
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from blob_store import (BlobStore, PACK_DIR_NAME, materialize, read_source, source_stat,
+                        source_exists, write_source, remove_source)
+from code_storage import CodeStorageManager
+from test_code_storage import make_item
+
+
+class BlobStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = BlobStore(os.path.join(self.test_dir, PACK_DIR_NAME), pack_bytes=4096)
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_put_get_and_overwrite(self):
+        """압축 여부와 관계없이 같은 내용을 읽고, 다시 저장하면 새 내용만 보임"""
+        small = 'x = 1\n'
+        large = 'def handler():\n    return 1\n' * 50
+        self.store.put('owner_repo/small.py', small)
+        self.store.put('owner_repo/large.py', large)
+
+        self.assertEqual(self.store.get('owner_repo/small.py'), small.encode())
+        self.assertEqual(bytes(self.store.view('owner_repo/large.py')), large.encode())
+        self.assertEqual(self.store.stat('owner_repo/large.py').st_size, len(large))
+        # 반복되는 내용은 압축되어 원본보다 작게 저장됨
+        self.assertLess(self.store.stats()['pack_bytes'], len(small) + len(large))
+
+        self.store.put('owner_repo/small.py', 'x = 2\n')
+        self.assertEqual(self.store.get('owner_repo/small.py'), b'x = 2\n')
+        self.assertEqual((self.store.stats()['entries'], self.store.stats()['deleted']), (2, 1))
+
+        self.assertTrue(self.store.delete('owner_repo/small.py'))
+        with self.assertRaises(FileNotFoundError):
+            self.store.get('owner_repo/small.py')
+
+    def test_compact_reclaims_space(self):
+        """덮어쓰거나 지운 항목의 공간은 compact로 회수하고 남은 항목은 그대로 읽힘"""
+        for i in range(40):
+            self.store.put(f'owner_repo/module_{i}.py', f'# {i}\n' + os.urandom(100).hex())
+        for i in range(30):
+            self.store.delete(f'owner_repo/module_{i}.py')
+        before = self.store.stats()
+        self.assertGreater(before['packs'], 1)
+
+        result = self.store.compact()
+        after = self.store.stats()
+        self.assertGreater(result['reclaimed'], 0)
+        self.assertLess(after['pack_bytes'], before['pack_bytes'])
+        self.assertEqual((after['entries'], after['deleted']), (10, 0))
+        for i in range(30, 40):
+            self.assertTrue(self.store.get(f'owner_repo/module_{i}.py').startswith(f'# {i}\n'.encode()))
+
+    def test_ref_helpers(self):
+        """저장소 참조도 일반 파일 경로처럼 읽고, 쓰고, 외부 도구용 파일로 풀고, 지움"""
+        ref = self.store.put('owner_repo/pkg/module.py', 'print(1)\n')
+        self.assertEqual(read_source(ref), 'print(1)\n')
+        self.assertEqual(source_stat(ref).st_size, 9)
+
+        write_source(ref, 'print(2)\n')
+        with materialize(ref) as path:
+            self.assertTrue(path.endswith('.py'))
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'print(2)\n')
+        self.assertFalse(os.path.exists(path))
+
+        remove_source(ref)
+        self.assertFalse(source_exists(ref))
+
+
+class PackSourcesTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        metadata = []
+        for i in range(4):
+            item = make_item(i, local_dir=os.path.join(self.test_dir, 'owner_repo'))
+            os.makedirs(os.path.dirname(item['local_path']), exist_ok=True)
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(f'def handler_{i}():\n    return {i}\n')
+            metadata.append(item)
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def test_pack_sources(self):
+        """개별 파일을 저장소로 옮긴 뒤에도 검색과 내용 읽기가 그대로 동작"""
+        self.assertEqual(self.storage.pack_sources(), 4)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'owner_repo')))
+
+        results = self.storage.search_files(query='handler_2')
+        self.assertEqual([result['name'] for result in results], ['module_2.py'])
+        self.assertEqual(read_source(results[0]['local_path']), 'def handler_2():\n    return 2\n')
+
+        # 이미 옮긴 항목은 다시 옮기지 않음
+        self.assertEqual(self.storage.pack_sources(), 0)
+
+        # 색인을 다시 만들어도 저장소에서 내용을 읽음
+        self.storage.update_search_index()
+        self.assertEqual(len(self.storage.search_files(query='handler_3')), 1)
+
+    def test_pack_sources_keeps_files_when_import_fails(self):
+        """데이터베이스에 반영하지 못하면 개별 파일을 지우지 않음"""
+        def failed_import(*args, **kwargs):
+            self.storage.import_stats = None
+            return 0, 0
+
+        with mock.patch.object(self.storage, 'import_from_metadata', side_effect=failed_import):
+            self.assertEqual(self.storage.pack_sources(), 0)
+        for result in self.storage.search_files(limit=10):
+            self.assertTrue(os.path.exists(result['local_path']))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'metadata.json.tmp')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+import numpy as np
+from unittest import mock
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import code_dedup
+from code_dedup import CodeDeduplicator, optimal_bands, normalized_content_hash
+from code_storage import CodeStorageManager
+from test_code_storage import make_item
+
+BASE_CODE = '''
+import os
+import json
+
+
+def load_config(path):
+    """설정 파일 로드"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_config(path, config):
+    """설정 파일 저장"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+
+def merge_config(base, override):
+    """설정 병합"""
+    result = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge_config(result[key], value)
+        else:
+            result[key] = value
+    return result
+'''
+
+OTHER_CODE = '''
+class Stack:
+    def __init__(self):
+        self.items = []
+
+    def push(self, item):
+        self.items.append(item)
+
+    def pop(self):
+        return self.items.pop()
+
+    def peek(self):
+        return self.items[-1] if self.items else None
+
+    def __len__(self):
+        return len(self.items)
+'''
+
+
+class CodeDedupTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        contents = [
+            BASE_CODE,
+            "# Copyright (c) vendored copy\n# 수정된 헤더\n" + BASE_CODE,
+            BASE_CODE.replace("indent=2", "indent=4"),
+            OTHER_CODE,
+        ]
+        metadata = []
+        for i, content in enumerate(contents):
+            item = make_item(i, quality_score=5.0 + i, local_dir=self.test_dir)
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(content)
+            metadata.append(item)
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+        self.deduplicator = CodeDeduplicator(self.storage.db_file, threshold=0.7)
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def test_signature_estimates_jaccard(self):
+        """MinHash 추정 유사도가 실제 Jaccard 유사도에 가까움"""
+        first = self.deduplicator.shingles(BASE_CODE)
+        second = self.deduplicator.shingles(BASE_CODE.replace("indent=2", "indent=4"))
+        actual = len(set(first) & set(second)) / len(set(first) | set(second))
+
+        signatures = self.deduplicator.compute_signatures([first, second])
+        estimated = (signatures[0] == signatures[1]).mean()
+        self.assertLess(abs(estimated - actual), 0.15)
+
+        # 한 묶음으로 계산해도 파일별 계산과 같은 서명
+        single = self.deduplicator.compute_signatures([second])
+        self.assertTrue((single[0] == signatures[1]).all())
+
+    def test_mark_duplicates_keeps_best_representative(self):
+        """묶음마다 품질 점수가 가장 높은 파일만 남김"""
+        clusters, duplicates = self.deduplicator.mark_duplicates()
+        self.assertEqual((clusters, duplicates), (1, 2))
+
+        files = {f['name']: f for f in self.storage.search_files(limit=10)}
+        self.assertEqual(self.storage.get_statistics()['duplicate_file_count'], 2)
+        representative = files['module_2.py']['id']
+
+        import sqlite3
+        conn = sqlite3.connect(self.storage.db_file)
+        rows = dict(conn.execute('SELECT name, duplicate_of FROM files').fetchall())
+        conn.close()
+        self.assertEqual(rows, {
+            'module_0.py': representative, 'module_1.py': representative,
+            'module_2.py': None, 'module_3.py': None
+        })
+
+        # 변경되지 않은 파일은 서명을 다시 계산하지 않음
+        self.assertEqual(self.deduplicator.update_signatures(), 0)
+
+    def test_bucket_members_compared_pairwise(self):
+        """버킷의 첫 파일과 다른 두 유사 파일도 서로 비교해서 묶음"""
+        bands, rows = self.deduplicator.bands, self.deduplicator.rows
+        generator = np.random.RandomState(0)
+        similar = generator.randint(0, 1 << 32, size=self.deduplicator.num_perm).astype(np.uint64)
+        # 첫 밴드만 같고 나머지는 모두 다른 파일
+        other = generator.randint(0, 1 << 32, size=self.deduplicator.num_perm).astype(np.uint64)
+        other[:rows] = similar[:rows]
+        # 첫 밴드 밖에서는 밴드마다 한 칸씩만 달라서 첫 밴드 버킷에서만 만나는 파일
+        changed = similar.copy()
+        changed[np.arange(1, bands) * rows] += np.uint64(1)
+
+        signatures = np.stack([other, similar, changed])
+        self.assertEqual(self.deduplicator.find_clusters(signatures), [[1, 2]])
+        # 모든 쌍을 비교하기에는 큰 버킷도 묶음의 첫 파일들과 비교해서 찾음
+        with mock.patch.object(code_dedup, 'MAX_BUCKET_PAIRS', 2):
+            self.assertEqual(self.deduplicator.find_clusters(signatures), [[1, 2]])
+
+    def test_normalized_hash_ignores_comments_and_docstrings(self):
+        """공백, 주석, 독스트링만 다른 코드는 같은 해시"""
+        variant = BASE_CODE.replace('"""설정 파일 로드"""', '"""Load config."""')
+        variant = variant.replace("import json\n", "import json  # 표준 라이브러리\n\n\n")
+        self.assertEqual(normalized_content_hash(BASE_CODE), normalized_content_hash(variant))
+        self.assertNotEqual(normalized_content_hash(BASE_CODE),
+                            normalized_content_hash(BASE_CODE.replace("indent=2", "indent=4")))
+        # 들여쓰기 구조가 다르면 다른 코드
+        self.assertNotEqual(normalized_content_hash("if a:\n    b()\n    c()\n"),
+                            normalized_content_hash("if a:\n    b()\nc()\n"))
+
+    def test_search_collapses_exact_duplicates(self):
+        """검색에서 정확 중복 파일을 하나로 묶음"""
+        import sqlite3
+        conn = sqlite3.connect(self.storage.db_file)
+        conn.execute("UPDATE files SET normalized_hash = 'same' WHERE name IN ('module_0.py', 'module_1.py')")
+        conn.commit()
+        conn.close()
+
+        names = {f['name'] for f in self.storage.search_files(limit=10, collapse_duplicates=True)}
+        self.assertEqual(names, {'module_0.py', 'module_2.py', 'module_3.py'})
+        self.assertEqual(self.storage.get_statistics()['exact_duplicate_count'], 1)
+
+    def test_optimal_bands(self):
+        """기준값이 높을수록 밴드당 행 수가 많아짐"""
+        low_bands, low_rows = optimal_bands(0.5, 128)
+        high_bands, high_rows = optimal_bands(0.9, 128)
+        self.assertLessEqual(low_bands * low_rows, 128)
+        self.assertLess(low_rows, high_rows)
+
+if __name__ == '__main__':
+    unittest.main()
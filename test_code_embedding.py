@@ -0,0 +1,119 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+import numpy as np
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_embedding import CodeEmbedder, load_index
+from code_storage import CodeStorageManager
+from test_code_storage import make_item
+from test_code_dedup import BASE_CODE, OTHER_CODE
+
+QUEUE_CODE = '''
+class Queue:
+    def __init__(self):
+        self.entries = []
+
+    def enqueue(self, entry):
+        self.entries.append(entry)
+
+    def dequeue(self):
+        return self.entries.pop(0)
+
+    def __len__(self):
+        return len(self.entries)
+'''
+
+HTTP_CODE = '''
+import requests
+
+
+def fetch_json(url, timeout=10):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+'''
+
+
+class CodeEmbeddingTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        contents = [
+            BASE_CODE,
+            OTHER_CODE,
+            BASE_CODE.replace("load_config", "read_settings").replace("save_config", "write_settings"),
+            QUEUE_CODE,
+            HTTP_CODE,
+        ]
+        metadata = []
+        for i, content in enumerate(contents):
+            item = make_item(i, local_dir=self.test_dir)
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(content)
+            metadata.append(item)
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+        self.embedder = CodeEmbedder(self.storage.db_file)
+        self.ids = {item['file_path']: file_id for file_id, item in enumerate(metadata, 1)}
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def similar_paths(self, **kwargs):
+        return [item['path'] for item in self.storage.find_similar(**kwargs)]
+
+    def test_embedding_is_normalized_and_stable(self):
+        """같은 내용은 같은 정규화 벡터, 식별자 표기법이 달라도 가까움"""
+        first = self.embedder.embed(BASE_CODE)
+        self.assertAlmostEqual(float(np.linalg.norm(first)), 1.0, places=5)
+        np.testing.assert_array_equal(first, CodeEmbedder(self.storage.db_file).embed(BASE_CODE))
+        self.assertFalse(self.embedder.embed('').any())
+
+        snake = self.embedder.embed('def push_item(stack_items, new_item): stack_items.append(new_item)')
+        camel = self.embedder.embed('def pushItem(stackItems, newItem): stackItems.append(newItem)')
+        self.assertGreater(float(snake @ camel), float(snake @ self.embedder.embed(HTTP_CODE)))
+
+    def test_find_similar(self):
+        """파일 ID 또는 코드 조각으로 유사 파일 검색, 자기 자신과 삭제된 파일은 제외"""
+        self.assertEqual(self.storage.find_similar(file_id=1), [])  # 색인 전
+        self.assertEqual(self.embedder.update_embeddings(), 5)
+        self.assertEqual(self.embedder.update_embeddings(), 0)
+        self.assertEqual(self.embedder.build_index(), (5, 1))
+
+        results = self.storage.find_similar(file_id=self.ids['pkg/module_0.py'], limit=2)
+        self.assertEqual([item['path'] for item in results], ['pkg/module_2.py', 'pkg/module_1.py'])
+        self.assertGreater(results[0]['similarity'], results[1]['similarity'])
+
+        self.assertEqual(self.similar_paths(content=QUEUE_CODE, limit=1), ['pkg/module_3.py'])
+
+        self.storage.delete_files([self.ids['pkg/module_2.py']])
+        self.assertNotIn('pkg/module_2.py', self.similar_paths(file_id=self.ids['pkg/module_0.py']))
+
+    def test_clustered_index_matches_exact_search(self):
+        """묶음(IVF) 색인에서 모든 묶음을 확인하면 전체 비교와 같은 결과"""
+        self.embedder.update_embeddings()
+        self.assertEqual(self.embedder.build_index(lists=3), (5, 3))
+
+        index = load_index(self.embedder.index_dir)
+        self.assertEqual(index.offsets[-1], 5)
+        self.assertEqual(sorted(index.ids), [1, 2, 3, 4, 5])
+
+        query = self.embedder.embed(OTHER_CODE)
+        exact_ids, exact_scores = index.search(query, 5, exact=True)
+        probed_ids, probed_scores = index.search(query, 5, probes=3)
+        np.testing.assert_array_equal(exact_ids, probed_ids)
+        np.testing.assert_allclose(exact_scores, probed_scores, rtol=1e-5)
+        self.assertEqual(exact_ids[0], self.ids['pkg/module_1.py'])
+        self.assertAlmostEqual(float(exact_scores[0]), 1.0, places=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+from unittest import mock
+import pandas as pd
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import code_storage
+from code_export import ColumnarExporter, _read_contents, pa, pq
+from code_storage import CodeStorageManager, SEARCH_CONTENT_LIMIT
+from test_code_storage import make_item
+
+
+class CodeExportTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        metadata = []
+        for i in range(5):
+            item = make_item(i, quality_score=float(i * 2), local_dir=self.test_dir)
+            item['is_suitable'] = i >= 2
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(f'def handler_{i}():\n    return {i}\n')
+            metadata.append(item)
+        metadata[4]['has_secrets'] = True
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def test_csv_export_in_chunks(self):
+        """CSV는 여러 묶음으로 나눠 써도 머리글은 한 번, 행은 모두"""
+        with mock.patch.object(code_storage, 'EXPORT_CHUNK_ROWS', 2):
+            self.assertTrue(self.storage.export_to_csv("chunks.csv"))
+        exported = pd.read_csv(os.path.join(self.test_dir, "chunks.csv"))
+        self.assertEqual(list(exported['file_name']), [f"module_{i}.py" for i in range(4)])
+
+    @unittest.skipIf(pa is None, "pyarrow가 설치되어 있지 않음")
+    def test_parquet_row_groups(self):
+        """Parquet은 행 그룹 단위로 쓰고 필터와 소스 코드 열을 반영"""
+        result = self.storage.export_columnar("code.parquet", include_content=True,
+                                              min_quality=2.0)
+        self.assertEqual((result['rows'], result['row_groups']), (3, 1))
+
+        table = pq.read_table(result['path'])
+        self.assertEqual(table.column('file_name').to_pylist(),
+                         ['module_1.py', 'module_2.py', 'module_3.py'])
+        self.assertEqual(table.column('is_suitable').to_pylist(), [False, True, True])
+        self.assertEqual(table.column('content').to_pylist()[0], 'def handler_1():\n    return 1\n')
+
+        exporter = ColumnarExporter(self.storage.db_file, self.test_dir)
+        result = exporter.export("all.parquet", row_group_rows=2, include_secrets=True)
+        self.assertEqual((result['rows'], pq.ParquetFile(result['path']).metadata.num_row_groups), (5, 3))
+        self.assertNotIn('content', pq.read_schema(result['path']).names)
+
+    def test_content_is_read_from_source(self):
+        """소스 코드 열은 전문 검색 색인의 길이 제한과 관계없이 원본 전체를 읽음"""
+        large = 'x = 1\n' * (SEARCH_CONTENT_LIMIT // 6 + 10)
+        with open(os.path.join(self.test_dir, "module_3.py"), 'w', encoding='utf-8') as f:
+            f.write(large)
+        self.storage.update_search_index()
+
+        exporter = ColumnarExporter(self.storage.db_file, self.test_dir)
+        sql, params, columns = exporter._export_query(True, query='module_3')
+        with exporter.pool.connection() as conn:
+            local_paths = [row[-1] for row in conn.execute(sql, params)]
+        self.assertEqual(columns[-1][0], 'content')
+        self.assertEqual(_read_contents(local_paths + ['missing.py']), [large, None])
+
+    @unittest.skipIf(pa is None, "pyarrow가 설치되어 있지 않음")
+    def test_arrow_ipc(self):
+        """Arrow IPC 파일은 검색어로 걸러 레코드 배치 단위로 씀"""
+        result = self.storage.export_columnar("code.arrow", fmt='arrow', query='handler_3')
+        with pa.ipc.open_file(result['path']) as reader:
+            table = reader.read_all()
+        self.assertEqual(table.column('file_path').to_pylist(), ['pkg/module_3.py'])
+        self.assertFalse(os.path.exists(result['path'] + '.tmp'))
+
+if __name__ == '__main__':
+    unittest.main()
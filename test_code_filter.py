@@ -0,0 +1,204 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+from unittest import mock
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_filter import CodeQualityFilter
+from quality_model import QualityPredictor, FEATURE_NAMES, extract_features
+
+SAMPLE_CODE = '''
+import os
+
+
+def list_python_files(directory):
+    """디렉토리의 파이썬 파일 목록"""
+    result = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            result.append(os.path.join(directory, name))
+    return result
+
+
+def count_lines(path):
+    """파일 라인 수"""
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+'''
+
+
+class CodeFilterTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        self.metadata_file = os.path.join(self.test_dir, "metadata.json")
+        self.metadata = []
+        for i in range(3):
+            local_path = os.path.join(self.test_dir, f"sample_{i}.py")
+            with open(local_path, 'w', encoding='utf-8') as f:
+                f.write(SAMPLE_CODE + f"\nVERSION = {i}\n")
+            self.metadata.append({
+                'repo_name': 'repo',
+                'repo_full_name': 'owner/repo',
+                'repo_url': 'https://github.com/owner/repo',
+                'repo_license': 'MIT License',
+                'file_name': f"sample_{i}.py",
+                'file_path': f"sample_{i}.py",
+                'file_url': f"https://github.com/owner/repo/blob/main/sample_{i}.py",
+                'local_path': local_path
+            })
+        with open(self.metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(self.metadata, f)
+
+        self.filter = CodeQualityFilter(metadata_file=self.metadata_file)
+        self.filter.min_quality_score = 5.0
+        self.filter.isolate_analysis = False
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def _run_filter(self, **kwargs):
+        """pylint 호출 횟수를 세면서 필터링 실행"""
+        with mock.patch.object(self.filter, 'evaluate_code_quality', return_value=8.0) as evaluate, \
+             mock.patch.object(self.filter, 'check_code_complexity', return_value={}):
+            result = self.filter.filter_code(**kwargs)
+        return result, evaluate.call_count
+
+    def test_incremental_filter_skips_unchanged(self):
+        """변경되지 않은 파일은 다시 분석하지 않음"""
+        (suitable, unsuitable), calls = self._run_filter()
+        self.assertEqual((suitable, unsuitable), (3, 0))
+        self.assertEqual(calls, 3)
+
+        _, calls = self._run_filter()
+        self.assertEqual(calls, 0)
+
+        # 내용이 바뀐 파일만 다시 분석
+        with open(self.metadata[1]['local_path'], 'a', encoding='utf-8') as f:
+            f.write("EXTRA = True\n")
+        _, calls = self._run_filter()
+        self.assertEqual(calls, 1)
+
+    def test_full_and_invalidate(self):
+        """--full 및 명시적 무효화"""
+        self._run_filter()
+
+        self.assertEqual(self.filter.invalidate([self.metadata[0]['local_path']]), 1)
+        _, calls = self._run_filter()
+        self.assertEqual(calls, 1)
+
+        _, calls = self._run_filter(full=True)
+        self.assertEqual(calls, 3)
+
+    def test_threshold_change_without_reanalysis(self):
+        """기준 변경은 분석 없이 판정만 갱신"""
+        self._run_filter()
+
+        self.filter.min_quality_score = 9.0
+        (suitable, unsuitable), calls = self._run_filter()
+        self.assertEqual(calls, 0)
+        self.assertEqual((suitable, unsuitable), (0, 3))
+
+    def test_prescreen_rejects_without_pylint(self):
+        """사전 검사로 분명한 파일은 pylint 없이 판정"""
+        contents = [
+            "# Generated by the protocol buffer compiler.  DO NOT EDIT!\n" + SAMPLE_CODE,
+            SAMPLE_CODE + "\ndef broken(:\n    pass\n",
+            "",
+        ]
+        for item, content in zip(self.metadata, contents):
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(content)
+
+        (suitable, unsuitable), calls = self._run_filter()
+        self.assertEqual((suitable, unsuitable), (0, 3))
+        self.assertEqual(calls, 0)
+
+        metadata = self.filter.load_metadata()
+        self.assertTrue(all(item['evaluation_tier'] == 'prescreen' for item in metadata))
+        self.assertEqual(metadata[0]['unsuitable_reason'], "자동 생성 코드")
+        self.assertEqual(metadata[1]['unsuitable_reason'], "구문 오류")
+        self.assertTrue(metadata[2]['unsuitable_reason'].startswith("코드 라인 수 부족"))
+
+    def test_clean_files_get_pylint_score(self):
+        """사전 검사를 통과한 파일은 적합 판정 전에 반드시 pylint로 평가"""
+        with mock.patch.object(self.filter, 'evaluate_code_quality', return_value=3.0) as evaluate, \
+             mock.patch.object(self.filter, 'check_code_complexity', return_value={}):
+            suitable, unsuitable = self.filter.filter_code()
+        self.assertEqual((suitable, unsuitable), (0, 3))
+        self.assertEqual(evaluate.call_count, 3)
+
+        metadata = self.filter.load_metadata()
+        self.assertTrue(all(item['evaluation_tier'] == 'pylint' for item in metadata))
+        self.assertTrue(all(item['quality_score'] == 3.0 for item in metadata))
+        self.assertTrue(all(item['lint_messages'] is not None for item in metadata))
+
+    def test_quality_model_skips_confident_files(self):
+        """예측 모델이 확신하는 파일은 pylint 생략"""
+        features = extract_features(SAMPLE_CODE)
+        self.assertEqual(len(features), len(FEATURE_NAMES))
+
+        # 함수 밀도에 비례하는 점수로 학습한 간단한 모델
+        train_x, train_y = [], []
+        for i in range(40):
+            row = [float((i * (j + 3)) % 7) for j in range(len(FEATURE_NAMES))]
+            train_x.append(row)
+            train_y.append(min(10.0, 2.0 + row[6]))
+        model = QualityPredictor().fit(train_x, train_y)
+        self.assertLess(model.evaluate(train_x, train_y, 5.0)['mae'], 0.5)
+
+        self.filter.quality_model = model
+        self.filter.min_quality_score = 0.5
+        _, calls = self._run_filter()
+        self.assertEqual(calls, 0)
+        metadata = self.filter.load_metadata()
+        self.assertTrue(all(item['evaluation_tier'] == 'model' for item in metadata))
+
+        # 기준이 예측값 근처로 바뀌면 pylint로 다시 평가
+        self.filter.min_quality_score = metadata[0]['quality_score']
+        _, calls = self._run_filter()
+        self.assertEqual(calls, 3)
+
+    def test_exact_duplicates_analyzed_once(self):
+        """주석/독스트링만 다른 파일은 한 번만 분석하고 결과 재사용"""
+        with open(self.metadata[2]['local_path'], 'w', encoding='utf-8') as f:
+            f.write('"""복사본"""\n# vendored\n' + SAMPLE_CODE + "\nVERSION = 0  # 원본\n")
+        self.metadata[2]['repo_license'] = 'Proprietary'
+        with open(self.metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(self.metadata, f)
+
+        (suitable, unsuitable), calls = self._run_filter()
+        self.assertEqual(calls, 2)
+        self.assertEqual((suitable, unsuitable), (2, 1))
+
+        metadata = self.filter.load_metadata()
+        self.assertEqual(metadata[0]['normalized_hash'], metadata[2]['normalized_hash'])
+        self.assertEqual(metadata[2]['reused_from'], metadata[0]['local_path'])
+        self.assertEqual(metadata[2]['quality_score'], 8.0)
+        # 판정은 재사용한 파일의 라이센스 기준
+        self.assertFalse(metadata[2]['is_suitable'])
+
+    def test_analysis_timeout_recorded(self):
+        """분석 시간 초과는 상태와 사유로 기록되고 다음 실행에서 건너뜀"""
+        with mock.patch.object(self.filter, 'evaluate_code_quality_guarded',
+                               return_value=(None, 'timeout')) as guarded, \
+             mock.patch.object(self.filter, 'check_code_complexity', return_value={}):
+            suitable, unsuitable = self.filter.filter_code()
+        self.assertEqual((suitable, unsuitable), (0, 3))
+        self.assertEqual(guarded.call_count, 3)
+
+        metadata = self.filter.load_metadata()
+        self.assertTrue(all(item['analysis_status'] == 'timeout' for item in metadata))
+        self.assertEqual(metadata[0]['unsuitable_reason'], "분석 시간 초과 (timeout)")
+
+        # 같은 내용이면 다시 분석하지 않음
+        _, calls = self._run_filter()
+        self.assertEqual(calls, 0)
+
+if __name__ == '__main__':
+    unittest.main()
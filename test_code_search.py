@@ -0,0 +1,115 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+from unittest import mock
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import code_storage
+from code_search import CodeGrep, trigram_query
+from code_storage import CodeStorageManager
+from test_code_storage import make_item
+
+SOURCES = [
+    'import asyncio\n\n\nasync def fetch_async(url):\n    return await asyncio.sleep(0)\n',
+    'def load_async(path):\n    """비동기가 아님"""\n    return open(path).read()\n',
+    'class Loader:\n    def load(self, path):\n        return path\n',
+]
+
+
+class TrigramQueryTestCase(unittest.TestCase):
+    def test_required_literals(self):
+        """정규식에서 반드시 필요한 문자열만 검색식으로"""
+        self.assertEqual(trigram_query(r'def \w+_async\('), '"def " AND "_async("')
+        self.assertEqual(trigram_query(r'import (numpy|pandas) as np'),
+                         '"import " AND ("numpy" OR "pandas") AND " as np"')
+        self.assertEqual(trigram_query(r'(?:foo)?bar'), '"bar"')
+        # 대안 중 하나라도 조건이 없으면 후보를 좁힐 수 없음
+        self.assertIsNone(trigram_query(r'load|\w+'))
+        self.assertIsNone(trigram_query(r'\w+\('))
+
+
+class CodeGrepTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        self.metadata = []
+        for index, source in enumerate(SOURCES):
+            item = make_item(index, local_dir=self.test_dir)
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(source)
+            self.metadata.append(item)
+        self.write_metadata(self.metadata)
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+        self.searcher = CodeGrep(self.storage.db_file)
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def write_metadata(self, metadata):
+        """메타데이터 파일 저장"""
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+    def grep(self, pattern, **kwargs):
+        return [(m['path'], m['line']) for m in self.searcher.grep(pattern, **kwargs)]
+
+    def test_candidates_then_verify(self):
+        """후보 파일로 좁힌 뒤 정규식으로 확인"""
+        self.assertEqual(self.grep(r'def \w+_async\('),
+                         [('pkg/module_0.py', 4), ('pkg/module_1.py', 1)])
+        self.assertEqual(self.searcher.stats['candidates'], 2)
+
+        # 후보에는 있어도 (대소문자 무시 색인) 정규식으로 걸러짐
+        self.assertEqual(self.grep(r'LOAD'), [])
+        self.assertEqual(self.searcher.stats['candidates'], 2)
+        self.assertEqual(self.grep(r'^class \w+', ignore_case=True), [('pkg/module_2.py', 1)])
+
+        # 문자열 조건이 없으면 모든 파일 확인
+        self.assertEqual(len(self.grep(r'\breturn\b')), 3)
+        self.assertEqual(self.searcher.stats['candidates'], 3)
+
+    def test_context_and_limit(self):
+        """앞뒤 줄과 최대 일치 수"""
+        match = next(self.searcher.grep(r'await', context=1))
+        self.assertEqual(match['before'], ['async def fetch_async(url):'])
+        self.assertEqual(match['after'], [''])
+        self.assertEqual(len(self.grep(r'return', max_matches=2)), 2)
+
+    def test_index_follows_ingest(self):
+        """가져오기, 수정, 삭제가 트라이그램 색인에 반영"""
+        with open(self.metadata[2]['local_path'], 'w', encoding='utf-8') as f:
+            f.write('async def gather_async(tasks):\n    pass\n')
+        self.metadata[2]['content_hash'] = 'changed'
+        self.write_metadata(self.metadata[1:])
+        self.storage.import_from_metadata(prune=True)
+
+        self.assertEqual(self.grep(r'def \w+_async\('),
+                         [('pkg/module_1.py', 1), ('pkg/module_2.py', 1)])
+        self.assertEqual(self.grep(r'asyncio'), [])
+        self.assertEqual(self.searcher.candidate_ids('asyncio'), [])
+
+    def test_truncated_index_content(self):
+        """색인에 앞부분만 들어간 파일은 원본 전체에서 확인"""
+        with open(self.metadata[2]['local_path'], 'w', encoding='utf-8') as f:
+            f.write('# ' + 'x' * 60 + '\nasync def tail_async(items):\n    pass\n')
+        with mock.patch.object(code_storage, 'SEARCH_CONTENT_LIMIT', 40):
+            self.storage.update_search_index()
+
+        self.assertEqual(self.grep(r'def \w+_async\('),
+                         [('pkg/module_0.py', 4), ('pkg/module_1.py', 1), ('pkg/module_2.py', 2)])
+        self.assertEqual(self.grep(r'tail_async'), [('pkg/module_2.py', 2)])
+        self.assertEqual(self.searcher.stats['unreadable'], 0)
+
+        # 원본을 읽지 못하면 앞부분만 확인하고 통계에 남김
+        os.remove(self.metadata[2]['local_path'])
+        self.assertEqual(self.grep(r'tail_async'), [])
+        self.assertEqual(self.searcher.stats['unreadable'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,405 @@
+import unittest
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+import shutil
+from unittest import mock
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import db_connection
+from code_filter import CodeQualityFilter
+from code_storage import CodeStorageManager, SCHEMA_VERSION, SECONDARY_INDEXES, iter_metadata
+
+
+def make_item(index, license_name='MIT License', quality_score=7.0, code_lines=50, local_dir=''):
+    """테스트용 메타데이터 항목 생성"""
+    return {
+        'repo_name': f"repo{index % 2}",
+        'repo_full_name': f"owner/repo{index % 2}",
+        'repo_url': f"https://github.com/owner/repo{index % 2}",
+        'repo_stars': 10,
+        'repo_license': license_name,
+        'file_name': f"module_{index}.py",
+        'file_path': f"pkg/module_{index}.py",
+        'file_url': f"https://github.com/owner/repo{index % 2}/blob/main/pkg/module_{index}.py",
+        'local_path': os.path.join(local_dir, f"module_{index}.py"),
+        'quality_score': quality_score,
+        'code_lines': code_lines,
+        'is_suitable': True,
+        'unsuitable_reason': None,
+        'complexity': {'avg_complexity': 1.0, 'max_complexity': 2, 'function_count': 3}
+    }
+
+
+class CodeStorageTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        self.metadata = [
+            make_item(0, quality_score=9.0, code_lines=120, local_dir=self.test_dir),
+            make_item(1, quality_score=6.5, code_lines=40, local_dir=self.test_dir),
+            make_item(2, quality_score=4.0, code_lines=300, local_dir=self.test_dir),
+            make_item(3, quality_score=8.0, code_lines=5, local_dir=self.test_dir),
+        ]
+        self.write_metadata(self.metadata)
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def write_metadata(self, metadata):
+        """메타데이터 파일 저장"""
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+    def test_reevaluate_suitability_matches_filter(self):
+        """집합 단위 재판정이 필터 판정과 일치"""
+        quality_filter = CodeQualityFilter(metadata_file=os.path.join(self.test_dir, "metadata.json"))
+        quality_filter.min_quality_score = 7.0
+        quality_filter.min_code_lines = 10
+
+        suitable, unsuitable = self.storage.reevaluate_suitability(quality_filter)
+        self.assertEqual((suitable, unsuitable), (1, 3))
+
+        results = {r['name']: r for r in self.storage.search_files(limit=10)}
+        for item in self.metadata:
+            expected, reason = quality_filter.judge_suitability(
+                item['repo_license'], item['code_lines'], item['quality_score'])
+            self.assertEqual(results[item['file_name']]['is_suitable'], expected)
+
+    def test_profiles_side_by_side(self):
+        """프로필별 판정 결과 비교"""
+        quality_filter = CodeQualityFilter(metadata_file=os.path.join(self.test_dir, "metadata.json"))
+        quality_filter.min_quality_score = 5.0
+        self.storage.evaluate_profile('loose', quality_filter)
+        quality_filter.min_quality_score = 8.5
+        self.storage.evaluate_profile('strict', quality_filter)
+
+        profiles = {p['name']: p for p in self.storage.compare_profiles()}
+        self.assertEqual(profiles['loose']['suitable_count'], 2)
+        self.assertEqual(profiles['strict']['suitable_count'], 1)
+
+    def test_bulk_import_in_batches(self):
+        """여러 묶음으로 나눠 가져와도 저장소/파일 ID와 부가 정보가 일치"""
+        metadata = [make_item(i, local_dir=self.test_dir) for i in range(4, 25)]
+        metadata[3]['has_secrets'] = True
+        metadata[3]['secret_findings'] = [{'rule': 'jwt', 'line': 3, 'masked': 'eyJh****', 'entropy': 5.1}]
+        metadata[7]['lint_messages'] = {'W0611': {'symbol': 'unused-import', 'count': 1}}
+        # 같은 파일이 묶음 경계를 넘어 다시 나와도 한 번만 추가
+        metadata.append(dict(metadata[0]))
+        self.write_metadata(self.metadata + metadata)
+
+        self.assertEqual(list(iter_metadata(os.path.join(self.test_dir, "metadata.json"), read_size=16)),
+                         self.metadata + metadata)
+
+        repo_count, file_count = self.storage.import_from_metadata(batch_size=4, defer_indexes=True)
+        self.assertEqual((repo_count, file_count), (0, 21))
+        self.assertEqual(self.storage.get_statistics()['file_count'], 25)
+        self.assertEqual(self.storage.get_statistics()['secret_file_count'], 1)
+        self.assertEqual(len(self.storage.search_files(with_lint=['W0611'])), 1)
+
+        conn = sqlite3.connect(self.storage.db_file)
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        orphans = conn.execute('''
+        SELECT COUNT(*) FROM files f LEFT JOIN repositories r ON r.id = f.repo_id WHERE r.id IS NULL
+        ''').fetchone()[0]
+        conn.close()
+        self.assertTrue({name for name, _ in SECONDARY_INDEXES} <= indexes)
+        self.assertEqual(orphans, 0)
+
+        self.assertEqual(self.storage.import_from_metadata(batch_size=4), (0, 0))
+
+    def test_delta_sync(self):
+        """바뀐 항목만 갱신하고 사라진 파일은 삭제하며 판정 변경은 메타데이터에 반영"""
+        self.storage.sync_metadata()
+        result = self.storage.sync_metadata()
+        self.assertTrue(result['skipped'])
+        self.assertEqual(result['exported'], 0)
+
+        self.metadata[1]['quality_score'] = 9.5
+        self.storage.add_tag(self.storage.search_files(query='module_3')[0]['id'], 'removed')
+        self.write_metadata(self.metadata[:3])
+        stats = self.storage.sync_metadata()['imported']
+        self.assertEqual((stats['inserted'], stats['updated'], stats['deleted'], stats['unchanged']),
+                         (0, 1, 1, 2))
+        files = {f['name']: f for f in self.storage.search_files(limit=10)}
+        self.assertEqual(files['module_1.py']['quality_score'], 9.5)
+        self.assertNotIn('module_3.py', files)
+
+        quality_filter = CodeQualityFilter(metadata_file=os.path.join(self.test_dir, "metadata.json"))
+        quality_filter.min_quality_score = 7.0
+        self.storage.reevaluate_suitability(quality_filter)
+        result = self.storage.sync_metadata()
+        self.assertTrue(result['skipped'])
+        self.assertEqual(result['exported'], 1)
+        with open(os.path.join(self.test_dir, "metadata.json"), encoding='utf-8') as f:
+            exported = {item['file_name']: item for item in json.load(f)}
+        self.assertFalse(exported['module_2.py']['is_suitable'])
+        self.assertTrue(exported['module_1.py']['is_suitable'])
+
+        result = self.storage.sync_metadata()
+        self.assertEqual((result['skipped'], result['exported']), (True, 0))
+        self.assertEqual(self.storage.sync_metadata(full=True)['imported']['unchanged'], 3)
+
+    def test_sync_stops_when_import_fails(self):
+        """가져오기에 실패하면 동기화를 멈추고 워터마크를 남기지 않음"""
+        self.storage.sync_metadata()
+        watermark = self.storage.get_sync_state()['metadata_watermark']
+
+        broken = make_item(4, local_dir=self.test_dir)
+        broken['file_url'] = None
+        self.write_metadata(self.metadata + [broken])
+        result = self.storage.sync_metadata()
+        self.assertTrue(result['failed'])
+        self.assertIsNone(result['imported'])
+        self.assertEqual(self.storage.get_sync_state()['metadata_watermark'], watermark)
+
+        # 고친 뒤에는 같은 메타데이터를 다시 가져옴
+        self.write_metadata(self.metadata)
+        self.assertFalse(self.storage.sync_metadata()['failed'])
+
+    def test_lint_message_filters(self):
+        """pylint 메시지 ID, 심볼, 분류로 파일 검색"""
+        self.metadata[0]['lint_messages'] = {'W0611': {'symbol': 'unused-import', 'count': 2}}
+        self.metadata[1]['lint_messages'] = {'C0301': {'symbol': 'line-too-long', 'count': 1},
+                                             'W0718': {'symbol': 'broad-exception-caught', 'count': 1}}
+        self.metadata[2]['lint_messages'] = {}
+        self.write_metadata(self.metadata)
+        self.storage.import_from_metadata()
+
+        def names(**kwargs):
+            return {f['name'] for f in self.storage.search_files(limit=10, **kwargs)}
+
+        self.assertEqual(names(with_lint=['W0611']), {'module_0.py'})
+        self.assertEqual(names(with_lint=['warning', 'line-too-long']), {'module_1.py'})
+        # pylint로 검사하지 않은 파일(module_3)은 '없음' 조건에서 제외
+        self.assertEqual(names(without_lint=['unused-import']), {'module_1.py', 'module_2.py'})
+        self.assertEqual(names(without_lint=['W']), {'module_2.py'})
+
+        file_id = self.storage.search_files(limit=10, with_lint=['W0611'])[0]['id']
+        self.assertEqual(self.storage.get_lint_messages(file_id),
+                         [{'msg_id': 'W0611', 'symbol': 'unused-import', 'count': 2}])
+        self.storage.export_to_metadata()
+        with open(os.path.join(self.test_dir, "metadata.json"), encoding='utf-8') as f:
+            exported = {item['file_name']: item for item in json.load(f)}
+        self.assertEqual(exported['module_1.py']['lint_messages'], self.metadata[1]['lint_messages'])
+        self.assertNotIn('lint_messages', exported['module_3.py'])
+
+    def test_search_loads_tags_in_one_query(self):
+        """결과 수와 관계없이 태그는 쿼리 한 번으로 조회"""
+        files = self.storage.search_files()
+        for item in files:
+            self.storage.add_tag(item['id'], 'sample')
+        self.storage.add_tag(files[0]['id'], 'extra')
+
+        statements = []
+        with self.storage.pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+            results = self.storage.search_files()
+            conn.set_trace_callback(None)
+        self.assertEqual(len(statements), 2)
+        self.assertEqual({item['id']: item['tags'] for item in results},
+                         {item['id']: self.storage.get_file_tags(item['id']) for item in files})
+        self.assertEqual(results[0]['tags'], ['sample', 'extra'])
+
+    def test_keyset_pagination(self):
+        """커서로 페이지를 넘겨도 정렬 순서 그대로 빠짐없이, 품질 점수가 없는 파일은 맨 뒤"""
+        self.metadata += [
+            make_item(4, quality_score=None, code_lines=40, local_dir=self.test_dir),
+            make_item(5, quality_score=8.0, code_lines=40, local_dir=self.test_dir),
+            make_item(6, quality_score=None, code_lines=None, local_dir=self.test_dir),
+        ]
+        self.write_metadata(self.metadata)
+        self.storage.import_from_metadata()
+
+        def walk(sort=None, **filters):
+            names, cursor = [], None
+            while True:
+                page = self.storage.search_page(limit=2, sort=sort, cursor=cursor, **filters)
+                names.extend(item['name'][len('module_'):-len('.py')] for item in page['results'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    return names
+
+        self.assertEqual(walk(), ['0', '5', '3', '1', '2', '6', '4'])
+        self.assertEqual(walk(), [f['name'][7:-3] for f in self.storage.search_files(limit=10)])
+        self.assertEqual(walk('lines'), ['2', '0', '5', '4', '1', '3', '6'])
+        self.assertEqual(walk('newest'), ['6', '5', '4', '3', '2', '1', '0'])
+        self.assertEqual(walk('oldest'), ['0', '1', '2', '3', '4', '5', '6'])
+        self.assertEqual(walk(min_quality=6.5), ['0', '5', '3', '1'])
+        self.assertEqual(walk(query='module_*', sort='relevance'), walk(query='module_*'))
+        self.assertEqual(sorted(walk(query='module_*')), [str(i) for i in range(7)])
+        self.assertEqual(list(self.storage.iter_search_files(page_size=3)),
+                         self.storage.search_files(limit=10))
+
+        cursor = self.storage.search_page(limit=2)['next_cursor']
+        with self.assertRaises(ValueError):
+            self.storage.search_page(limit=2, sort='lines', cursor=cursor)
+        with self.assertRaises(ValueError):
+            self.storage.search_page(cursor='not-a-cursor')
+        self.assertEqual(self.storage.search_files(sort='relevance'), [])
+
+    def test_query_plans_use_indexes(self):
+        """자주 쓰는 쿼리가 전체 스캔하지 않고 이전 데이터베이스도 인덱스가 생성됨"""
+        self.storage.add_tag(self.storage.search_files(query='module_0')[0]['id'], 'sample')
+        self.assertEqual(self.storage.check_query_plans(), {})
+        self.assertEqual([f['name'] for f in self.storage.search_files(tags=['sample', 'missing'])],
+                         ['module_0.py'])
+
+        # 스키마 버전 기록 전 데이터베이스 흉내
+        conn = sqlite3.connect(self.storage.db_file)
+        for name, _ in SECONDARY_INDEXES:
+            conn.execute(f'DROP INDEX {name}')
+        conn.execute('PRAGMA user_version = 0')
+        conn.commit()
+        conn.close()
+        regressions = self.storage.check_query_plans()
+        self.assertIn('SCAN f', regressions['search_suitable'])
+        self.assertIn('SCAN ft', regressions['search_tags'])
+
+        storage = CodeStorageManager(base_dir=self.test_dir)
+        self.assertEqual(storage.check_query_plans(), {})
+        conn = sqlite3.connect(storage.db_file)
+        self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+        conn.close()
+
+    def test_statistics_counters_follow_writes(self):
+        """트리거로 갱신한 통계가 테이블 전체 집계와 항상 일치"""
+        def assert_matches_rebuild():
+            stats = self.storage.get_statistics()
+            self.assertTrue(self.storage.rebuild_statistics())
+            self.assertEqual(stats, self.storage.get_statistics())
+            return stats
+
+        stats = assert_matches_rebuild()
+        self.assertEqual(stats['file_count'], 4)
+        self.assertEqual(stats['average_quality_score'], 6.88)
+        self.assertEqual(stats['quality_histogram'], [0, 0, 0, 0, 1, 0, 1, 0, 1, 1])
+        self.assertEqual(stats['license_distribution'], {'MIT License': 2})
+        self.assertEqual([repo['file_count'] for repo in stats['top_repositories']], [2, 2])
+
+        # 정규화 해시가 같은 파일 추가, 품질 점수와 적합 여부 변경
+        extra = [make_item(i, quality_score=None, local_dir=self.test_dir) for i in (4, 5, 6)]
+        for item in extra:
+            item['normalized_hash'] = 'same'
+        self.metadata[1]['quality_score'] = 2.5
+        self.metadata[2]['is_suitable'] = False
+        self.write_metadata(self.metadata + extra)
+        self.storage.import_from_metadata()
+        ids = {f['name']: f['id'] for f in self.storage.search_files(limit=10)}
+        self.storage.add_tag(ids['module_0.py'], 'web')
+        self.storage.add_tag(ids['module_2.py'], 'web')
+        self.storage.add_tag(ids['module_2.py'], 'cli')
+        self.storage.remove_tag(ids['module_2.py'], 'cli')
+        with self.storage.pool.connection() as conn:
+            conn.execute('UPDATE files SET duplicate_of = ? WHERE id = ?', (ids['module_0.py'], ids['module_3.py']))
+
+        stats = assert_matches_rebuild()
+        self.assertEqual((stats['file_count'], stats['suitable_file_count']), (7, 6))
+        self.assertEqual((stats['exact_duplicate_count'], stats['duplicate_file_count']), (2, 1))
+        self.assertEqual(stats['top_tags'], [{'name': 'web', 'count': 2}])
+
+        # 삭제, 인덱스/트리거를 멈췄다가 다시 만드는 대량 가져오기
+        self.storage.delete_files([ids['module_4.py'], ids['module_0.py']])
+        self.write_metadata(self.metadata + extra + [make_item(7, local_dir=self.test_dir)])
+        self.storage.import_from_metadata(defer_indexes=True)
+        stats = assert_matches_rebuild()
+        self.assertEqual((stats['file_count'], stats['exact_duplicate_count']), (8, 2))
+        self.assertEqual(self.storage.check_query_plans(), {})
+
+    def test_full_text_search(self):
+        """소스 코드 전문 검색, 접두어 검색, 발췌, 수정/삭제 반영"""
+        sources = {
+            0: 'import asyncio\n\nasync def fetch_pages(urls):\n    return await asyncio.gather(*urls)\n',
+            1: 'import argparse\n\ndef parse_args():\n    return argparse.ArgumentParser()\n',
+        }
+        for index, source in sources.items():
+            with open(self.metadata[index]['local_path'], 'w', encoding='utf-8') as f:
+                f.write(source)
+        self.metadata[0]['content_hash'] = 'changed'
+        self.metadata[1]['content_hash'] = 'changed'
+        self.write_metadata(self.metadata)
+        self.storage.import_from_metadata()
+
+        def names(query):
+            return [f['name'] for f in self.storage.search_files(query=query, limit=10)]
+
+        self.assertEqual(names('asyncio gather'), ['module_0.py'])
+        self.assertEqual(names('argpar*'), ['module_1.py'])
+        self.assertEqual(names('parse_args'), ['module_1.py'])
+        self.assertEqual(names('owner/repo1 module_3'), ['module_3.py'])
+        self.assertEqual(names('"unbalanced'), [])
+        result = self.storage.search_files(query='gather')[0]
+        self.assertIn('[gather]', result['snippet'])
+
+        # 파일명에서 일치하면 소스 코드에서만 일치한 파일보다 앞
+        with open(self.metadata[2]['local_path'], 'w', encoding='utf-8') as f:
+            f.write('module_1 = None\n')
+        self.storage.update_search_index([self.storage.search_files(query='module_2')[0]['id']])
+        self.assertEqual(names('module_1'), ['module_1.py', 'module_2.py'])
+
+        self.write_metadata(self.metadata[1:])
+        self.storage.import_from_metadata(prune=True)
+        self.assertEqual(names('asyncio'), [])
+
+    def test_open_does_not_wait_for_writer(self):
+        """이미 만든 데이터베이스를 여는 것은 다른 연결의 쓰기 트랜잭션을 기다리지 않음"""
+        writer = sqlite3.connect(self.storage.db_file, isolation_level=None)
+        writer.execute('BEGIN IMMEDIATE')
+        try:
+            self.storage.pool.close()
+            with mock.patch.object(db_connection, 'BUSY_TIMEOUT', 0.1), \
+                    mock.patch('builtins.print') as printed:
+                storage = CodeStorageManager(base_dir=self.test_dir)
+            printed.assert_called_once_with("데이터베이스 초기화 완료")
+            self.assertEqual(len(storage.search_files(query='module_1')), 1)
+        finally:
+            writer.rollback()
+            writer.close()
+
+    def test_symbol_index(self):
+        """정의 이름과 가져온 모듈로 파일 찾기, 변경/삭제 반영"""
+        def symbol(name, kind='class', line=1):
+            return {'name': name, 'qualname': name, 'kind': kind, 'signature': '()',
+                    'line': line, 'end_line': line + 3}
+
+        self.metadata[0].update(symbols=[symbol('ConfigParser'), symbol('parse_args', 'function', 5)],
+                                imports=['argparse', 'os.path'])
+        self.metadata[1].update(symbols=[symbol('Parser'), symbol('fetch', 'async_function', 9)],
+                                imports=['asyncio'])
+        self.metadata[2].update(symbols=[symbol('ParserError')], imports=['asyncio.subprocess'])
+        self.write_metadata(self.metadata)
+        self.storage.import_from_metadata()
+
+        def names(pattern, kind=None):
+            return sorted(s['qualname'] for s in self.storage.find_symbols(pattern, kind=kind))
+
+        def importers(module):
+            return sorted(i['path'] for i in self.storage.find_importers(module))
+
+        self.assertEqual(names('Parser'), ['Parser'])
+        self.assertEqual(names('Parser*'), ['Parser', 'ParserError'])
+        self.assertEqual(names('*Parser'), ['ConfigParser', 'Parser'])
+        self.assertEqual(names('*', kind='function'), ['fetch', 'parse_args'])
+        self.assertEqual(importers('asyncio'), ['pkg/module_1.py', 'pkg/module_2.py'])
+        self.assertEqual(importers('os'), ['pkg/module_0.py'])
+        self.assertEqual(importers('asyncio.subprocess'), ['pkg/module_2.py'])
+
+        # 내보낸 메타데이터를 다시 가져와도 바뀐 항목 없음
+        self.storage.export_to_metadata()
+        self.assertEqual(self.storage.sync_metadata(full=True)['imported']['updated'], 0)
+
+        self.metadata[1].update(symbols=[symbol('HttpClient')], imports=[])
+        self.write_metadata([self.metadata[1], self.metadata[3]])
+        self.storage.import_from_metadata(prune=True)
+        self.assertEqual(names('*Parser*'), [])
+        self.assertEqual(names('Http*'), ['HttpClient'])
+        self.assertEqual(importers('asyncio'), [])
+
+if __name__ == '__main__':
+    unittest.main()
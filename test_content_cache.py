@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from content_cache import ContentCache, render_highlighted
+
+
+class ContentCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.reads = []
+        self.cache = ContentCache(max_bytes=3 * sys.getsizeof('x' * 1000))
+
+    def loader(self, content):
+        """읽은 횟수를 기록하는 내용 읽기 함수"""
+        def load():
+            self.reads.append(content)
+            return content
+        return load
+
+    def test_lru_and_hit_rate(self):
+        """같은 버전은 다시 읽지 않고, 크기 상한을 넘으면 가장 오래 쓰지 않은 항목부터 내보냄"""
+        for file_id in (1, 2, 3):
+            self.cache.get(file_id, 'v1', self.loader(str(file_id) * 1000))
+        self.assertEqual(self.cache.get(1, 'v1', self.loader('unused')), '1' * 1000)
+        self.assertEqual(len(self.reads), 3)
+
+        # 네 번째 항목을 넣으면 가장 오래 쓰지 않은 2번이 빠짐
+        self.cache.get(4, 'v1', self.loader('4' * 1000))
+        self.cache.get(2, 'v1', self.loader('2' * 1000))
+        self.assertEqual(len(self.reads), 5)
+
+        # 내용 버전이 바뀌면 새로 읽음
+        self.assertEqual(self.cache.get(1, 'v2', self.loader('new')), 'new')
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 6))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 7)
+        self.assertGreater(stats['evictions'], 0)
+        self.assertLessEqual(stats['bytes'], self.cache.max_bytes)
+
+    def test_highlighted_and_invalidate(self):
+        """구문 강조 HTML은 한 번만 만들고, 무효화하면 그 파일의 모든 버전을 지움"""
+        source = 'def f():\n    return "<tag>"\n'
+        content, html = self.cache.get_highlighted(7, 'v1', self.loader(source))
+        self.assertEqual(content, source)
+        self.assertEqual(html, render_highlighted(source))
+        self.assertNotIn('<tag>', html)
+
+        self.assertEqual(self.cache.get_highlighted(7, 'v1', self.loader(source))[1], html)
+        self.assertEqual(self.cache.stats()['html_hits'], 1)
+
+        self.cache.get(7, 'v2', self.loader(source))
+        self.assertEqual(self.cache.invalidate(7), 2)
+        self.assertEqual(self.cache.stats()['bytes'], 0)
+        self.cache.get(7, 'v1', self.loader(source))
+        self.assertEqual(len(self.reads), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import os
+import sys
+import gzip
+import json
+import tempfile
+import shutil
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_storage import CodeStorageManager
+from dataset_export import DatasetExporter, load_manifest, verify_dataset
+from test_code_storage import make_item
+
+# 파일 두 개(각 30바이트)마다 샤드 하나
+SHARD_MB = 60 / 1024 / 1024
+
+
+class DatasetExportTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        metadata = []
+        for i in range(7):
+            item = make_item(i, local_dir=self.test_dir)
+            item['is_suitable'] = i != 5
+            with open(item['local_path'], 'w', encoding='utf-8') as f:
+                f.write(f'def handler_{i}():\n    return {i:>5}\n')
+            metadata.append(item)
+        metadata[6]['has_secrets'] = True
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        self.storage = CodeStorageManager(base_dir=self.test_dir)
+        self.storage.import_from_metadata()
+        self.output_dir = os.path.join(self.test_dir, "dataset")
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        shutil.rmtree(self.test_dir)
+
+    def export(self, output_dir=None, workers=1):
+        exporter = DatasetExporter(self.storage, output_dir or self.output_dir, shard_mb=SHARD_MB,
+                                   compression='gzip', workers=workers)
+        return exporter, exporter.export(suitable_only=True)
+
+    def read_shards(self, output_dir=None):
+        output_dir = output_dir or self.output_dir
+        shards = []
+        for shard in load_manifest(output_dir)['shards']:
+            with gzip.open(os.path.join(output_dir, shard['file']), 'rt', encoding='utf-8') as f:
+                shards.append([json.loads(line) for line in f])
+        return shards
+
+    def test_sharded_export_is_deterministic(self):
+        """필터에 맞는 파일을 오래된 파일부터 고정 크기 샤드로, 작업자 수와 관계없이 같은 결과"""
+        _, manifest = self.export()
+        self.assertTrue(manifest['complete'])
+        self.assertEqual((manifest['files'], manifest['records'], len(manifest['shards'])), (5, 5, 3))
+
+        shards = self.read_shards()
+        self.assertEqual([[record['id'] for record in shard] for shard in shards], [[1, 2], [3, 4], [5]])
+        self.assertEqual(shards[0][0]['content'], 'def handler_0():\n    return     0\n')
+        self.assertEqual(verify_dataset(self.output_dir), [])
+
+        other_dir = os.path.join(self.test_dir, "parallel")
+        _, parallel = self.export(other_dir, workers=2)
+        self.assertEqual(parallel, manifest)
+        for shard in manifest['shards']:
+            with open(os.path.join(self.output_dir, shard['file']), 'rb') as a, \
+                    open(os.path.join(other_dir, shard['file']), 'rb') as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_resume_and_verify(self):
+        """다시 실행하면 완성된 샤드는 건너뛰고, 손상된 샤드는 체크섬으로 찾음"""
+        self.export()
+        os.remove(os.path.join(self.output_dir, 'shard-00001.jsonl.gz'))
+        exporter, manifest = self.export()
+        self.assertEqual((exporter.stats['written'], exporter.stats['resumed']), (1, 2))
+        self.assertEqual(verify_dataset(self.output_dir), [])
+
+        with open(os.path.join(self.output_dir, 'shard-00002.jsonl.gz'), 'r+b') as f:
+            f.seek(20)
+            f.write(b'\x00')
+        self.assertEqual(verify_dataset(self.output_dir), ['shard-00002.jsonl.gz'])
+
+        # 선택된 파일이 바뀌면 계획이 달라진 샤드만 다시 쓰고 남는 샤드는 정리
+        self.storage.delete_files([4, 5])
+        exporter, manifest = self.export()
+        self.assertEqual([shard['file'] for shard in manifest['shards']],
+                         ['shard-00000.jsonl.gz', 'shard-00001.jsonl.gz'])
+        self.assertEqual(exporter.stats['resumed'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'shard-00002.jsonl.gz')))
+
+    def test_resume_after_new_and_changed_files(self):
+        """새 파일은 마지막 샤드만, 내용이 바뀐 파일은 그 파일이 든 샤드만 다시 씀"""
+        self.export()
+
+        with open(os.path.join(self.test_dir, "metadata.json"), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        item = make_item(7, local_dir=self.test_dir)
+        with open(item['local_path'], 'w', encoding='utf-8') as f:
+            f.write('def handler_7():\n    return     7\n')
+        metadata.append(item)
+        with open(os.path.join(self.test_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        self.storage.import_from_metadata()
+
+        exporter, manifest = self.export()
+        self.assertEqual((exporter.stats['written'], exporter.stats['resumed']), (1, 2))
+        self.assertEqual([[record['id'] for record in shard] for shard in self.read_shards()][-1], [5, 8])
+
+        # 파일 목록은 같고 내용만 바뀐 샤드도 다시 씀
+        path = self.storage.get_file(3)['local_path']
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('def handler_2():\n    return   222\n')
+        os.utime(path, (1, 1))
+        exporter, manifest = self.export()
+        self.assertEqual((exporter.stats['written'], exporter.stats['resumed']), (1, 2))
+        self.assertEqual(self.read_shards()[1][0]['content'], 'def handler_2():\n    return   222\n')
+
+    def test_packed_sources(self):
+        """묶음 저장소로 옮긴 소스도 같은 크기 기준으로 샤드를 나누고 내용을 읽음"""
+        self.export()
+        expected = self.read_shards()
+        self.storage.pack_sources()
+
+        packed_dir = os.path.join(self.test_dir, "packed")
+        _, manifest = self.export(packed_dir)
+        self.assertEqual(len(manifest['shards']), 3)
+        self.assertEqual([[record['content'] for record in shard] for shard in self.read_shards(packed_dir)],
+                         [[record['content'] for record in shard] for shard in expected])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+import sqlite3
+import tempfile
+import shutil
+import threading
+
+# 테스트 환경 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from db_connection import ConnectionPool, get_pool
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.test_dir, "test.db")
+        self.pool = ConnectionPool(self.db_file)
+        with self.pool.connection() as conn:
+            conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+
+    def tearDown(self):
+        """테스트 환경 정리"""
+        self.pool.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_connections_are_reused_in_wal_mode(self):
+        """반납된 연결을 다시 쓰고 WAL 모드로 열림"""
+        for i in range(5):
+            with self.pool.connection() as conn:
+                conn.execute('INSERT INTO items (name) VALUES (?)', (f"item{i}",))
+        self.assertEqual(self.pool.stats['created'], 1)
+
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            # 중첩 호출은 같은 연결 사용
+            with self.pool.connection() as inner:
+                self.assertIs(inner, conn)
+
+        self.assertIs(get_pool(self.db_file), get_pool(os.path.join(self.test_dir, ".", "test.db")))
+
+    def test_rollback_on_error(self):
+        """예외가 나면 트랜잭션 롤백 후 연결 반납"""
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('lost')")
+                raise ValueError()
+
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 0)
+
+    def test_readers_not_blocked_by_writer(self):
+        """쓰기 트랜잭션 중에도 다른 스레드에서 읽기 가능"""
+        with self.pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('committed')")
+
+        counts = []
+        with self.pool.connection() as writer:
+            writer.execute("INSERT INTO items (name) VALUES ('pending')")
+
+            def read():
+                with self.pool.connection() as reader:
+                    counts.append(reader.execute('SELECT COUNT(*) FROM items').fetchone()[0])
+
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join(timeout=5)
+        self.assertEqual(counts, [1])
+
+        conn = sqlite3.connect(self.db_file)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 2)
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import os
 import sys
+import json
 import tempfile
 import shutil
 from flask import Flask
@@ -98,6 +99,46 @@ class WebAppTestCase(unittest.TestCase):
         data = response.get_json()
         self.assertIsNotNone(data)
         self.assertIsInstance(data, list)
+        
+        response = self.app.get('/code/api/list?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_api_grep(self):
+        """API: 정규식 검색 결과 마지막 줄의 검색 통계 테스트"""
+        response = self.app.get('/code/api/grep?pattern=def%20&limit=1')
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+        self.assertIn('unreadable', lines[-1]['stats'])
+        self.assertTrue(all('file_id' in line for line in lines[:-1]))
+    
+    def test_api_cache_stats(self):
+        """API: 파일 내용 캐시 통계 테스트"""
+        response = self.app.get('/code_crud/api/cache/stats')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertTrue(data['success'])
+        self.assertIn('hit_rate', data['stats'])
+        self.assertIn('entries', data['stats'])
+    
+    def test_content_version_follows_writes(self):
+        """다른 프로세스가 고친 내용도 캐시 키(내용 버전)가 바뀌어 새로 읽힘"""
+        from web_app.api import _content_version
+        from blob_store import get_store
+        
+        path = os.path.join(self.test_dir, "module.py")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('x = 1\n')
+        before = _content_version({'local_path': path})
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('x = 2\n')
+        os.utime(path, (1, 1))
+        self.assertNotEqual(_content_version({'local_path': path}), before)
+        
+        store = get_store(os.path.join(self.test_dir, "packs"))
+        ref = store.put('owner_repo/module.py', 'x = 1\n')
+        before = _content_version({'local_path': ref})
+        store.put('owner_repo/module.py', 'x = 2\n')
+        self.assertNotEqual(_content_version({'local_path': ref}), before)
     
     def test_api_crawler_status(self):
         """API: 크롤링 상태 테스트"""
@@ -5,6 +5,8 @@ import json
 import time
 import threading
 import sqlite3
+import contextlib
+import functools
 from datetime import datetime
 
 # 기존 크롤러 모듈 경로 추가
@@ -12,16 +14,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from github_crawler import GitHubPythonCrawler
 from code_filter import CodeQualityFilter
 from code_storage import CodeStorageManager
+from code_search import CodeGrep
+from db_connection import get_pool
+from blob_store import read_source, source_stat, write_source, remove_source
+from content_cache import get_content_cache
 
 # 크롤링 작업 상태 저장
 crawling_jobs = []
 current_job = None
 
+# 웹 앱과 CLI가 함께 쓰는 데이터베이스 경로
+DB_FILE = 'collected_code/code_database.db'
+
+@contextlib.contextmanager
 def get_db_connection():
-    """데이터베이스 연결 생성"""
-    conn = sqlite3.connect('collected_code/code_database.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """공유 연결 풀에서 데이터베이스 연결 빌려 쓰기 (행은 열 이름으로 접근)"""
+    with get_pool(DB_FILE).connection() as conn:
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.row_factory = None
 
 def crawl_repository(repo_url, max_files):
     """특정 저장소 URL에서 크롤링"""
@@ -137,73 +150,10 @@ def get_crawling_status():
     }
 
 def get_code_statistics():
-    """코드 통계 정보 조회"""
-    try:
-        conn = get_db_connection()
-        
-        # 기본 통계
-        stats = {}
-        
-        # 저장소 수
-        cursor = conn.execute("SELECT COUNT(DISTINCT id) FROM repositories")
-        stats['repository_count'] = cursor.fetchone()[0]
-        
-        # 파일 수
-        cursor = conn.execute("SELECT COUNT(id) FROM files")
-        stats['file_count'] = cursor.fetchone()[0]
-        
-        # 적합한 파일 수
-        cursor = conn.execute("SELECT COUNT(id) FROM files WHERE is_suitable = 1")
-        stats['suitable_file_count'] = cursor.fetchone()[0]
-        
-        # 평균 품질 점수
-        cursor = conn.execute("SELECT AVG(quality_score) FROM files WHERE quality_score IS NOT NULL")
-        avg_quality = cursor.fetchone()[0]
-        stats['average_quality_score'] = avg_quality if avg_quality else 0
-        
-        # 저장소별 파일 수
-        cursor = conn.execute("""
-            SELECT r.name, COUNT(f.id) as file_count
-            FROM repositories r
-            JOIN files f ON r.id = f.repo_id
-            GROUP BY r.id
-            ORDER BY file_count DESC
-            LIMIT 10
-        """)
-        stats['repositories'] = [{'name': row['name'], 'file_count': row['file_count']} for row in cursor.fetchall()]
-        
-        # 품질 점수 분포
-        stats['quality_distribution'] = [0, 0, 0, 0, 0]  # 0-2, 2-4, 4-6, 6-8, 8-10
-        cursor = conn.execute("SELECT quality_score FROM files WHERE quality_score IS NOT NULL")
-        for row in cursor.fetchall():
-            score = row['quality_score']
-            if score < 2:
-                stats['quality_distribution'][0] += 1
-            elif score < 4:
-                stats['quality_distribution'][1] += 1
-            elif score < 6:
-                stats['quality_distribution'][2] += 1
-            elif score < 8:
-                stats['quality_distribution'][3] += 1
-            else:
-                stats['quality_distribution'][4] += 1
-        
-        # 태그 분포
-        cursor = conn.execute("""
-            SELECT t.name, COUNT(ft.file_id) as count
-            FROM tags t
-            JOIN file_tags ft ON t.id = ft.tag_id
-            GROUP BY t.id
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        stats['tags'] = [{'name': row['name'], 'count': row['count']} for row in cursor.fetchall()]
-        
-        conn.close()
-        return stats
-    
-    except Exception as e:
-        print(f"통계 정보 조회 오류: {str(e)}")
+    """코드 통계 정보 조회 (트리거가 갱신한 통계 카운터를 읽음)"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    summary = storage.get_statistics()
+    if not summary:
         return {
             'repository_count': 0,
             'file_count': 0,
@@ -213,61 +163,148 @@ def get_code_statistics():
             'quality_distribution': [0, 0, 0, 0, 0],
             'tags': []
         }
+    
+    # 품질 점수 분포: 1점 단위 분포를 2점 단위(0-2, 2-4, 4-6, 6-8, 8-10)로 묶음
+    histogram = summary['quality_histogram']
+    return {
+        'repository_count': summary['repository_count'],
+        'file_count': summary['file_count'],
+        'suitable_file_count': summary['suitable_file_count'],
+        'average_quality_score': summary['average_quality_score'],
+        'repositories': [{'name': repo['name'], 'file_count': repo['file_count']}
+                         for repo in summary['top_repositories']],
+        'quality_distribution': [histogram[i] + histogram[i + 1] for i in range(0, len(histogram), 2)],
+        'tags': summary['top_tags']
+    }
 
-def search_code(query=None, suitable_only=False, min_quality=None, limit=100):
+def search_code(query=None, suitable_only=False, min_quality=None, limit=100,
+                collapse_duplicates=False, with_lint=None, without_lint=None):
     """코드 검색"""
     storage = CodeStorageManager(base_dir="collected_code")
-    results = storage.search_files(
+    # 태그 정보는 search_files가 결과 전체에 대해 한 번에 채움
+    return storage.search_files(
         query=query,
         suitable_only=suitable_only,
         min_quality=min_quality,
-        limit=limit
+        limit=limit,
+        collapse_duplicates=collapse_duplicates,
+        with_lint=with_lint,
+        without_lint=without_lint
     )
-    
-    # 태그 정보 추가
-    for item in results:
-        item['tags'] = storage.get_file_tags(item['id'])
-    
-    return results
 
-def get_file_content(file_id):
-    """파일 내용 조회"""
+def search_code_page(query=None, suitable_only=False, min_quality=None, limit=100,
+                     collapse_duplicates=False, with_lint=None, without_lint=None,
+                     sort=None, cursor=None):
+    """코드 검색 결과 한 페이지와 다음 페이지 커서 (올바르지 않은 커서나 정렬 기준이면 ValueError)"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    return storage.search_page(
+        query=query,
+        suitable_only=suitable_only,
+        min_quality=min_quality,
+        limit=limit,
+        collapse_duplicates=collapse_duplicates,
+        with_lint=with_lint,
+        without_lint=without_lint,
+        sort=sort,
+        cursor=cursor
+    )
+
+def iter_search_code(query=None, suitable_only=False, min_quality=None):
+    """코드 검색 결과 전체를 페이지 단위로 읽으며 하나씩 반환"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    return storage.iter_search_files(
+        query=query,
+        suitable_only=suitable_only,
+        min_quality=min_quality
+    )
+
+def export_code_columnar(output_file, fmt='parquet', query=None, suitable_only=False,
+                         min_quality=None, include_content=False):
+    """코드 데이터를 Parquet/Arrow 파일로 스트리밍 내보내기 (collected_code 기준 경로)"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    return storage.export_columnar(
+        output_file, fmt=fmt, include_content=include_content, query=query,
+        min_quality=min_quality, suitable_only=suitable_only
+    )
+
+def grep_code(pattern, ignore_case=False, context=0, limit=100, stats=None):
+    """정규식 코드 검색 (일치하는 줄을 찾는 대로 반환하는 제너레이터, 끝나면 stats에 검색 통계 기록)"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    searcher = CodeGrep(storage.db_file)
+    yield from searcher.grep(
+        pattern,
+        ignore_case=ignore_case,
+        context=context,
+        max_matches=limit
+    )
+    if stats is not None:
+        stats.update(searcher.stats)
+
+def find_symbols(pattern, kind=None, limit=100):
+    """정의(클래스, 함수, 메서드) 이름 검색"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    return storage.find_symbols(pattern, kind=kind, limit=limit)
+
+def find_importers(module, limit=100):
+    """모듈을 가져오는 파일 검색"""
+    storage = CodeStorageManager(base_dir="collected_code")
+    return storage.find_importers(module, limit=limit)
+
+def find_similar_code(file_id=None, content=None, limit=10, exact=False):
+    """내용이 유사한 파일 검색"""
     storage = CodeStorageManager(base_dir="collected_code")
-    results = storage.search_files(limit=100)
+    return storage.find_similar(file_id=file_id, content=content, limit=limit, exact=exact)
+
+def _content_version(file_info):
+    """
+    내용 캐시 키로 쓸 내용 버전 (파일 크기와 수정 시각, 묶음 저장소는 저장 시각)
     
-    file_info = None
-    for item in results:
-        if item['id'] == file_id:
-            file_info = item
-            break
+    웹 편집은 content_hash를 바꾸지 않으므로 파일 자체의 크기/시각을 써서
+    다른 프로세스가 고친 내용도 다음 요청부터 새로 읽습니다.
+    """
+    stat = source_stat(file_info['local_path'])
+    return f"{stat.st_size}:{stat.st_mtime!r}"
+
+def get_file_content(file_id, highlighted=False):
+    """
+    파일 내용 조회 (최근에 본 파일은 메모리 캐시에서)
+    
+    highlighted가 참이면 (파일 정보, 내용, 구문 강조 HTML)을 반환합니다.
+    """
+    storage = CodeStorageManager(base_dir="collected_code")
+    file_info = storage.get_file(file_id)
     
     if not file_info:
-        return None, "파일을 찾을 수 없습니다."
+        return (None, "파일을 찾을 수 없습니다.", None) if highlighted else (None, "파일을 찾을 수 없습니다.")
     
     try:
-        with open(file_info['local_path'], 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        return file_info, content
+        cache = get_content_cache()
+        version = _content_version(file_info)
+        loader = functools.partial(read_source, file_info['local_path'])
+        if highlighted:
+            content, html = cache.get_highlighted(file_id, version, loader)
+            return file_info, content, html
+        return file_info, cache.get(file_id, version, loader)
     except Exception as e:
-        return file_info, f"파일 내용을 읽을 수 없습니다: {str(e)}"
+        message = f"파일 내용을 읽을 수 없습니다: {str(e)}"
+        return (file_info, message, None) if highlighted else (file_info, message)
+
+def get_content_cache_stats():
+    """파일 내용 캐시 통계 (적중률 등)"""
+    return get_content_cache().stats()
 
 def update_file_content(file_id, content):
     """파일 내용 업데이트"""
     storage = CodeStorageManager(base_dir="collected_code")
-    results = storage.search_files(limit=100)
-    
-    file_info = None
-    for item in results:
-        if item['id'] == file_id:
-            file_info = item
-            break
+    file_info = storage.get_file(file_id)
     
     if not file_info:
         return False, "파일을 찾을 수 없습니다."
     
     try:
-        with open(file_info['local_path'], 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_source(file_info['local_path'], content)
+        get_content_cache().invalidate(file_id)
+        storage.update_search_index([file_id])
         return True, "파일이 성공적으로 업데이트되었습니다."
     except Exception as e:
         return False, f"파일 업데이트 중 오류 발생: {str(e)}"
@@ -275,31 +312,26 @@ def update_file_content(file_id, content):
 def delete_file(file_id):
     """파일 삭제"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            # 파일 정보 조회
+            cursor.execute("SELECT local_path FROM files WHERE id = ?", (file_id,))
+            result = cursor.fetchone()
+            
+            if not result:
+                return False, "파일을 찾을 수 없습니다."
+            
+            local_path = result['local_path']
         
-        # 파일 정보 조회
-        cursor.execute("SELECT local_path FROM files WHERE id = ?", (file_id,))
-        result = cursor.fetchone()
-        
-        if not result:
-            conn.close()
-            return False, "파일을 찾을 수 없습니다."
-        
-        local_path = result['local_path']
-        
-        # 파일 태그 삭제
-        cursor.execute("DELETE FROM file_tags WHERE file_id = ?", (file_id,))
-        
-        # 파일 정보 삭제
-        cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
-        
-        conn.commit()
-        conn.close()
+        # 파일 정보와 태그, 심볼 등 딸린 데이터 삭제
+        storage = CodeStorageManager(base_dir="collected_code")
+        if not storage.delete_files([file_id]):
+            return False, "파일 정보를 삭제하지 못했습니다."
         
-        # 실제 파일 삭제
-        if os.path.exists(local_path):
-            os.remove(local_path)
+        # 실제 파일 (또는 묶음 저장소 항목) 삭제
+        remove_source(local_path)
+        get_content_cache().invalidate(file_id)
         
         return True, "파일이 성공적으로 삭제되었습니다."
     except Exception as e:
@@ -1,8 +1,14 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+import re
+import json
+from flask import (
+    Blueprint, render_template, redirect, url_for, flash, request, jsonify,
+    Response, stream_with_context
+)
 from web_app.api import (
-    get_code_statistics, search_code, get_file_content, 
-    update_file_content, delete_file, manage_file_tag
+    get_code_statistics, search_code, search_code_page, grep_code, find_symbols, find_importers, get_file_content, 
+    find_similar_code, update_file_content, delete_file, manage_file_tag
 )
+from content_cache import highlight_css
 
 code = Blueprint('code', __name__)
 
@@ -34,8 +40,8 @@ def index():
 @code.route('/<int:code_id>')
 def view(code_id):
     """코드 상세 조회 페이지"""
-    # 파일 정보 및 내용 가져오기
-    code_info, content = get_file_content(code_id)
+    # 파일 정보, 내용, 구문 강조 HTML 가져오기 (최근에 본 파일은 캐시에서)
+    code_info, content, highlighted = get_file_content(code_id, highlighted=True)
     
     if not code_info:
         flash('코드를 찾을 수 없습니다.', 'danger')
@@ -45,6 +51,8 @@ def view(code_id):
                           title=code_info['name'], 
                           code=code_info, 
                           content=content,
+                          highlighted=highlighted,
+                          highlight_css=highlight_css(),
                           tags=code_info.get('tags', []))
 
 @code.route('/<int:code_id>/edit', methods=['GET', 'POST'])
@@ -128,27 +136,119 @@ def stats():
 
     
 
+def _split_list_arg(name):
+    """쉼표로 구분하거나 여러 번 지정한 요청 매개변수를 목록으로 변환"""
+    values = []
+    for value in request.args.getlist(name):
+        values.extend(part.strip() for part in value.split(',') if part.strip())
+    return values
+
 @code.route('/api/list')
 def api_list():
-    """API: 코드 목록"""
+    """API: 코드 목록 (다음 페이지 커서는 X-Next-Cursor 헤더와 Link 헤더로 반환)"""
     # 검색 매개변수
     query = request.args.get('query', '')
     suitable_only = request.args.get('suitable_only') == 'true'
     min_quality = request.args.get('min_quality')
     limit = request.args.get('limit', 100, type=int)
+    collapse_duplicates = request.args.get('collapse_duplicates') == 'true'
+    # pylint 메시지 조건 (메시지 ID, 심볼 또는 분류, 쉼표로 구분하거나 여러 번 지정)
+    with_lint = _split_list_arg('with_lint')
+    without_lint = _split_list_arg('without_lint')
+    # 정렬 기준 (relevance, quality, lines, newest, oldest)과 이전 응답의 다음 페이지 커서
+    sort = request.args.get('sort') or None
+    cursor = request.args.get('cursor') or None
     
     if min_quality:
         min_quality = float(min_quality)
     
     # 코드 검색
-    results = search_code(
-        query=query,
-        suitable_only=suitable_only,
-        min_quality=min_quality,
-        limit=limit
-    )
+    try:
+        page = search_code_page(
+            query=query,
+            suitable_only=suitable_only,
+            min_quality=min_quality,
+            limit=limit,
+            collapse_duplicates=collapse_duplicates,
+            with_lint=with_lint,
+            without_lint=without_lint,
+            sort=sort,
+            cursor=cursor
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    response = jsonify(page['results'])
+    if page['next_cursor']:
+        args = request.args.to_dict(flat=False)
+        args['cursor'] = [page['next_cursor']]
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+        response.headers['Link'] = f'<{url_for("code.api_list", _external=True, **args)}>; rel="next"'
+    return response
+
+@code.route('/api/grep')
+def api_grep():
+    """API: 정규식 코드 검색 (일치하는 줄을 한 줄에 하나씩 JSON으로 스트리밍, 마지막 줄은 {"stats": 검색 통계})"""
+    pattern = request.args.get('pattern', '')
+    ignore_case = request.args.get('ignore_case') == 'true'
+    context = request.args.get('context', 0, type=int)
+    limit = request.args.get('limit', 100, type=int)
+    
+    if not pattern:
+        return jsonify({'success': False, 'message': '정규식을 입력하세요.'}), 400
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        return jsonify({'success': False, 'message': f'올바르지 않은 정규식: {str(e)}'}), 400
+    
+    def lines():
+        # 원본을 읽지 못해 앞부분만 확인한 파일 수(unreadable) 등은 검색이 끝나야 알 수 있음
+        stats = {}
+        for match in grep_code(pattern, ignore_case=ignore_case, context=context, limit=limit, stats=stats):
+            yield json.dumps(match, ensure_ascii=False) + '\n'
+        yield json.dumps({'stats': stats}, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
+@code.route('/api/symbols')
+def api_symbols():
+    """API: 정의 이름 검색 (name은 GLOB 패턴, kind는 class/function/method)"""
+    name = request.args.get('name', '')
+    kind = request.args.get('kind') or None
+    limit = request.args.get('limit', 100, type=int)
+    
+    if not name:
+        return jsonify({'success': False, 'message': '찾을 이름을 입력하세요.'}), 400
+    return jsonify(find_symbols(name, kind=kind, limit=limit))
+
+@code.route('/api/importers')
+def api_importers():
+    """API: 모듈을 가져오는 파일 검색"""
+    module = request.args.get('module', '')
+    limit = request.args.get('limit', 100, type=int)
+    
+    if not module:
+        return jsonify({'success': False, 'message': '모듈 이름을 입력하세요.'}), 400
+    return jsonify(find_importers(module, limit=limit))
+
+@code.route('/api/similar/<int:code_id>')
+def api_similar(code_id):
+    """API: 파일과 내용이 유사한 코드 검색"""
+    limit = request.args.get('limit', 10, type=int)
+    exact = request.args.get('exact') == 'true'
+    return jsonify(find_similar_code(file_id=code_id, limit=limit, exact=exact))
+
+@code.route('/api/similar', methods=['POST'])
+def api_similar_snippet():
+    """API: 코드 조각과 내용이 유사한 코드 검색"""
+    data = request.get_json(silent=True) or {}
+    content = data.get('content', '')
+    limit = data.get('limit', 10)
+    exact = bool(data.get('exact', False))
     
-    return jsonify(results)
+    if not content.strip():
+        return jsonify({'success': False, 'message': '코드 조각을 입력하세요.'}), 400
+    return jsonify(find_similar_code(content=content, limit=limit, exact=exact))
 
 @code.route('/api/stats')
 def api_stats():
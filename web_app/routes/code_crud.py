@@ -1,9 +1,11 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
 from web_app import db
 from web_app.api import (
-    search_code, get_file_content, update_file_content, 
-    delete_file, manage_file_tag, get_code_statistics
+    iter_search_code, get_file_content, update_file_content, 
+    delete_file, manage_file_tag, get_code_statistics, export_code_columnar,
+    get_content_cache_stats
 )
+from code_export import EXPORT_FORMATS
 import json
 import os
 
@@ -27,6 +29,14 @@ def api_get_file(file_id):
         'content': content
     })
 
+@code_crud.route('/api/cache/stats', methods=['GET'])
+def api_cache_stats():
+    """API: 파일 내용 캐시 통계"""
+    return jsonify({
+        'success': True,
+        'stats': get_content_cache_stats()
+    })
+
 @code_crud.route('/api/file/<int:file_id>', methods=['PUT'])
 def api_update_file(file_id):
     """API: 파일 내용 업데이트"""
@@ -146,13 +156,13 @@ def api_export():
     if min_quality:
         min_quality = float(min_quality)
     
-    # 코드 검색
-    results = search_code(
+    # 코드 검색 (검색 결과 전체를 페이지 단위로 읽으며 바로 파일에 씀)
+    results = iter_search_code(
         query=query,
         suitable_only=suitable_only,
-        min_quality=min_quality,
-        limit=1000  # 내보내기는 더 많은 결과를 허용
+        min_quality=min_quality
     )
+    count = 0
     
     # 내보내기 디렉토리 확인
     export_dir = os.path.join('collected_code', 'exports')
@@ -173,6 +183,7 @@ def api_export():
             writer.writerow(['ID', '파일명', '저장소', '품질 점수', '코드 라인', '적합성', '태그', '로컬 경로'])
             # 데이터 작성
             for item in results:
+                count += 1
                 writer.writerow([
                     item['id'],
                     item['name'],
@@ -185,7 +196,28 @@ def api_export():
                 ])
     elif format_type == 'json':
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+            f.write('[')
+            for item in results:
+                f.write(',\n' if count else '\n')
+                json.dump(item, f)
+                count += 1
+            f.write('\n]\n' if count else ']\n')
+    elif format_type in EXPORT_FORMATS:
+        # 검색 결과를 거치지 않고 데이터베이스 커서에서 바로 행 그룹 단위로 씀
+        result = export_code_columnar(
+            os.path.join('exports', filename),
+            fmt=format_type,
+            query=query,
+            suitable_only=suitable_only,
+            min_quality=min_quality,
+            include_content=bool(data.get('include_content'))
+        )
+        if result is None:
+            return jsonify({
+                'success': False,
+                'message': f'{format_type} 형식으로 내보내지 못했습니다. (pyarrow 설치 여부를 확인하세요)'
+            }), 500
+        count = result['rows']
     else:
         return jsonify({
             'success': False,
@@ -197,7 +229,7 @@ def api_export():
     
     return jsonify({
         'success': True,
-        'message': f'{len(results)}개 항목이 {format_type} 형식으로 내보내기 되었습니다.',
+        'message': f'{count}개 항목이 {format_type} 형식으로 내보내기 되었습니다.',
         'file_path': relative_path,
         'file_name': filename
     })